@@ -273,7 +273,7 @@ class AudioReactiveGenerator:
                 analysis = self.analyze_audio(audio_data)
                 
                 # Generate frame based on visualization mode
-                pixels = self._generate_frame_pixels(analysis, visualization_mode)
+                pixels = self.generate_frame_pixels(analysis, visualization_mode)
                 
                 frame = Frame(
                     pixels=pixels,
@@ -304,10 +304,12 @@ class AudioReactiveGenerator:
         logger.info(f"Generated pattern: {len(frames)} frames")
         return pattern
     
-    def _generate_frame_pixels(self, analysis: Dict, mode: str) -> List[Tuple[int, int, int]]:
+    def generate_frame_pixels(self, analysis: Dict, mode: str) -> List[Tuple[int, int, int]]:
         """
         Generate pixel colors from audio analysis
         
+        Used for pattern frames, the live preview and live streaming.
+        
         Args:
             analysis: Audio analysis dictionary
             mode: Visualization mode
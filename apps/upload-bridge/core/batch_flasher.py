@@ -6,15 +6,23 @@ Complete implementation with threading and progress tracking
 import threading
 import queue
 import time
-from dataclasses import dataclass
-from typing import List, Callable, Optional
+import json
+import shutil
+import hashlib
+import logging
+import dataclasses
+from dataclasses import dataclass, field
+from typing import List, Callable, Optional, Dict
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from core.pattern import Pattern
-from uploaders.base import UploaderBase, UploadResult
+from uploaders.base import UploaderBase, UploadResult, BuildResult
 from uploaders.uploader_registry import get_uploader
+from firmware.build_cache import pattern_fingerprint
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -36,6 +44,10 @@ class FlashJobResult:
     duration_seconds: float
     bytes_written: int
     error_message: Optional[str] = None
+    flash_seconds: float = 0.0
+    verify_seconds: float = 0.0
+    wait_seconds: float = 0.0  # Time queued for a flash slot
+    verified: Optional[bool] = None  # None = verification not run
 
 
 class BatchFlasher:
@@ -122,8 +134,8 @@ class BatchFlasher:
         """Worker thread that processes flash jobs"""
         while True:
             try:
-                # Get next job (with timeout)
-                job = self.job_queue.get(timeout=1)
+                # All jobs are queued before workers start
+                job = self.job_queue.get_nowait()
             except queue.Empty:
                 # No more jobs
                 break
@@ -251,6 +263,298 @@ class BatchFlasher:
         }
 
 
+def artifact_key(pattern: Pattern, chip_id: str, build_opts: Optional[Dict] = None) -> str:
+    """Key identifying one firmware artifact: (chip, pattern, options)."""
+    opts = json.dumps(build_opts or {}, sort_keys=True, default=str)
+    raw = f"{chip_id}|{pattern_fingerprint(pattern)}|{opts}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ThroughputReport:
+    """Production-line throughput for one scheduler run"""
+    boards: int = 0
+    successful: int = 0
+    failed: int = 0
+    ports: int = 0
+    wall_seconds: float = 0.0
+    build_seconds: float = 0.0
+    builds: int = 0
+    artifact_reuses: int = 0
+    flash_seconds: List[float] = field(default_factory=list)
+    verify_seconds: List[float] = field(default_factory=list)
+    wait_seconds: List[float] = field(default_factory=list)
+    
+    @property
+    def boards_per_hour(self) -> float:
+        """Successfully flashed boards per hour of wall time"""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.successful * 3600.0 / self.wall_seconds
+    
+    @staticmethod
+    def _mean(values: List[float]) -> float:
+        return sum(values) / len(values) if values else 0.0
+    
+    def to_dict(self) -> dict:
+        """Summary for logging/UI"""
+        return {
+            "boards": self.boards,
+            "successful": self.successful,
+            "failed": self.failed,
+            "ports": self.ports,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "boards_per_hour": round(self.boards_per_hour, 1),
+            "builds": self.builds,
+            "artifact_reuses": self.artifact_reuses,
+            "build_seconds": round(self.build_seconds, 3),
+            "avg_flash_seconds": round(self._mean(self.flash_seconds), 3),
+            "avg_verify_seconds": round(self._mean(self.verify_seconds), 3),
+            "avg_wait_seconds": round(self._mean(self.wait_seconds), 3),
+            "max_flash_seconds": round(max(self.flash_seconds, default=0.0), 3),
+        }
+
+
+class BatchFlashScheduler:
+    """
+    Production-line batch flashing
+    
+    - Firmware is built once per (chip, pattern, options) and the artifact
+      is reused for every board and every later run with the same inputs.
+    - Every port gets its own worker, so all attached ports flash
+      concurrently. Each worker owns its port, so a board's verify never
+      collides with the next flash on the same port. The flip side is that
+      boards on one port are strictly sequential: board N+1 is flashed only
+      after board N has verified, because verification reads back through
+      that port. Flash/verify overlap happens across ports only.
+    - Flash and verify are separate stages: a board releases its flash slot
+      as soon as the write finishes, so with ``max_concurrent_flashes``
+      limiting writes (USB power/bandwidth), board N verifies while board
+      N+1 is already being flashed on another port.
+    - Per-stage times are collected into a ThroughputReport.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent_flashes: Optional[int] = None,
+        verify: bool = True,
+        artifact_dir: Optional[str] = None,
+        build_func: Optional[Callable[[Pattern, str, Dict], BuildResult]] = None,
+        uploader_factory: Optional[Callable[[str], UploaderBase]] = None
+    ):
+        """
+        Initialize scheduler
+        
+        Args:
+            max_concurrent_flashes: Simultaneous flash writes (None = one per port)
+            verify: Run uploader verification after each flash
+            artifact_dir: Where reusable firmware artifacts are kept
+            build_func: Build function (defaults to FirmwareBuilder().build)
+            uploader_factory: Returns an uploader for a chip id (defaults to get_uploader)
+        """
+        self.max_concurrent_flashes = max_concurrent_flashes
+        self.verify = verify
+        self.artifact_dir = Path(artifact_dir) if artifact_dir else Path("./build/artifacts")
+        self._build_func = build_func
+        self._uploader_factory = uploader_factory or get_uploader
+        self._artifacts: Dict[str, BuildResult] = {}
+        self._artifact_lock = threading.Lock()
+        self.progress_callback: Optional[Callable[[int, int, FlashJobResult], None]] = None
+        self.report = ThroughputReport()
+    
+    def set_progress_callback(self, callback: Callable[[int, int, FlashJobResult], None]):
+        """
+        Set callback for progress updates
+        
+        Args:
+            callback: Function(completed, remaining, last_result)
+        """
+        self.progress_callback = callback
+    
+    def get_artifact(self, pattern: Pattern, chip_id: str,
+                     build_opts: Optional[Dict] = None) -> BuildResult:
+        """
+        Build firmware, or return the existing artifact for the same inputs
+        
+        The built binary is copied to a key-named file in ``artifact_dir`` so a
+        later build for the same chip can't overwrite it.
+        """
+        build_opts = dict(build_opts or {})
+        key = artifact_key(pattern, chip_id, build_opts)
+        
+        with self._artifact_lock:
+            cached = self._artifacts.get(key)
+            if cached and Path(cached.firmware_path).exists():
+                self.report.artifact_reuses += 1
+                return cached
+            
+            start = time.time()
+            if self._build_func:
+                result = self._build_func(pattern, chip_id, build_opts)
+            else:
+                from firmware.builder import FirmwareBuilder
+                result = FirmwareBuilder().build(pattern, chip_id, build_opts)
+            self.report.build_seconds += time.time() - start
+            self.report.builds += 1
+            
+            if not result.success:
+                raise Exception(f"Build failed: {result.error_message}")
+            
+            source = Path(result.firmware_path)
+            if source.exists():
+                self.artifact_dir.mkdir(parents=True, exist_ok=True)
+                stable = self.artifact_dir / f"{chip_id}_{key[:16]}{source.suffix}"
+                shutil.copy2(source, stable)
+                result = dataclasses.replace(result, firmware_path=str(stable))
+            
+            self._artifacts[key] = result
+            return result
+    
+    def flash_ports(
+        self,
+        pattern: Pattern,
+        chip_id: str,
+        ports: List[str],
+        build_opts: Optional[Dict] = None,
+        boards_per_port: int = 1
+    ) -> List[FlashJobResult]:
+        """
+        Flash one pattern to every board on every port
+        
+        ``self.report`` is not reset here, so build time from an earlier
+        ``get_artifact`` call for the same run stays in the report. Use a new
+        scheduler (or assign a fresh ThroughputReport) for a separate run.
+        
+        Args:
+            pattern: Pattern to flash
+            chip_id: Target chip type
+            ports: Serial ports on the fixture
+            build_opts: Build options (gpio_pin etc.)
+            boards_per_port: Boards fed through each port in this run
+        
+        Returns:
+            List of FlashJobResult
+        """
+        build_opts = dict(build_opts or {})
+        artifact = self.get_artifact(pattern, chip_id, build_opts)
+        
+        jobs = [
+            FlashJob(
+                job_id=f"{port}#{board}",
+                port=port,
+                chip_id=chip_id,
+                firmware_path=artifact.firmware_path,
+                gpio_pin=build_opts.get('gpio_pin', 2)
+            )
+            for board in range(boards_per_port)
+            for port in ports
+        ]
+        return self.run(jobs, reset_report=False)
+    
+    def run(self, jobs: List[FlashJob], reset_report: bool = True) -> List[FlashJobResult]:
+        """
+        Execute jobs with one worker per port
+        
+        Jobs for the same port run in submission order.
+        
+        Returns:
+            List of FlashJobResult in completion order
+        """
+        if reset_report:
+            self.report = ThroughputReport()
+        
+        per_port: Dict[str, List[FlashJob]] = {}
+        for job in jobs:
+            per_port.setdefault(job.port, []).append(job)
+        
+        slots = self.max_concurrent_flashes or len(per_port) or 1
+        flash_slots = threading.Semaphore(slots)
+        results: List[FlashJobResult] = []
+        lock = threading.Lock()
+        total = len(jobs)
+        
+        def _port_worker(port_jobs: List[FlashJob]):
+            for job in port_jobs:
+                try:
+                    result = self._run_job(job, flash_slots)
+                except Exception as e:
+                    result = FlashJobResult(
+                        job_id=job.job_id,
+                        port=job.port,
+                        success=False,
+                        duration_seconds=0,
+                        bytes_written=0,
+                        error_message=str(e)
+                    )
+                with lock:
+                    results.append(result)
+                    completed = len(results)
+                if self.progress_callback:
+                    self.progress_callback(completed, total - completed, result)
+        
+        start = time.time()
+        workers = [
+            threading.Thread(target=_port_worker, args=(port_jobs,),
+                             name=f"FlashPort-{port}", daemon=True)
+            for port, port_jobs in per_port.items()
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        report = self.report
+        report.wall_seconds = time.time() - start
+        report.ports = len(per_port)
+        report.boards = len(results)
+        report.successful = sum(1 for r in results if r.success)
+        report.failed = report.boards - report.successful
+        report.flash_seconds = [r.flash_seconds for r in results]
+        report.verify_seconds = [r.verify_seconds for r in results if r.verified is not None]
+        report.wait_seconds = [r.wait_seconds for r in results]
+        logger.info(f"Batch flash throughput: {report.to_dict()}")
+        
+        return results
+    
+    def _run_job(self, job: FlashJob, flash_slots: threading.Semaphore) -> FlashJobResult:
+        """Flash (holding a slot) then verify (slot released) one board"""
+        uploader = self._uploader_factory(job.chip_id)
+        if not uploader:
+            raise Exception(f"No uploader for {job.chip_id}")
+        port_params = {'port': job.port, 'gpio': job.gpio_pin}
+        
+        queued = time.time()
+        with flash_slots:
+            flash_start = time.time()
+            upload_result = uploader.upload(job.firmware_path, port_params)
+            flash_end = time.time()
+        
+        verified = None
+        verify_seconds = 0.0
+        if upload_result.success and self.verify:
+            verify_start = time.time()
+            verified = bool(uploader.verify(job.firmware_path, port_params))
+            verify_seconds = time.time() - verify_start
+        
+        success = upload_result.success and verified is not False
+        error = upload_result.error_message
+        if upload_result.success and verified is False:
+            error = "Verification failed"
+        
+        return FlashJobResult(
+            job_id=job.job_id,
+            port=job.port,
+            success=success,
+            duration_seconds=time.time() - queued,
+            bytes_written=upload_result.bytes_written,
+            error_message=error,
+            flash_seconds=flash_end - flash_start,
+            verify_seconds=verify_seconds,
+            wait_seconds=flash_start - queued,
+            verified=verified
+        )
+
+
 # Convenience function
 def batch_flash_devices(
     pattern: Pattern,
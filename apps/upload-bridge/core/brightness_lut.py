@@ -0,0 +1,211 @@
+"""
+Brightness LUT - Per-channel lookup tables for hardware brightness
+
+Global brightness (through its curve), value gamma, LED-type colour
+correction and per-channel scaling are folded into one 256-entry table per
+channel. Every consumer applies the same tables:
+
+- Preview and export translate each frame's packed RGB bytes through the
+  tables (``bytes.translate`` per channel, or numpy fancy indexing on a
+  frame tensor) instead of evaluating the curve per pixel.
+- Firmware generation emits the tables as a ``PROGMEM`` array so the MCU
+  corrects colour with a table read instead of float math.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    NUMPY_AVAILABLE = False
+
+RGB = Tuple[int, int, int]
+
+BRIGHTNESS_CURVES = ("linear", "gamma_corrected", "logarithmic", "exponential", "s_curve")
+
+# Typical white-balance correction per LED chip (FastLED's TypicalLEDStrip,
+# Typical8mmPixel and UncorrectedColor values)
+LED_COLOR_CORRECTION: Dict[str, RGB] = {
+    "ws2811": (255, 224, 140),
+    "ws2812": (255, 176, 240),
+    "ws2812b": (255, 176, 240),
+    "sk6812": (255, 176, 240),
+    "neopixel": (255, 176, 240),
+    "apa102": (255, 176, 240),
+    "apa102c": (255, 176, 240),
+    "dotstar": (255, 176, 240),
+    "generic": (255, 255, 255),
+}
+
+
+def curve_level(curve_type: str, brightness: float) -> int:
+    """
+    Hardware level (0-255) of a software brightness (0.0-1.0) on a curve
+
+    Unknown curve types map linearly.
+
+    Raises:
+        ValueError: Brightness outside 0.0-1.0
+    """
+    if not (0.0 <= brightness <= 1.0):
+        raise ValueError(f"Software brightness must be 0.0-1.0, got {brightness}")
+
+    if curve_type == "gamma_corrected":
+        value = brightness ** 2.2
+    elif curve_type == "logarithmic":
+        value = math.log(1 + brightness * 9) / math.log(10)
+    elif curve_type == "exponential":
+        value = brightness ** 0.5
+    elif curve_type == "s_curve":
+        value = 1 / (1 + math.exp(-10 * (brightness - 0.5)))
+    else:
+        value = brightness
+    return int(value * 255)
+
+
+@lru_cache(maxsize=64)
+def _compile_tables(level: int, multipliers: Tuple[float, float, float],
+                    correction: RGB, gamma: float) -> Tuple[bytes, bytes, bytes]:
+    scale = level / 255.0
+    if gamma == 1.0:
+        values = list(range(256))
+    else:
+        values = [255.0 * (v / 255.0) ** gamma for v in range(256)]
+    tables = []
+    for mult, corr in zip(multipliers, correction):
+        factor = mult * (corr / 255.0)
+        tables.append(bytes(max(0, min(255, int(v * scale * factor))) for v in values))
+    return tuple(tables)
+
+
+@dataclass(frozen=True)
+class BrightnessLUT:
+    """
+    Compiled per-channel brightness tables
+
+    ``red[v]`` is the output level of an input red value ``v``; likewise for
+    ``green`` and ``blue``. Each table is 256 bytes and doubles as a
+    ``bytes.translate`` table.
+    """
+    red: bytes
+    green: bytes
+    blue: bytes
+
+    @classmethod
+    def compile(cls, brightness: float = 1.0, curve_type: str = "gamma_corrected",
+                per_channel: Optional[Dict[str, float]] = None, led_type: str = "ws2812",
+                gamma: float = 1.0, color_correction: bool = False) -> 'BrightnessLUT':
+        """
+        Compile brightness settings into tables
+
+        Args:
+            brightness: Global brightness (0.0-1.0), mapped through ``curve_type``
+            curve_type: Brightness curve (unknown names fall back to gamma_corrected)
+            per_channel: Optional 'red'/'green'/'blue' multipliers
+            led_type: LED chip type, selects the colour correction
+            gamma: Exponent applied to input values before scaling (1.0 = none)
+            color_correction: Apply the LED type's white-balance correction
+
+        Raises:
+            ValueError: Brightness outside 0.0-1.0
+        """
+        if curve_type not in BRIGHTNESS_CURVES:
+            curve_type = "gamma_corrected"
+        level = curve_level(curve_type, brightness)
+        per_channel = per_channel or {}
+        multipliers = (
+            float(per_channel.get('red', 1.0)),
+            float(per_channel.get('green', 1.0)),
+            float(per_channel.get('blue', 1.0)),
+        )
+        correction = (255, 255, 255)
+        if color_correction:
+            correction = LED_COLOR_CORRECTION.get(str(led_type).lower(), correction)
+        return cls(*_compile_tables(level, multipliers, correction, float(gamma)))
+
+    @classmethod
+    def from_metadata(cls, metadata, per_channel: bool = True,
+                      color_correction: bool = False) -> 'BrightnessLUT':
+        """
+        Compile the brightness settings stored in pattern metadata
+
+        Args:
+            metadata: PatternMetadata (missing fields use their defaults)
+            per_channel: Honour the metadata's per-channel multipliers when enabled
+            color_correction: Apply the LED type's white-balance correction
+        """
+        multipliers = None
+        if per_channel and getattr(metadata, 'per_channel_brightness', False):
+            multipliers = {
+                'red': getattr(metadata, 'red_brightness', 1.0),
+                'green': getattr(metadata, 'green_brightness', 1.0),
+                'blue': getattr(metadata, 'blue_brightness', 1.0),
+            }
+        brightness = getattr(metadata, 'brightness', 1.0)
+        return cls.compile(
+            brightness=1.0 if brightness is None else brightness,
+            curve_type=getattr(metadata, 'brightness_curve', None) or 'gamma_corrected',
+            per_channel=multipliers,
+            led_type=getattr(metadata, 'led_type', None) or 'ws2812',
+            color_correction=color_correction,
+        )
+
+    @property
+    def tables(self) -> Tuple[bytes, bytes, bytes]:
+        """The red, green and blue tables"""
+        return (self.red, self.green, self.blue)
+
+    def as_array(self) -> "np.ndarray":
+        """Tables as a (3, 256) uint8 array"""
+        return np.frombuffer(b"".join(self.tables), dtype=np.uint8).reshape(3, 256)
+
+    def apply_pixel(self, pixel: Sequence[int]) -> RGB:
+        """Map one pixel (channel values are clamped to 0-255 first)"""
+        r, g, b = (max(0, min(255, int(c))) for c in pixel[:3])
+        return (self.red[r], self.green[g], self.blue[b])
+
+    def apply_pixels(self, pixels: Sequence[Sequence[int]]) -> List[RGB]:
+        """
+        Map a frame's pixels
+
+        Packs the frame to bytes and translates each channel plane in one
+        call; frames with out-of-range or malformed pixels take the
+        per-pixel path.
+        """
+        try:
+            data = bytes(chain.from_iterable(pixels))
+        except (TypeError, ValueError):
+            data = None
+        if data is None or len(data) != len(pixels) * 3:
+            return [self.apply_pixel(p) for p in pixels]
+        out = bytearray(len(data))
+        out[0::3] = data[0::3].translate(self.red)
+        out[1::3] = data[1::3].translate(self.green)
+        out[2::3] = data[2::3].translate(self.blue)
+        return list(zip(out[0::3], out[1::3], out[2::3]))
+
+    def apply_array(self, rgb: "np.ndarray") -> "np.ndarray":
+        """Map a uint8 array whose last axis is RGB (any leading shape)"""
+        return self.as_array()[np.arange(3), rgb]
+
+    def to_c_array(self, name: str = "brightness_lut", qualifier: str = "static const") -> str:
+        """
+        C definition of the tables as ``uint8_t name[3][256] PROGMEM``
+
+        Rows are red, green, blue; 16 values per line.
+        """
+        lines = [f"{qualifier} uint8_t {name}[3][256] PROGMEM = {{"]
+        for channel, table in zip(("red", "green", "blue"), self.tables):
+            lines.append(f"    {{  // {channel}")
+            for start in range(0, 256, 16):
+                row = ", ".join(str(v) for v in table[start:start + 16])
+                lines.append(f"        {row},")
+            lines.append("    },")
+        lines.append("};")
+        return "\n".join(lines) + "\n"
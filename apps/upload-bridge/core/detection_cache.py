@@ -0,0 +1,260 @@
+"""
+Detection Cache - Persistent results of file format detection
+
+Opening a pattern file scores every parser against the raw bytes, and the
+preview then runs wiring/corner detection on the parsed frames. Both give
+the same answer every time the same file is opened, so this module records
+them in an SQLite table keyed by the file content:
+
+- the key is a BLAKE2b digest of the first and last `SAMPLE_BYTES` of the
+  file, its size and its extension (parsers look at the extension), so
+  hashing stays cheap for large files
+- each row holds the parser choice, dimensions, LED/frame counts and, once
+  computed, the detected wiring mode, data-in corner, confidence and reason
+- rows are evicted least recently used first beyond ``max_entries``
+
+Wiring results are only reused when a digest of the detection inputs (see
+`core.file_format_detector.detection_input_digest`) still matches, so a
+pattern edited after loading is detected afresh. Bump
+`DETECTION_CACHE_VERSION` whenever parser or detector output changes; a
+database written by another version is discarded on open.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DETECTION_CACHE_VERSION = 1
+# Bytes hashed from each end of a file
+SAMPLE_BYTES = 64 * 1024
+DETECTION_CACHE_MAX_ENTRIES = 2000
+
+_COLUMNS = (
+    "format_name", "width", "height", "led_count", "frame_count",
+    "wiring_mode", "data_in_corner", "confidence", "reason", "input_digest",
+)
+
+
+def default_cache_path() -> Path:
+    """Detection cache database in the user cache location."""
+    try:
+        from PySide6.QtCore import QStandardPaths
+        base = Path(QStandardPaths.writableLocation(QStandardPaths.CacheLocation)) / "UploadBridge"
+    except Exception:
+        base = Path.home() / ".upload_bridge"
+    return base / "detection_cache.db"
+
+
+def _digest(head: bytes, tail: bytes, size: int, suffix: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{size}:{suffix.lower()}:".encode("utf-8"))
+    digest.update(head)
+    digest.update(tail)
+    return digest.hexdigest()
+
+
+def content_key(data: bytes, suffix: str = "", sample_bytes: int = SAMPLE_BYTES) -> str:
+    """Cache key for file contents already in memory."""
+    if len(data) <= 2 * sample_bytes:
+        return _digest(data, b"", len(data), suffix)
+    return _digest(data[:sample_bytes], data[-sample_bytes:], len(data), suffix)
+
+
+def file_content_key(path: Union[str, Path], sample_bytes: int = SAMPLE_BYTES) -> str:
+    """Cache key for a file, reading only its first and last ``sample_bytes``."""
+    path = Path(path)
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        if size <= 2 * sample_bytes:
+            return _digest(f.read(), b"", size, path.suffix)
+        head = f.read(sample_bytes)
+        f.seek(-sample_bytes, os.SEEK_END)
+        return _digest(head, f.read(sample_bytes), size, path.suffix)
+
+
+@dataclass
+class DetectionRecord:
+    """Detection results for one file."""
+    format_name: str
+    width: int
+    height: int
+    led_count: int
+    frame_count: int
+    wiring_mode: Optional[str] = None  # None until wiring detection has run
+    data_in_corner: Optional[str] = None
+    confidence: Optional[float] = None
+    reason: Optional[str] = None
+    input_digest: Optional[str] = None  # Detection inputs the wiring result belongs to
+
+    @property
+    def has_wiring(self) -> bool:
+        return self.wiring_mode is not None and self.data_in_corner is not None
+
+
+class DetectionCache:
+    """
+    SQLite-backed LRU cache of `DetectionRecord` rows keyed by `content_key`.
+
+    Database errors are logged and treated as misses; the cache never makes
+    loading a file fail.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None,
+                 max_entries: int = DETECTION_CACHE_MAX_ENTRIES):
+        self.db_path = Path(db_path) if db_path is not None else default_cache_path()
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._init_database()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_database(self) -> None:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != DETECTION_CACHE_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS detections")
+                    conn.execute(f"PRAGMA user_version = {DETECTION_CACHE_VERSION}")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS detections (
+                        key TEXT PRIMARY KEY,
+                        format_name TEXT NOT NULL,
+                        width INTEGER NOT NULL,
+                        height INTEGER NOT NULL,
+                        led_count INTEGER NOT NULL,
+                        frame_count INTEGER NOT NULL,
+                        wiring_mode TEXT,
+                        data_in_corner TEXT,
+                        confidence REAL,
+                        reason TEXT,
+                        input_digest TEXT,
+                        last_used INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_detections_last_used ON detections(last_used)")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Detection cache unavailable at {self.db_path}: {e}")
+
+    def get(self, key: str) -> Optional[DetectionRecord]:
+        """Record for ``key`` (marking it most recently used), or None."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM detections WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE detections SET last_used = (SELECT MAX(last_used) FROM detections) + 1 "
+                        "WHERE key = ?",
+                        (key,),
+                    )
+        except sqlite3.Error as e:
+            logger.debug(f"Detection cache lookup failed: {e}")
+            row = None
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return DetectionRecord(**dict(zip(_COLUMNS, row)))
+
+    def put(self, key: str, record: DetectionRecord) -> None:
+        """Store ``record`` as the most recently used entry, evicting the oldest."""
+        values = [getattr(record, name) for name in _COLUMNS]
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO detections (key, {', '.join(_COLUMNS)}, last_used) "
+                    f"VALUES (?, {', '.join('?' * len(_COLUMNS))}, "
+                    "(SELECT COALESCE(MAX(last_used), 0) + 1 FROM detections))",
+                    [key, *values],
+                )
+                evicted = conn.execute(
+                    "DELETE FROM detections WHERE key IN "
+                    "(SELECT key FROM detections ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            self.stats["evictions"] += max(0, evicted)
+        except sqlite3.Error as e:
+            logger.debug(f"Detection cache store failed: {e}")
+
+    def record_wiring(self, key: str, wiring_mode: str, data_in_corner: str, confidence: float,
+                      reason: str, input_digest: Optional[str]) -> bool:
+        """
+        Attach wiring detection results to an existing entry.
+
+        Returns False if ``key`` has no entry (the file was not loaded
+        through a caching registry).
+        """
+        try:
+            with self._connect() as conn:
+                updated = conn.execute(
+                    "UPDATE detections SET wiring_mode = ?, data_in_corner = ?, confidence = ?, "
+                    "reason = ?, input_digest = ? WHERE key = ?",
+                    (wiring_mode, data_in_corner, confidence, reason, input_digest, key),
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.debug(f"Detection cache update failed: {e}")
+            return False
+        return updated > 0
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for ``key`` if there is one."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM detections WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.debug(f"Detection cache delete failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM detections")
+        except sqlite3.Error as e:
+            logger.debug(f"Detection cache clear failed: {e}")
+
+    def __len__(self) -> int:
+        try:
+            with self._connect() as conn:
+                return conn.execute("SELECT COUNT(*) FROM detections").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """Database location, entry count and hit/miss statistics."""
+        return {"db_path": str(self.db_path), "entry_count": len(self), **self.stats}
+
+
+_UNSET = object()
+_shared_cache: Any = _UNSET
+
+
+def get_detection_cache() -> Optional[DetectionCache]:
+    """Shared detection cache at `default_cache_path`, or None if disabled."""
+    global _shared_cache
+    if _shared_cache is _UNSET:
+        _shared_cache = DetectionCache()
+    return _shared_cache
+
+
+def set_detection_cache(cache: Optional[DetectionCache]) -> None:
+    """Replace the shared detection cache; None disables caching."""
+    global _shared_cache
+    _shared_cache = cache
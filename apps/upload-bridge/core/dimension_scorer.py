@@ -12,7 +12,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 import math
 import math
-from typing import Iterable, Iterator, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 RGBPixel = Tuple[int, int, int]
 
@@ -204,25 +211,42 @@ def layout_score(width: int, height: int, total_pixels: Optional[int] = None) ->
     return _base_layout_score(width, height)
 
 
-def _pixel_alignment_bonus(frame: Iterable[RGBPixel], width: int) -> float:
-    frame_list = list(frame) if frame is not None else []
-    if width <= 1 or len(frame_list) < width + 1:
-        return 0.0
+def _pixel_array(pixels: Sequence[RGBPixel]):
+    """
+    (N, 3) int64 array of the pixels' RGB channels, or None.
+
+    None means NumPy is unavailable or the pixels are not integer triples
+    (or wider); callers then fall back to the pure-Python path.
+    """
+    if not NUMPY_AVAILABLE or not len(pixels):
+        return None
+    try:
+        array = np.asarray(pixels)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 2 or array.shape[1] < 3 or array.dtype.kind not in "iu":
+        return None
+    return array[:, :3].astype(np.int64, copy=False)
+
+
+def _neighbor_diffs(frame_list: Sequence[RGBPixel]):
+    """Summed absolute RGB difference between each pixel and the next."""
+    array = _pixel_array(frame_list)
+    if array is not None:
+        return np.abs(np.diff(array, axis=0)).sum(axis=1)
+    return [
+        sum(abs(frame_list[idx][channel] - frame_list[idx + 1][channel]) for channel in range(3))
+        for idx in range(len(frame_list) - 1)
+    ]
 
-    wrap_diffs: List[int] = []
-    inline_diffs: List[int] = []
-    for idx in range(len(frame_list) - 1):
-        diff = sum(abs(frame_list[idx][channel] - frame_list[idx + 1][channel]) for channel in range(3))
-        if (idx + 1) % width == 0:
-            wrap_diffs.append(diff)
-        else:
-            inline_diffs.append(diff)
 
-    if not inline_diffs or not wrap_diffs:
+def _alignment_from_sums(inline_total: int, inline_count: int, wrap_total: int, wrap_count: int) -> float:
+    """Alignment bonus from summed neighbour differences inside rows and across row wraps."""
+    if not inline_count or not wrap_count:
         return 0.0
 
-    avg_inline = sum(inline_diffs) / len(inline_diffs)
-    avg_wrap = sum(wrap_diffs) / len(wrap_diffs)
+    avg_inline = inline_total / inline_count
+    avg_wrap = wrap_total / wrap_count
     if avg_wrap <= avg_inline:
         return 0.0
 
@@ -230,6 +254,36 @@ def _pixel_alignment_bonus(frame: Iterable[RGBPixel], width: int) -> float:
     return min(0.2, max(0.0, gain * 0.1))
 
 
+def _pixel_alignment_bonuses(frame: Iterable[RGBPixel], widths: Iterable[int]) -> Dict[int, float]:
+    """
+    `_pixel_alignment_bonus` for several widths of one frame.
+
+    Neighbour differences are computed once; each width then only sums the
+    differences at its row wraps (every ``width``-th one).
+    """
+    frame_list = list(frame) if frame is not None else []
+    widths = list(widths)
+    bonuses = {width: 0.0 for width in widths}
+    if not any(1 < width < len(frame_list) for width in widths):
+        return bonuses
+
+    diffs = _neighbor_diffs(frame_list)
+    total = int(sum(diffs))
+    for width in widths:
+        if width <= 1 or len(frame_list) < width + 1:
+            continue
+        wrap = diffs[width - 1 :: width]
+        wrap_total = int(sum(wrap))
+        bonuses[width] = _alignment_from_sums(
+            total - wrap_total, len(diffs) - len(wrap), wrap_total, len(wrap)
+        )
+    return bonuses
+
+
+def _pixel_alignment_bonus(frame: Iterable[RGBPixel], width: int) -> float:
+    return _pixel_alignment_bonuses(frame, (width,))[width]
+
+
 def generate_layout_candidates(
     led_count: int,
     first_frame: Optional[Iterable[RGBPixel]] = None,
@@ -238,10 +292,14 @@ def generate_layout_candidates(
 ) -> List[Tuple[int, int, float]]:
     """Return sorted layout candidates (width, height, confidence)."""
     candidates: List[Tuple[int, int, float]] = []
-    for width, height in _factor_pairs(led_count, include_strips=include_strips):
+    pairs = list(_factor_pairs(led_count, include_strips=include_strips))
+    alignment: Dict[int, float] = {}
+    if first_frame:
+        alignment = _pixel_alignment_bonuses(first_frame, (width for width, _ in pairs))
+    for width, height in pairs:
         score = _base_layout_score(width, height)
         if first_frame:
-            score += _pixel_alignment_bonus(first_frame, width)
+            score += alignment[width]
         score = max(0.05, min(score, 0.99))
         candidates.append((width, height, score))
 
@@ -342,10 +400,7 @@ def infer_leds_and_frames(
         first_frame_pixels: Optional[List[RGBPixel]] = None
         if pixel_bytes and len(pixel_bytes) >= led_count * 3:
             raw = pixel_bytes[: led_count * 3]
-            first_frame_pixels = [
-                (raw[i], raw[i + 1], raw[i + 2])
-                for i in range(0, led_count * 3, 3)
-            ]
+            first_frame_pixels = list(zip(raw[0::3], raw[1::3], raw[2::3]))
 
         layout = pick_best_layout(
             led_count,
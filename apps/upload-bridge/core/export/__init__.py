@@ -9,9 +9,16 @@ from .encoders import (
     build_dat_payload,
     build_intel_hex,
     build_c_header,
+    build_palette_payload,
     encode_frame_bytes,
     bytes_per_pixel,
     prepare_frame_pixels,
+    quantize_pattern,
+)
+from .palette import (
+    PaletteQuantization,
+    QuantizationReport,
+    quantize_frames,
 )
 from .validator import (
     ExportPreview,
@@ -36,6 +43,12 @@ __all__ = [
     'encode_frame_bytes',
     'bytes_per_pixel',
     'prepare_frame_pixels',
+    'build_palette_payload',
+    'quantize_pattern',
+    # Palette
+    'PaletteQuantization',
+    'QuantizationReport',
+    'quantize_frames',
     # Validator
     'ExportPreview',
     'ExportValidationError',
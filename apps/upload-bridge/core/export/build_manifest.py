@@ -23,7 +23,9 @@ class BuildManifest:
         pattern: Pattern,
         device_profiles: Optional[List[str]] = None,
         export_format: str = "bin",
-        schema_version: str = "1.0"
+        schema_version: str = "1.0",
+        build_result: Optional[Any] = None,
+        build_cache_stats: Optional[Dict[str, Any]] = None
     ):
         """
         Initialize build manifest.
@@ -33,11 +35,16 @@ class BuildManifest:
             device_profiles: List of device profile IDs used
             export_format: Export format (bin, hex, leds, etc.)
             schema_version: Pattern schema version
+            build_result: Optional firmware BuildResult (cache hit, build time)
+            build_cache_stats: Optional firmware build cache statistics
         """
         self.pattern = pattern
         self.device_profiles = device_profiles or []
         self.export_format = export_format
         self.schema_version = schema_version
+        self.build_result = build_result
+        self.build_cache_stats = build_cache_stats
+        self.firmware_hash: Optional[str] = None
         self.created_at = datetime.utcnow().isoformat() + 'Z'
     
     def compute_pattern_hash(self) -> str:
@@ -68,11 +75,35 @@ class BuildManifest:
         """
         return hashlib.sha256(firmware_bytes).hexdigest()
     
+    def build_cache_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Firmware build cache report: this build's hit/miss and overall hit rate.
+        
+        Returns:
+            Dictionary, or None when no firmware build was involved
+        """
+        if self.build_result is None and self.build_cache_stats is None:
+            return None
+        
+        info: Dict[str, Any] = dict(self.build_cache_stats or {})
+        if self.build_result is not None:
+            info["cache_hit"] = bool(getattr(self.build_result, "cache_hit", False))
+            info["build_seconds"] = round(getattr(self.build_result, "build_seconds", 0.0), 3)
+        return info
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert manifest to dictionary"""
         pattern_hash = self.compute_pattern_hash()
         
-        return {
+        build_info = {
+            "deterministic": True,
+            "reproducible": True
+        }
+        cache_info = self.build_cache_info()
+        if cache_info is not None:
+            build_info["cache"] = cache_info
+        
+        manifest_dict = {
             "schema_version": self.schema_version,
             "pattern_id": self.pattern.id,
             "pattern_name": self.pattern.name,
@@ -87,11 +118,11 @@ class BuildManifest:
             "device_profiles": self.device_profiles,
             "created_at": self.created_at,
             "tool_version": "3.0",  # Upload Bridge version
-            "build_info": {
-                "deterministic": True,
-                "reproducible": True
-            }
+            "build_info": build_info
         }
+        if self.firmware_hash is not None:
+            manifest_dict["firmware_hash"] = self.firmware_hash
+        return manifest_dict
     
     def save(self, file_path: Path) -> None:
         """
@@ -159,7 +190,9 @@ def generate_build_manifest(
     pattern: Pattern,
     export_format: str = "bin",
     device_profiles: Optional[List[str]] = None,
-    firmware_bytes: Optional[bytes] = None
+    firmware_bytes: Optional[bytes] = None,
+    build_result: Optional[Any] = None,
+    build_cache_stats: Optional[Dict[str, Any]] = None
 ) -> BuildManifest:
     """
     Generate build manifest for exported pattern.
@@ -169,22 +202,28 @@ def generate_build_manifest(
         export_format: Export format
         device_profiles: List of device profile IDs
         firmware_bytes: Optional firmware binary (for hash calculation)
+        build_result: Optional firmware BuildResult
+        build_cache_stats: Optional build cache statistics; defaults to the
+            process-wide firmware build cache when build_result is given
         
     Returns:
         BuildManifest object
     """
+    if build_result is not None and build_cache_stats is None:
+        from firmware.build_cache import get_build_cache
+        build_cache_stats = get_build_cache().stats.to_dict()
+    
     manifest = BuildManifest(
         pattern=pattern,
         device_profiles=device_profiles,
-        export_format=export_format
+        export_format=export_format,
+        build_result=build_result,
+        build_cache_stats=build_cache_stats
     )
     
     # Add firmware hash if provided
     if firmware_bytes:
-        firmware_hash = manifest.compute_firmware_hash(firmware_bytes)
-        manifest_dict = manifest.to_dict()
-        manifest_dict["firmware_hash"] = firmware_hash
-        # Note: This modifies the dict but doesn't affect the object
+        manifest.firmware_hash = manifest.compute_firmware_hash(firmware_bytes)
     
     return manifest
 
@@ -13,6 +13,7 @@ from typing import Iterable, List, Tuple
 from core.pattern import Frame, Pattern
 from core.export_options import ExportOptions, RGB
 from core.mapping.circular_mapper import CircularMapper
+from core.export.palette import PaletteQuantization, pack_indices, quantize_frames
 
 
 def _reverse_bits(value: int, bit_count: int = 8) -> int:
@@ -109,9 +110,9 @@ def prepare_frame_pixels(pattern: Pattern, frame: Frame) -> List[RGB]:
     return pixels
 
 
-def encode_frame_bytes(pattern: Pattern, frame: Frame, options: ExportOptions) -> bytes:
+def ordered_frame_pixels(pattern: Pattern, frame: Frame, options: ExportOptions) -> List[RGB]:
     """
-    Encode a single frame into bytes (pixel only, no duration header).
+    Return a frame's pixels in output (wiring) order, before colour encoding.
     
     For circular layouts, this function reorders pixels using the mapping table
     to match physical LED wiring order. The mapping table is the single source
@@ -214,11 +215,19 @@ def encode_frame_bytes(pattern: Pattern, frame: Frame, options: ExportOptions) -
             pattern.metadata.width,
             pattern.metadata.height,
         )
+    return ordered_pixels
+
+
+def _encode_color(pixel: RGB, options: ExportOptions) -> bytes:
+    """Encode one colour with channel order, colour space and bit order applied."""
+    return bytes(_apply_bit_order(byte, options) for byte in _encode_pixel_bytes(pixel, options))
 
+
+def encode_frame_bytes(pattern: Pattern, frame: Frame, options: ExportOptions) -> bytes:
+    """Encode a single frame into bytes (pixel only, no duration header)."""
     data = bytearray()
-    for pixel in ordered_pixels:
-        for byte in _encode_pixel_bytes(pixel, options):
-            data.append(_apply_bit_order(byte, options))
+    for pixel in ordered_frame_pixels(pattern, frame, options):
+        data.extend(_encode_color(pixel, options))
     return bytes(data)
 
 
@@ -227,9 +236,50 @@ def bytes_per_pixel(options: ExportOptions) -> int:
     return len(_encode_pixel_bytes((0, 0, 0), options))
 
 
+def quantize_pattern(pattern: Pattern, options: ExportOptions) -> PaletteQuantization:
+    """Quantize a pattern's frames (in output order) for palette export."""
+    segment_frames = options.palette_segment_frames if options.palette_mode == "Segment" else 0
+    frames = [ordered_frame_pixels(pattern, frame, options) for frame in pattern.frames]
+    return quantize_frames(frames, options.palette_max_colors, segment_frames)
+
+
+def build_palette_payload(pattern: Pattern, options: ExportOptions) -> Tuple[bytes, PaletteQuantization]:
+    """
+    Return the indexed-colour binary payload and its quantization.
+
+    Layout (little-endian):
+        u16 led count, u16 frame count,
+        u8 bits per index, u8 bytes per palette colour, u16 segment count
+        per segment:
+            u16 frame count, u16 palette colours, encoded palette colours
+            per frame: u16 delay_ms, packed indices (first LED in the low bits)
+    """
+    quantization = quantize_pattern(pattern, options)
+    bits = quantization.index_bits
+    payload = bytearray()
+    payload.extend(struct.pack("<HH", pattern.metadata.led_count, pattern.frame_count))
+    payload.extend(struct.pack("<BBH", bits, bytes_per_pixel(options), len(quantization.segments)))
+    for segment in quantization.segments:
+        payload.extend(struct.pack("<HH", len(segment.frames), len(segment.palette)))
+        for color in segment.palette:
+            payload.extend(_encode_color(color, options))
+        for offset, indices in enumerate(segment.frames):
+            frame = pattern.frames[segment.start_frame + offset]
+            payload.extend(struct.pack("<H", max(1, min(frame.duration_ms, 65535))))
+            payload.extend(pack_indices(indices, bits))
+    return bytes(payload), quantization
+
+
 def build_binary_payload(pattern: Pattern, options: ExportOptions | None = None) -> bytes:
-    """Return full binary payload (with Upload Bridge header)."""
+    """
+    Return full binary payload (with Upload Bridge header).
+
+    With ``options.palette_enabled`` the payload is the indexed-colour
+    layout of ``build_palette_payload``.
+    """
     opts = options or ExportOptions()
+    if opts.palette_enabled:
+        return build_palette_payload(pattern, opts)[0]
     payload = bytearray()
     payload.extend(struct.pack("<H", pattern.metadata.led_count))
     payload.extend(struct.pack("<H", pattern.frame_count))
@@ -308,10 +358,84 @@ def build_intel_hex(pattern: Pattern, options: ExportOptions | None = None) -> s
     return "\n".join(lines) + "\n"
 
 
+def _c_array_values(data: bytes, byte_width: int) -> Tuple[str, str]:
+    """Group encoded bytes into C array elements; returns (element type, values)."""
+    if byte_width == 3:
+        element_type = "uint32_t"
+        step = 3
+    elif byte_width == 2:
+        element_type = "uint16_t"
+        step = 2
+    else:
+        element_type = "uint8_t"
+        step = 1
+
+    values: List[int] = []
+    for offset in range(0, len(data), step):
+        chunk = data[offset:offset + step]
+        if len(chunk) < step:
+            chunk = chunk + bytes([0] * (step - len(chunk)))
+        if step == 3:
+            value = (chunk[0] << 16) | (chunk[1] << 8) | chunk[2]
+        else:
+            value = 0
+            for idx, byte in enumerate(chunk):
+                value |= byte << (idx * 8)
+        values.append(value)
+
+    hex_width = step * 2 if step != 3 else 6
+    return element_type, ", ".join(f"0x{value:0{hex_width}X}" for value in values)
+
+
+def _palette_header_lines(pattern: Pattern, options: ExportOptions, array_basename: str) -> List[str]:
+    quantization = quantize_pattern(pattern, options)
+    byte_width = bytes_per_pixel(options)
+    segments = quantization.segments
+    lines = [
+        f"// Indexed colour: {quantization.report.summary()}",
+        f"// Frames hold {quantization.index_bits}-bit palette indices, first LED in the low bits",
+        f"static const uint8_t {array_basename}_INDEX_BITS = {quantization.index_bits};",
+        f"static const uint16_t {array_basename}_PALETTES = {len(segments)};",
+        "",
+    ]
+    for number, segment in enumerate(segments):
+        palette_bytes = b"".join(_encode_color(color, options) for color in segment.palette)
+        element_type, formatted = _c_array_values(palette_bytes, byte_width)
+        lines.append(f"static const {element_type} {array_basename}_Palette{number}[] PROGMEM = {{")
+        lines.append(f"    {formatted}")
+        lines.append("};")
+        lines.append("")
+
+    if len(segments) > 1:
+        segment_type = "uint8_t" if len(segments) <= 256 else "uint16_t"
+        frame_segments = ", ".join(
+            str(number) for number, segment in enumerate(segments) for _ in segment.frames
+        )
+        lines.append(f"static const {segment_type} {array_basename}_FramePalette[] PROGMEM = {{")
+        lines.append(f"    {frame_segments}")
+        lines.append("};")
+        lines.append("")
+
+    for segment in segments:
+        for offset, indices in enumerate(segment.frames):
+            packed = pack_indices(indices, quantization.index_bits)
+            _, formatted = _c_array_values(packed, 1)
+            lines.append(
+                f"static const uint8_t {array_basename}_Frame{segment.start_frame + offset}[] PROGMEM = {{"
+            )
+            lines.append(f"    {formatted}")
+            lines.append("};")
+            lines.append("")
+    return lines
+
+
 def build_c_header(pattern: Pattern, options: ExportOptions | None = None, array_basename: str = "Pattern") -> str:
     """
     Generate a simple C header representation with frame arrays.
     Returns header text (caller writes to .h file).
+
+    With ``options.palette_enabled`` frames are packed palette indices and
+    the palette arrays hold the encoded colours.
     """
     opts = options or ExportOptions()
     lines: List[str] = [
@@ -324,39 +448,17 @@ def build_c_header(pattern: Pattern, options: ExportOptions | None = None, array
         f"static const uint16_t {array_basename}_FRAMES = {pattern.frame_count};",
         "",
     ]
+    if opts.palette_enabled:
+        lines.extend(_palette_header_lines(pattern, opts, array_basename))
+        return "\n".join(lines)
 
     byte_width = bytes_per_pixel(opts)
     for index, frame in enumerate(pattern.frames):
         frame_bytes = encode_frame_bytes(pattern, frame, opts)
         array_name = f"{array_basename}_Frame{index}"
-
-        if byte_width == 3:
-            element_type = "uint32_t"
-            step = 3
-        elif byte_width == 2:
-            element_type = "uint16_t"
-            step = 2
-        else:
-            element_type = "uint8_t"
-            step = 1
+        element_type, formatted = _c_array_values(frame_bytes, byte_width)
 
         lines.append(f"static const {element_type} {array_name}[] PROGMEM = {{")
-
-        values: List[int] = []
-        for offset in range(0, len(frame_bytes), step):
-            chunk = frame_bytes[offset:offset + step]
-            if len(chunk) < step:
-                chunk = chunk + bytes([0] * (step - len(chunk)))
-            if step == 3:
-                value = (chunk[0] << 16) | (chunk[1] << 8) | chunk[2]
-            else:
-                value = 0
-                for idx, byte in enumerate(chunk):
-                    value |= byte << (idx * 8)
-            values.append(value)
-
-        hex_width = step * 2 if step != 3 else 6
-        formatted = ", ".join(f"0x{value:0{hex_width}X}" for value in values)
         lines.append(f"    {formatted}")
         lines.append("};")
         lines.append("")
@@ -366,6 +468,9 @@ def build_c_header(pattern: Pattern, options: ExportOptions | None = None, array
 
 __all__ = [
     "encode_frame_bytes",
+    "ordered_frame_pixels",
+    "quantize_pattern",
+    "build_palette_payload",
     "bytes_per_pixel",
     "prepare_frame_pixels",
     "build_binary_payload",
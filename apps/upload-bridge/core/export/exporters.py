@@ -7,6 +7,7 @@ encoders, validators, and build manifest generation.
 
 from __future__ import annotations
 
+import math
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -681,52 +682,61 @@ class PatternExporter:
             led_count = pattern.metadata.circular_led_count
             xlights_data["model"]["leds"] = led_count
         
-        current_time_ms = 0
-        for frame in pattern.frames:
-            # Get pixels from frame
-            pixels = prepare_frame_pixels(pattern, frame)
-            
-            # For circular layouts, reorder pixels using mapping table
-            if layout_type != "rectangular" and pattern.metadata.circular_mapping_table:
-                # Reorder pixels according to LED wiring order
-                reordered_pixels = []
-                for led_idx in range(led_count):
-                    if led_idx < len(pattern.metadata.circular_mapping_table):
-                        grid_x, grid_y = pattern.metadata.circular_mapping_table[led_idx]
-                        if 0 <= grid_y < pattern.metadata.height and 0 <= grid_x < pattern.metadata.width:
-                            grid_idx = grid_y * pattern.metadata.width + grid_x
-                            if grid_idx < len(pixels):
-                                reordered_pixels.append(pixels[grid_idx])
+        # xLights plays at a fixed frame rate: sample the timeline at the
+        # sequence fps and convert each pattern frame's pixels only once
+        step_ms = 1000.0 / xlights_data["sequence"]["fps"]
+        sample_count = max(1, math.ceil(total_ms / step_ms)) if total_ms > 0 else 0
+        indices = pattern.frames_at_times([k * step_ms for k in range(sample_count)])
+        rgb_arrays: Dict[int, list] = {}
+        for k, frame_idx in enumerate(indices):
+            frame_idx = int(frame_idx)
+            rgb_array = rgb_arrays.get(frame_idx)
+            if rgb_array is None:
+                frame = pattern.frames[frame_idx]
+                # Get pixels from frame
+                pixels = prepare_frame_pixels(pattern, frame)
+                
+                # For circular layouts, reorder pixels using mapping table
+                if layout_type != "rectangular" and pattern.metadata.circular_mapping_table:
+                    # Reorder pixels according to LED wiring order
+                    reordered_pixels = []
+                    for led_idx in range(led_count):
+                        if led_idx < len(pattern.metadata.circular_mapping_table):
+                            grid_x, grid_y = pattern.metadata.circular_mapping_table[led_idx]
+                            if 0 <= grid_y < pattern.metadata.height and 0 <= grid_x < pattern.metadata.width:
+                                grid_idx = grid_y * pattern.metadata.width + grid_x
+                                if grid_idx < len(pixels):
+                                    reordered_pixels.append(pixels[grid_idx])
+                                else:
+                                    reordered_pixels.append((0, 0, 0))
                             else:
                                 reordered_pixels.append((0, 0, 0))
                         else:
                             reordered_pixels.append((0, 0, 0))
+                    pixels = reordered_pixels
+                
+                # Convert pixels to RGB array
+                rgb_array = []
+                for pixel in pixels[:led_count]:
+                    if isinstance(pixel, (list, tuple)) and len(pixel) >= 3:
+                        rgb_array.append([int(pixel[0]), int(pixel[1]), int(pixel[2])])
                     else:
-                        reordered_pixels.append((0, 0, 0))
-                pixels = reordered_pixels
-            
-            # Convert pixels to RGB array
-            rgb_array = []
-            for pixel in pixels[:led_count]:
-                if isinstance(pixel, (list, tuple)) and len(pixel) >= 3:
-                    rgb_array.append([int(pixel[0]), int(pixel[1]), int(pixel[2])])
-                else:
+                        rgb_array.append([0, 0, 0])
+                
+                # Pad or trim to exact LED count
+                while len(rgb_array) < led_count:
                     rgb_array.append([0, 0, 0])
-            
-            # Pad or trim to exact LED count
-            while len(rgb_array) < led_count:
-                rgb_array.append([0, 0, 0])
-            rgb_array = rgb_array[:led_count]
+                rgb_array = rgb_array[:led_count]
+                rgb_arrays[frame_idx] = rgb_array
+            time_ms = round(k * step_ms)
             
             # xLights frame format
             xlights_frame = {
-                "time_ms": current_time_ms,
-                "duration_ms": frame.duration_ms,
+                "time_ms": time_ms,
+                "duration_ms": round((k + 1) * step_ms) - time_ms,
                 "pixels": rgb_array
             }
             xlights_data["sequence"]["frames"].append(xlights_frame)
-            
-            current_time_ms += frame.duration_ms
         
         # Add metadata for Budurasmala layouts
         if hasattr(pattern.metadata, 'layout_type') and pattern.metadata.layout_type != "rectangular":
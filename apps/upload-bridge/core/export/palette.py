@@ -0,0 +1,271 @@
+"""
+Palette Quantization - Indexed-colour export payloads
+
+Most patterns use a handful of colours, so storing a palette plus 1/2/4/8-bit
+indices per LED is several times smaller than 24-bit pixels. Palettes are
+built per pattern ("Global") or per run of frames ("Segment"):
+
+- Up to ``max_colors`` distinct colours: the palette is exact.
+- More colours: median cut over the (sampled) distinct colours weighted by
+  use, refined with a few k-means passes when numpy is available. Every
+  pixel then maps to its nearest palette entry and the error is reported.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    NUMPY_AVAILABLE = False
+
+RGB = Tuple[int, int, int]
+
+SAMPLE_COLORS = 4096  # Distinct colours fed to median cut / k-means
+KMEANS_PASSES = 4
+
+
+def index_bits(colors: int) -> int:
+    """Bits per index for a palette of ``colors`` entries (1, 2, 4 or 8)"""
+    for bits in (1, 2, 4):
+        if colors <= 1 << bits:
+            return bits
+    return 8
+
+
+def pack_indices(indices: Sequence[int], bits: int) -> bytes:
+    """Pack indices ``bits`` wide, first index in the least significant bits"""
+    per_byte = 8 // bits
+    packed = bytearray((len(indices) + per_byte - 1) // per_byte)
+    for i, index in enumerate(indices):
+        packed[i // per_byte] |= index << ((i % per_byte) * bits)
+    return bytes(packed)
+
+
+def unpack_indices(data: bytes, bits: int, count: int) -> List[int]:
+    """Inverse of ``pack_indices``"""
+    per_byte = 8 // bits
+    mask = (1 << bits) - 1
+    return [(data[i // per_byte] >> ((i % per_byte) * bits)) & mask for i in range(count)]
+
+
+@dataclass
+class QuantizationReport:
+    """Colour error introduced by quantization (channel values 0-255)"""
+    source_colors: int
+    palette_colors: int
+    exact: bool
+    mean_error: float = 0.0  # Mean absolute error per channel
+    max_error: int = 0  # Largest single-channel error
+    psnr: float = math.inf  # Peak signal-to-noise ratio in dB
+
+    def summary(self) -> str:
+        """One-line description for previews and logs"""
+        if self.exact:
+            return f"exact palette ({self.palette_colors} colours)"
+        return (
+            f"{self.source_colors} colours -> {self.palette_colors}: "
+            f"mean error {self.mean_error:.2f}, max {self.max_error}, PSNR {self.psnr:.1f} dB"
+        )
+
+
+@dataclass
+class PaletteSegment:
+    """A palette and the frames indexed against it"""
+    start_frame: int
+    palette: List[RGB]
+    frames: List[List[int]]  # One palette index per LED
+
+
+@dataclass
+class PaletteQuantization:
+    """Quantized frames, split into segments sharing a palette"""
+    segments: List[PaletteSegment]
+    report: QuantizationReport
+    index_bits: int  # Widest index over all segments, used for every frame
+
+    @property
+    def frame_count(self) -> int:
+        return sum(len(segment.frames) for segment in self.segments)
+
+    def segment_of(self, frame_index: int) -> int:
+        """Segment holding frame ``frame_index``"""
+        for number, segment in enumerate(self.segments):
+            if frame_index < segment.start_frame + len(segment.frames):
+                return number
+        raise IndexError(frame_index)
+
+
+def _widest_channel(box: List[Tuple[RGB, int]]) -> Tuple[int, int]:
+    """(spread, channel) of the channel with the largest value range in a box"""
+    if len(box) < 2:
+        return (0, 0)
+    return max((max(c[ch] for c, _ in box) - min(c[ch] for c, _ in box), ch) for ch in range(3))
+
+
+def _median_cut(colors: List[RGB], weights: List[int], max_colors: int) -> List[RGB]:
+    """Split the weighted colour set at channel medians into ``max_colors`` boxes"""
+    items = list(zip(colors, weights))
+    boxes = [(_widest_channel(items), items)]
+    while len(boxes) < max_colors:
+        number = max(range(len(boxes)), key=lambda i: boxes[i][0][0])
+        (spread, channel), box = boxes[number]
+        if spread == 0:
+            break
+        box = sorted(box, key=lambda item: item[0][channel])
+        half = sum(w for _, w in box) / 2
+        running = 0
+        split = 1
+        for split in range(1, len(box)):
+            running += box[split - 1][1]
+            if running >= half:
+                break
+        low, high = box[:split], box[split:]
+        boxes[number:number + 1] = [(_widest_channel(low), low), (_widest_channel(high), high)]
+
+    palette = []
+    for _, box in boxes:
+        total = sum(w for _, w in box)
+        palette.append(tuple(
+            int(round(sum(c[channel] * w for c, w in box) / total)) for channel in range(3)
+        ))
+    return palette
+
+
+def _nearest(colors: List[RGB], palette: List[RGB]) -> List[int]:
+    """Index of the nearest palette entry (squared RGB distance) for each colour"""
+    if NUMPY_AVAILABLE:
+        # |c - p|^2 = |c|^2 - 2 c.p + |p|^2; |c|^2 does not change the argmin
+        pal = np.asarray(palette, dtype=np.float64)
+        src = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        pal_sq = (pal * pal).sum(axis=1)[None, :]
+        out = np.empty(len(src), dtype=np.int64)
+        for start in range(0, len(src), 4096):
+            dist = pal_sq - 2.0 * (src[start:start + 4096] @ pal.T)
+            out[start:start + 4096] = dist.argmin(axis=1)
+        return out.tolist()
+    return [
+        min(range(len(palette)), key=lambda i: sum((a - b) ** 2 for a, b in zip(color, palette[i])))
+        for color in colors
+    ]
+
+
+def _refine(palette: List[RGB], colors: List[RGB], weights: List[int]) -> List[RGB]:
+    """A few weighted k-means passes seeded with ``palette`` (numpy only)"""
+    if not NUMPY_AVAILABLE:
+        return palette
+    src = np.asarray(colors, dtype=np.float64)
+    w = np.asarray(weights, dtype=np.float64)
+    centres = np.asarray(palette, dtype=np.float64)
+    for _ in range(KMEANS_PASSES):
+        labels = np.asarray(_nearest(colors, np.rint(centres).astype(np.int32).tolist()))
+        totals = np.bincount(labels, weights=w, minlength=len(centres))
+        used = totals > 0
+        for channel in range(3):
+            sums = np.bincount(labels, weights=src[:, channel] * w, minlength=len(centres))
+            centres[used, channel] = sums[used] / totals[used]
+    return [tuple(int(v) for v in row) for row in np.clip(np.rint(centres), 0, 255)]
+
+
+def build_palette(counts: Dict[RGB, int], max_colors: int = 256) -> Tuple[List[RGB], bool]:
+    """
+    Choose a palette for colours with their use counts
+
+    Args:
+        counts: Colour -> number of pixels using it
+        max_colors: Palette size limit (2-256)
+
+    Returns:
+        (palette, exact) - exact palettes list colours by descending use
+    """
+    if len(counts) <= max_colors:
+        return [color for color, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))], True
+
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    if len(ranked) > SAMPLE_COLORS:
+        # Keep the most used colours and an even stride through the rest
+        head = ranked[:SAMPLE_COLORS // 2]
+        tail = ranked[SAMPLE_COLORS // 2:]
+        step = len(tail) / (SAMPLE_COLORS - len(head))
+        ranked = head + [tail[int(i * step)] for i in range(SAMPLE_COLORS - len(head))]
+    colors = [color for color, _ in ranked]
+    weights = [count for _, count in ranked]
+    palette = _refine(_median_cut(colors, weights, max_colors), colors, weights)
+    return list(dict.fromkeys(palette)), False
+
+
+def _quantize_segment(frames: Sequence[Sequence[RGB]], start: int,
+                      max_colors: int) -> Tuple[PaletteSegment, bool, Counter, Dict[RGB, RGB]]:
+    counts: Counter = Counter()
+    for pixels in frames:
+        counts.update(tuple(p[:3]) for p in pixels)
+    palette, exact = build_palette(counts, max_colors)
+    colors = list(counts)
+    nearest = range(len(palette)) if exact else _nearest(colors, palette)
+    if exact:
+        lookup = {color: i for i, color in enumerate(palette)}
+    else:
+        lookup = dict(zip(colors, nearest))
+    segment = PaletteSegment(
+        start_frame=start,
+        palette=palette,
+        frames=[[lookup[tuple(p[:3])] for p in pixels] for pixels in frames],
+    )
+    return segment, exact, counts, {color: palette[lookup[color]] for color in colors}
+
+
+def quantize_frames(frames: Sequence[Sequence[RGB]], max_colors: int = 256,
+                    segment_frames: int = 0) -> PaletteQuantization:
+    """
+    Quantize frames to indexed colour
+
+    Args:
+        frames: Per-frame pixel lists (all the same length)
+        max_colors: Palette size limit per segment (2-256)
+        segment_frames: Frames per palette segment; 0 for one global palette
+
+    Raises:
+        ValueError: max_colors outside 2-256
+    """
+    if not 2 <= max_colors <= 256:
+        raise ValueError(f"Palette size must be 2-256 colours, got {max_colors}")
+    step = segment_frames if segment_frames > 0 else max(1, len(frames))
+    segments: List[PaletteSegment] = []
+    all_colors: set = set()
+    pixels_total = 0
+    abs_error = 0
+    sq_error = 0
+    max_error = 0
+    exact = True
+    for start in range(0, len(frames), step):
+        segment, segment_exact, counts, mapped = _quantize_segment(frames[start:start + step], start, max_colors)
+        segments.append(segment)
+        all_colors.update(counts)
+        pixels_total += sum(counts.values())
+        if not segment_exact:
+            exact = False
+            for color, count in counts.items():
+                diffs = [abs(a - b) for a, b in zip(color, mapped[color])]
+                abs_error += sum(diffs) * count
+                sq_error += sum(d * d for d in diffs) * count
+                max_error = max(max_error, *diffs)
+
+    report = QuantizationReport(
+        source_colors=len(all_colors),
+        palette_colors=max((len(s.palette) for s in segments), default=0),
+        exact=exact,
+    )
+    if not exact and pixels_total:
+        samples = pixels_total * 3
+        report.mean_error = abs_error / samples
+        report.max_error = max_error
+        mse = sq_error / samples
+        report.psnr = 10 * math.log10(255 ** 2 / mse) if mse else math.inf
+    bits = index_bits(max(1, report.palette_colors))
+    return PaletteQuantization(segments=segments, report=report, index_bits=bits)
@@ -19,6 +19,7 @@ from core.export.encoders import (
     encode_frame_bytes,
     prepare_frame_pixels,
     build_binary_payload,
+    build_palette_payload,
     build_dat_payload,
     build_intel_hex,
     build_c_header,
@@ -77,7 +78,45 @@ def _base_stats(pattern: Pattern, options: ExportOptions) -> Tuple[int, int]:
     return bpp, expected_frame_bytes
 
 
+def _palette_binary_preview(pattern: Pattern, options: ExportOptions) -> ExportPreview:
+    payload, quantization = build_palette_payload(pattern, options)
+    bpp = bytes_per_pixel(options)
+    led_count = pattern.metadata.led_count
+    index_bytes = (led_count * quantization.index_bits + 7) // 8
+    raw_bytes = 4 + pattern.frame_count * (2 + led_count * bpp)
+    header_summary = (
+        f"Header: {led_count} LEDs • "
+        f"{pattern.frame_count} frame(s) • "
+        f"{len(quantization.segments)} palette(s) • "
+        f"{quantization.index_bits}-bit indices"
+    )
+    detail_lines = [
+        f"Palette: {quantization.report.summary()}",
+        f"Payload bytes (incl. header): {len(payload)} "
+        f"({raw_bytes / max(1, len(payload)):.1f}x smaller than {bpp} byte(s)/pixel)",
+    ]
+
+    preview = ExportPreview(
+        format_name="Binary Format",
+        total_bytes=len(payload),
+        frame_count=pattern.frame_count,
+        bytes_per_frame=index_bytes,
+        header_summary=header_summary,
+        detail_lines=detail_lines,
+        geometry=_check_geometry(pattern),
+    )
+
+    if not quantization.report.exact:
+        preview.warnings.append(
+            f"Pattern uses {quantization.report.source_colors} colours; "
+            f"palette export is lossy ({quantization.report.summary()})."
+        )
+    return preview
+
+
 def _binary_preview(pattern: Pattern, options: ExportOptions) -> ExportPreview:
+    if options.palette_enabled:
+        return _palette_binary_preview(pattern, options)
     payload = build_binary_payload(pattern, options)
     bpp, expected_frame_bytes = _base_stats(pattern, options)
     header_summary = (
@@ -41,6 +41,16 @@ class ExportOptions:
     # Number format
     number_format: str = "Hex"  # "Hex", "Decimal", "Binary"
     
+    # Indexed colour (binary/hex/header): palette + 1/2/4/8-bit indices per LED
+    palette_mode: str = "Off"  # "Off", "Global", "Segment"
+    palette_max_colors: int = 256  # 2-256; more colours are quantized
+    palette_segment_frames: int = 16  # Frames sharing a palette in "Segment" mode
+    
+    @property
+    def palette_enabled(self) -> bool:
+        """Whether pixels are exported as palette indices"""
+        return self.palette_mode in ("Global", "Segment")
+    
     def reorder_pixels(self, pixels: List[RGB], width: int, height: int) -> List[RGB]:
         """
         Reorder pixels according to scanning direction and serpentine wiring.
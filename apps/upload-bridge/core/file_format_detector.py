@@ -5,24 +5,62 @@ This module analyzes pattern pixel data to determine the most likely wiring form
 It uses heuristics based on pixel patterns and corner/edge analysis.
 """
 
+import hashlib
+from functools import lru_cache
 from typing import Tuple, Optional, List, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 from .pattern import Pattern
 from .matrix_mapper import (
     MatrixMappingOptions,
     get_linear_index,
     unwrap_pixels_to_design_order,
 )
-from .dimension_scorer import _pixel_alignment_bonus
+from .dimension_scorer import _alignment_from_sums, _pixel_alignment_bonus, _pixel_array
+
+# Frames sampled from the start of a pattern for detection
+SAMPLE_FRAMES = 3
+
+# Data-in corners as (mapping origin, label)
+ORIGINS = (
+    ("top_left", "LT"),
+    ("top_right", "RT"),
+    ("bottom_left", "LB"),
+    ("bottom_right", "RB"),
+)
+
+# Every (order, serpentine, origin) wiring candidate, in comparison order
+WIRING_CANDIDATES = tuple(
+    (order, serpentine, origin)
+    for order in ("row", "column")
+    for serpentine in (False, True)
+    for origin, _ in ORIGINS
+)
+
+# LED Matrix Studio diagnostic palette: TL = Red, TR = Green, BL = Blue, BR = Yellow
+CORNER_MARKERS = ((255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0))
+
+# Brightness step that counts as a transition for the contiguity bonus
+TRANSITION_THRESHOLD = 10
 
 
 def _average_neighbor_diff(pixels: List[Tuple[int, int, int]], step: int) -> float:
     """Average RGB difference between pixels separated by `step`."""
     if step <= 0 or step >= len(pixels):
         return 0.0
+    array = _pixel_array(pixels)
+    if array is not None:
+        total = int(np.abs(array[step:] - array[:-step]).sum())
+        return total / (len(pixels) - step)
     total = 0
     count = 0
     for idx in range(len(pixels) - step):
@@ -287,11 +325,24 @@ def _detect_row_serpentine_from_raw(
     if width < 2 or height < 2 or len(raw_pixels) < width * height:
         return False
 
+    tolerance = 5
+    array = _pixel_array(raw_pixels[: width * height])
+    if array is not None:
+        rows = array.reshape(height, width, 3)
+        straight_diffs = np.abs(rows[:-1] - rows[1:]).sum(axis=(1, 2))
+        serp_diffs = np.abs(rows[:-1] - rows[1:, ::-1]).sum(axis=(1, 2))
+        serp_votes = int((serp_diffs + tolerance < straight_diffs).sum())
+        straight_votes = int((straight_diffs + tolerance < serp_diffs).sum())
+        serp_score = float(int(serp_diffs.sum()))
+        straight_score = float(int(straight_diffs.sum()))
+        if serp_votes == straight_votes:
+            return serp_score < straight_score
+        return serp_votes > straight_votes
+
     serp_votes = 0
     straight_votes = 0
     serp_score = 0.0
     straight_score = 0.0
-    tolerance = 5
 
     for row_idx in range(height - 1):
         start_a = row_idx * width
@@ -370,7 +421,7 @@ def _contiguity_bonus(
             for col in range(width - 1):
                 a = design_pixels[base + col]
                 b = design_pixels[base + col + 1]
-                if abs(brightness(a) - brightness(b)) > 10:
+                if abs(brightness(a) - brightness(b)) > TRANSITION_THRESHOLD:
                     transitions += 1
         return transitions
 
@@ -381,12 +432,15 @@ def _contiguity_bonus(
                 idx = row * width + col
                 a = design_pixels[idx]
                 b = design_pixels[idx + width]
-                if abs(brightness(a) - brightness(b)) > 10:
+                if abs(brightness(a) - brightness(b)) > TRANSITION_THRESHOLD:
                     transitions += 1
         return transitions
 
-    row_transitions = count_row_transitions()
-    col_transitions = count_col_transitions()
+    return _contiguity_from_transitions(count_row_transitions(), count_col_transitions(), order)
+
+
+def _contiguity_from_transitions(row_transitions: int, col_transitions: int, order: str) -> float:
+    """Contiguity bonus from brightness transition counts along rows and columns."""
     if order == "row":
         target = row_transitions
         other = col_transitions
@@ -416,51 +470,200 @@ def _corner_marker_bonus(
     if width <= 1 or height <= 1 or len(design_pixels) != width * height:
         return 0.0
 
-    expected = [
-        ((255, 0, 0), 0),  # TL
-        ((0, 255, 0), width - 1),  # TR
-        ((0, 0, 255), width * (height - 1)),  # BL
-        ((255, 255, 0), width * height - 1),  # BR
-    ]
+    corners = (0, width - 1, width * (height - 1), width * height - 1)
     matches = 0
-    for color, idx in expected:
+    for color, idx in zip(CORNER_MARKERS, corners):
         actual = design_pixels[idx]
         diff = abs(actual[0] - color[0]) + abs(actual[1] - color[1]) + abs(actual[2] - color[2])
         if diff <= 50:
             matches += 1
+    return _marker_from_matches(matches)
+
+
+def _marker_from_matches(matches: int) -> float:
+    """Corner-marker bonus for the number of corners showing their palette colour."""
     if matches == 0:
         return 0.0
     return min(0.2, matches * 0.05)
 
 
-def _analyze_order_unwrap(
-    raw_pixels: List[Tuple[int, int, int]],
+@lru_cache(maxsize=16)
+def _design_permutations(width: int, height: int):
+    """
+    Physical index behind each design pixel, for every wiring candidate.
+
+    Row ``c`` of the (candidates, width * height) array is the vectorised
+    `get_linear_index` for ``WIRING_CANDIDATES[c]``, so ``pixels[perms[c]]``
+    unwraps a frame into design order.
+    """
+    ys, xs = np.divmod(np.arange(width * height), width)
+    perms = np.empty((len(WIRING_CANDIDATES), width * height), dtype=np.intp)
+    for row, (order, serpentine, origin) in enumerate(WIRING_CANDIDATES):
+        nx = (width - 1 - xs) if origin in ("top_right", "bottom_right") else xs
+        ny = (height - 1 - ys) if origin in ("bottom_left", "bottom_right") else ys
+        if order == "row":
+            if serpentine:
+                nx = np.where(ny % 2 == 1, width - 1 - nx, nx)
+            perms[row] = ny * width + nx
+        else:
+            if serpentine:
+                ny = np.where(nx % 2 == 1, height - 1 - ny, ny)
+            perms[row] = nx * height + ny
+    perms.flags.writeable = False
+    return perms
+
+
+def _batched_components(
+    frames_pixels: List[List[Tuple[int, int, int]]],
     width: int,
     height: int,
-    order: str,
-) -> Tuple[List[Tuple[int, int, int]], Optional[bool], float]:
-    best_score = float("-inf")
-    best_pixels = raw_pixels
-    best_serp: Optional[bool] = None
-    for serp in (False, True):
-        for origin in ("top_left", "top_right", "bottom_left", "bottom_right"):
+) -> Optional[List[Dict[Tuple[str, bool, str], Tuple[float, float, float]]]]:
+    """
+    `_frame_candidate_components` as one array computation over all frames
+    and candidates. Returns None when the pixels cannot be vectorised.
+
+    Only exact integer aggregates (difference sums, transition and marker
+    counts) come from NumPy; the bonuses are derived from them with the same
+    float arithmetic as the per-candidate helpers, so scores match exactly.
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    arrays = []
+    for pixels in frames_pixels:
+        array = _pixel_array(pixels)
+        if array is None:
+            return None
+        arrays.append(array)
+
+    stack = np.stack(arrays)
+    if stack.min() >= 0 and stack.max() <= 255:
+        stack = stack.astype(np.int16)  # Differences of 8-bit channels fit; keeps the gather small
+    perms = _design_permutations(width, height)
+    designs = stack[:, perms]  # (frames, candidates, pixels, 3)
+    frame_count, candidate_count = designs.shape[:2]
+    count = width * height
+
+    has_alignment = width > 1 and count >= width + 1
+    if has_alignment:
+        diffs = np.abs(np.diff(designs, axis=2)).sum(axis=3)
+        wraps = diffs[:, :, width - 1 :: width]
+        wrap_totals = wraps.sum(axis=2)
+        inline_totals = diffs.sum(axis=2) - wrap_totals
+        wrap_count = wraps.shape[2]
+        inline_count = diffs.shape[2] - wrap_count
+
+    brightness = designs.sum(axis=3).reshape(frame_count, candidate_count, height, width)
+    row_transitions = (np.abs(np.diff(brightness, axis=3)) > TRANSITION_THRESHOLD).sum(axis=(2, 3))
+    col_transitions = (np.abs(np.diff(brightness, axis=2)) > TRANSITION_THRESHOLD).sum(axis=(2, 3))
+
+    has_markers = width > 1 and height > 1
+    if has_markers:
+        corners = designs[:, :, [0, width - 1, width * (height - 1), count - 1]]
+        matches = (np.abs(corners - np.array(CORNER_MARKERS)).sum(axis=3) <= 50).sum(axis=2)
+
+    results = []
+    for f in range(frame_count):
+        components = {}
+        for c, candidate in enumerate(WIRING_CANDIDATES):
+            alignment = 0.0
+            if has_alignment:
+                alignment = _alignment_from_sums(
+                    int(inline_totals[f, c]), inline_count, int(wrap_totals[f, c]), wrap_count
+                )
+            contiguity = _contiguity_from_transitions(
+                int(row_transitions[f, c]), int(col_transitions[f, c]), candidate[0]
+            )
+            marker = _marker_from_matches(int(matches[f, c])) if has_markers else 0.0
+            components[candidate] = (alignment, contiguity, marker)
+        results.append(components)
+    return results
+
+
+def _frame_candidate_components(
+    frames_pixels: List[List[Tuple[int, int, int]]],
+    width: int,
+    height: int,
+) -> List[Dict[Tuple[str, bool, str], Tuple[float, float, float]]]:
+    """
+    (alignment, contiguity, marker) bonuses of every wiring candidate.
+
+    One dict per frame holding ``width * height`` pixels (other frames are
+    skipped), keyed by ``(order, serpentine, origin)``.
+    """
+    valid = [pixels for pixels in frames_pixels if len(pixels) == width * height]
+    if not valid:
+        return []
+    batched = _batched_components(valid, width, height)
+    if batched is not None:
+        return batched
+
+    results = []
+    for pixels in valid:
+        components = {}
+        for order, serpentine, origin in WIRING_CANDIDATES:
             options = MatrixMappingOptions(
                 width=width,
                 height=height,
                 order=order,
-                serpentine=serp,
+                serpentine=serpentine,
                 origin=origin,
             )
-            unwrapped = unwrap_pixels_to_design_order(raw_pixels, options)
-            alignment = _pixel_alignment_bonus(unwrapped, width)
-            contiguity = _contiguity_bonus(unwrapped, width, height, order)
-            marker = _corner_marker_bonus(unwrapped, width, height)
+            design = unwrap_pixels_to_design_order(pixels, options)
+            components[(order, serpentine, origin)] = (
+                _pixel_alignment_bonus(design, width),
+                _contiguity_bonus(design, width, height, order),
+                _corner_marker_bonus(design, width, height),
+            )
+        results.append(components)
+    return results
+
+
+def _analyze_order_unwrap(
+    raw_pixels: List[Tuple[int, int, int]],
+    width: int,
+    height: int,
+    order: str,
+) -> Tuple[List[Tuple[int, int, int]], Optional[bool], float]:
+    if len(raw_pixels) != width * height:
+        # Unwrapping leaves mismatched frames as they are; score them unchanged
+        pixels = list(raw_pixels)
+        score = (
+            _pixel_alignment_bonus(pixels, width)
+            + _contiguity_bonus(pixels, width, height, order)
+            + _corner_marker_bonus(pixels, width, height)
+        )
+        return pixels, False, score
+    components = _frame_candidate_components([raw_pixels], width, height)[0]
+    return _best_unwrap(raw_pixels, width, height, order, components)
+
+
+def _best_unwrap(
+    raw_pixels: List[Tuple[int, int, int]],
+    width: int,
+    height: int,
+    order: str,
+    components: Dict[Tuple[str, bool, str], Tuple[float, float, float]],
+) -> Tuple[List[Tuple[int, int, int]], Optional[bool], float]:
+    """Best-scoring serpentine/origin for ``order`` given one frame's candidate components."""
+    best_score = float("-inf")
+    best: Optional[Tuple[bool, str]] = None
+    for serp in (False, True):
+        for origin, _ in ORIGINS:
+            alignment, contiguity, marker = components[(order, serp, origin)]
             score = alignment + contiguity + marker
             if score > best_score:
                 best_score = score
-                best_pixels = unwrapped
-                best_serp = serp
-    return best_pixels, best_serp, best_score
+                best = (serp, origin)
+    if best is None:
+        return raw_pixels, None, best_score
+    options = MatrixMappingOptions(
+        width=width,
+        height=height,
+        order=order,
+        serpentine=best[0],
+        origin=best[1],
+    )
+    return unwrap_pixels_to_design_order(raw_pixels, options), best[0], best_score
 
 
 def _score_orientation(
@@ -470,41 +673,80 @@ def _score_orientation(
     order: str,
     serpentine: bool,
 ) -> Dict[str, float]:
-    scores: Dict[str, float] = {}
     if not frames_pixels:
         return {"LT": 0.0, "RT": 0.0, "LB": 0.0, "RB": 0.0}
+    frame_components = _frame_candidate_components(frames_pixels, width, height)
+    return _orientation_scores(frame_components, order, serpentine)
+
 
-    for origin, label in [
-        ("top_left", "LT"),
-        ("top_right", "RT"),
-        ("bottom_left", "LB"),
-        ("bottom_right", "RB"),
-    ]:
+def _orientation_scores(
+    frame_components: List[Dict[Tuple[str, bool, str], Tuple[float, float, float]]],
+    order: str,
+    serpentine: bool,
+) -> Dict[str, float]:
+    """Mean score per data-in corner for one order/serpentine pair."""
+    scores: Dict[str, float] = {}
+    for origin, label in ORIGINS:
         total_score = 0.0
-        valid_frames = 0
-        for pixels in frames_pixels:
-            if len(pixels) != width * height:
-                continue
-            options = MatrixMappingOptions(
-                width=width,
-                height=height,
-                order=order,
-                serpentine=serpentine,
-                origin=origin,
-            )
-            design = unwrap_pixels_to_design_order(pixels, options)
-            alignment = _pixel_alignment_bonus(design, width)
-            contiguity = _contiguity_bonus(design, width, height, order)
-            marker = _corner_marker_bonus(design, width, height)
+        for components in frame_components:
+            alignment, contiguity, marker = components[(order, serpentine, origin)]
             total_score += alignment + contiguity + marker
-            valid_frames += 1
-        if valid_frames:
-            scores[label] = total_score / valid_frames
-        else:
-            scores[label] = 0.0
+        scores[label] = total_score / len(frame_components) if frame_components else 0.0
     return scores
 
 
+def _wiring_mode_name(order: str, serpentine: bool) -> str:
+    return (
+        "Serpentine" if order == "row" and serpentine else
+        "Row-major" if order == "row" else
+        "Column-serpentine" if serpentine else
+        "Column-major"
+    )
+
+
+def _candidate_table(
+    frame_components: List[Dict[Tuple[str, bool, str], Tuple[float, float, float]]],
+) -> List[Dict[str, object]]:
+    labels = dict(ORIGINS)
+    frame_count = len(frame_components)
+    table = []
+    for candidate in WIRING_CANDIDATES:
+        order, serpentine, origin = candidate
+        parts = [components[candidate] for components in frame_components]
+        score = sum(alignment + contiguity + marker for alignment, contiguity, marker in parts)
+        table.append(
+            {
+                "wiring_mode": _wiring_mode_name(order, serpentine),
+                "corner": labels[origin],
+                "order": order,
+                "serpentine": serpentine,
+                "alignment": sum(part[0] for part in parts) / frame_count if frame_count else 0.0,
+                "contiguity": sum(part[1] for part in parts) / frame_count if frame_count else 0.0,
+                "marker": sum(part[2] for part in parts) / frame_count if frame_count else 0.0,
+                "score": score / frame_count if frame_count else 0.0,
+            }
+        )
+    table.sort(key=lambda row: row["score"], reverse=True)
+    return table
+
+
+def score_wiring_candidates(pattern: Pattern) -> List[Dict[str, object]]:
+    """
+    Heuristic score of every wiring/corner candidate, for debugging detection.
+
+    Each entry holds the candidate's ``wiring_mode`` and ``corner``, its
+    ``alignment``, ``contiguity`` and ``marker`` bonuses averaged over the
+    sampled frames, and their total ``score`` - the value `detect_file_format`
+    compares before hint bonuses. Entries are sorted best first.
+    """
+    if not pattern or not pattern.frames:
+        return []
+    width = pattern.metadata.width
+    height = pattern.metadata.height
+    frames = [list(frame.pixels) for frame in pattern.frames[:SAMPLE_FRAMES]]
+    return _candidate_table(_frame_candidate_components(frames, width, height))
+
+
 def detect_file_format(pattern: Pattern) -> Tuple[str, str]:
     """
     Auto-detect the most likely file format (wiring mode + data-in corner).
@@ -534,7 +776,7 @@ def detect_file_format(pattern: Pattern) -> Tuple[str, str]:
     corner_hint = getattr(pattern.metadata, 'data_in_corner_hint', None)
 
     frames_to_analyze: List[List[Tuple[int, int, int]]] = []
-    for frame in pattern.frames[: min(3, len(pattern.frames))]:
+    for frame in pattern.frames[:SAMPLE_FRAMES]:
         frames_to_analyze.append(list(frame.pixels))
 
     if not frames_to_analyze:
@@ -575,8 +817,22 @@ def detect_file_format(pattern: Pattern) -> Tuple[str, str]:
         elif col_step_diff is not None and adjacent_diff < col_step_diff * ratio_threshold:
             storage_order = "column"
 
-    row_pixels, row_serp, row_score = _analyze_order_unwrap(raw_pixels, width, height, "row")
-    col_pixels, col_serp, col_score = _analyze_order_unwrap(raw_pixels, width, height, "column")
+    # Score every wiring candidate of the sampled frames in one pass
+    frame_components = _frame_candidate_components(frames_to_analyze, width, height)
+    if logger.isEnabledFor(logging.DEBUG):
+        for row in _candidate_table(frame_components):
+            logger.debug(
+                "Wiring candidate %s %s: score=%.4f (alignment=%.4f contiguity=%.4f marker=%.4f)",
+                row["wiring_mode"],
+                row["corner"],
+                row["score"],
+                row["alignment"],
+                row["contiguity"],
+                row["marker"],
+            )
+
+    row_pixels, row_serp, row_score = _best_unwrap(raw_pixels, width, height, "row", frame_components[0])
+    col_pixels, col_serp, col_score = _best_unwrap(raw_pixels, width, height, "column", frame_components[0])
 
     if col_score > row_score:
         analysis_pixels = col_pixels
@@ -607,7 +863,7 @@ def detect_file_format(pattern: Pattern) -> Tuple[str, str]:
     candidates = []
     for order in ("row", "column"):
         for serpentine in (False, True):
-            orientation_scores = _score_orientation(frames_to_analyze, width, height, order, serpentine)
+            orientation_scores = _orientation_scores(frame_components, order, serpentine)
             best_corner, best_score = max(orientation_scores.items(), key=lambda item: item[1])
             candidates.append(
                 {
@@ -753,12 +1009,7 @@ def detect_file_format(pattern: Pattern) -> Tuple[str, str]:
     if best_score < 1e-6:
         best_corner = corner_hint or "LT"
 
-    wiring_mode = (
-        "Serpentine" if order == "row" and serpentine else
-        "Row-major" if order == "row" else
-        "Column-serpentine" if serpentine else
-        "Column-major"
-    )
+    wiring_mode = _wiring_mode_name(order, serpentine)
 
     # Log detection method (hint vs heuristic)
     detection_method = "hint" if hint_confidence >= 0.9 and wiring_hint else "heuristic"
@@ -774,10 +1025,36 @@ def detect_file_format(pattern: Pattern) -> Tuple[str, str]:
     return wiring_mode, best_corner
 
 
+def detection_input_digest(pattern: Pattern) -> str:
+    """
+    Digest of everything `detect_file_format` reads: dimensions, metadata
+    hints and the sampled frames.
+    """
+    metadata = pattern.metadata
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((
+        metadata.width,
+        metadata.height,
+        getattr(metadata, 'wiring_mode_hint', None),
+        getattr(metadata, 'data_in_corner_hint', None),
+        getattr(metadata, 'hint_confidence', 0.0),
+    )).encode("utf-8"))
+    for frame in pattern.frames[:SAMPLE_FRAMES]:
+        pixels = list(frame.pixels)
+        array = _pixel_array(pixels)
+        digest.update(f"|{len(pixels)}|".encode("ascii"))
+        digest.update(array.tobytes() if array is not None else repr(pixels).encode("utf-8"))
+    return digest.hexdigest()
+
+
 def detect_file_format_with_confidence(pattern: Pattern) -> Tuple[str, str, float, str]:
     """
     Auto-detect file format with confidence score (0.0-1.0) and detection reason.
     
+    Patterns loaded through a caching parser registry carry a
+    ``source_content_key``; their results are stored in the shared detection
+    cache and reused while the detection inputs are unchanged.
+    
     Returns:
         Tuple of (wiring_mode, data_in_corner, confidence, reason)
         reason: "strong_hint", "medium_hint", "weak_hint", "heuristic", "low_confidence"
@@ -785,6 +1062,24 @@ def detect_file_format_with_confidence(pattern: Pattern) -> Tuple[str, str, floa
     if not pattern or not pattern.frames:
         return ("Row-major", "LT", 0.5, "fallback")
     
+    cache_key = getattr(pattern.metadata, 'source_content_key', None)
+    cache = None
+    if cache_key:
+        from .detection_cache import get_detection_cache
+        cache = get_detection_cache()
+    if cache is not None:
+        input_digest = detection_input_digest(pattern)
+        cached = cache.get(cache_key)
+        if cached is not None and cached.has_wiring and cached.input_digest == input_digest:
+            logger.debug("Using cached file format detection for %s", cache_key)
+            return (cached.wiring_mode, cached.data_in_corner, cached.confidence, cached.reason)
+        result = _detect_file_format_with_confidence(pattern)
+        cache.record_wiring(cache_key, *result, input_digest)
+        return result
+    return _detect_file_format_with_confidence(pattern)
+
+
+def _detect_file_format_with_confidence(pattern: Pattern) -> Tuple[str, str, float, str]:
     # Check metadata hints first
     hint_confidence = getattr(pattern.metadata, 'hint_confidence', 0.0)
     wiring_hint = getattr(pattern.metadata, 'wiring_mode_hint', None)
@@ -0,0 +1,159 @@
+"""
+Frame Time Index - Cumulative frame start times for fast time lookups
+
+``Pattern.get_frame_at_time`` used to sum durations from the first frame on
+every call. The index keeps cumulative start times and answers lookups with
+``bisect`` (or ``numpy.searchsorted`` for batches).
+
+Keeping it current:
+
+- Pattern / FrameManager mutators report the first frame they touched, and
+  only the suffix from that frame is recomputed on the next lookup.
+- Direct edits elsewhere (``pattern.frames.insert``, ``frame.duration_ms =``,
+  replacing ``pattern.frames``) are detected cheaply: the index remembers the
+  frames list object, its length, and the global timing epoch that
+  ``Frame`` bumps whenever an existing frame's duration changes. Any
+  mismatch rebuilds the index in full.
+"""
+
+import bisect
+from itertools import accumulate
+from typing import List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    NUMPY_AVAILABLE = False
+
+_timing_epoch = 0
+
+
+def bump_timing_epoch() -> None:
+    """Record that some frame's duration changed"""
+    global _timing_epoch
+    _timing_epoch += 1
+
+
+def timing_epoch() -> int:
+    """Current timing epoch"""
+    return _timing_epoch
+
+
+class FrameTimeIndex:
+    """
+    Cumulative start times of a frame list
+
+    ``starts[i]`` is the time at which frame ``i`` begins; ``starts[-1]`` is
+    the total duration. Entries past ``_valid`` are stale and recomputed
+    lazily.
+    """
+
+    def __init__(self):
+        self._starts: List[int] = [0]
+        self._valid = 0  # Frames whose end time in _starts is current
+        self._frames: Optional[Sequence] = None  # Held (not id()) so a new list can never alias it
+        self._count = 0
+        self._epoch = -1
+        self._array = None  # numpy copy of _starts for batch lookups
+
+    # Synchronisation
+
+    def _in_sync(self, frames: Sequence) -> bool:
+        return (
+            frames is self._frames
+            and len(frames) == self._count
+            and self._epoch == _timing_epoch
+        )
+
+    def snapshot(self, frames: Sequence) -> bool:
+        """Whether the index matches ``frames`` before a tracked edit"""
+        return self._in_sync(frames)
+
+    def patch(self, frames: Sequence, start: int, was_in_sync: bool) -> None:
+        """
+        Record a tracked edit touching frames from ``start`` on
+
+        Args:
+            frames: The frame list after the edit
+            start: First frame index whose start or duration may have changed
+            was_in_sync: Result of ``snapshot`` taken before the edit
+        """
+        if not was_in_sync:
+            return  # Untracked edits happened too; the next lookup rebuilds
+        self._valid = max(0, min(self._valid, start))
+        self._count = len(frames)
+        self._epoch = _timing_epoch
+        self._array = None
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next lookup"""
+        self._frames = None
+
+    def _refresh(self, frames: Sequence) -> List[int]:
+        if not self._in_sync(frames):
+            self._frames = frames
+            self._count = len(frames)
+            self._epoch = _timing_epoch
+            self._valid = 0
+            self._array = None
+        if self._valid < self._count:
+            del self._starts[self._valid + 1:]
+            totals = accumulate(
+                (frame.duration_ms for frame in frames[self._valid:]),
+                initial=self._starts[self._valid],
+            )
+            next(totals)  # The initial value is already present
+            self._starts.extend(totals)
+            self._valid = self._count
+            self._array = None
+        return self._starts
+
+    # Lookups
+
+    def starts(self, frames: Sequence) -> List[int]:
+        """Cumulative start times (``len(frames) + 1`` entries)"""
+        return self._refresh(frames)
+
+    def total_ms(self, frames: Sequence) -> int:
+        """Total duration of ``frames``"""
+        return self._refresh(frames)[-1]
+
+    def frame_at(self, frames: Sequence, time_ms: float) -> Optional[int]:
+        """
+        Frame playing at ``time_ms``
+
+        Returns None for negative times or no frames; times past the end map
+        to the last frame.
+        """
+        if time_ms < 0 or not frames:
+            return None
+        starts = self._refresh(frames)
+        return min(bisect.bisect_right(starts, time_ms) - 1, len(frames) - 1)
+
+    def frames_at(self, frames: Sequence, times_ms: Union[Sequence[float], "np.ndarray"]):
+        """
+        Frames playing at each of ``times_ms``
+
+        Negative times map to -1. Returns a numpy int array when numpy is
+        available, else a list.
+        """
+        starts = self._refresh(frames)
+        last = len(frames) - 1
+        if NUMPY_AVAILABLE:
+            if self._array is None:
+                self._array = np.asarray(starts, dtype=np.int64)
+            times = np.asarray(times_ms, dtype=np.float64)
+            if last < 0:
+                return np.full(times.shape, -1, dtype=np.int64)
+            idx = np.searchsorted(self._array, times, side="right") - 1
+            idx = np.minimum(idx, last)
+            idx[times < 0] = -1
+            return idx
+        if last < 0:
+            return [-1] * len(times_ms)
+        return [
+            -1 if t < 0 else min(bisect.bisect_right(starts, t) - 1, last)
+            for t in times_ms
+        ]
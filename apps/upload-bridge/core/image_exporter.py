@@ -7,6 +7,7 @@ or animated GIFs.
 
 from __future__ import annotations
 
+import math
 import os
 from typing import List, Tuple
 from PIL import Image
@@ -18,6 +19,8 @@ RGB = Tuple[int, int, int]
 class ImageExporter:
     """Handles exporting LED matrix patterns to image formats."""
     
+    GIF_TICK_MS = 10  # GIF frame delays are whole centiseconds
+    
     @staticmethod
     def export_frame_as_image(
         frame: Frame,
@@ -100,7 +103,10 @@ class ImageExporter:
             images = []
             durations = []
             
-            for frame in pattern.frames:
+            for frame_idx, ticks in enumerate(ImageExporter._gif_ticks(pattern)):
+                if ticks == 0:
+                    continue  # Shorter than a GIF tick and no tick lands on it
+                frame = pattern.frames[frame_idx]
                 # Create image
                 img = Image.new("RGB", (img_width, img_height), (0, 0, 0))
                 
@@ -119,8 +125,7 @@ class ImageExporter:
                                     img.putpixel((x_start + px, y_start + py), (r, g, b))
                 
                 images.append(img)
-                # Convert milliseconds to centiseconds (GIF uses centiseconds)
-                durations.append(max(1, frame.duration_ms // 10))
+                durations.append(ticks * ImageExporter.GIF_TICK_MS)
             
             # Save as animated GIF
             if len(images) == 1:
@@ -142,6 +147,25 @@ class ImageExporter:
         except Exception as e:
             raise Exception(f"Failed to export GIF: {e}")
     
+    @staticmethod
+    def _gif_ticks(pattern: Pattern) -> List[int]:
+        """
+        GIF delay (in centisecond ticks) for each pattern frame.
+        
+        The pattern's timeline is sampled once per tick, so per-frame rounding
+        doesn't accumulate and the GIF keeps the pattern's total duration.
+        A pattern with no duration shows each frame for one tick.
+        """
+        total_ms = pattern.duration_ms
+        if total_ms <= 0:
+            return [1] * pattern.frame_count
+        tick = ImageExporter.GIF_TICK_MS
+        indices = pattern.frames_at_times([k * tick for k in range(math.ceil(total_ms / tick))])
+        ticks = [0] * pattern.frame_count
+        for idx in indices:
+            ticks[int(idx)] += 1
+        return ticks
+    
     @staticmethod
     def export_sprite_sheet(
         pattern: Pattern,
@@ -4,7 +4,7 @@ Lazy Frame Loader - Load frames on-demand for large patterns
 
 import logging
 from collections import OrderedDict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .pattern import Pattern, Frame
 
@@ -20,6 +20,11 @@ class LazyFrameLoader:
     - LRU cache with configurable size
     - Progress tracking
     - Memory-efficient for large patterns
+    - Direction-aware prefetch around the playhead
+    - GUI-thread only: prefetch runs synchronously on the caller's thread
+    
+    Cached frames are the pattern's own Frame objects, not copies; callers
+    must not mutate them.
     """
     
     def __init__(self, pattern: Pattern, cache_size: int = 50):
@@ -54,46 +59,34 @@ class LazyFrameLoader:
             return None
         
         # Check cache first
-        if frame_index in self.frame_cache:
+        frame = self.frame_cache.get(frame_index)
+        if frame is not None:
             # Move to end (most recently used)
-            frame = self.frame_cache.pop(frame_index)
-            self.frame_cache[frame_index] = frame
-            logger.debug(f"Cache HIT: Frame {frame_index}")
+            self.frame_cache.move_to_end(frame_index)
             return frame
         
-        # Cache miss - load from pattern
-        logger.debug(f"Cache MISS: Loading frame {frame_index}")
-        
         if not self.pattern or frame_index >= len(self.pattern.frames):
             return None
         
         frame = self.pattern.frames[frame_index]
         
-        # Create a copy for caching
-        cached_frame = Frame(
-            pixels=[tuple(p) for p in frame.pixels],
-            duration_ms=frame.duration_ms
-        )
-        
         # Evict oldest if cache is full
         if len(self.frame_cache) >= self.cache_size:
-            oldest_index = next(iter(self.frame_cache))
-            del self.frame_cache[oldest_index]
+            oldest_index, _ = self.frame_cache.popitem(last=False)
             self.loaded_indices.discard(oldest_index)
-            logger.debug(f"Cache eviction: Removed frame {oldest_index}")
         
         # Add to cache
-        self.frame_cache[frame_index] = cached_frame
+        self.frame_cache[frame_index] = frame
         self.loaded_indices.add(frame_index)
         
-        return cached_frame
+        return frame
     
-    def preload_frames(self, indices: List[int]):
+    def preload_frames(self, indices: Iterable[int]):
         """
         Preload multiple frames.
         
         Args:
-            indices: List of frame indices to preload
+            indices: Frame indices to preload
         """
         for idx in indices:
             if 0 <= idx < self.total_frames:
@@ -110,6 +103,22 @@ class LazyFrameLoader:
         for idx in range(max(0, start), min(self.total_frames, end)):
             self.load_frame(idx)
     
+    def prefetch_ahead(self, frame_index: int, direction: int = 1, count: int = 8, behind: int = 1):
+        """
+        Preload frames the playhead is heading towards.
+        
+        Args:
+            frame_index: Current playhead frame
+            direction: 1 for forward playback/scrubbing, -1 for backward
+            count: Frames to load ahead of the playhead
+            behind: Frames to keep loaded behind the playhead
+        """
+        step = 1 if direction >= 0 else -1
+        indices = [frame_index + step * offset for offset in range(count + 1)]
+        indices += [frame_index - step * offset for offset in range(1, behind + 1)]
+        # Load farthest first so the nearest frames end up most recently used
+        self.preload_frames(reversed(indices))
+    
     def get_frame(self, frame_index: int) -> Optional[Frame]:
         """
         Get frame (alias for load_frame for clarity).
@@ -3,7 +3,8 @@ Mapping module for coordinate transformations between different LED layouts.
 """
 
 from .circular_mapper import CircularMapper
+from .circular_layout_index import CircularLayoutIndex
 from .irregular_shape_mapper import IrregularShapeMapper
 
-__all__ = ['CircularMapper', 'IrregularShapeMapper']
+__all__ = ['CircularMapper', 'CircularLayoutIndex', 'IrregularShapeMapper']
 
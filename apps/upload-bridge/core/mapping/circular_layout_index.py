@@ -0,0 +1,261 @@
+"""
+Circular Layout Index - Cached lookups over a circular mapping table.
+
+`CircularMapper` keeps the mapping table (LED index -> grid cell) as the
+single source of truth. Answering the reverse questions - which LED sits on
+a grid cell, which LED is nearest a polar position, which LEDs share a ring -
+by scanning that table is linear per query, so this module builds the reverse
+structures once per layout and shares them:
+
+- a dict from grid cell to the first LED mapped onto it
+- the physical LED positions from `generate_led_positions_for_preview`,
+  normalised to a unit preview (center 0, max radius 1), grouped into rings
+  ordered by angle and indexed by a 2-D KD-tree
+- memoized preview positions per (center, max radius)
+
+Indexes are cached by a fingerprint of the layout geometry and revalidated
+against the metadata's mapping table, so regenerating or replacing the table
+never serves stale lookups.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Metadata fields that shape the mapping table and LED positions
+LAYOUT_FIELDS = (
+    "layout_type", "width", "height", "circular_led_count", "circular_radius",
+    "circular_inner_radius", "circular_start_angle", "circular_end_angle",
+    "multi_ring_count", "ring_led_counts", "ring_radii", "ray_count", "leds_per_ray",
+    "ray_spacing_angle", "custom_led_positions", "led_position_units",
+    "custom_position_center_x", "custom_position_center_y",
+)
+
+# Distinct layouts whose indexes are kept alive
+MAX_INDEXES = 32
+# Preview geometries (center, max radius) memoized per index
+MAX_PREVIEW_GEOMETRIES = 8
+# LEDs whose radii differ by less than this share a ring
+RING_RADIUS_TOLERANCE = 1e-6
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def layout_fingerprint(metadata) -> Hashable:
+    """Hashable summary of the metadata fields that shape a circular layout."""
+    return tuple(_freeze(getattr(metadata, name, None)) for name in LAYOUT_FIELDS)
+
+
+class KDTree2D:
+    """
+    Static 2-D KD-tree over a list of (x, y) points.
+
+    Queries return point indices. Ties on distance resolve to the lowest
+    index, matching a first-match linear scan.
+    """
+
+    def __init__(self, points: List[Tuple[float, float]]):
+        self.points = [(float(x), float(y)) for x, y in points]
+        self._root = self._build(list(range(len(self.points))), 0)
+
+    def _build(self, indices: List[int], axis: int):
+        if not indices:
+            return None
+        points = self.points
+        indices.sort(key=lambda i: (points[i][axis], i))
+        mid = len(indices) // 2
+        return (
+            indices[mid],
+            axis,
+            self._build(indices[:mid], 1 - axis),
+            self._build(indices[mid + 1:], 1 - axis),
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def nearest(self, x: float, y: float) -> Optional[int]:
+        """Index of the point closest to (x, y), or None if the tree is empty."""
+        points = self.points
+        best = [math.inf, -1]
+
+        def visit(node):
+            if node is None:
+                return
+            idx, axis, left, right = node
+            px, py = points[idx]
+            distance = (px - x) ** 2 + (py - y) ** 2
+            if distance < best[0] or (distance == best[0] and idx < best[1]):
+                best[0] = distance
+                best[1] = idx
+            diff = (x - px) if axis == 0 else (y - py)
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if diff * diff <= best[0]:
+                visit(far)
+
+        visit(self._root)
+        return best[1] if best[1] >= 0 else None
+
+
+class CircularLayoutIndex:
+    """
+    Reverse, ring and polar lookups for one circular layout.
+
+    Built from a metadata object whose mapping table is already present; use
+    `CircularLayoutIndex.for_metadata` to get the shared instance.
+
+    ``rings`` lists LED indices per ring, innermost first, each ordered by
+    angle; ``ring_of`` and ``slot_of`` give an LED's ring and position
+    within it. Ring radii and angles are in unit preview space.
+    """
+
+    def __init__(self, metadata):
+        table = metadata.circular_mapping_table or []
+        self.table = table
+        self.cells: Tuple[Tuple[int, int], ...] = tuple(tuple(cell) for cell in table)
+        self.width = metadata.width
+        self.height = metadata.height
+        self.led_count = len(self.cells)
+
+        self.led_for_cell: Dict[Tuple[int, int], int] = {}
+        for led_idx, cell in enumerate(self.cells):
+            self.led_for_cell.setdefault(cell, led_idx)
+
+        self._tree: Optional[KDTree2D] = None
+        self._previews: "OrderedDict[Tuple[float, float, float], List[Tuple[float, float]]]" = OrderedDict()
+
+        positions = []
+        if metadata.layout_type != "rectangular":
+            positions = self.preview_positions(metadata, 0.0, 0.0, 1.0)
+        if len(positions) != self.led_count:
+            # Unknown geometry: fall back to mapped grid cells
+            center_x = (self.width - 1) / 2.0
+            center_y = (self.height - 1) / 2.0
+            positions = [(x - center_x, y - center_y) for x, y in self.cells]
+        self.unit_positions: List[Tuple[float, float]] = positions
+        self._build_rings()
+
+    def _build_rings(self) -> None:
+        polar = []
+        for led_idx, (x, y) in enumerate(self.unit_positions):
+            angle = math.atan2(y, x) % (2 * math.pi)
+            polar.append((math.hypot(x, y), angle, led_idx))
+        polar.sort()
+
+        self.ring_radii: List[float] = []
+        self.rings: List[List[int]] = []
+        self.ring_angles: List[List[float]] = []
+        ring: List[Tuple[float, int]] = []
+        for radius, angle, led_idx in polar:
+            if ring and radius - self.ring_radii[-1] > RING_RADIUS_TOLERANCE:
+                self._close_ring(ring)
+                ring = []
+            if not ring:
+                self.ring_radii.append(radius)
+            ring.append((angle, led_idx))
+        if ring:
+            self._close_ring(ring)
+
+        self.ring_of = [0] * self.led_count
+        self.slot_of = [0] * self.led_count
+        for ring_idx, leds in enumerate(self.rings):
+            for slot, led_idx in enumerate(leds):
+                self.ring_of[led_idx] = ring_idx
+                self.slot_of[led_idx] = slot
+
+    def _close_ring(self, ring: List[Tuple[float, int]]) -> None:
+        ring.sort()
+        self.ring_angles.append([angle for angle, _ in ring])
+        self.rings.append([led_idx for _, led_idx in ring])
+
+    @classmethod
+    def for_metadata(cls, metadata) -> "CircularLayoutIndex":
+        """Shared index for the metadata's layout and current mapping table."""
+        key = layout_fingerprint(metadata)
+        table = metadata.circular_mapping_table or []
+        index = _indexes.get(key)
+        if index is not None and index.table is not table:
+            if index.table == table:
+                # Same table contents in a new object (copied or regenerated metadata)
+                index.table = table
+            else:
+                index = None
+        if index is None:
+            index = cls(metadata)
+            _indexes[key] = index
+            if len(_indexes) > MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+    def led_at(self, x: int, y: int) -> Optional[int]:
+        """First LED mapped to grid cell (x, y), or None."""
+        return self.led_for_cell.get((x, y))
+
+    def is_mapped(self, x: int, y: int) -> bool:
+        """True if any LED maps to grid cell (x, y)."""
+        return (x, y) in self.led_for_cell
+
+    def preview_positions(self, metadata, center_x: float, center_y: float,
+                          max_radius: float) -> List[Tuple[float, float]]:
+        """
+        LED positions for a preview, memoized per (center, max radius).
+
+        ``metadata`` must describe this index's layout. Callers get a fresh
+        list and may modify it.
+        """
+        from core.mapping.circular_mapper import CircularMapper
+
+        geometry = (center_x, center_y, max_radius)
+        positions = self._previews.get(geometry)
+        if positions is None:
+            positions = CircularMapper._compute_led_positions_for_preview(
+                metadata, center_x, center_y, max_radius)
+            self._previews[geometry] = positions
+            if len(self._previews) > MAX_PREVIEW_GEOMETRIES:
+                self._previews.popitem(last=False)
+        else:
+            self._previews.move_to_end(geometry)
+        return list(positions)
+
+    def tree(self) -> KDTree2D:
+        """KD-tree over `unit_positions`."""
+        if self._tree is None:
+            self._tree = KDTree2D(self.unit_positions)
+        return self._tree
+
+    def led_at_polar(self, angle_deg: float, radius: float) -> Optional[int]:
+        """LED nearest to a polar position in unit preview space, or None."""
+        angle = math.radians(angle_deg)
+        return self.tree().nearest(radius * math.cos(angle), radius * math.sin(angle))
+
+    def ring_shifts(self, angle_deg: float) -> List[int]:
+        """Per-ring slot shifts that rotate the layout by ``angle_deg``."""
+        return [int(round(angle_deg * len(leds) / 360.0)) for leds in self.rings]
+
+    def rotate_leds(self, led_indices: List[int], shifts: List[int]) -> List[int]:
+        """Move LEDs along their rings by per-ring slot shifts."""
+        rings = self.rings
+        ring_of = self.ring_of
+        slot_of = self.slot_of
+        rotated = []
+        for led_idx in led_indices:
+            leds = rings[ring_of[led_idx]]
+            rotated.append(leds[(slot_of[led_idx] + shifts[ring_of[led_idx]]) % len(leds)])
+        return rotated
+
+
+_indexes: "OrderedDict[Hashable, CircularLayoutIndex]" = OrderedDict()
+
+
+def clear_layout_indexes() -> None:
+    """Drop every cached index."""
+    _indexes.clear()
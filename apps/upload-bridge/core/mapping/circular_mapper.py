@@ -336,17 +336,25 @@ class CircularMapper:
         
         For each LED in the circular layout, find the nearest grid cell.
         This is the SINGLE SOURCE OF TRUTH for circular layout mapping.
-        The mapping table is deterministic and stable across sessions.
+        The mapping table is deterministic and stable across sessions, so it
+        is generated once per distinct layout and shared as an immutable
+        `MappingTable`.
         
         Args:
             metadata: PatternMetadata with circular layout configuration
             
         Returns:
-            List of (x, y) tuples, where mapping_table[led_idx] = (x, y)
+            Sequence of (x, y) tuples, where mapping_table[led_idx] = (x, y)
             
         Raises:
             ValueError: If circular_led_count is not set for circular layouts
         """
+        from core.mapping.mapping_table import mapping_tables
+        return mapping_tables.table_for(metadata, CircularMapper._build_mapping_table)
+    
+    @staticmethod
+    def _build_mapping_table(metadata) -> List[Tuple[int, int]]:
+        """Uncached body of `generate_mapping_table`."""
         if metadata.layout_type == "rectangular":
             # For rectangular layouts, create 1:1 mapping (row-major order)
             mapping = []
@@ -582,14 +590,9 @@ class CircularMapper:
             # Generate mapping table if not present
             metadata.circular_mapping_table = CircularMapper.generate_mapping_table(metadata)
         
-        mapping_table = metadata.circular_mapping_table
-        
-        # Find LED index that maps to this grid cell
-        for led_idx, (grid_x, grid_y) in enumerate(mapping_table):
-            if grid_x == x and grid_y == y:
-                return led_idx
-        
-        return None
+        # Reverse lookup through the cached layout index
+        from core.mapping.circular_layout_index import CircularLayoutIndex
+        return CircularLayoutIndex.for_metadata(metadata).led_at(x, y)
     
     @staticmethod
     def led_index_to_grid(led_idx: int, metadata) -> Optional[Tuple[int, int]]:
@@ -645,6 +648,8 @@ class CircularMapper:
         This ensures the mapping table (single source of truth) is valid
         before use in preview or export.
         
+        Results are memoized per layout and table.
+        
         Returns:
             (is_valid, error_message)
         """
@@ -652,6 +657,12 @@ class CircularMapper:
             # Rectangular layouts don't need mapping table validation
             return (True, None)
         
+        from core.mapping.mapping_table import mapping_tables
+        return mapping_tables.validate(metadata, CircularMapper._check_mapping_table)
+    
+    @staticmethod
+    def _check_mapping_table(metadata) -> Tuple[bool, Optional[str]]:
+        """Uncached body of `validate_mapping_table`."""
         if not metadata.circular_mapping_table:
             return (False, "circular_mapping_table is None - cannot use circular layout without mapping")
         
@@ -705,7 +716,8 @@ class CircularMapper:
             return False
         
         # Check if (x, y) appears in mapping table
-        return (x, y) in metadata.circular_mapping_table
+        from core.mapping.circular_layout_index import CircularLayoutIndex
+        return CircularLayoutIndex.for_metadata(metadata).is_mapped(x, y)
     
     @staticmethod
     def ensure_mapping_table(metadata) -> bool:
@@ -790,6 +802,7 @@ class CircularMapper:
         Returns:
             List of (x, y) tuples in screen coordinates, indexed by LED index (0..N-1)
             Each tuple represents the screen position where that LED should be rendered.
+            Positions are memoized per layout and geometry.
         """
         if metadata.layout_type == "rectangular":
             # Rectangular layouts don't use circular preview
@@ -802,6 +815,18 @@ class CircularMapper:
         if not metadata.circular_mapping_table:
             return []
         
+        from core.mapping.circular_layout_index import CircularLayoutIndex
+        return CircularLayoutIndex.for_metadata(metadata).preview_positions(
+            metadata, center_x, center_y, max_radius)
+    
+    @staticmethod
+    def _compute_led_positions_for_preview(
+        metadata,
+        center_x: float,
+        center_y: float,
+        max_radius: float
+    ) -> List[Tuple[float, float]]:
+        """Uncached body of `generate_led_positions_for_preview` (mapping table must exist)."""
         led_count = len(metadata.circular_mapping_table)
         positions = []
         
@@ -0,0 +1,210 @@
+"""
+Mapping Table - Compact storage and shared generation for circular mapping tables.
+
+A circular mapping table lists the grid cell (x, y) behind each LED. Tables
+are stored as a `MappingTable`: an immutable sequence of (x, y) tuples
+backed by one ``array('H')`` of interleaved coordinates, so copies of a
+pattern share one table and equality is a buffer comparison. Anything that
+indexes, iterates or unpacks the old lists of tuples keeps working, and
+serializers write it out as a list of pairs exactly as before.
+
+`MappingTableService` generates each distinct layout's table once (keyed by
+`layout_fingerprint`) and memoizes validation results per table, so building
+metadata, copying patterns and encoding frames stop regenerating and
+revalidating the same table.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from itertools import chain
+from typing import Callable, Hashable, Iterator, List, Optional, Tuple
+
+from core.mapping.circular_layout_index import layout_fingerprint
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Largest coordinate an unsigned 16-bit cell can hold
+MAX_COORDINATE = 0xFFFF
+# Distinct layouts whose generated tables and validation results are kept
+MAX_LAYOUTS = 64
+# Metadata fields `CircularMapper.generate_mapping_table` fills in when unset
+GENERATED_FIELDS = ("circular_led_count", "ray_count", "leds_per_ray")
+
+
+class MappingTable(Sequence):
+    """Immutable LED index -> (grid_x, grid_y) table."""
+
+    __slots__ = ("_xy",)
+
+    def __init__(self, cells=()):
+        self._xy = array("H", chain.from_iterable(cells))
+        if len(self._xy) % 2:
+            raise ValueError("Mapping table cells must be (x, y) pairs")
+
+    @classmethod
+    def _from_xy(cls, xy: array) -> "MappingTable":
+        table = cls.__new__(cls)
+        table._xy = xy
+        return table
+
+    @classmethod
+    def coerce(cls, table):
+        """
+        Compact form of a table, or the table unchanged if it cannot be stored.
+
+        Tables holding anything but (x, y) pairs of ints in 0..65535 (negative
+        or non-integer cells from hand-edited files, say) are returned as is so
+        validation still reports them.
+        """
+        if table is None or isinstance(table, MappingTable):
+            return table
+        try:
+            cells = [tuple(cell) for cell in table]
+        except TypeError:
+            return table
+        for cell in cells:
+            if len(cell) != 2:
+                return table
+            for value in cell:
+                if type(value) is not int or not 0 <= value <= MAX_COORDINATE:
+                    return table
+        return cls(cells)
+
+    def __len__(self) -> int:
+        return len(self._xy) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return MappingTable._from_xy(self._xy[2 * start:2 * max(start, stop)])
+            return MappingTable(self[i] for i in range(start, stop, step))
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("mapping table index out of range")
+        return (self._xy[2 * index], self._xy[2 * index + 1])
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        values = iter(self._xy)
+        return zip(values, values)
+
+    def __contains__(self, cell) -> bool:
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return False
+        return any(cx == x and cy == y for cx, cy in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MappingTable):
+            return self._xy == other._xy
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._xy.tobytes())
+
+    def __repr__(self) -> str:
+        return f"MappingTable({self.to_list()!r})"
+
+    def __copy__(self) -> "MappingTable":
+        return self
+
+    def __deepcopy__(self, memo) -> "MappingTable":
+        return self
+
+    def __reduce__(self):
+        return (MappingTable._from_xy, (self._xy,))
+
+    def to_list(self) -> List[Tuple[int, int]]:
+        """Table as a list of (x, y) tuples (the serialized form)."""
+        return list(self)
+
+    def grid_indices(self, width: int) -> List[int]:
+        """Row-major grid index behind each LED."""
+        xs = self._xy[0::2]
+        ys = self._xy[1::2]
+        return [y * width + x for x, y in zip(xs, ys)]
+
+    def as_array(self):
+        """(N, 2) uint16 NumPy view of the table (read-only)."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for MappingTable.as_array")
+        view = np.frombuffer(self._xy, dtype=np.uint16).reshape(-1, 2)
+        view.flags.writeable = False
+        return view
+
+
+class MappingTableService:
+    """Shared, fingerprint-keyed mapping-table generation and validation."""
+
+    def __init__(self, max_layouts: int = MAX_LAYOUTS):
+        self.max_layouts = max_layouts
+        self._tables: "OrderedDict[Hashable, Tuple[MappingTable, tuple]]" = OrderedDict()
+        self._validations: "OrderedDict[Hashable, Tuple[MappingTable, Tuple[bool, Optional[str]]]]" = OrderedDict()
+
+    def _remember(self, cache: OrderedDict, key: Hashable, value) -> None:
+        cache[key] = value
+        if len(cache) > self.max_layouts:
+            cache.popitem(last=False)
+
+    def table_for(self, metadata, build: Callable):
+        """
+        Mapping table for the metadata's layout, generated on first use.
+
+        ``build`` produces the table for an unseen layout and may fill in
+        `GENERATED_FIELDS` on the metadata; cached hits replay those fields.
+        Build errors are raised and not cached.
+        """
+        key = layout_fingerprint(metadata)
+        entry = self._tables.get(key)
+        if entry is None:
+            table = MappingTable.coerce(build(metadata))
+            fields = tuple(getattr(metadata, name, None) for name in GENERATED_FIELDS)
+            if not isinstance(table, MappingTable):
+                return table
+            entry = (table, fields)
+            self._remember(self._tables, key, entry)
+        else:
+            self._tables.move_to_end(key)
+            for name, value in zip(GENERATED_FIELDS, entry[1]):
+                setattr(metadata, name, value)
+        return entry[0]
+
+    def validate(self, metadata, check: Callable) -> Tuple[bool, Optional[str]]:
+        """
+        Result of ``check(metadata)``, memoized per layout for compact tables.
+
+        Lists assigned by hand are checked every time.
+        """
+        table = metadata.circular_mapping_table
+        if not isinstance(table, MappingTable):
+            return check(metadata)
+        key = layout_fingerprint(metadata)
+        entry = self._validations.get(key)
+        if entry is not None and (entry[0] is table or entry[0] == table):
+            self._validations.move_to_end(key)
+            return entry[1]
+        result = check(metadata)
+        self._remember(self._validations, key, (table, result))
+        return result
+
+    def clear(self) -> None:
+        """Forget every generated table and validation result."""
+        self._tables.clear()
+        self._validations.clear()
+
+
+# Shared by CircularMapper and PatternMetadata
+mapping_tables = MappingTableService()
@@ -10,7 +10,7 @@ This module provides metrics collection for:
 
 import logging
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import deque
@@ -30,6 +30,7 @@ class UploadMetrics:
     speed_mbps: float = 0.0
     retry_count: int = 0
     device_ip: Optional[str] = None
+    chip_id: Optional[str] = None
     
     def calculate_speed(self) -> float:
         """Calculate transfer speed in Mbps"""
@@ -52,6 +53,7 @@ class UploadMetrics:
             'speed_mbps': self.speed_mbps,
             'retry_count': self.retry_count,
             'device_ip': self.device_ip,
+            'chip_id': self.chip_id,
         }
 
 
@@ -190,6 +192,63 @@ class MetricsCollector:
             'avg_retry_count': statistics.mean([m.retry_count for m in successful]),
         }
     
+    def upload_throughput(self, chip_id: Optional[str] = None,
+                          time_window_minutes: Optional[int] = None) -> Optional[Tuple[float, float]]:
+        """
+        Measured upload throughput from successful uploads.
+        
+        Fits ``duration = overhead + size / bytes_per_second`` by least squares
+        so fixed costs (bootloader entry, erase, verify) are separated from
+        transfer speed. With fewer than two distinct sizes the overhead is 0.
+        
+        Args:
+            chip_id: Only use uploads to this chip (None for all)
+            time_window_minutes: Only include metrics from last N minutes
+        
+        Returns:
+            (bytes_per_second, overhead_seconds), or None without history
+        """
+        cutoff = datetime.now() - timedelta(minutes=time_window_minutes) if time_window_minutes else None
+        samples = [
+            (m.file_size, m.duration_seconds) for m in self.uploads
+            if m.success and m.file_size > 0 and m.duration_seconds > 0
+            and (chip_id is None or m.chip_id == chip_id)
+            and (cutoff is None or m.timestamp >= cutoff)
+        ]
+        if not samples:
+            return None
+        
+        sizes = [size for size, _ in samples]
+        durations = [duration for _, duration in samples]
+        if len(set(sizes)) >= 2:
+            mean_size = statistics.mean(sizes)
+            mean_duration = statistics.mean(durations)
+            covariance = sum((s - mean_size) * (d - mean_duration) for s, d in samples)
+            variance = sum((s - mean_size) ** 2 for s in sizes)
+            seconds_per_byte = covariance / variance
+            overhead = mean_duration - seconds_per_byte * mean_size
+            if seconds_per_byte > 0 and overhead >= 0:
+                return (1.0 / seconds_per_byte, overhead)
+        # Too little spread (or a nonsensical fit): plain average rate
+        return (sum(sizes) / sum(durations), 0.0)
+    
+    def estimate_upload_seconds(self, file_size: int, chip_id: Optional[str] = None) -> Optional[float]:
+        """
+        Predict upload duration from measured throughput.
+        
+        Args:
+            file_size: Firmware size in bytes
+            chip_id: Target chip (history for other chips is not used)
+        
+        Returns:
+            Seconds, or None when no successful upload to the chip was recorded
+        """
+        throughput = self.upload_throughput(chip_id)
+        if throughput is None:
+            return None
+        bytes_per_second, overhead = throughput
+        return overhead + file_size / bytes_per_second
+    
     def get_network_stats(self, time_window_minutes: Optional[int] = None) -> Dict[str, Any]:
         """
         Get network health statistics.
@@ -339,7 +398,8 @@ def get_metrics_collector() -> MetricsCollector:
 
 
 def record_upload(file_size: int, duration: float, success: bool, 
-                 error_type: Optional[str] = None, device_ip: Optional[str] = None) -> None:
+                 error_type: Optional[str] = None, device_ip: Optional[str] = None,
+                 chip_id: Optional[str] = None) -> None:
     """
     Convenience function to record upload metrics.
     
@@ -349,6 +409,7 @@ def record_upload(file_size: int, duration: float, success: bool,
         success: Whether upload was successful
         error_type: Type of error if unsuccessful
         device_ip: IP address of target device
+        chip_id: Target chip identifier
     """
     metrics = UploadMetrics(
         file_size=file_size,
@@ -356,5 +417,6 @@ def record_upload(file_size: int, duration: float, success: bool,
         success=success,
         error_type=error_type,
         device_ip=device_ip,
+        chip_id=chip_id,
     )
     get_metrics_collector().record_upload(metrics)
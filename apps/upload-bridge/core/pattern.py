@@ -3,13 +3,31 @@ Pattern Data Model - Canonical representation of LED patterns
 Complete implementation with validation and transformations
 """
 
+from contextlib import contextmanager
+from itertools import chain
 from dataclasses import dataclass, field
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Sequence
 from pathlib import Path
 import json
 import uuid
 import enum
 
+from .brightness_lut import BrightnessLUT, curve_level
+from .frame_time_index import FrameTimeIndex, bump_timing_epoch
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Interpolation blend modes: straight RGB lerp, or lerp in linear light
+INTERPOLATION_MODES = ("linear", "gamma")
+BLEND_GAMMA = 2.2
+# Frame pairs blended per array chunk (bounds peak memory for large factors)
+_INTERPOLATION_CHUNK = 64
+
 
 @dataclass
 class Frame:
@@ -32,6 +50,12 @@ class Frame:
         if self.duration_ms < 0:
             raise ValueError(f"Frame duration cannot be negative: {self.duration_ms}")
     
+    def __setattr__(self, name, value):
+        # Retiming an existing frame invalidates pattern time indexes
+        if name == "duration_ms" and self.__dict__.get("duration_ms", value) != value:
+            bump_timing_epoch()
+        object.__setattr__(self, name, value)
+    
     @property
     def led_count(self) -> int:
         """Number of LEDs in this frame"""
@@ -41,6 +65,38 @@ class Frame:
         """Convert frame to raw RGB bytes"""
         return bytes([c for pixel in self.pixels for c in pixel])
     
+    @classmethod
+    def from_array(cls, rgb, duration_ms: int, intern: bool = False) -> 'Frame':
+        """
+        Build a frame from an (N, 3) uint8 array
+        
+        Skips per-pixel validation: uint8 values are always in range.
+        With ``intern`` every distinct colour becomes one shared tuple, which
+        is much cheaper for frames made of a few flat colours.
+        """
+        if duration_ms < 0:
+            raise ValueError(f"Frame duration cannot be negative: {duration_ms}")
+        pixels = None
+        if intern:
+            wide = rgb.astype(np.uint32)
+            colours, inverse = np.unique((wide[:, 0] << 16) | (wide[:, 1] << 8) | wide[:, 2],
+                                         return_inverse=True)
+            # Mostly distinct colours gain nothing from sharing tuples
+            if len(colours) * 4 <= len(wide):
+                palette = list(zip((colours >> 16).tolist(), ((colours >> 8) & 255).tolist(),
+                                   (colours & 255).tolist()))
+                pixels = list(map(palette.__getitem__, inverse.tolist()))
+        if pixels is None:
+            pixels = list(zip(*rgb.T.tolist()))
+        frame = cls.__new__(cls)
+        frame.__dict__.update(
+            pixels=pixels,
+            duration_ms=int(duration_ms),
+            is_baked=False,
+            source_frame_id=None,
+        )
+        return frame
+    
     def copy(self) -> 'Frame':
         """Create a deep copy of this frame"""
         return Frame(
@@ -85,6 +141,7 @@ class PatternMetadata:
     dimension_confidence: float = 0.0  # 0.0 - 1.0 confidence in width/height
     source_format: Optional[str] = None  # Original file format (bin, dat, hex, leds, etc.)
     source_path: Optional[str] = None  # Original file path (if known)
+    source_content_key: Optional[str] = None  # Detection-cache key of the source file (if loaded through one)
     # User override for dimensions
     dimension_override: bool = False  # True if dimensions were manually overridden
     dimension_override_source: Optional[str] = None  # 'user' when manually set
@@ -128,6 +185,13 @@ class PatternMetadata:
     background_image_offset_x: float = 0.0  # X offset for background image
     background_image_offset_y: float = 0.0  # Y offset for background image
     
+    def __setattr__(self, name, value):
+        # Mapping tables are stored compactly (see core.mapping.mapping_table)
+        if name == "circular_mapping_table" and value is not None:
+            from core.mapping.mapping_table import MappingTable
+            value = MappingTable.coerce(value)
+        object.__setattr__(self, name, value)
+    
     def __post_init__(self):
         """Validate metadata"""
         if self.width < 1:
@@ -273,6 +337,7 @@ class Pattern:
     frames: List[Frame] = field(default_factory=list)
     lms_pattern_instructions: List[Dict[str, object]] = field(default_factory=list)
     scratchpads: Dict[str, List[Tuple[int, int, int]]] = field(default_factory=dict)
+    _time_index: FrameTimeIndex = field(default_factory=FrameTimeIndex, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate pattern consistency"""
@@ -299,7 +364,16 @@ class Pattern:
     @property
     def duration_ms(self) -> int:
         """Total pattern duration in milliseconds"""
-        return sum(f.duration_ms for f in self.frames)
+        return self._time_index.total_ms(self.frames)
+    
+    @contextmanager
+    def _retiming(self, start: int):
+        """Track an edit to frame order or durations from frame ``start`` on"""
+        in_sync = self._time_index.snapshot(self.frames)
+        try:
+            yield
+        finally:
+            self._time_index.patch(self.frames, start, in_sync)
     
     @property
     def average_fps(self) -> float:
@@ -314,8 +388,9 @@ class Pattern:
             raise ValueError(f"FPS must be > 0: {fps}")
         
         duration_ms = int(1000.0 / fps)
-        for frame in self.frames:
-            frame.duration_ms = max(1, duration_ms)  # At least 1ms
+        with self._retiming(0):
+            for frame in self.frames:
+                frame.duration_ms = max(1, duration_ms)  # At least 1ms
     
     def scale_speed(self, multiplier: float):
         """
@@ -326,9 +401,10 @@ class Pattern:
         if multiplier <= 0:
             raise ValueError(f"Multiplier must be > 0: {multiplier}")
         
-        for frame in self.frames:
-            new_duration = int(frame.duration_ms * multiplier)
-            frame.duration_ms = max(1, new_duration)
+        with self._retiming(0):
+            for frame in self.frames:
+                new_duration = int(frame.duration_ms * multiplier)
+                frame.duration_ms = max(1, new_duration)
     
     def fit_to_duration(self, target_ms: int):
         """Adjust frame durations to fit exact total duration"""
@@ -341,10 +417,9 @@ class Pattern:
         duration_per_frame = target_ms // self.frame_count
         remainder = target_ms % self.frame_count
         
-        for i, frame in enumerate(self.frames):
-            frame.duration_ms = duration_per_frame
-            if i < remainder:
-                frame.duration_ms += 1
+        with self._retiming(0):
+            for i, frame in enumerate(self.frames):
+                frame.duration_ms = duration_per_frame + (1 if i < remainder else 0)
     
     def apply_brightness(self, brightness: int):
         """
@@ -407,7 +482,7 @@ class Pattern:
             raise IndexError(f"Frame index out of range: {frame_idx}")
         
         new_frame = self.frames[frame_idx].copy()
-        self.frames.insert(frame_idx + 1, new_frame)
+        self.insert_frame(frame_idx + 1, new_frame)
         return frame_idx + 1
     
     def delete_frame(self, frame_idx: int):
@@ -418,57 +493,65 @@ class Pattern:
         if self.frame_count == 1:
             raise ValueError("Cannot delete last frame")
         
-        del self.frames[frame_idx]
+        with self._retiming(frame_idx):
+            del self.frames[frame_idx]
+    
+    def insert_frame(self, frame_idx: int, frame: Frame):
+        """Insert a frame before index (appends when index == frame_count)"""
+        frame_idx = max(0, min(frame_idx, self.frame_count))
+        with self._retiming(frame_idx):
+            self.frames.insert(frame_idx, frame)
+    
+    def move_frame(self, src_idx: int, dest_idx: int):
+        """Move a frame from one index to another"""
+        if not (0 <= src_idx < self.frame_count):
+            raise IndexError(f"Frame index out of range: {src_idx}")
+        dest_idx = max(0, min(dest_idx, self.frame_count - 1))
+        with self._retiming(min(src_idx, dest_idx)):
+            self.frames.insert(dest_idx, self.frames.pop(src_idx))
+    
+    def set_frame_duration(self, frame_idx: int, duration_ms: int):
+        """Set one frame's duration"""
+        if not (0 <= frame_idx < self.frame_count):
+            raise IndexError(f"Frame index out of range: {frame_idx}")
+        with self._retiming(frame_idx):
+            self.frames[frame_idx].duration_ms = duration_ms
     
     def apply_advanced_brightness(self, brightness: float, curve_type: str = "gamma_corrected", 
-                                 per_channel: Optional[Dict[str, float]] = None, led_type: str = "ws2812"):
+                                 per_channel: Optional[Dict[str, float]] = None, led_type: str = "ws2812",
+                                 color_correction: bool = False):
         """
         Apply advanced brightness control to the pattern
         
+        The settings are compiled into per-channel lookup tables once and
+        every frame is translated through them.
+        
         Args:
             brightness: Global brightness (0.0-1.0)
             curve_type: Brightness curve type
-            per_channel: Per-channel brightness multipliers
+            per_channel: Per-channel brightness multipliers, or True to use
+                the multipliers stored in metadata
             led_type: LED chip type
+            color_correction: Apply the LED type's white-balance correction
         """
         # Update metadata
         self.metadata.brightness = brightness
         self.metadata.brightness_curve = curve_type
         self.metadata.led_type = led_type
         
-        # Create brightness mapper
-        curve_enum = BrightnessCurve(curve_type) if hasattr(BrightnessCurve, curve_type.upper()) else BrightnessCurve.GAMMA_CORRECTED
-        mapper = HardwareBrightnessMapper(curve_enum)
+        if per_channel is True:
+            # Use the multipliers stored by set_per_channel_brightness
+            per_channel = {
+                'red': self.metadata.red_brightness,
+                'green': self.metadata.green_brightness,
+                'blue': self.metadata.blue_brightness,
+            }
+        elif not isinstance(per_channel, dict):
+            per_channel = None
         
-        # Apply brightness to all frames
+        lut = BrightnessLUT.compile(brightness, curve_type, per_channel, led_type, color_correction=color_correction)
         for frame in self.frames:
-            new_pixels = []
-            for r, g, b in frame.pixels:
-                # Apply global brightness using hardware mapping
-                mapped_brightness = mapper.map_brightness(brightness) / 255.0  # Convert to 0.0-1.0
-                
-                # Apply per-channel brightness if specified
-                if per_channel and isinstance(per_channel, dict):
-                    r_mult = per_channel.get('red', 1.0)
-                    g_mult = per_channel.get('green', 1.0)
-                    b_mult = per_channel.get('blue', 1.0)
-                    
-                    new_r = int(r * mapped_brightness * r_mult)
-                    new_g = int(g * mapped_brightness * g_mult)
-                    new_b = int(b * mapped_brightness * b_mult)
-                else:
-                    new_r = int(r * mapped_brightness)
-                    new_g = int(g * mapped_brightness)
-                    new_b = int(b * mapped_brightness)
-                
-                # Clamp values to 0-255
-                new_r = max(0, min(255, new_r))
-                new_g = max(0, min(255, new_g))
-                new_b = max(0, min(255, new_b))
-                
-                new_pixels.append((new_r, new_g, new_b))
-            
-            frame.pixels = new_pixels
+            frame.pixels = lut.apply_pixels(frame.pixels)
     
     def set_per_channel_brightness(self, red: float, green: float, blue: float):
         """Set per-channel brightness multipliers"""
@@ -502,11 +585,55 @@ class Pattern:
         """Set speed keyframes"""
         self.metadata.speed_keyframes = keyframes
     
-    def interpolate_frames(self, factor: float):
-        """Interpolate frames to increase frame count"""
+    def frames_array(self) -> "np.ndarray":
+        """
+        All frame pixels as a (frames, leds, 3) uint8 tensor
+        
+        Raises:
+            ValueError: Frames have different LED counts or malformed pixels
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for frames_array")
+        if not self.frames:
+            return np.zeros((0, self.led_count, 3), dtype=np.uint8)
+        led_count = len(self.frames[0].pixels)
+        tensor = np.empty((len(self.frames), led_count, 3), dtype=np.uint8)
+        for i, frame in enumerate(self.frames):
+            try:
+                data = bytes(chain.from_iterable(frame.pixels))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Frame {i} has malformed pixels") from e
+            if len(data) != led_count * 3:
+                raise ValueError(f"Frame {i} has {len(data) // 3} LEDs, expected {led_count}")
+            tensor[i] = np.frombuffer(data, dtype=np.uint8).reshape(led_count, 3)
+        return tensor
+    
+    def interpolate_frames(self, factor: float, mode: str = "linear"):
+        """
+        Interpolate frames to increase frame count
+        
+        ``int(factor) - 1`` in-between frames are inserted between each pair
+        of frames at ``t = j / factor``.
+        
+        Args:
+            factor: Frame multiplication factor (> 1.0)
+            mode: "linear" blends RGB values directly; "gamma" blends in
+                linear light, which avoids dark midpoints between colours
+        """
+        if mode not in INTERPOLATION_MODES:
+            raise ValueError(f"Unknown interpolation mode: {mode}")
         if factor <= 1.0:
             return
         
+        if NUMPY_AVAILABLE and len(self.frames) > 1:
+            try:
+                tensor = self.frames_array()
+            except ValueError:
+                tensor = None  # Ragged or malformed frames: per-pixel path
+            if tensor is not None:
+                self.frames = self._interpolate_tensor(tensor, factor, mode)
+                return
+        
         new_frames = []
         for i in range(len(self.frames) - 1):
             current_frame = self.frames[i]
@@ -518,17 +645,10 @@ class Pattern:
             # Add interpolated frames
             for j in range(1, int(factor)):
                 t = j / factor
-                interpolated_pixels = []
-                
-                for k in range(len(current_frame.pixels)):
-                    r1, g1, b1 = current_frame.pixels[k]
-                    r2, g2, b2 = next_frame.pixels[k]
-                    
-                    r = int(r1 + (r2 - r1) * t)
-                    g = int(g1 + (g2 - g1) * t)
-                    b = int(b1 + (b2 - b1) * t)
-                    
-                    interpolated_pixels.append((r, g, b))
+                interpolated_pixels = [
+                    _blend_pixel(p1, p2, t, mode)
+                    for p1, p2 in zip(current_frame.pixels, next_frame.pixels)
+                ]
                 
                 # Create interpolated frame with proportional duration
                 duration = int(current_frame.duration_ms / factor)
@@ -539,6 +659,36 @@ class Pattern:
         
         self.frames = new_frames
     
+    def _interpolate_tensor(self, tensor: "np.ndarray", factor: float, mode: str) -> List[Frame]:
+        """Generate all in-between frames for ``factor`` as array operations"""
+        t = np.arange(1, int(factor), dtype=np.float64) / factor
+        weights = t[None, :, None, None]
+        linear_lut = _linear_light_lut() if mode == "gamma" else None
+        new_frames: List[Frame] = []
+        
+        for start in range(0, len(self.frames) - 1, _INTERPOLATION_CHUNK):
+            stop = min(start + _INTERPOLATION_CHUNK, len(self.frames) - 1)
+            if linear_lut is not None:
+                a = linear_lut[tensor[start:stop]][:, None]
+                b = linear_lut[tensor[start + 1:stop + 1]][:, None]
+                blended = a + (b - a) * weights
+                blended = np.power(blended, 1.0 / BLEND_GAMMA) * 255.0 + 0.5
+            else:
+                a = tensor[start:stop, None].astype(np.float64)
+                b = tensor[start + 1:stop + 1, None].astype(np.float64)
+                blended = a + (b - a) * weights
+            # Truncation matches int() for non-negative values
+            blended = np.clip(blended, 0, 255).astype(np.uint8)
+            
+            for offset, inbetweens in enumerate(blended):
+                current_frame = self.frames[start + offset]
+                new_frames.append(current_frame)
+                duration = max(1, int(current_frame.duration_ms / factor))
+                new_frames.extend(Frame.from_array(rgb, duration) for rgb in inbetweens)
+        
+        new_frames.append(self.frames[-1])
+        return new_frames
+    
     def apply_variable_speed(self, keyframes: list):
         """Apply variable speed using keyframes"""
         if not keyframes:
@@ -547,56 +697,61 @@ class Pattern:
         # Sort keyframes by frame
         keyframes.sort(key=lambda x: x[0])
         
-        # Apply speed changes to all frames between keyframes
+        # Speed multiplier per frame, interpolated between keyframes
+        frame_count = len(self.frames)
+        indices: List[int] = []
+        multipliers: List[float] = []
         for i in range(len(keyframes) - 1):
             start_frame, start_speed = keyframes[i]
             end_frame, end_speed = keyframes[i + 1]
-            
-            # Apply speed to frames in this range
-            for frame_idx in range(start_frame, min(end_frame, len(self.frames))):
-                if frame_idx < len(self.frames):
-                    # Interpolate speed between keyframes
-                    if end_frame > start_frame:
-                        t = (frame_idx - start_frame) / (end_frame - start_frame)
-                        speed_mult = start_speed + (end_speed - start_speed) * t
-                    else:
-                        speed_mult = start_speed
-                    
-                    # Scale duration by speed multiplier
-                    if speed_mult > 0:
-                        new_duration = int(self.frames[frame_idx].duration_ms / speed_mult)
-                        self.frames[frame_idx].duration_ms = max(1, new_duration)
+            segment = range(max(0, start_frame), min(end_frame, frame_count))
+            if not segment:
+                continue
+            indices.extend(segment)
+            if NUMPY_AVAILABLE:
+                t = (np.arange(segment.start, segment.stop, dtype=np.float64) - start_frame) / (end_frame - start_frame)
+                multipliers.extend((start_speed + (end_speed - start_speed) * t).tolist())
+            else:
+                multipliers.extend(
+                    start_speed + (end_speed - start_speed) * ((idx - start_frame) / (end_frame - start_frame))
+                    for idx in segment
+                )
+        
+        with self._retiming(max(0, keyframes[0][0])):
+            self._scale_durations(indices, multipliers)
+    
+    def _scale_durations(self, indices: Sequence[int], multipliers: Sequence[float]):
+        """Divide the durations of ``indices`` by positive speed multipliers (min 1 ms)"""
+        if NUMPY_AVAILABLE and len(indices):
+            idx = np.asarray(indices, dtype=np.int64)
+            mult = np.asarray(multipliers, dtype=np.float64)
+            keep = mult > 0
+            idx, mult = idx[keep], mult[keep]
+            durations = np.fromiter((self.frames[i].duration_ms for i in idx.tolist()), dtype=np.float64, count=len(idx))
+            scaled = np.maximum(1, (durations / mult).astype(np.int64))
+            for i, duration in zip(idx.tolist(), scaled.tolist()):
+                self.frames[i].duration_ms = duration
+            return
+        for i, speed_mult in zip(indices, multipliers):
+            if speed_mult > 0:
+                self.frames[i].duration_ms = max(1, int(self.frames[i].duration_ms / speed_mult))
     
     def apply_speed_curve(self, curve_type: str):
         """Apply speed curve to pattern"""
         self.metadata.speed_curve = curve_type
         
-        # Map curve type to function
-        curve_functions = {
-            'linear': SpeedController.linear_easing,
-            'ease_in_quad': SpeedController.ease_in_quad,
-            'ease_out_quad': SpeedController.ease_out_quad,
-            'ease_in_out_quad': SpeedController.ease_in_out_quad,
-            'ease_in_cubic': SpeedController.ease_in_cubic,
-            'ease_out_cubic': SpeedController.ease_out_cubic,
-            'ease_in_out_cubic': SpeedController.ease_in_out_cubic
-        }
+        # Position of each frame in the animation (0.0 to 1.0)
+        total_frames = len(self.frames)
+        if NUMPY_AVAILABLE:
+            t = np.arange(total_frames, dtype=np.float64) / (total_frames - 1) if total_frames > 1 else np.zeros(total_frames)
+        else:
+            t = [i / (total_frames - 1) if total_frames > 1 else 0.0 for i in range(total_frames)]
         
-        curve_func = curve_functions.get(curve_type, SpeedController.linear_easing)
+        # Speed multiplier per frame from the easing curve
+        speed_mults = SpeedController.evaluate_curve(curve_type, t)
         
-        # Apply curve to all frames
-        total_frames = len(self.frames)
-        for i, frame in enumerate(self.frames):
-            # Calculate position in animation (0.0 to 1.0)
-            t = i / (total_frames - 1) if total_frames > 1 else 0.0
-            
-            # Apply curve to get speed multiplier
-            speed_mult = curve_func(t)
-            
-            # Adjust frame duration based on speed curve
-            if speed_mult > 0:
-                new_duration = int(frame.duration_ms / speed_mult)
-                frame.duration_ms = max(1, new_duration)
+        with self._retiming(0):
+            self._scale_durations(range(total_frames), speed_mults)
     
     @property
     def total_duration_ms(self) -> int:
@@ -681,7 +836,11 @@ class Pattern:
                 "circular_start_angle": getattr(self.metadata, 'circular_start_angle', 0.0),
                 "circular_end_angle": getattr(self.metadata, 'circular_end_angle', 360.0),
                 "circular_led_spacing": getattr(self.metadata, 'circular_led_spacing', None),
-                "circular_mapping_table": getattr(self.metadata, 'circular_mapping_table', None),
+                "circular_mapping_table": (
+                    [tuple(cell) for cell in mapping_table]
+                    if (mapping_table := getattr(self.metadata, 'circular_mapping_table', None)) is not None
+                    else None
+                ),
                 # Multi-ring layout (Budurasmala)
                 "multi_ring_count": getattr(self.metadata, 'multi_ring_count', None),
                 "ring_led_counts": getattr(self.metadata, 'ring_led_counts', None),
@@ -838,29 +997,39 @@ class Pattern:
         return Pattern.from_dict(data)
     
     def get_frame_at_time(self, time_ms: int) -> Optional[int]:
-        """Get frame index at specified time in milliseconds"""
-        if time_ms < 0 or self.frame_count == 0:
-            return None
+        """Get frame index at specified time in milliseconds
         
-        elapsed = 0
-        for i, frame in enumerate(self.frames):
-            elapsed += frame.duration_ms
-            if time_ms < elapsed:
-                return i
+        Times beyond the pattern duration return the last frame; negative
+        times (or an empty pattern) return None.
+        """
+        return self._time_index.frame_at(self.frames, time_ms)
+    
+    def frames_at_times(self, times_ms: Sequence[float]):
+        """Get frame indices for many times at once
+        
+        Intended for resampling to fixed-rate outputs (video, GIF, xLights).
+        Negative times map to -1.
         
-        # Time beyond pattern duration, return last frame
-        return self.frame_count - 1
+        Returns:
+            numpy int array (list when numpy is unavailable)
+        """
+        return self._time_index.frames_at(self.frames, times_ms)
+    
+    def frame_start_ms(self, frame_idx: int) -> int:
+        """Time at which a frame starts playing"""
+        if not (0 <= frame_idx <= self.frame_count):
+            raise IndexError(f"Frame index out of range: {frame_idx}")
+        return self._time_index.starts(self.frames)[frame_idx]
     
     def estimate_memory_bytes(self) -> int:
-        """Estimate memory usage in bytes"""
-        # Header: num_leds (2) + num_frames (2)
-        size = 4
-        
-        # Each frame: delay (2) + RGB data (3 * led_count)
-        for frame in self.frames:
-            size += 2 + (frame.led_count * 3)
+        """
+        Estimate uncompressed frame data size in bytes
         
-        return size
+        Chip-specific flash, RAM and timing budgets come from
+        ``FlashService.estimate_budget``.
+        """
+        from firmware.budget_estimator import BudgetEstimator
+        return BudgetEstimator.raw_data_bytes(self)
     
     def validate(self) -> Tuple[bool, List[str]]:
         """
@@ -1117,37 +1286,37 @@ class HardwareBrightnessMapper:
         Returns:
             Hardware brightness value (0-255)
         """
-        if not (0.0 <= software_brightness <= 1.0):
-            raise ValueError(f"Software brightness must be 0.0-1.0, got {software_brightness}")
-        
-        if self.curve_type == BrightnessCurve.LINEAR:
-            return int(software_brightness * 255)
-        
-        elif self.curve_type == BrightnessCurve.GAMMA_CORRECTED:
-            # Gamma correction (gamma = 2.2)
-            gamma_corrected = software_brightness ** 2.2
-            return int(gamma_corrected * 255)
-        
-        elif self.curve_type == BrightnessCurve.LOGARITHMIC:
-            # Logarithmic curve
-            import math
-            log_brightness = math.log(1 + software_brightness * 9) / math.log(10)
-            return int(log_brightness * 255)
-        
-        elif self.curve_type == BrightnessCurve.EXPONENTIAL:
-            # Exponential curve
-            exp_brightness = software_brightness ** 0.5
-            return int(exp_brightness * 255)
-        
-        elif self.curve_type == BrightnessCurve.S_CURVE:
-            # S-curve (sigmoid-like)
-            import math
-            s_brightness = 1 / (1 + math.exp(-10 * (software_brightness - 0.5)))
-            return int(s_brightness * 255)
+        return curve_level(self.curve_type.value, software_brightness)
+    
+    def compile_lut(self, brightness: float, per_channel: Optional[Dict[str, float]] = None,
+                    led_type: str = "ws2812", color_correction: bool = False) -> BrightnessLUT:
+        """
+        Compile brightness on this curve into per-channel lookup tables
         
-        else:
-            # Default to linear
-            return int(software_brightness * 255)
+        Args:
+            brightness: Software brightness (0.0-1.0)
+            per_channel: Optional 'red'/'green'/'blue' multipliers
+            led_type: LED chip type
+            color_correction: Apply the LED type's white-balance correction
+        """
+        return BrightnessLUT.compile(brightness, self.curve_type.value, per_channel, led_type,
+                                     color_correction=color_correction)
+    
+    @staticmethod
+    def apply_to_pixel(pixel: Tuple[int, int, int], brightness: float, led_type: str = "ws2812",
+                       curve_type: str = "gamma_corrected", color_correction: bool = False) -> Tuple[int, int, int]:
+        """
+        Map a single pixel through the brightness tables
+        
+        Args:
+            pixel: RGB pixel
+            brightness: Software brightness (0.0-1.0)
+            led_type: LED chip type
+            curve_type: Brightness curve type
+            color_correction: Apply the LED type's white-balance correction
+        """
+        lut = BrightnessLUT.compile(brightness, curve_type, led_type=led_type, color_correction=color_correction)
+        return lut.apply_pixel(pixel)
     
     def apply_to_pattern(self, pattern: 'Pattern') -> 'Pattern':
         """
@@ -1159,23 +1328,11 @@ class HardwareBrightnessMapper:
         Returns:
             New pattern with mapped brightness
         """
-        new_frames = []
-        
-        for frame in pattern.frames:
-            new_pixels = []
-            for r, g, b in frame.pixels:
-                # Apply brightness mapping to each color channel
-                brightness = pattern.metadata.brightness
-                mapped_brightness = self.map_brightness(brightness)
-                
-                # Scale RGB values by mapped brightness
-                new_r = int((r * mapped_brightness) / 255)
-                new_g = int((g * mapped_brightness) / 255)
-                new_b = int((b * mapped_brightness) / 255)
-                
-                new_pixels.append((new_r, new_g, new_b))
-            
-            new_frames.append(Frame(pixels=new_pixels, duration_ms=frame.duration_ms))
+        lut = self.compile_lut(pattern.metadata.brightness)
+        new_frames = [
+            Frame(pixels=lut.apply_pixels(frame.pixels), duration_ms=frame.duration_ms)
+            for frame in pattern.frames
+        ]
         
         return Pattern(
             name=pattern.name,
@@ -1184,6 +1341,37 @@ class HardwareBrightnessMapper:
         )
 
 
+# Speed curve name -> SpeedController easing method
+_CURVE_METHODS = {
+    'linear': 'linear_easing',
+    'ease_in_quad': 'ease_in_quad',
+    'ease_out_quad': 'ease_out_quad',
+    'ease_in_out_quad': 'ease_in_out_quad',
+    'ease_in_cubic': 'ease_in_cubic',
+    'ease_out_cubic': 'ease_out_cubic',
+    'ease_in_out_cubic': 'ease_in_out_cubic',
+}
+
+
+def _linear_light_lut() -> "np.ndarray":
+    """Linear-light value of each 8-bit channel level"""
+    return (np.arange(256, dtype=np.float64) / 255.0) ** BLEND_GAMMA
+
+
+def _blend_pixel(p1, p2, t: float, mode: str = "linear") -> Tuple[int, int, int]:
+    """Blend two RGB pixels at ``t`` (per-pixel fallback for interpolate_frames)"""
+    if mode == "gamma":
+        blended = []
+        for c1, c2 in zip(p1[:3], p2[:3]):
+            l1 = (c1 / 255.0) ** BLEND_GAMMA
+            l2 = (c2 / 255.0) ** BLEND_GAMMA
+            blended.append(min(255, int((l1 + (l2 - l1) * t) ** (1.0 / BLEND_GAMMA) * 255.0 + 0.5)))
+        return tuple(blended)
+    r1, g1, b1 = p1[:3]
+    r2, g2, b2 = p2[:3]
+    return (int(r1 + (r2 - r1) * t), int(g1 + (g2 - g1) * t), int(b1 + (b2 - b1) * t))
+
+
 class SpeedController:
     """Controls animation speed and timing"""
     
@@ -1227,6 +1415,29 @@ class SpeedController:
         """Cubic ease-in-out"""
         return 4 * t * t * t if t < 0.5 else 1 - pow(-2 * t + 2, 3) / 2
     
+    @staticmethod
+    def evaluate_curve(curve_type: str, t):
+        """
+        Evaluate an easing curve over a time vector
+        
+        Args:
+            curve_type: Curve name (unknown names fall back to linear)
+            t: numpy array of positions in [0, 1], or a list of floats
+        
+        Returns:
+            Values of the same shape (list in, list out)
+        """
+        if not (NUMPY_AVAILABLE and isinstance(t, np.ndarray)):
+            curve_func = getattr(SpeedController, _CURVE_METHODS.get(curve_type, 'linear_easing'))
+            return [curve_func(x) for x in t]
+        if curve_type == 'ease_in_out_quad':
+            return np.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2)
+        if curve_type == 'ease_in_out_cubic':
+            return np.where(t < 0.5, 4 * t * t * t, 1 - (-2 * t + 2) ** 3 / 2)
+        # The remaining curves are branch-free and evaluate elementwise on arrays
+        curve_func = getattr(SpeedController, _CURVE_METHODS.get(curve_type, 'linear_easing'))
+        return curve_func(t)
+    
     def set_speed_multiplier(self, multiplier: float):
         """Set speed multiplier (0.1 = 10% speed, 2.0 = 200% speed)"""
         self.speed_multiplier = max(0.1, min(10.0, multiplier))
@@ -15,6 +15,15 @@ from PIL import Image, ImageDraw, ImageFont
 
 from core.pattern import Pattern, Frame, PatternMetadata
 
+try:
+    import numpy as np
+    from core import template_kernels
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    template_kernels = None
+    NUMPY_AVAILABLE = False
+
 RGB = Tuple[int, int, int]
 
 # Simple 5x7 Font Bitmaps (Column-major)
@@ -427,6 +436,18 @@ class TemplateLibrary:
         
         return template.generator(**params)
     
+    def _kernel_pattern(self, name: str, frame_arrays, width: int, height: int, duration_ms: int = 100) -> Pattern:
+        """Build a pattern from per-frame ``(N, 3)`` arrays produced by `core.template_kernels`."""
+        pattern_frames: List[Frame] = []
+        for rgb in frame_arrays:
+            if rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+                # Let Frame validation report the offending pixel exactly as the loops would
+                pattern_frames.append(Frame(pixels=list(zip(*rgb.T.tolist())), duration_ms=duration_ms))
+            else:
+                pattern_frames.append(Frame.from_array(rgb, duration_ms, intern=True))
+        metadata = PatternMetadata(width=width, height=height)
+        return Pattern(name=name, metadata=metadata, frames=pattern_frames)
+    
     def _get_font(self, font_name: Optional[str] = None, size: int = 10) -> ImageFont.FreeTypeFont:
         """Load a font or fallback to default."""
         try:
@@ -555,6 +576,10 @@ class TemplateLibrary:
     
     def _generate_fire(self, intensity: float, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate fire effect pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.fire(intensity, frames, width, height)
+            return self._kernel_pattern("Fire Effect", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         random.seed(42)  # Deterministic
         
@@ -582,6 +607,10 @@ class TemplateLibrary:
     
     def _generate_rain(self, drops: int, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate rain effect pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.rain(drops, color, frames, width, height)
+            return self._kernel_pattern("Rain Effect", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         random.seed(42)
         
@@ -613,6 +642,10 @@ class TemplateLibrary:
     
     def _generate_matrix_rain(self, columns: int, speed: int, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate Matrix-style rain effect."""
+        if NUMPY_AVAILABLE and isinstance(speed, int):
+            frame_arrays = template_kernels.matrix_rain(columns, speed, frames, width, height)
+            return self._kernel_pattern("Matrix Rain", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         random.seed(42)
         
@@ -765,6 +798,10 @@ class TemplateLibrary:
     
     def _generate_color_cycle(self, speed: float, frames: int, hue_start: float, saturation: float, brightness: float, width: int, height: int, **kwargs) -> Pattern:
         """Generate color cycle pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.color_cycle(speed, frames, hue_start, saturation, brightness, width, height)
+            return self._kernel_pattern("Color Cycle", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         
         def hsv_to_rgb(h, s, v):
@@ -835,6 +872,10 @@ class TemplateLibrary:
     
     def _generate_spiral(self, color: RGB, frames: int, speed: float, thickness: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate spiral pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.spiral(color, frames, speed, thickness, width, height)
+            return self._kernel_pattern("Spiral", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         max_radius = min(width, height) / 2
@@ -866,6 +907,10 @@ class TemplateLibrary:
     
     def _generate_pulse(self, color: RGB, frames: int, speed: float, center_x: float, center_y: float, width: int, height: int, **kwargs) -> Pattern:
         """Generate pulse pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.pulse(color, frames, speed, center_x, center_y, width, height)
+            return self._kernel_pattern("Pulse", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         cx, cy = int(width * center_x), int(height * center_y)
         max_radius = min(width, height) / 2
@@ -897,6 +942,10 @@ class TemplateLibrary:
     
     def _generate_fade(self, color: RGB, frames: int, fade_type: str, width: int, height: int, **kwargs) -> Pattern:
         """Generate fade in/out pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.fade(color, frames, fade_type, width, height)
+            return self._kernel_pattern("Fade", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         
         for frame_idx in range(frames):
@@ -929,6 +978,10 @@ class TemplateLibrary:
     
     def _generate_random(self, density: float, frames: int, color: RGB, width: int, height: int, **kwargs) -> Pattern:
         """Generate random pixel pattern."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.random_pixels(density, frames, color, width, height)
+            return self._kernel_pattern("Random Pixels", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         random.seed(42)
         
@@ -951,6 +1004,10 @@ class TemplateLibrary:
     
     def _generate_ray_rotation(self, speed: float, color: RGB, ray_count: int, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate rotating rays pattern (Budurasmala)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.ray_rotation(speed, color, ray_count, frames, width, height)
+            return self._kernel_pattern("Ray Rotation", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         max_radius = min(width, height) / 2
@@ -986,6 +1043,10 @@ class TemplateLibrary:
     
     def _generate_pulsing_halo(self, ring_count: int, pulse_speed: float, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate pulsing halo pattern (Budurasmala)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.pulsing_halo(ring_count, pulse_speed, color, frames, width, height)
+            return self._kernel_pattern("Pulsing Halo", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         max_radius = min(width, height) / 2
@@ -1026,6 +1087,10 @@ class TemplateLibrary:
     
     def _generate_twinkling_stars(self, density: float, twinkle_speed: float, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate twinkling stars pattern (Budurasmala)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.twinkling_stars(density, twinkle_speed, color, frames, width, height)
+            return self._kernel_pattern("Twinkling Stars", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         num_stars = int(width * height * density)
         random.seed(42)
@@ -1063,6 +1128,10 @@ class TemplateLibrary:
     
     def _generate_wave_propagation(self, wave_count: int, speed: float, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate wave propagation pattern (Budurasmala)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.wave_propagation(wave_count, speed, color, frames, width, height)
+            return self._kernel_pattern("Wave Propagation", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         max_radius = min(width, height) / 2
@@ -1117,6 +1186,12 @@ class TemplateLibrary:
         if not gradient_colors:
             gradient_colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
         
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.color_gradient_rotation(
+                gradient_colors, rotation_speed, frames, width, height
+            )
+            return self._kernel_pattern("Color Gradient Rotation", frame_arrays, width, height)
+        
         for frame_idx in range(frames):
             pixels = [(0, 0, 0)] * (width * height)
             angle_offset = (frame_idx * rotation_speed / frames) * 2 * math.pi
@@ -1165,6 +1240,10 @@ class TemplateLibrary:
     # Cultural Pattern Templates (Budurasmala - Phase 3)
     def _generate_lotus_pattern(self, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate lotus flower pattern (Buddhist symbolism)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.lotus(color, frames, width, height)
+            return self._kernel_pattern("Lotus Pattern", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         max_radius = min(width, height) / 2
@@ -1202,6 +1281,10 @@ class TemplateLibrary:
     
     def _generate_dharma_wheel(self, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate dharma wheel pattern (Buddhist symbolism)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.dharma_wheel(color, frames, width, height)
+            return self._kernel_pattern("Dharma Wheel", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         max_radius = min(width, height) / 2
@@ -1254,6 +1337,10 @@ class TemplateLibrary:
     
     def _generate_vesak_stars(self, color: RGB, frames: int, width: int, height: int, **kwargs) -> Pattern:
         """Generate Vesak stars pattern (traditional festival pattern)."""
+        if NUMPY_AVAILABLE:
+            frame_arrays = template_kernels.vesak_stars(color, frames, width, height)
+            return self._kernel_pattern("Vesak Stars", frame_arrays, width, height)
+        
         pattern_frames: List[Frame] = []
         center_x, center_y = width / 2, height / 2
         
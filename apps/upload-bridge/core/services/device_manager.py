@@ -234,13 +234,12 @@ class DeviceManager:
             device.status = DeviceStatus.ERROR
             return False
     
-    def play_pattern(self, device_id: str, pattern_data: bytes, pattern_name: str = "Pattern") -> bool:
-        """Play pattern on device."""
+    def upload_pattern(self, device_id: str, pattern_data: bytes, pattern_name: str = "Pattern") -> bool:
+        """Upload pattern to device without starting playback."""
         device = self.get_device(device_id)
         if not device:
             return False
         
-        # Upload pattern
         @retry_network_errors(max_attempts=2, delay=1.0, backoff=2.0)
         def _upload_pattern_request(url: str, files: dict) -> requests.Response:
             return requests.post(url, files=files, timeout=30)
@@ -249,8 +248,19 @@ class DeviceManager:
             url = f"http://{device.ip_address}:{device.port}/api/upload"
             files = {'pattern': (pattern_name, pattern_data, 'application/octet-stream')}
             response = _upload_pattern_request(url, files)
-            
-            if response.status_code == 200:
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Failed to upload pattern to {device_id}: {e}")
+            return False
+    
+    def play_pattern(self, device_id: str, pattern_data: bytes, pattern_name: str = "Pattern") -> bool:
+        """Play pattern on device."""
+        device = self.get_device(device_id)
+        if not device:
+            return False
+        
+        try:
+            if self.upload_pattern(device_id, pattern_data, pattern_name):
                 # Send play command
                 command = DeviceCommand("play", {"pattern": pattern_name})
                 if self.send_command(device_id, command):
@@ -262,6 +272,54 @@ class DeviceManager:
         
         return False
     
+    def get_device_time(self, device_id: str, timeout: float = 1.0) -> Optional[float]:
+        """
+        Read the device clock.
+        
+        Args:
+            device_id: Device ID
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Device time in seconds since the epoch, or None if unavailable
+        """
+        device = self.get_device(device_id)
+        if not device:
+            return None
+        
+        try:
+            url = f"http://{device.ip_address}:{device.port}/api/time"
+            response = requests.get(url, timeout=timeout)
+            if response.status_code == 200:
+                return float(response.json()["time"])
+        except Exception:
+            pass
+        
+        return None
+    
+    def get_playback_start(self, device_id: str) -> Optional[float]:
+        """
+        Get the device-clock time at which current playback started.
+        
+        Returns:
+            Start time in device seconds since the epoch, or None if unknown
+        """
+        device = self.get_device(device_id)
+        if not device:
+            return None
+        
+        try:
+            url = f"http://{device.ip_address}:{device.port}/api/status"
+            response = requests.get(url, timeout=2)
+            if response.status_code == 200:
+                started_at = response.json().get('started_at')
+                if started_at is not None:
+                    return float(started_at)
+        except Exception:
+            pass
+        
+        return None
+    
     def pause_device(self, device_id: str) -> bool:
         """Pause playback on device."""
         command = DeviceCommand("pause")
@@ -13,6 +13,9 @@ import time
 from core.pattern import Pattern
 from uploaders.uploader_registry import UploaderRegistry, get_uploader
 from uploaders.base import UploaderBase, BuildResult, UploadResult
+from firmware.build_cache import get_build_cache
+from firmware.budget_estimator import BudgetEstimator, FirmwareBudget
+from core.metrics_collector import record_upload
 from core.events import get_event_bus
 from core.events.flash_events import (
     FirmwareBuildStartedEvent,
@@ -43,6 +46,30 @@ def _get_enterprise_logger():
         return None
 
 
+def firmware_image_bytes(firmware_path: str) -> int:
+    """
+    Bytes a firmware file puts on the chip.
+    
+    Intel HEX files are ASCII with addressing overhead, so only the data
+    records are counted; other files are raw images. Returns 0 if the file
+    can't be read.
+    """
+    path = Path(firmware_path)
+    try:
+        if path.suffix.lower() not in ('.hex', '.ihex'):
+            return path.stat().st_size
+        total = 0
+        with open(path, 'r', encoding='ascii', errors='ignore') as f:
+            for line in f:
+                line = line.strip()
+                # :LLAAAATT... with record type 00 = data
+                if len(line) >= 9 and line[0] == ':' and line[7:9] == '00':
+                    total += int(line[1:3], 16)
+        return total
+    except (OSError, ValueError):
+        return 0
+
+
 class FlashService:
     """
     Service for firmware building and uploading operations.
@@ -134,7 +161,7 @@ class FlashService:
         
         # Build firmware
         try:
-            result = uploader.build_firmware(pattern, build_opts)
+            result = get_build_cache().build(uploader, pattern, build_opts)
             # #region agent log
             try:
                 debug_log("flash_service.py:99", "Firmware build completed", {
@@ -280,6 +307,7 @@ class FlashService:
             
             # Audit and performance logging
             duration_ms = (time.time() - start_time) * 1000
+            self._record_upload_metrics(firmware_path, chip_id, result, duration_ms / 1000.0)
             enterprise_logger = _get_enterprise_logger()
             if enterprise_logger:
                 enterprise_logger.log_audit("firmware_uploaded", details={
@@ -319,6 +347,42 @@ class FlashService:
             logger.error(f"Firmware upload failed: {e}", exc_info=True)
             raise RuntimeError(f"Firmware upload failed: {str(e)}") from e
     
+    def _record_upload_metrics(self, firmware_path: str, chip_id: str,
+                               result: UploadResult, elapsed_seconds: float) -> None:
+        """Feed the upload into the metrics collector used for upload-time estimates."""
+        file_size = result.bytes_written or firmware_image_bytes(firmware_path)
+        record_upload(
+            file_size=file_size,
+            duration=result.duration_seconds or elapsed_seconds,
+            success=result.success,
+            error_type=None if result.success else (result.error_message or "upload_failed"),
+            chip_id=chip_id,
+        )
+    
+    def estimate_budget(
+        self,
+        pattern: Pattern,
+        chip_id: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> FirmwareBudget:
+        """
+        Estimate flash, RAM, frame render time and upload time before building.
+        
+        Args:
+            pattern: Pattern to embed
+            chip_id: Chip identifier
+            config: Build configuration, as passed to ``build_firmware``
+        
+        Returns:
+            FirmwareBudget; check ``fits`` and ``warnings`` before building
+        """
+        config = config or {}
+        uploader = get_uploader(chip_id)
+        if uploader is not None:
+            # Measure the layout the uploader's build generates
+            config = uploader.generator_config(config)
+        return BudgetEstimator().estimate(pattern, chip_id, config)
+    
     def verify_upload(
         self,
         chip_id: str,
@@ -396,3 +460,39 @@ class FlashService:
         uploader = get_uploader(chip_id)
         return uploader is not None
 
+    
+    def create_build_manifest(
+        self,
+        pattern: Pattern,
+        chip_id: str,
+        build_result: BuildResult
+    ):
+        """
+        Create a build manifest for built firmware.
+        
+        The manifest includes the firmware hash and the build cache report
+        (whether this build was a cache hit, overall hit rate, time saved).
+        
+        Args:
+            pattern: Pattern the firmware was built from
+            chip_id: Chip identifier
+            build_result: Result returned by build_firmware
+        
+        Returns:
+            BuildManifest
+        """
+        from core.export.build_manifest import generate_build_manifest
+        
+        firmware_bytes = None
+        firmware_path = Path(build_result.firmware_path)
+        if firmware_path.is_file():
+            firmware_bytes = firmware_path.read_bytes()
+        
+        return generate_build_manifest(
+            pattern=pattern,
+            export_format=build_result.binary_type,
+            device_profiles=[chip_id],
+            firmware_bytes=firmware_bytes,
+            build_result=build_result,
+            build_cache_stats=get_build_cache().stats.to_dict()
+        )
@@ -0,0 +1,502 @@
+"""
+Frame Streamer - Real-time frame streaming to WiFi LED devices over UDP.
+
+Pushes rendered frames to devices as they are produced instead of uploading
+a whole pattern. Two standard LED streaming protocols are supported:
+
+- DDP (Distributed Display Protocol, port 4048): one logical pixel buffer,
+  fragmented into packets by byte offset, last packet flagged "push".
+- E1.31 / sACN (port 5568): DMX universes of up to 510 RGB channels
+  (170 pixels), so large matrices span consecutive universes.
+"""
+
+from __future__ import annotations
+
+import time
+import math
+import socket
+import struct
+import logging
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+Color = Tuple[int, int, int]
+FrameSource = Callable[[int], Optional[Sequence[Color]]]
+
+
+class StreamProtocol(Enum):
+    """UDP LED streaming protocol."""
+    DDP = "ddp"
+    E131 = "e131"
+
+
+DDP_PORT = 4048
+DDP_HEADER_LEN = 10
+DDP_MAX_DATA = 1440  # 480 RGB pixels, fits a standard 1500-byte MTU
+DDP_FLAG_VER1 = 0x40
+DDP_FLAG_PUSH = 0x01
+DDP_TYPE_RGB24 = 0x0B
+DDP_ID_DISPLAY = 1
+
+E131_PORT = 5568
+E131_HEADER_LEN = 126
+E131_PIXELS_PER_UNIVERSE = 170
+E131_ACN_ID = b"ASC-E1.17\x00\x00\x00"
+
+
+def pixels_to_bytes(pixels: Sequence[Color], color_order: str = "RGB") -> bytes:
+    """Pack pixels into a contiguous byte buffer in the given channel order."""
+    if color_order == "RGB":
+        return bytes(c for px in pixels for c in px)
+    order = ["RGB".index(ch) for ch in color_order.upper()]
+    return bytes(px[i] for px in pixels for i in order)
+
+
+def build_ddp_packets(data: bytes, sequence: int = 1, max_data: int = DDP_MAX_DATA) -> List[bytes]:
+    """
+    Fragment a frame buffer into DDP packets.
+
+    Args:
+        data: Frame bytes (3 bytes per pixel)
+        sequence: Sequence number (1-15, 0 disables sequencing)
+        max_data: Maximum payload per packet (multiple of 3)
+
+    Returns:
+        List of packets; the last one carries the PUSH flag
+    """
+    packets = []
+    total = len(data)
+    offset = 0
+    while True:
+        chunk = data[offset:offset + max_data]
+        last = offset + len(chunk) >= total
+        flags = DDP_FLAG_VER1 | (DDP_FLAG_PUSH if last else 0)
+        header = struct.pack(
+            "!BBBBIH", flags, sequence & 0x0F, DDP_TYPE_RGB24, DDP_ID_DISPLAY, offset, len(chunk)
+        )
+        packets.append(header + chunk)
+        offset += len(chunk)
+        if last:
+            return packets
+
+
+def parse_ddp_packet(packet: bytes) -> Tuple[int, bytes, bool]:
+    """Parse a DDP packet into (offset, payload, push)."""
+    if len(packet) < DDP_HEADER_LEN:
+        raise ValueError("DDP packet too short")
+    flags, _seq, _dtype, _dest, offset, length = struct.unpack("!BBBBIH", packet[:DDP_HEADER_LEN])
+    if flags & 0xC0 != DDP_FLAG_VER1:
+        raise ValueError("Unsupported DDP version")
+    payload = packet[DDP_HEADER_LEN:DDP_HEADER_LEN + length]
+    return offset, payload, bool(flags & DDP_FLAG_PUSH)
+
+
+def build_e131_packet(
+    universe: int,
+    channels: bytes,
+    sequence: int,
+    cid: bytes,
+    source_name: str = "Upload Bridge",
+    priority: int = 100
+) -> bytes:
+    """Build one E1.31 data packet carrying up to 512 DMX channels."""
+    channels = channels[:512]
+    total = E131_HEADER_LEN + len(channels)
+    name = source_name.encode("utf-8")[:63].ljust(64, b"\x00")
+
+    root = struct.pack("!HH12sHI16s", 0x0010, 0x0000, E131_ACN_ID,
+                       0x7000 | (total - 16), 0x00000004, cid)
+    framing = struct.pack("!HI64sBHBBH", 0x7000 | (total - 38), 0x00000002, name,
+                          priority, 0, sequence & 0xFF, 0, universe)
+    dmp = struct.pack("!HBBHHHB", 0x7000 | (total - 115), 0x02, 0xA1, 0x0000, 0x0001,
+                      len(channels) + 1, 0x00)
+    return root + framing + dmp + channels
+
+
+def parse_e131_packet(packet: bytes) -> Tuple[int, bytes]:
+    """Parse an E1.31 data packet into (universe, channels)."""
+    if len(packet) < E131_HEADER_LEN or packet[4:16] != E131_ACN_ID:
+        raise ValueError("Not an E1.31 packet")
+    universe = struct.unpack("!H", packet[113:115])[0]
+    count = struct.unpack("!H", packet[123:125])[0] - 1
+    return universe, packet[E131_HEADER_LEN:E131_HEADER_LEN + count]
+
+
+def build_e131_packets(
+    data: bytes,
+    start_universe: int,
+    sequence: int,
+    cid: bytes,
+    pixels_per_universe: int = E131_PIXELS_PER_UNIVERSE
+) -> List[bytes]:
+    """Map a frame buffer onto consecutive universes, one packet each."""
+    step = pixels_per_universe * 3
+    universes = max(1, math.ceil(len(data) / step))
+    return [
+        build_e131_packet(start_universe + i, data[i * step:(i + 1) * step], sequence, cid)
+        for i in range(universes)
+    ]
+
+
+@dataclass
+class StreamTarget:
+    """A device receiving a slice of the streamed frame."""
+    host: str
+    port: Optional[int] = None  # Defaults to the protocol's standard port
+    protocol: StreamProtocol = StreamProtocol.DDP
+    led_offset: int = 0  # First frame pixel sent to this device
+    led_count: Optional[int] = None  # None = rest of the frame
+    start_universe: int = 1  # E1.31 only
+    color_order: str = "RGB"
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Socket address."""
+        if self.port is not None:
+            return (self.host, self.port)
+        return (self.host, DDP_PORT if self.protocol == StreamProtocol.DDP else E131_PORT)
+
+    @classmethod
+    def for_device(cls, device, **kwargs) -> "StreamTarget":
+        """Build a target from a DeviceManager BudurasmalaDevice."""
+        return cls(host=device.ip_address, **kwargs)
+
+
+@dataclass
+class StreamStats:
+    """Throughput and timing statistics for a streaming session."""
+    frames_sent: int = 0
+    frames_dropped: int = 0
+    packets_sent: int = 0
+    bytes_sent: int = 0
+    send_errors: int = 0
+    started_at: Optional[float] = None
+    last_frame_at: Optional[float] = None
+    intervals: List[float] = field(default_factory=list)
+    max_samples: int = 1000
+
+    def record_frame(self, now: float, packets: int, size: int) -> None:
+        """Record a sent frame."""
+        if self.last_frame_at is not None:
+            self.intervals.append(now - self.last_frame_at)
+            if len(self.intervals) > self.max_samples:
+                del self.intervals[0]
+        if self.started_at is None:
+            self.started_at = now
+        self.last_frame_at = now
+        self.frames_sent += 1
+        self.packets_sent += packets
+        self.bytes_sent += size
+
+    @property
+    def elapsed_s(self) -> float:
+        """Time between the first and last frame."""
+        if self.started_at is None or self.last_frame_at is None:
+            return 0.0
+        return self.last_frame_at - self.started_at
+
+    @property
+    def achieved_fps(self) -> float:
+        """Mean frame rate over recent frames."""
+        if not self.intervals:
+            return 0.0
+        mean = sum(self.intervals) / len(self.intervals)
+        return 1.0 / mean if mean > 0 else 0.0
+
+    @property
+    def jitter_ms(self) -> float:
+        """Standard deviation of the inter-frame interval."""
+        n = len(self.intervals)
+        if n < 2:
+            return 0.0
+        mean = sum(self.intervals) / n
+        var = sum((x - mean) ** 2 for x in self.intervals) / n
+        return math.sqrt(var) * 1000.0
+
+    @property
+    def throughput_kbps(self) -> float:
+        """Payload throughput in kilobits per second."""
+        elapsed = self.elapsed_s
+        return (self.bytes_sent * 8 / 1000.0) / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Snapshot for display/logging."""
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "packets_sent": self.packets_sent,
+            "bytes_sent": self.bytes_sent,
+            "send_errors": self.send_errors,
+            "achieved_fps": round(self.achieved_fps, 2),
+            "jitter_ms": round(self.jitter_ms, 3),
+            "throughput_kbps": round(self.throughput_kbps, 1),
+        }
+
+
+def layer_manager_source(layer_manager, loop: bool = True) -> FrameSource:
+    """Frame source rendering frames from a LayerManager."""
+    def _source(index: int) -> Optional[Sequence[Color]]:
+        count = layer_manager.frame_count()
+        if count <= 0:
+            return None
+        if index >= count and not loop:
+            return None
+        return layer_manager.render_frame(index % count)
+    return _source
+
+
+def audio_reactive_source(generator, visualization_mode: str = "frequency_bars") -> FrameSource:
+    """
+    Frame source reading live audio from an AudioReactiveGenerator.
+
+    The generator must already be capturing (``start_capture``).
+    """
+    blank = [(0, 0, 0)] * generator.led_count
+
+    def _source(index: int) -> Optional[Sequence[Color]]:
+        audio_data = generator.read_audio_chunk()
+        if audio_data is None:
+            return blank
+        analysis = generator.analyze_audio(audio_data)
+        return generator.generate_frame_pixels(analysis, visualization_mode)
+    return _source
+
+
+class FrameStreamer:
+    """
+    Streams frames to one or more devices at a fixed frame rate.
+
+    Frames are paced against a monotonic clock: each frame has a deadline
+    ``start + n / fps``. When rendering or sending falls more than one frame
+    behind, late frames are skipped (counted as dropped) rather than letting
+    the stream drift.
+    """
+
+    def __init__(self, targets: List[StreamTarget], fps: float = 30.0, source_name: str = "Upload Bridge"):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.targets = list(targets)
+        self.fps = fps
+        self.source_name = source_name
+        self.stats = StreamStats()
+        self._cid = uuid.uuid4().bytes
+        self._sequence = 0
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def _socket(self) -> socket.socket:
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        return self._sock
+
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def packets_for_target(self, target: StreamTarget, pixels: Sequence[Color], sequence: int) -> List[bytes]:
+        """Encode the target's slice of a frame into protocol packets."""
+        end = None if target.led_count is None else target.led_offset + target.led_count
+        data = pixels_to_bytes(pixels[target.led_offset:end], target.color_order)
+        if target.protocol == StreamProtocol.DDP:
+            return build_ddp_packets(data, sequence=(sequence - 1) % 15 + 1)
+        return build_e131_packets(data, target.start_universe, sequence, self._cid)
+
+    def send_frame(self, pixels: Sequence[Color]) -> int:
+        """
+        Send one frame to all targets immediately.
+
+        Returns:
+            Number of packets sent
+        """
+        sock = self._socket()
+        sequence = self._next_sequence()
+        sent = 0
+        size = 0
+        for target in self.targets:
+            for packet in self.packets_for_target(target, pixels, sequence):
+                try:
+                    sock.sendto(packet, target.address)
+                    sent += 1
+                    size += len(packet)
+                except OSError as e:
+                    self.stats.send_errors += 1
+                    logger.debug(f"Stream send to {target.host} failed: {e}")
+        self.stats.record_frame(time.monotonic(), sent, size)
+        return sent
+
+    def stream(self, source: FrameSource, max_frames: Optional[int] = None) -> StreamStats:
+        """
+        Stream frames from ``source`` until it returns None, ``max_frames``
+        have been scheduled, or ``stop()`` is called. Blocks the caller.
+        """
+        period = 1.0 / self.fps
+        self._running = True
+        start = time.monotonic()
+        index = 0
+
+        while self._running and (max_frames is None or index < max_frames):
+            deadline = start + index * period
+            now = time.monotonic()
+            if now < deadline:
+                time.sleep(deadline - now)
+            elif now - deadline >= period:
+                # More than a frame late: skip ahead to the current slot
+                skipped = int((now - deadline) / period)
+                if max_frames is not None:
+                    skipped = min(skipped, max_frames - index)
+                self.stats.frames_dropped += skipped
+                index += skipped
+                continue
+
+            pixels = source(index)
+            if pixels is None:
+                break
+            self.send_frame(pixels)
+            index += 1
+
+        self._running = False
+        return self.stats
+
+    def start(self, source: FrameSource, max_frames: Optional[int] = None) -> None:
+        """Stream in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self.stream, args=(source, max_frames), daemon=True)
+        self._thread.start()
+        logger.info(f"Frame streaming started to {len(self.targets)} target(s) at {self.fps} FPS")
+
+    def stop(self) -> None:
+        """Stop streaming and release the socket."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+        logger.info(f"Frame streaming stopped: {self.stats.to_dict()}")
+
+    def is_streaming(self) -> bool:
+        """True while the background stream is running."""
+        return self._running
+
+
+class LoopbackReceiver:
+    """
+    UDP receiver that reassembles streamed frames, for tests and debugging.
+
+    Decodes DDP (frame complete on PUSH) or E1.31 (frame complete when the
+    last expected universe arrives).
+    """
+
+    def __init__(
+        self,
+        protocol: StreamProtocol = StreamProtocol.DDP,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        led_count: Optional[int] = None,
+        start_universe: int = 1
+    ):
+        self.protocol = protocol
+        self.led_count = led_count
+        self.start_universe = start_universe
+        self.frames: List[bytes] = []
+        self.packets_received = 0
+        self._buffer = bytearray()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+        self._sock.settimeout(0.1)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._frame_event = threading.Event()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound socket address."""
+        return self._sock.getsockname()
+
+    def target(self, **kwargs) -> StreamTarget:
+        """Stream target pointing at this receiver."""
+        host, port = self.address
+        return StreamTarget(host=host, port=port, protocol=self.protocol,
+                            start_universe=self.start_universe, **kwargs)
+
+    def start(self) -> None:
+        """Start receiving in a background thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop receiving and close the socket."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._sock.close()
+
+    def wait_for_frames(self, count: int, timeout: float = 2.0) -> bool:
+        """Block until ``count`` frames have been reassembled."""
+        deadline = time.monotonic() + timeout
+        while len(self.frames) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._frame_event.wait(remaining)
+            self._frame_event.clear()
+        return True
+
+    def frame_pixels(self, index: int) -> List[Color]:
+        """Decode a received frame back into RGB tuples."""
+        data = self.frames[index]
+        return [tuple(data[i:i + 3]) for i in range(0, len(data) - 2, 3)]
+
+    def _loop(self) -> None:
+        while self._running:
+            try:
+                packet, _ = self._sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.packets_received += 1
+            try:
+                self._handle(packet)
+            except ValueError as e:
+                logger.debug(f"Loopback receiver dropped packet: {e}")
+
+    def _complete(self, size: int) -> None:
+        self.frames.append(bytes(self._buffer[:size]))
+        self._frame_event.set()
+
+    def _handle(self, packet: bytes) -> None:
+        if self.protocol == StreamProtocol.DDP:
+            offset, payload, push = parse_ddp_packet(packet)
+            end = offset + len(payload)
+            if len(self._buffer) < end:
+                self._buffer.extend(b"\x00" * (end - len(self._buffer)))
+            self._buffer[offset:end] = payload
+            if push:
+                self._complete(end)
+            return
+
+        universe, channels = parse_e131_packet(packet)
+        index = universe - self.start_universe
+        if index < 0:
+            return
+        step = E131_PIXELS_PER_UNIVERSE * 3
+        offset = index * step
+        end = offset + len(channels)
+        if len(self._buffer) < end:
+            self._buffer.extend(b"\x00" * (end - len(self._buffer)))
+        self._buffer[offset:end] = channels
+        expected = (self.led_count or 0) * 3
+        last_universe = max(0, math.ceil(expected / step) - 1)
+        if index >= last_universe:
+            self._complete(max(end, expected))
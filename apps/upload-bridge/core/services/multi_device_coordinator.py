@@ -9,8 +9,9 @@ from __future__ import annotations
 import time
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -33,6 +34,78 @@ class DeviceGroup:
     sync_mode: SyncMode = SyncMode.MASTER_SLAVE
     master_device_id: Optional[str] = None
     sync_tolerance_ms: int = 50  # Maximum sync tolerance in milliseconds
+    cascade_delay_ms: int = 100  # Delay between devices in cascade mode
+
+
+@dataclass
+class ClockEstimate:
+    """
+    NTP-style estimate of a device clock relative to the local clock.
+    
+    ``offset_s`` is added to a local timestamp to get the device timestamp.
+    It is taken from the round-trip with the smallest RTT, whose error is
+    bounded by half that RTT.
+    """
+    device_id: str
+    offset_s: float = 0.0
+    rtt_s: float = 0.0  # RTT of the sample the offset was taken from
+    max_rtt_s: float = 0.0  # Worst RTT observed while sampling
+    samples: int = 0
+    
+    @property
+    def valid(self) -> bool:
+        """True if at least one round-trip succeeded."""
+        return self.samples > 0
+    
+    @property
+    def uncertainty_s(self) -> float:
+        """Upper bound on the offset error."""
+        return self.rtt_s / 2.0
+    
+    def to_device_time(self, local_time: float) -> float:
+        """Convert a local timestamp to the device clock."""
+        return local_time + self.offset_s
+    
+    def to_local_time(self, device_time: float) -> float:
+        """Convert a device timestamp to the local clock."""
+        return device_time - self.offset_s
+
+
+@dataclass
+class SyncReport:
+    """Outcome of a synchronized start."""
+    group_id: str
+    sync_mode: SyncMode
+    start_time: float  # Local clock
+    device_start_times: Dict[str, float] = field(default_factory=dict)  # Device clocks
+    estimates: Dict[str, ClockEstimate] = field(default_factory=dict)
+    uploaded: Dict[str, bool] = field(default_factory=dict)
+    commanded: Dict[str, bool] = field(default_factory=dict)
+    lead_time_s: float = 0.0
+    measured_skew_ms: Optional[float] = None
+    
+    @property
+    def success(self) -> bool:
+        """True if every device received the pattern and its start command."""
+        return (
+            bool(self.commanded)
+            and all(self.uploaded.get(d, False) for d in self.commanded)
+            and all(self.commanded.values())
+        )
+    
+    @property
+    def expected_skew_ms(self) -> float:
+        """
+        Worst-case skew implied by the clock estimates.
+        
+        Two devices can disagree by at most the sum of their offset
+        uncertainties, so the bound is the sum of the two largest.
+        """
+        bounds = sorted(
+            (e.uncertainty_s for e in self.estimates.values()),
+            reverse=True
+        )
+        return sum(bounds[:2]) * 1000.0
 
 
 class MultiDeviceCoordinator:
@@ -58,6 +131,13 @@ class MultiDeviceCoordinator:
         self.groups: Dict[str, DeviceGroup] = {}
         self.sync_thread: Optional[threading.Thread] = None
         self.sync_active = False
+        self.clock_estimates: Dict[str, ClockEstimate] = {}
+        self.sync_reports: Dict[str, SyncReport] = {}
+        
+        # Clock sync tuning
+        self.clock_sync_rounds = 8
+        self.min_lead_time_s = 0.05
+        self.rtt_safety_factor = 2.0
     
     def create_group(
         self,
@@ -141,42 +221,191 @@ class MultiDeviceCoordinator:
         
         return False
     
-    def _play_master_slave(
+    def estimate_clock_offset(self, device_id: str, rounds: Optional[int] = None) -> ClockEstimate:
+        """
+        Estimate a device's clock offset from several round-trips.
+        
+        Each round records local send/receive times around a device clock
+        read and assumes the device read happened at the midpoint. The
+        sample with the minimum RTT is kept since queueing delay only ever
+        adds to the RTT.
+        
+        Args:
+            device_id: Device ID
+            rounds: Number of round-trips (defaults to ``clock_sync_rounds``)
+            
+        Returns:
+            ClockEstimate (``samples == 0`` if the device clock is unreachable)
+        """
+        rounds = rounds or self.clock_sync_rounds
+        estimate = ClockEstimate(device_id=device_id)
+        best_rtt: Optional[float] = None
+        
+        for _ in range(rounds):
+            t0 = time.time()
+            device_time = self.device_manager.get_device_time(device_id)
+            t3 = time.time()
+            if device_time is None:
+                continue
+            
+            rtt = t3 - t0
+            estimate.samples += 1
+            estimate.max_rtt_s = max(estimate.max_rtt_s, rtt)
+            if best_rtt is None or rtt < best_rtt:
+                best_rtt = rtt
+                estimate.rtt_s = rtt
+                estimate.offset_s = device_time - (t0 + t3) / 2.0
+        
+        if not estimate.valid:
+            logger.warning(f"Clock sync failed for {device_id}; assuming zero offset")
+        
+        self.clock_estimates[device_id] = estimate
+        return estimate
+    
+    def estimate_group_offsets(self, group: DeviceGroup) -> Dict[str, ClockEstimate]:
+        """Estimate clock offsets for all devices in a group in parallel."""
+        if not group.device_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(group.device_ids)) as pool:
+            results = pool.map(self.estimate_clock_offset, group.device_ids)
+            return dict(zip(group.device_ids, results))
+    
+    def get_sync_report(self, group_id: str) -> Optional[SyncReport]:
+        """Get the report of the last synchronized start for a group."""
+        return self.sync_reports.get(group_id)
+    
+    def measure_achieved_skew(self, group_id: str) -> Optional[float]:
+        """
+        Measure the skew of the last synchronized start.
+        
+        Queries each device for the device-clock time playback actually
+        started, maps it to the local clock, removes the intended per-device
+        delay (cascade mode) and returns the spread in milliseconds.
+        
+        Returns:
+            Skew in milliseconds, or None if fewer than two devices reported
+        """
+        report = self.sync_reports.get(group_id)
+        if not report:
+            return None
+        
+        errors = []
+        for device_id, scheduled in report.device_start_times.items():
+            started_at = self.device_manager.get_playback_start(device_id)
+            if started_at is None:
+                continue
+            errors.append(started_at - scheduled)
+        
+        if len(errors) < 2:
+            return None
+        
+        report.measured_skew_ms = (max(errors) - min(errors)) * 1000.0
+        return report.measured_skew_ms
+    
+    def _stage_uploads(
         self,
         group: DeviceGroup,
         pattern_data: bytes,
         pattern_name: str
-    ) -> bool:
-        """Play in master-slave mode."""
-        # Upload pattern to all devices first
-        for device_id in group.device_ids:
-            # Upload but don't play yet
+    ) -> Dict[str, bool]:
+        """Upload pattern to all devices in parallel without starting playback."""
+        def _upload(device_id: str) -> bool:
             try:
-                url = f"http://{self.device_manager.get_device(device_id).ip_address}/api/upload"
-                # Upload pattern (simplified - would use actual device manager method)
-                pass
+                return bool(self.device_manager.upload_pattern(device_id, pattern_data, pattern_name))
             except Exception as e:
                 logger.error(f"Failed to upload to {device_id}: {e}")
                 return False
         
-        # Master device plays first, then commands slaves
-        if group.master_device_id:
-            master = self.device_manager.get_device(group.master_device_id)
-            if master:
-                # Play on master
-                self.device_manager.play_pattern(group.master_device_id, pattern_data, pattern_name)
-                
-                # Send sync command to slaves
-                from core.services.device_manager import DeviceCommand
-                for device_id in group.device_ids:
-                    if device_id != group.master_device_id:
-                        cmd = DeviceCommand("sync_play", {
-                            "master_id": group.master_device_id,
-                            "pattern": pattern_name
-                        })
-                        self.device_manager.send_command(device_id, cmd)
-        
-        return True
+        if not group.device_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(group.device_ids)) as pool:
+            return dict(zip(group.device_ids, pool.map(_upload, group.device_ids)))
+    
+    def _prepare_start(
+        self,
+        group: DeviceGroup,
+        pattern_data: bytes,
+        pattern_name: str
+    ) -> Optional[SyncReport]:
+        """
+        Stage uploads, measure clocks and pick a common local start time.
+        
+        The start time leaves room for the slowest device to receive its
+        command: ``rtt_safety_factor`` times the worst RTT seen during clock
+        sampling, but never less than ``min_lead_time_s``.
+        """
+        uploaded = self._stage_uploads(group, pattern_data, pattern_name)
+        failed = [d for d, ok in uploaded.items() if not ok]
+        if failed:
+            logger.error(f"Upload failed for {', '.join(failed)}; not starting group '{group.name}'")
+            return None
+        
+        estimates = self.estimate_group_offsets(group)
+        worst_rtt = max((e.max_rtt_s for e in estimates.values()), default=0.0)
+        lead = max(self.min_lead_time_s, self.rtt_safety_factor * worst_rtt)
+        
+        return SyncReport(
+            group_id=group.group_id,
+            sync_mode=group.sync_mode,
+            start_time=time.time() + lead,
+            estimates=estimates,
+            uploaded=uploaded,
+            lead_time_s=lead
+        )
+    
+    def _dispatch(self, report: SyncReport, commands: Dict[str, "DeviceCommand"]) -> bool:
+        """Send start commands to all devices in parallel."""
+        def _send(item) -> bool:
+            device_id, cmd = item
+            try:
+                return bool(self.device_manager.send_command(device_id, cmd))
+            except Exception as e:
+                logger.error(f"Failed to command {device_id}: {e}")
+                return False
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(commands))) as pool:
+            results = pool.map(_send, commands.items())
+            report.commanded = dict(zip(commands.keys(), results))
+        
+        self.sync_reports[report.group_id] = report
+        logger.info(
+            f"Synchronized start for group '{report.group_id}' "
+            f"(lead {report.lead_time_s * 1000:.1f} ms, "
+            f"expected skew <= {report.expected_skew_ms:.1f} ms)"
+        )
+        return report.success
+    
+    def _play_master_slave(
+        self,
+        group: DeviceGroup,
+        pattern_data: bytes,
+        pattern_name: str
+    ) -> bool:
+        """Play in master-slave mode."""
+        from core.services.device_manager import DeviceCommand
+        
+        report = self._prepare_start(group, pattern_data, pattern_name)
+        if not report:
+            return False
+        
+        # Master starts at the common time, slaves follow the master's schedule
+        commands = {}
+        for device_id in group.device_ids:
+            device_time = report.estimates[device_id].to_device_time(report.start_time)
+            report.device_start_times[device_id] = device_time
+            if device_id == group.master_device_id:
+                commands[device_id] = DeviceCommand("play_at", {
+                    "pattern": pattern_name,
+                    "sync_time": device_time
+                })
+            else:
+                commands[device_id] = DeviceCommand("sync_play", {
+                    "master_id": group.master_device_id,
+                    "pattern": pattern_name,
+                    "sync_time": device_time
+                })
+        
+        return self._dispatch(report, commands)
     
     def _play_peer_to_peer(
         self,
@@ -185,21 +414,23 @@ class MultiDeviceCoordinator:
         pattern_name: str
     ) -> bool:
         """Play in peer-to-peer mode (all devices sync to common clock)."""
-        # Calculate sync time (current time + small delay for coordination)
-        sync_time = time.time() + 0.1  # 100ms delay
+        from core.services.device_manager import DeviceCommand
+        
+        report = self._prepare_start(group, pattern_data, pattern_name)
+        if not report:
+            return False
         
-        # Upload and schedule play on all devices
+        # Same local instant, expressed in each device's own clock
+        commands = {}
         for device_id in group.device_ids:
-            # Upload pattern
-            # Schedule play at sync_time
-            from core.services.device_manager import DeviceCommand
-            cmd = DeviceCommand("play_at", {
+            device_time = report.estimates[device_id].to_device_time(report.start_time)
+            report.device_start_times[device_id] = device_time
+            commands[device_id] = DeviceCommand("play_at", {
                 "pattern": pattern_name,
-                "sync_time": sync_time
+                "sync_time": device_time
             })
-            self.device_manager.send_command(device_id, cmd)
         
-        return True
+        return self._dispatch(report, commands)
     
     def _play_cascade(
         self,
@@ -208,20 +439,26 @@ class MultiDeviceCoordinator:
         pattern_name: str
     ) -> bool:
         """Play in cascade mode (effects flow from one device to next)."""
-        cascade_delay = 0.1  # 100ms delay between devices
+        from core.services.device_manager import DeviceCommand
+        
+        report = self._prepare_start(group, pattern_data, pattern_name)
+        if not report:
+            return False
         
+        cascade_delay = group.cascade_delay_ms / 1000.0
+        
+        # Absolute start times, so network delay doesn't accumulate down the chain
+        commands = {}
         for i, device_id in enumerate(group.device_ids):
-            delay = i * cascade_delay
-            
-            # Schedule play with delay
-            from core.services.device_manager import DeviceCommand
-            cmd = DeviceCommand("play_delayed", {
+            local_start = report.start_time + i * cascade_delay
+            device_time = report.estimates[device_id].to_device_time(local_start)
+            report.device_start_times[device_id] = device_time
+            commands[device_id] = DeviceCommand("play_at", {
                 "pattern": pattern_name,
-                "delay": delay
+                "sync_time": device_time
             })
-            self.device_manager.send_command(device_id, cmd)
         
-        return True
+        return self._dispatch(report, commands)
     
     def pause_all(self, group_id: str) -> bool:
         """Pause all devices in group."""
@@ -44,7 +44,8 @@ class PatternService:
     
     def __init__(self):
         """Initialize the pattern service."""
-        self.parser_registry = ParserRegistry()
+        from core.detection_cache import get_detection_cache
+        self.parser_registry = ParserRegistry(detection_cache=get_detection_cache())
         self.repository = PatternRepository.instance()
         self.event_bus = get_event_bus()
         self.template_library = TemplateLibrary()
@@ -0,0 +1,160 @@
+"""
+Simulated Devices - Local stand-ins for networked Budurasmala devices.
+
+Provides a DeviceManager-compatible harness with per-device clock offsets and
+injected network latency, used to exercise multi-device synchronization
+without hardware.
+"""
+
+from __future__ import annotations
+
+import time
+import random
+import threading
+import logging
+from typing import Optional, Dict, List
+from dataclasses import dataclass, field
+
+from core.services.device_manager import BudurasmalaDevice, DeviceCommand, DeviceStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SimulatedDevice:
+    """A simulated device with its own clock and network path."""
+    device_id: str
+    clock_offset_s: float = 0.0  # Device clock minus local clock
+    latency_s: float = 0.005  # One-way network delay
+    jitter_s: float = 0.0  # Extra random one-way delay, uniform in [0, jitter_s]
+    upload_time_s: float = 0.0  # Time to accept a pattern upload
+    patterns: Dict[str, bytes] = field(default_factory=dict)
+    commands: List[DeviceCommand] = field(default_factory=list)
+    started_at: Optional[float] = None  # Device clock
+
+    def device_time(self) -> float:
+        """Current time on the device clock."""
+        return time.time() + self.clock_offset_s
+
+    def true_start_local(self) -> Optional[float]:
+        """Actual playback start on the local clock (ground truth)."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.clock_offset_s
+
+
+class SimulatedDeviceManager:
+    """
+    Drop-in replacement for DeviceManager backed by simulated devices.
+
+    Every request sleeps for the device's one-way latency (plus jitter) in
+    each direction, so timing-sensitive code sees realistic round-trips.
+    Devices start playback at the requested ``sync_time`` or, if the command
+    arrives late, at the moment it arrives.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.devices: Dict[str, SimulatedDevice] = {}
+        self._records: Dict[str, BudurasmalaDevice] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def add_simulated_device(self, device: SimulatedDevice) -> None:
+        """Register a simulated device."""
+        self.devices[device.device_id] = device
+        self._records[device.device_id] = BudurasmalaDevice(
+            device_id=device.device_id,
+            name=f"Simulated {device.device_id}",
+            ip_address="127.0.0.1",
+            status=DeviceStatus.ONLINE
+        )
+
+    def true_skew_ms(self, device_ids: Optional[List[str]] = None) -> Optional[float]:
+        """Spread of actual start times on the local clock (ground truth)."""
+        ids = device_ids or list(self.devices)
+        starts = [self.devices[d].true_start_local() for d in ids]
+        starts = [s for s in starts if s is not None]
+        if len(starts) < 2:
+            return None
+        return (max(starts) - min(starts)) * 1000.0
+
+    def _delay(self, device: SimulatedDevice) -> None:
+        with self._lock:
+            jitter = self._rng.uniform(0.0, device.jitter_s) if device.jitter_s else 0.0
+        time.sleep(device.latency_s + jitter)
+
+    # DeviceManager interface
+
+    def get_device(self, device_id: str) -> Optional[BudurasmalaDevice]:
+        """Get device by ID."""
+        return self._records.get(device_id)
+
+    def list_devices(self) -> List[BudurasmalaDevice]:
+        """List all devices."""
+        return list(self._records.values())
+
+    def get_device_time(self, device_id: str, timeout: float = 1.0) -> Optional[float]:
+        """Read the device clock after a simulated round-trip."""
+        device = self.devices.get(device_id)
+        if not device:
+            return None
+        self._delay(device)
+        device_time = device.device_time()
+        self._delay(device)
+        return device_time
+
+    def upload_pattern(self, device_id: str, pattern_data: bytes, pattern_name: str = "Pattern") -> bool:
+        """Simulate a pattern upload."""
+        device = self.devices.get(device_id)
+        if not device:
+            return False
+        self._delay(device)
+        time.sleep(device.upload_time_s)
+        device.patterns[pattern_name] = pattern_data
+        self._delay(device)
+        return True
+
+    def send_command(self, device_id: str, command: DeviceCommand) -> bool:
+        """Deliver a command after the one-way delay and apply it."""
+        device = self.devices.get(device_id)
+        if not device:
+            return False
+        self._delay(device)
+        arrived = device.device_time()
+        device.commands.append(command)
+
+        if command.command in ("play", "play_at", "sync_play"):
+            sync_time = command.parameters.get("sync_time", arrived)
+            device.started_at = max(sync_time, arrived)
+            self._records[device_id].status = DeviceStatus.PLAYING
+        elif command.command == "pause":
+            self._records[device_id].status = DeviceStatus.PAUSED
+        elif command.command == "stop":
+            device.started_at = None
+            self._records[device_id].status = DeviceStatus.STOPPED
+
+        self._delay(device)
+        return True
+
+    def play_pattern(self, device_id: str, pattern_data: bytes, pattern_name: str = "Pattern") -> bool:
+        """Upload and immediately play."""
+        if not self.upload_pattern(device_id, pattern_data, pattern_name):
+            return False
+        return self.send_command(device_id, DeviceCommand("play", {"pattern": pattern_name}))
+
+    def get_playback_start(self, device_id: str) -> Optional[float]:
+        """Device-clock time at which playback started."""
+        device = self.devices.get(device_id)
+        return device.started_at if device else None
+
+    def pause_device(self, device_id: str) -> bool:
+        """Pause playback."""
+        return self.send_command(device_id, DeviceCommand("pause"))
+
+    def stop_device(self, device_id: str) -> bool:
+        """Stop playback."""
+        return self.send_command(device_id, DeviceCommand("stop"))
+
+    def set_brightness(self, device_id: str, brightness: int) -> bool:
+        """Set brightness."""
+        return self.send_command(device_id, DeviceCommand("set_brightness", {"brightness": brightness}))
@@ -0,0 +1,466 @@
+"""
+Template Kernels - Array implementations of the procedural pattern templates
+
+Each kernel yields one ``(width * height, 3)`` int64 array per frame and
+reproduces the per-pixel reference loops in ``core.pattern_templates``
+exactly: the same float expressions are evaluated in the same order, drawing
+order is kept wherever later points overwrite earlier ones, and templates
+seeded with ``random.seed(42)`` draw from the ``random`` module in the same
+sequence.
+
+Trigonometry is evaluated with ``math`` on the (small) set of distinct
+angles rather than with ``np.sin``/``np.cos``, whose SIMD implementations may
+differ from libm in the last bit and move a point across a pixel boundary.
+Per-pixel work (distances, colour ramps, blending) is done on coordinate
+grids.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import sys
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+RGB = Tuple[int, int, int]
+
+# CPython's tuple hash (xxHash-derived, Objects/tupleobject.c)
+_XXPRIME_1 = np.uint64(11400714785074694791)
+_XXPRIME_2 = np.uint64(14029467366897019727)
+_XXPRIME_5 = np.uint64(2870177450012600261)
+_XXROTATE = np.uint64(31)
+_XXROTATE_BACK = np.uint64(33)
+
+
+def _cos(angles: np.ndarray) -> np.ndarray:
+    return np.fromiter(map(math.cos, angles.ravel().tolist()), float, angles.size).reshape(angles.shape)
+
+
+def _sin(angles: np.ndarray) -> np.ndarray:
+    return np.fromiter(map(math.sin, angles.ravel().tolist()), float, angles.size).reshape(angles.shape)
+
+
+def _radians(degrees: range) -> np.ndarray:
+    return np.fromiter(map(math.radians, degrees), float, len(degrees))
+
+
+def tuple_hash(*lanes: np.ndarray) -> np.ndarray:
+    """
+    ``hash((a, b, ...))`` of small non-negative ints, element-wise
+
+    Matches CPython 3.8+ on 64-bit builds, where ``hash(n) == n`` for these
+    values; callers check ``TUPLE_HASH_EXACT`` first.
+    """
+    lanes = np.broadcast_arrays(*(np.asarray(lane, dtype=np.uint64) for lane in lanes))
+    acc = np.full(lanes[0].shape, _XXPRIME_5, dtype=np.uint64)
+    for lane in lanes:
+        acc += lane * _XXPRIME_2
+        acc = (acc << _XXROTATE) | (acc >> _XXROTATE_BACK)
+        acc *= _XXPRIME_1
+    acc += np.uint64(len(lanes) ^ (2870177450012600261 ^ 3527539))
+    result = acc.view(np.int64)
+    return np.where(result == -1, 1546275796, result)
+
+
+def _tuple_hash_exact() -> bool:
+    if sys.hash_info.width != 64:
+        return False
+    samples = [(0, 0, 0), (3, 7, 11), (63, 0, 59), (1000, 2, 999)]
+    lanes = [np.array(column) for column in zip(*samples)]
+    return tuple_hash(*lanes).tolist() == [hash(sample) for sample in samples]
+
+
+TUPLE_HASH_EXACT = _tuple_hash_exact()
+
+
+def _blank(width: int, height: int) -> np.ndarray:
+    return np.zeros((width * height, 3), dtype=np.int64)
+
+
+def _plot(canvas: np.ndarray, width: int, height: int, xs: np.ndarray, ys: np.ndarray, colors) -> None:
+    """
+    Write points in drawing order; where points repeat, the last one wins
+
+    ``colors`` is one RGB triple or an array with one row per point.
+    """
+    xs = xs.ravel()
+    ys = ys.ravel()
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    index = (ys * width + xs)[inside]
+    if not index.size:
+        return
+    colors = np.asarray(colors, dtype=np.int64)
+    if colors.ndim == 1:
+        canvas[index] = colors
+        return
+    colors = colors.reshape(-1, 3)[inside]
+    # First occurrence in reverse order is the last write
+    _, first = np.unique(index[::-1], return_index=True)
+    last = index.size - 1 - first
+    canvas[index[last]] = colors[last]
+
+
+def _scale(color: RGB, factor: np.ndarray) -> np.ndarray:
+    """``(int(color[0] * f), int(color[1] * f), int(color[2] * f))`` per factor"""
+    return np.stack([(channel * factor).astype(np.int64) for channel in color], axis=-1)
+
+
+def fire(intensity: float, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    random.seed(42)  # Deterministic
+    ys = np.arange(height)
+    xs = np.arange(width)
+    fire_intensity = (1.0 - (ys / height) * intensity)[:, None]
+    for frame_idx in range(frames):
+        if TUPLE_HASH_EXACT:
+            hashed = tuple_hash(xs[None, :], ys[:, None], frame_idx)
+        else:
+            hashed = np.array([[hash((x, y, frame_idx)) for x in range(width)] for y in range(height)],
+                              dtype=np.int64).reshape(height, width)
+        noise = (hashed % 100) / 100.0
+        r = (255 * fire_intensity * (0.7 + 0.3 * noise)).astype(np.int64)
+        g = (100 * fire_intensity * (0.5 + 0.5 * noise)).astype(np.int64)
+        b = np.broadcast_to((20 * fire_intensity).astype(np.int64), r.shape)
+        yield np.stack([r, g, b], axis=-1).reshape(-1, 3)
+
+
+def rain(drops: int, color: RGB, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    random.seed(42)
+    drop_positions = [(random.randint(0, width - 1), random.randint(-height, 0))
+                      for _ in range(drops)]
+    for _ in range(frames):
+        for i, (x, y) in enumerate(drop_positions):
+            y += 1
+            if y >= height:
+                y = -1
+                x = random.randint(0, width - 1)
+            drop_positions[i] = (x, y)
+        canvas = _blank(width, height)
+        if drop_positions:
+            xs, ys = (np.array(axis) for axis in zip(*drop_positions))
+            _plot(canvas, width, height, xs, ys, color)
+        yield canvas
+
+
+def matrix_rain(columns: int, speed: int, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    random.seed(42)
+    column_data = []
+    for col in range(columns):
+        col_x = (col * width) // columns
+        length = random.randint(5, height)
+        column_data.append({
+            "x": col_x,
+            "y": random.randint(-height, 0),
+            "length": length,
+            "chars": [random.choice("0123456789ABCDEF") for _ in range(length)]
+        })
+
+    for _ in range(frames):
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+        greens: List[np.ndarray] = []
+        for col_info in column_data:
+            offsets = np.arange(len(col_info["chars"]))
+            xs.append(np.full(offsets.size, col_info["x"]))
+            ys.append(col_info["y"] + offsets)
+            greens.append((255 * (1.0 - (offsets / col_info["length"]))).astype(np.int64))
+
+            col_info["y"] += speed
+            if col_info["y"] > height:
+                col_info["y"] = -col_info["length"]
+                col_info["chars"] = [random.choice("0123456789ABCDEF") for _ in range(col_info["length"])]
+
+        canvas = _blank(width, height)
+        if xs:
+            green = np.concatenate(greens)
+            colors = np.zeros((green.size, 3), dtype=np.int64)
+            colors[:, 1] = green
+            _plot(canvas, width, height, np.concatenate(xs), np.concatenate(ys), colors)
+        yield canvas
+
+
+def color_cycle(speed: float, frames: int, hue_start: float, saturation: float, brightness: float,
+                width: int, height: int) -> Iterator[np.ndarray]:
+    # The hue only depends on x + y, so colours are computed once per diagonal
+    diagonal = (np.arange(width)[None, :] + np.arange(height)[:, None]).ravel()
+    position_hue = np.arange(max(width + height - 1, 0)) / (width + height) * 0.3
+    c = brightness * saturation
+    m = brightness - c
+    for frame_idx in range(frames):
+        hue = (hue_start + (frame_idx * speed / frames)) % 1.0
+        h = (hue + position_hue) % 1.0
+        x = c * (1 - np.abs((h * 6) % 2 - 1))
+        sextant = np.select([h < 1 / 6, h < 2 / 6, h < 3 / 6, h < 4 / 6, h < 5 / 6], [0, 1, 2, 3, 4], 5)
+        zero = np.zeros_like(x)
+        full = np.full_like(x, c)
+        # (r, g, b) before adding m for each sextant of the hue circle
+        r = np.choose(sextant, [full, x, zero, zero, x, full])
+        g = np.choose(sextant, [x, full, full, x, zero, zero])
+        b = np.choose(sextant, [zero, zero, x, full, full, x])
+        table = np.stack([((channel + m) * 255).astype(np.int64) for channel in (r, g, b)], axis=-1)
+        yield table[diagonal]
+
+
+def spiral(color: RGB, frames: int, speed: float, thickness: int, width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    radii = np.arange(0, int(max_radius), 1)
+    offsets = np.arange(-thickness, thickness + 1)
+    for frame_idx in range(frames):
+        angle_offset = (frame_idx * speed / frames) * 2 * math.pi
+        angle = (radii / max_radius) * 4 * math.pi + angle_offset
+        x = (center_x + radii * _cos(angle)).astype(np.int64)
+        y = (center_y + radii * _sin(angle)).astype(np.int64)
+        # Thickness square around each point (single colour, so drawing order does not matter)
+        px, py = np.broadcast_arrays(x[:, None, None] + offsets[None, None, :],
+                                     y[:, None, None] + offsets[None, :, None])
+        canvas = _blank(width, height)
+        _plot(canvas, width, height, px, py, color)
+        yield canvas
+
+
+def pulse(color: RGB, frames: int, speed: float, center_x: float, center_y: float,
+          width: int, height: int) -> Iterator[np.ndarray]:
+    cx, cy = int(width * center_x), int(height * center_y)
+    max_radius = min(width, height) / 2
+    dx = np.arange(width)[None, :] - cx
+    dy = np.arange(height)[:, None] - cy
+    dist = np.sqrt(dx * dx + dy * dy).ravel()
+    for frame_idx in range(frames):
+        t = (frame_idx / frames) * 2 * math.pi
+        radius = max_radius * (0.3 + 0.7 * abs(math.sin(t * speed)))
+        gap = np.abs(dist - radius)
+        ring = gap < 2
+        canvas = _blank(width, height)
+        canvas[ring] = _scale(color, 1.0 - gap[ring] / 2.0)
+        yield canvas
+
+
+def fade(color: RGB, frames: int, fade_type: str, width: int, height: int) -> Iterator[np.ndarray]:
+    for frame_idx in range(frames):
+        if fade_type == "in":
+            intensity = frame_idx / frames
+        elif fade_type == "out":
+            intensity = 1.0 - (frame_idx / frames)
+        else:  # in_out
+            if frame_idx < frames / 2:
+                intensity = (frame_idx * 2) / frames
+            else:
+                intensity = 1.0 - ((frame_idx - frames / 2) * 2) / frames
+        fade_color = [int(color[0] * intensity), int(color[1] * intensity), int(color[2] * intensity)]
+        yield np.tile(np.array(fade_color, dtype=np.int64), (width * height, 1))
+
+
+def random_pixels(density: float, frames: int, color: RGB, width: int, height: int) -> Iterator[np.ndarray]:
+    random.seed(42)
+    for _ in range(frames):
+        num_pixels = int(width * height * density)
+        points = [(random.randint(0, width - 1), random.randint(0, height - 1)) for _ in range(num_pixels)]
+        canvas = _blank(width, height)
+        if points:
+            xs, ys = (np.array(axis) for axis in zip(*points))
+            _plot(canvas, width, height, xs, ys, color)
+        yield canvas
+
+
+def ray_rotation(speed: float, color: RGB, ray_count: int, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    radii = np.arange(0, int(max_radius), 2)
+    rays = np.arange(ray_count)
+    # Fade intensity based on distance
+    colors = np.broadcast_to(_scale(color, 1.0 - (radii / max_radius) * 0.5), (ray_count, radii.size, 3))
+    for frame_idx in range(frames):
+        angle_offset = (frame_idx * speed / frames) * 2 * math.pi
+        ray_angle = (2 * math.pi * rays / ray_count) + angle_offset
+        x = (center_x + radii[None, :] * _cos(ray_angle)[:, None]).astype(np.int64)
+        y = (center_y + radii[None, :] * _sin(ray_angle)[:, None]).astype(np.int64)
+        canvas = _blank(width, height)
+        _plot(canvas, width, height, x, y, colors)
+        yield canvas
+
+
+def pulsing_halo(ring_count: int, pulse_speed: float, color: RGB, frames: int,
+                 width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    rings = np.arange(ring_count)
+    rad = _radians(range(0, 360, 2))
+    cos, sin = _cos(rad), _sin(rad)
+    base_radius = max_radius * (rings + 1) / (ring_count + 1)
+    # Fade outer rings
+    colors = np.broadcast_to(_scale(color, 1.0 - (rings / ring_count) * 0.3)[:, None, :], (ring_count, rad.size, 3))
+    for frame_idx in range(frames):
+        t = (frame_idx / frames) * 2 * math.pi
+        pulse_factor = 0.3 + 0.7 * (0.5 + 0.5 * math.sin(t * pulse_speed))
+        radius = (base_radius * pulse_factor)[:, None]
+        x = (center_x + radius * cos[None, :]).astype(np.int64)
+        y = (center_y + radius * sin[None, :]).astype(np.int64)
+        canvas = _blank(width, height)
+        _plot(canvas, width, height, x, y, colors)
+        yield canvas
+
+
+def twinkling_stars(density: float, twinkle_speed: float, color: RGB, frames: int,
+                    width: int, height: int) -> Iterator[np.ndarray]:
+    num_stars = int(width * height * density)
+    random.seed(42)
+    star_positions = [(random.randint(0, width - 1), random.randint(0, height - 1)) for _ in range(num_stars)]
+    if star_positions:
+        xs, ys = (np.array(axis) for axis in zip(*star_positions))
+    else:
+        xs = ys = np.zeros(0, dtype=np.int64)
+    # Each star's phase depends only on its position, so repeated stars share a colour
+    star_phase = (xs + ys) % 10
+    phase_offsets = [(phase / 10.0) * 2 * math.pi for phase in range(10)]
+    for frame_idx in range(frames):
+        t = frame_idx / frames
+        intensity = np.array([0.3 + 0.7 * abs(math.sin(t * twinkle_speed * 2 * math.pi + offset))
+                              for offset in phase_offsets])
+        canvas = _blank(width, height)
+        _plot(canvas, width, height, xs, ys, _scale(color, intensity)[star_phase])
+        yield canvas
+
+
+def wave_propagation(wave_count: int, speed: float, color: RGB, frames: int,
+                     width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    angle = _radians(range(0, 360, 1))
+    r_offsets = np.arange(-3, 4)
+    radius = max_radius * 0.7 + r_offsets
+    # Point positions do not change between waves or frames
+    x = (center_x + radius[None, :] * _cos(angle)[:, None]).astype(np.int64)
+    y = (center_y + radius[None, :] * _sin(angle)[:, None]).astype(np.int64)
+    distance_fade = 1.0 - np.abs(r_offsets) / 3.0
+    waves = np.arange(wave_count)
+    for frame_idx in range(frames):
+        t = frame_idx / frames
+        wave_phase = (t * speed + waves / wave_count) * 2 * math.pi
+        wave_angle = angle[None, :] + wave_phase[:, None]
+        wave_intensity = 0.5 + 0.5 * _sin(wave_angle * 8)
+        intensity = wave_intensity[:, :, None] * distance_fade[None, None, :]
+        visible = (intensity > 0.1).ravel()
+        canvas = _blank(width, height)
+        _plot(canvas, width, height,
+              np.broadcast_to(x, intensity.shape).ravel()[visible],
+              np.broadcast_to(y, intensity.shape).ravel()[visible],
+              _scale(color, intensity.ravel()[visible]))
+        yield canvas
+
+
+def color_gradient_rotation(gradient_colors: Sequence[RGB], rotation_speed: float, frames: int,
+                            width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    palette = np.array(gradient_colors, dtype=np.int64).reshape(-1, 3)
+    count = len(palette)
+    dx = (np.arange(width)[None, :] - center_x) + np.zeros((height, 1))
+    dy = (np.arange(height)[:, None] - center_y) + np.zeros((1, width))
+    radius = np.sqrt(dx * dx + dy * dy).ravel()
+    inside = radius <= max_radius
+    base_angle = np.fromiter(map(math.atan2, dy.ravel()[inside].tolist(), dx.ravel()[inside].tolist()),
+                             float, int(inside.sum()))
+    radius_fade = 1.0 - (radius[inside] / max_radius) * 0.3
+    full_turn = 2 * math.pi
+    for frame_idx in range(frames):
+        angle_offset = (frame_idx * rotation_speed / frames) * 2 * math.pi
+        angle = ((base_angle + angle_offset) % full_turn + full_turn) % full_turn
+        gradient_pos = angle / full_turn
+        color_idx = (gradient_pos * count).astype(np.int64) % count
+        next_color_idx = (color_idx + 1) % count
+        local_pos = (gradient_pos * count) % 1.0
+        blended = (palette[color_idx] * (1 - local_pos)[:, None]
+                   + palette[next_color_idx] * local_pos[:, None]).astype(np.int64)
+        canvas = _blank(width, height)
+        canvas[inside] = (blended * radius_fade[:, None]).astype(np.int64)
+        yield canvas
+
+
+def lotus(color: RGB, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    radii = np.arange(0, int(max_radius * 0.8), 1)
+    petals = np.arange(8)
+    spread = _radians(range(-15, 16, 2))
+    # Fade from center
+    colors = np.broadcast_to(_scale(color, 1.0 - (radii / (max_radius * 0.8)))[None, :, None, :],
+                             (8, radii.size, spread.size, 3))
+    for frame_idx in range(frames):
+        t = (frame_idx / frames) * 2 * math.pi
+        petal_angle = (2 * math.pi * petals / 8) + t * 0.1
+        angle = petal_angle[:, None] + spread[None, :]
+        x = (center_x + radii[None, :, None] * _cos(angle)[:, None, :]).astype(np.int64)
+        y = (center_y + radii[None, :, None] * _sin(angle)[:, None, :]).astype(np.int64)
+        canvas = _blank(width, height)
+        _plot(canvas, width, height, x, y, colors)
+        yield canvas
+
+
+def dharma_wheel(color: RGB, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    max_radius = min(width, height) / 2
+    # Outer circle and hub are the same every frame; everything is one colour
+    rim = _radians(range(0, 360, 1))
+    static = _blank(width, height)
+    _plot(static, width, height,
+          (center_x + max_radius * 0.9 * _cos(rim)).astype(np.int64),
+          (center_y + max_radius * 0.9 * _sin(rim)).astype(np.int64), color)
+    hub_radii = np.arange(0, int(max_radius * 0.3), 1)[:, None]
+    hub = _radians(range(0, 360, 2))[None, :]
+    _plot(static, width, height,
+          (center_x + hub_radii * _cos(hub)).astype(np.int64),
+          (center_y + hub_radii * _sin(hub)).astype(np.int64), color)
+    spoke_radii = np.arange(int(max_radius * 0.3), int(max_radius * 0.9), 1)[None, :]
+    spokes = np.arange(8)
+    for frame_idx in range(frames):
+        t = (frame_idx / frames) * 2 * math.pi
+        spoke_angle = ((2 * math.pi * spokes / 8) + t * 0.2)[:, None]
+        canvas = static.copy()
+        _plot(canvas, width, height,
+              (center_x + spoke_radii * _cos(spoke_angle)).astype(np.int64),
+              (center_y + spoke_radii * _sin(spoke_angle)).astype(np.int64), color)
+        yield canvas
+
+
+def _line(x1: int, y1: int, x2: int, y2: int) -> Tuple[np.ndarray, np.ndarray]:
+    steps = max(abs(x2 - x1), abs(y2 - y1))
+    if steps == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    t = np.arange(steps + 1) / steps
+    return (x1 + (x2 - x1) * t).astype(np.int64), (y1 + (y2 - y1) * t).astype(np.int64)
+
+
+def vesak_stars(color: RGB, frames: int, width: int, height: int) -> Iterator[np.ndarray]:
+    center_x, center_y = width / 2, height / 2
+    star_positions = [
+        (center_x, center_y),
+        (center_x * 0.5, center_y * 0.5),
+        (center_x * 1.5, center_y * 0.5),
+        (center_x * 0.5, center_y * 1.5),
+        (center_x * 1.5, center_y * 1.5),
+    ]
+    star_size = min(width, height) * 0.15
+    for frame_idx in range(frames):
+        rotation = frame_idx / frames * 2 * math.pi
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+        for star_x, star_y in star_positions:
+            if star_x >= width or star_y >= height:
+                continue
+            for i in range(5):
+                outer_angle = (2 * math.pi * i / 5) - math.pi / 2 + rotation
+                outer_x = int(star_x + star_size * math.cos(outer_angle))
+                outer_y = int(star_y + star_size * math.sin(outer_angle))
+                inner_angle = (2 * math.pi * (i + 0.5) / 5) - math.pi / 2 + rotation
+                inner_x = int(star_x + star_size * 0.4 * math.cos(inner_angle))
+                inner_y = int(star_y + star_size * 0.4 * math.sin(inner_angle))
+                for line in (_line(int(star_x), int(star_y), outer_x, outer_y),
+                             _line(outer_x, outer_y, inner_x, inner_y)):
+                    xs.append(line[0])
+                    ys.append(line[1])
+        canvas = _blank(width, height)
+        if xs:
+            _plot(canvas, width, height, np.concatenate(xs), np.concatenate(ys), color)
+        yield canvas
@@ -0,0 +1,229 @@
+"""
+Template Previews - Gallery previews for the pattern template library
+
+Previews for many templates are rendered in parallel worker processes (the
+generators are CPU bound and hold the GIL), and small previews are cached on
+disk so reopening a gallery does not render anything at all.
+
+Cache entries are keyed by template name, size and the fully merged template
+parameters plus `PREVIEW_CACHE_VERSION`; bump the version whenever generator
+output changes. Templates whose output depends on the wall clock are never
+cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from core.pattern import Frame, Pattern, PatternMetadata
+from core.pattern_templates import TemplateLibrary
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_CACHE_VERSION = 1
+# Only previews up to this many LEDs are cached (gallery thumbnails, not full patterns)
+PREVIEW_CACHE_MAX_LEDS = 32 * 32
+PREVIEW_CACHE_MAX_ENTRIES = 256
+# Output depends on the current time
+UNCACHED_TEMPLATES = frozenset({"Clock"})
+
+_worker_library: Optional[TemplateLibrary] = None
+
+
+def default_cache_dir() -> Path:
+    """Preview cache directory in the user cache location."""
+    try:
+        from PySide6.QtCore import QStandardPaths
+        base = Path(QStandardPaths.writableLocation(QStandardPaths.CacheLocation)) / "UploadBridge"
+    except Exception:
+        base = Path.home() / ".upload_bridge"
+    return base / "template_previews"
+
+
+def _render_payload(template_name: str, width: int, height: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one template into plain arrays (runs in worker processes)."""
+    global _worker_library
+    if _worker_library is None:
+        _worker_library = TemplateLibrary()
+    pattern = _worker_library.generate_pattern(template_name, width, height, **params)
+    led_count = width * height
+    pixels = np.array([frame.pixels for frame in pattern.frames], dtype=np.uint8).reshape(-1, led_count, 3)
+    return {
+        "name": pattern.name,
+        "width": width,
+        "height": height,
+        "durations": np.array([frame.duration_ms for frame in pattern.frames], dtype=np.int64),
+        "pixels": pixels,
+    }
+
+
+def _pattern_from_payload(payload: Dict[str, Any]) -> Pattern:
+    frames = [
+        Frame.from_array(rgb, int(duration), intern=True)
+        for rgb, duration in zip(payload["pixels"], payload["durations"].tolist())
+    ]
+    metadata = PatternMetadata(width=int(payload["width"]), height=int(payload["height"]))
+    return Pattern(name=str(payload["name"]), metadata=metadata, frames=frames)
+
+
+class TemplatePreviewCache:
+    """
+    On-disk cache of small template previews.
+
+    Each preview is one compressed ``.npz`` file named after its key; the
+    oldest files are pruned once more than ``max_entries`` exist.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_leds: int = PREVIEW_CACHE_MAX_LEDS,
+                 max_entries: int = PREVIEW_CACHE_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_leds = max_leds
+        self.max_entries = max_entries
+
+    def key(self, template_name: str, width: int, height: int, params: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a preview, or None if it should not be cached."""
+        if template_name in UNCACHED_TEMPLATES or width * height > self.max_leds:
+            return None
+        try:
+            blob = json.dumps([PREVIEW_CACHE_VERSION, template_name, width, height, params], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return {name: data[name] for name in ("name", "width", "height", "durations", "pixels")}
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable template preview {path}: {e}")
+            return None
+
+    def store(self, key: str, payload: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = path.with_suffix(".tmp.npz")
+            np.savez_compressed(temp_file, **payload)
+            temp_file.replace(path)
+            self._prune()
+        except OSError as e:
+            logger.warning(f"Could not write template preview {path}: {e}")
+
+    def _prune(self) -> None:
+        entries = list(self.cache_dir.glob("*.npz"))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every cached preview."""
+        for path in self.cache_dir.glob("*.npz"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def render_template_previews(
+    template_names: Iterable[str],
+    width: int,
+    height: int,
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_workers: Optional[int] = None,
+    cache: Optional[TemplatePreviewCache] = None,
+    library: Optional[TemplateLibrary] = None,
+) -> Dict[str, Pattern]:
+    """
+    Render gallery previews for several templates.
+
+    Args:
+        template_names: Templates to preview
+        width: Preview width in LEDs
+        height: Preview height in LEDs
+        params: Optional per-template parameter overrides
+        max_workers: Worker process limit (1 renders in this process)
+        cache: Preview cache; a default on-disk cache is used if omitted
+        library: Template library used to resolve default parameters
+
+    Returns:
+        Preview patterns by template name. Templates that fail to render are
+        logged and left out.
+    """
+    names = list(dict.fromkeys(template_names))
+    library = library or TemplateLibrary()
+    cache = cache if cache is not None else TemplatePreviewCache()
+    previews: Dict[str, Pattern] = {}
+    pending = {}
+    for name in names:
+        template = library.get_template(name)
+        if template is None:
+            logger.warning(f"Unknown template for preview: {name}")
+            continue
+        merged = dict(template.parameters)
+        merged.update((params or {}).get(name, {}))
+        merged.pop("width", None)
+        merged.pop("height", None)
+        key = cache.key(name, width, height, merged)
+        payload = cache.load(key) if key else None
+        if payload is not None:
+            previews[name] = _pattern_from_payload(payload)
+        else:
+            pending[name] = (merged, key)
+
+    workers = min(len(pending), max_workers or os.cpu_count() or 1)
+    payloads: Dict[str, Dict[str, Any]] = {}
+    if workers > 1:
+        try:
+            # Spawned workers do not inherit the GUI process state
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = {
+                    name: pool.submit(_render_payload, name, width, height, merged)
+                    for name, (merged, _) in pending.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        payloads[name] = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Template preview failed for {name}: {e}")
+        except Exception as e:
+            logger.warning(f"Preview worker pool unavailable, rendering in process: {e}")
+            payloads.clear()
+            workers = 1
+    if workers <= 1:
+        for name, (merged, _) in pending.items():
+            try:
+                payloads[name] = _render_payload(name, width, height, merged)
+            except Exception as e:
+                logger.warning(f"Template preview failed for {name}: {e}")
+
+    for name, payload in payloads.items():
+        key = pending[name][1]
+        if key:
+            cache.store(key, payload)
+        previews[name] = _pattern_from_payload(payload)
+    # Keep the caller's ordering
+    return {name: previews[name] for name in names if name in previews}
@@ -3,15 +3,21 @@ Circular Text Renderer - Render text on circular/curved matrix layouts.
 
 This module provides utilities for rendering text on Budurasmala circular matrices,
 including curved text layouts and hybrid ring+matrix arrangements.
+
+Grid cells are resolved to LEDs through the shared `CircularLayoutIndex`,
+which also holds the LEDs of each ring ordered by angle. Rotating text is
+rendered once and then moved by shifting ring indices, so each animation
+frame is linear in the LED count.
 """
 
 from __future__ import annotations
 
 import math
 from typing import List, Tuple, Optional
+from core.mapping.circular_layout_index import CircularLayoutIndex
 from core.pattern import PatternMetadata, Frame
 from domain.text.text_renderer import TextRenderer, TextRenderOptions
-from domain.text.glyph_provider import GlyphProvider
+from domain.text.glyph_atlas import get_glyph_atlas
 
 RGB = Tuple[int, int, int]
 
@@ -57,6 +63,82 @@ class CircularTextRenderer:
         if not text or not metadata.circular_mapping_table:
             return new_frame
         
+        pixel_count = len(new_frame.pixels)
+        for led_idx in self._text_led_indices(text, metadata, start_angle, radius, font_size):
+            if led_idx < pixel_count:
+                new_frame.pixels[led_idx] = color
+        
+        return new_frame
+    
+    def render_rotating_text_frames(
+        self,
+        text: str,
+        metadata: PatternMetadata,
+        frame: Frame,
+        frame_count: int,
+        color: RGB = (255, 255, 255),
+        start_angle: float = 0.0,
+        angle_step: Optional[float] = None,
+        radius: Optional[float] = None,
+        font_size: int = 5,
+        duration_ms: Optional[int] = None
+    ) -> List[Frame]:
+        """
+        Render text rotating around a circular matrix.
+        
+        The text is laid out once; each frame moves its LEDs along their rings
+        by the index shift matching the frame's rotation, instead of laying
+        the text out again.
+        
+        Args:
+            text: Text to render
+            metadata: PatternMetadata with circular layout
+            frame: Background frame (not modified)
+            frame_count: Number of frames to generate
+            color: Text color (RGB)
+            start_angle: Angle of the first frame in degrees
+            angle_step: Rotation per frame in degrees (None = one full turn)
+            radius: Radius for text (None = use circular_radius)
+            font_size: Character size (5x7 default)
+            duration_ms: Frame duration (None = keep the background's)
+            
+        Returns:
+            List of ``frame_count`` frames
+        """
+        if angle_step is None:
+            angle_step = 360.0 / max(1, frame_count)
+        if duration_ms is None:
+            duration_ms = frame.duration_ms
+        
+        background = list(frame.pixels)
+        pixel_count = len(background)
+        if not text or not metadata.circular_mapping_table:
+            return [Frame(pixels=list(background), duration_ms=duration_ms) for _ in range(frame_count)]
+        
+        index = CircularLayoutIndex.for_metadata(metadata)
+        lit = list(dict.fromkeys(self._text_led_indices(text, metadata, start_angle, radius, font_size)))
+        
+        frames = []
+        for frame_idx in range(frame_count):
+            pixels = list(background)
+            shifts = index.ring_shifts(frame_idx * angle_step)
+            for led_idx in index.rotate_leds(lit, shifts):
+                if led_idx < pixel_count:
+                    pixels[led_idx] = color
+            frames.append(Frame(pixels=pixels, duration_ms=duration_ms))
+        return frames
+    
+    def _text_led_indices(
+        self,
+        text: str,
+        metadata: PatternMetadata,
+        start_angle: float,
+        radius: Optional[float],
+        font_size: int
+    ) -> List[int]:
+        """LED indices lit by text laid out around the circle, in drawing order."""
+        index = CircularLayoutIndex.for_metadata(metadata)
+        
         # Get radius
         if radius is None:
             radius = metadata.circular_radius or (min(metadata.width, metadata.height) / 2.0 - 1.0)
@@ -75,41 +157,28 @@ class CircularTextRenderer:
         )
         angle_per_char = total_angle / max(1, len(text))
         
-        # Use glyph provider for character rendering
-        glyph_provider = GlyphProvider(width=char_width, height=char_height)
+        atlas = get_glyph_atlas(None, char_width, char_height)
         
-        # Render each character
+        led_indices = []
         for char_idx, char in enumerate(text):
             # Calculate angle for this character
-            char_angle_deg = start_angle + (char_idx * angle_per_char)
-            char_angle_rad = math.radians(char_angle_deg)
+            char_angle_rad = math.radians(start_angle + (char_idx * angle_per_char))
             
             # Character position on circle
             char_center_x = center_x + radius * math.cos(char_angle_rad)
             char_center_y = center_y + radius * math.sin(char_angle_rad)
             
-            # Get glyph
-            glyph = glyph_provider.glyph(char)
-            
-            # Render glyph pixels
-            for gy, row in enumerate(glyph):
-                for gx, pixel in enumerate(row):
-                    if pixel:
-                        # Calculate pixel position relative to character center
-                        pixel_x = char_center_x + (gx - char_width / 2.0)
-                        pixel_y = char_center_y + (gy - char_height / 2.0)
-                        
-                        # Find nearest grid cell
-                        grid_x = int(round(pixel_x))
-                        grid_y = int(round(pixel_y))
-                        
-                        if 0 <= grid_x < metadata.width and 0 <= grid_y < metadata.height:
-                            # Find LED index that maps to this grid cell
-                            led_idx = self._find_led_for_grid(metadata, grid_x, grid_y)
-                            if led_idx is not None and led_idx < len(new_frame.pixels):
-                                new_frame.pixels[led_idx] = color
+            for gx, gy in atlas.glyph(char).points:
+                # Nearest grid cell to the pixel, relative to the character center
+                grid_x = int(round(char_center_x + (gx - char_width / 2.0)))
+                grid_y = int(round(char_center_y + (gy - char_height / 2.0)))
+                
+                if 0 <= grid_x < metadata.width and 0 <= grid_y < metadata.height:
+                    led_idx = index.led_at(grid_x, grid_y)
+                    if led_idx is not None:
+                        led_indices.append(led_idx)
         
-        return new_frame
+        return led_indices
     
     def render_text_on_curved_matrix(
         self,
@@ -153,7 +222,7 @@ class CircularTextRenderer:
         center_y = metadata.height / 2.0
         
         # Render text along curve
-        glyph_provider = GlyphProvider(width=char_width, height=char_height)
+        atlas = get_glyph_atlas(None, char_width, char_height)
         text_width = len(text) * char_width
         
         for char_idx, char in enumerate(text):
@@ -167,20 +236,15 @@ class CircularTextRenderer:
             char_x = center_x + x_offset
             char_y = center_y + y_offset
             
-            # Get glyph
-            glyph = glyph_provider.glyph(char)
-            
             # Render glyph
-            for gy, row in enumerate(glyph):
-                for gx, pixel in enumerate(row):
-                    if pixel:
-                        pixel_x = int(round(char_x + gx - char_width / 2.0))
-                        pixel_y = int(round(char_y + gy - char_height / 2.0))
-                        
-                        if 0 <= pixel_x < metadata.width and 0 <= pixel_y < metadata.height:
-                            idx = pixel_y * metadata.width + pixel_x
-                            if idx < len(new_frame.pixels):
-                                new_frame.pixels[idx] = color
+            for gx, gy in atlas.glyph(char).points:
+                pixel_x = int(round(char_x + gx - char_width / 2.0))
+                pixel_y = int(round(char_y + gy - char_height / 2.0))
+                
+                if 0 <= pixel_x < metadata.width and 0 <= pixel_y < metadata.height:
+                    idx = pixel_y * metadata.width + pixel_x
+                    if idx < len(new_frame.pixels):
+                        new_frame.pixels[idx] = color
         
         return new_frame
     
@@ -197,10 +261,4 @@ class CircularTextRenderer:
                 return grid_y * metadata.width + grid_x
             return None
         
-        # Search mapping table
-        for led_idx, (mapped_x, mapped_y) in enumerate(metadata.circular_mapping_table):
-            if mapped_x == grid_x and mapped_y == grid_y:
-                return led_idx
-        
-        return None
-
+        return CircularLayoutIndex.for_metadata(metadata).led_at(grid_x, grid_y)
@@ -7,6 +7,7 @@ This module provides functionality to export LED matrix patterns as video files
 
 from __future__ import annotations
 
+import math
 import os
 from typing import Optional
 from PIL import Image
@@ -93,7 +94,11 @@ class VideoExporter:
                 raise Exception("Failed to open video writer")
             
             # Write frames
-            for frame in pattern.frames:
+            sample_counts = VideoExporter._sample_counts(pattern, fps)
+            for frame, frame_count in zip(pattern.frames, sample_counts):
+                if not frame_count:
+                    continue  # Shorter than one video frame and skipped over
+                
                 # Create image
                 img = Image.new("RGB", (video_width, video_height), (0, 0, 0))
                 
@@ -116,9 +121,7 @@ class VideoExporter:
                 img_array = np.array(img)
                 img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
                 
-                # Write frame (repeat based on duration)
-                frame_duration_sec = frame.duration_ms / 1000.0
-                frame_count = max(1, int(frame_duration_sec * fps))
+                # Write frame once per video frame sampled inside its duration
                 for _ in range(frame_count):
                     video_writer.write(img_bgr)
             
@@ -145,7 +148,11 @@ class VideoExporter:
             
             # Prepare frames
             frames_data = []
-            for frame in pattern.frames:
+            sample_counts = VideoExporter._sample_counts(pattern, fps)
+            for frame, frame_count in zip(pattern.frames, sample_counts):
+                if not frame_count:
+                    continue  # Shorter than one video frame and skipped over
+                
                 # Create image
                 img = Image.new("RGB", (video_width, video_height), (0, 0, 0))
                 
@@ -167,9 +174,7 @@ class VideoExporter:
                 import numpy as np
                 img_array = np.array(img)
                 
-                # Repeat frame based on duration
-                frame_duration_sec = frame.duration_ms / 1000.0
-                frame_count = max(1, int(frame_duration_sec * fps))
+                # Repeat frame once per video frame sampled inside its duration
                 for _ in range(frame_count):
                     frames_data.append(img_array)
             
@@ -180,6 +185,24 @@ class VideoExporter:
         except Exception as e:
             raise Exception(f"Failed to export video with imageio: {e}")
     
+    @staticmethod
+    def _sample_counts(pattern: Pattern, fps: int) -> list[int]:
+        """
+        Number of fixed-rate video frames that land on each pattern frame.
+        
+        Video frames are sampled at ``k / fps`` seconds on the pattern's
+        timeline, so the output keeps the pattern's total duration instead of
+        accumulating per-frame rounding.
+        """
+        step_ms = 1000.0 / fps
+        total_ms = pattern.duration_ms
+        sample_count = max(1, math.ceil(total_ms / step_ms)) if total_ms > 0 else 1
+        indices = pattern.frames_at_times([k * step_ms for k in range(sample_count)])
+        counts = [0] * pattern.frame_count
+        for idx in indices:
+            counts[int(idx)] += 1
+        return counts
+    
     @staticmethod
     def get_supported_formats() -> list[str]:
         """Get list of supported video formats."""
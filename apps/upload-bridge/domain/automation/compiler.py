@@ -0,0 +1,205 @@
+"""
+Automation Compiler - Automation actions as cached index permutations
+
+Scroll, rotate, mirror, flip, bounce, reveal and similar actions only move
+pixels around or blank them: output pixel ``i`` is either input pixel
+``index[i]`` or a constant fill (black, opaque alpha, a wipe colour). For a
+given action, parameters, step and frame size that mapping never changes, so
+it is compiled once into a gather index and reused for every frame and layer.
+
+Compilation traces the action's reference implementation: the transform is
+run once on position markers instead of pixels, and wherever a marker lands
+the output gathers from that position. Anything else in the output is a fill
+value. This keeps compiled output identical to the reference code, including
+its edge cases (short pixel lists, non-square rotation, padding).
+
+Consecutive compiled actions compose into a single gather, so a whole
+automation stack costs one indexed copy per frame. Actions that compute new
+colour values (invert, wipe fades, colour cycling) cannot be traced and run
+directly between gathers.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Transform = Callable[[List[Any]], List[Any]]
+# (cache key, transform); a key of None marks a value-dependent transform
+Stage = Tuple[Optional[Hashable], Transform]
+
+
+class _Source:
+    """Input position marker used while tracing a transform"""
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+@dataclass(frozen=True)
+class Gather:
+    """
+    Output pixel ``i`` is ``values[index[i]]`` or, for negative entries,
+    ``fills[-1 - index[i]]``.
+    """
+    index: Tuple[int, ...]
+    fills: Tuple[Any, ...] = ()
+
+    @classmethod
+    def trace(cls, transform: Transform, length: int) -> "Gather":
+        """
+        Compile a pixel-moving transform for inputs of ``length`` values
+
+        Raises:
+            ValueError: The transform inspected or altered pixel values
+        """
+        output = transform([_Source(i) for i in range(length)])
+        fills: List[Any] = []
+        index = []
+        for value in output:
+            if isinstance(value, _Source):
+                index.append(value.index)
+                continue
+            if not isinstance(value, (int, tuple)):
+                raise ValueError(f"Transform produced a derived value {value!r}")
+            if value not in fills:
+                fills.append(value)
+            index.append(-1 - fills.index(value))
+        return cls(index=tuple(index), fills=tuple(fills))
+
+    def then(self, later: "Gather") -> "Gather":
+        """Single gather equivalent to applying ``self`` and then ``later``"""
+        offset = len(self.fills)
+        index = tuple(
+            (self.index[i] if i >= 0 else i - offset) for i in later.index
+        )
+        return Gather(index=index, fills=self.fills + later.fills)
+
+    def apply(self, values: Sequence[Any]) -> List[Any]:
+        """Gather output values in one indexed copy"""
+        source = list(values)
+        # Fill k sits at position -1 - k from the end
+        source.extend(reversed(self.fills))
+        return list(map(source.__getitem__, self.index))
+
+
+class AutomationCompiler:
+    """
+    LRU cache of compiled gathers keyed by action, parameters, step and size.
+
+    Callers describe each action as a stage: a hashable key that fully
+    determines the transform's geometry (action type, parameters, step, frame
+    size) plus the reference transform. Stages with key ``None`` or an
+    unhashable key are applied directly.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Hashable, Optional[Gather]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable, build: Callable[[], Optional[Gather]]) -> Optional[Gather]:
+        if key in self._cache:
+            gather = self._cache[key]
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return gather
+        self.misses += 1
+        gather = build()
+        self._cache[key] = gather
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return gather
+
+    def gather(self, key: Hashable, transform: Transform, length: int) -> Optional[Gather]:
+        """Compiled gather for one stage on inputs of ``length`` values (None if untraceable)"""
+        return self._lookup(("stage", key, length), lambda: self._trace(key, transform, length))
+
+    def apply(self, stages: Sequence[Stage], values: Sequence[Any]) -> List[Any]:
+        """
+        Run ``stages`` in order over ``values``.
+
+        Runs of compilable stages are fused into one cached gather; other
+        stages are called directly between them.
+        """
+        result = values
+        run: List[Tuple[Hashable, Transform]] = []
+
+        def flush(current):
+            if not run:
+                return current
+            keys = tuple(key for key, _ in run)
+            transforms = [transform for _, transform in run]
+            run.clear()
+            length = len(current)
+            if len(keys) == 1:
+                gather = self.gather(keys[0], transforms[0], length)
+            else:
+                gather = self._lookup(("chain", keys, length),
+                                      lambda: self._compose(keys, transforms, length))
+            if gather is None:
+                # Let the reference code run (and raise, if the input is invalid)
+                for transform in transforms:
+                    current = transform(list(current))
+                return current
+            return gather.apply(current)
+
+        for key, transform in stages:
+            if key is not None:
+                try:
+                    hash(key)
+                except TypeError:
+                    key = None
+            if key is None:
+                result = transform(list(flush(result)))
+            else:
+                run.append((key, transform))
+        return flush(result)
+
+    @staticmethod
+    def _trace(key: Hashable, transform: Transform, length: int) -> Optional[Gather]:
+        try:
+            return Gather.trace(transform, length)
+        except Exception as exc:
+            logger.debug("Automation stage %r not compiled: %s", key, exc)
+            return None
+
+    def _compose(self, keys, transforms, length: int) -> Optional[Gather]:
+        combined = None
+        for key, transform in zip(keys, transforms):
+            stage = self.gather(key, transform, length)
+            if stage is None:
+                return None
+            length = len(stage.index)
+            combined = stage if combined is None else combined.then(stage)
+        return combined
+
+    def clear(self) -> None:
+        """Drop every compiled gather"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_automation_compiler: Optional[AutomationCompiler] = None
+
+
+def get_automation_compiler() -> AutomationCompiler:
+    """Shared compiler used by layer rendering and parametric actions"""
+    global _automation_compiler
+    if _automation_compiler is None:
+        _automation_compiler = AutomationCompiler()
+    return _automation_compiler
+
+
+def freeze_params(params: Optional[dict]) -> Hashable:
+    """Hashable form of an action's parameter dict (unhashable values stay unhashable)"""
+    if not params:
+        return ()
+    return tuple(sorted((str(k), v) for k, v in params.items()))
@@ -7,9 +7,10 @@ All actions are deterministic and testable.
 
 from typing import List, Tuple, Optional, Dict, Any
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 
 from core.pattern import Pattern, Frame
+from domain.automation.compiler import get_automation_compiler
 
 Color = Tuple[int, int, int]
 
@@ -28,6 +29,12 @@ class ActionType(Enum):
     ROTATE_CCW = "rotate_ccw"
 
 
+# Actions whose pixel mapping does not depend on the frame index
+STATIC_ACTIONS = {
+    ActionType.ROTATE, ActionType.ROTATE_180, ActionType.ROTATE_CCW, ActionType.MIRROR, ActionType.FLIP,
+}
+
+
 @dataclass
 class ActionParameters:
     """Parameters for automation actions"""
@@ -104,7 +111,36 @@ class ParametricAction:
         height: int,
         frame_index: int
     ) -> List[Color]:
-        """Transform frame pixels based on action type"""
+        """Transform frame pixels via a cached gather compiled from the reference transform"""
+        def transform(values):
+            return self._transform_frame_direct(values, width, height, frame_index)
+        
+        key = self._compile_key(width, height, frame_index)
+        return get_automation_compiler().apply([(key, transform)], pixels)
+    
+    def _compile_key(self, width: int, height: int, frame_index: int):
+        """Cache key covering everything the action's pixel mapping depends on (None = not compilable)"""
+        if self.action_type == ActionType.INVERT:
+            return None  # Changes colour values
+        if self.action_type in STATIC_ACTIONS:
+            frame_index = 0
+        elif self.action_type == ActionType.SCROLL:
+            # Scrolling wraps, so only the distance modulo the axis length matters
+            axis = width if self.parameters.direction.lower() in ["right", "left"] else height
+            distance = int(self.parameters.distance * self.parameters.speed * (frame_index + 1))
+            frame_index = distance % max(1, axis)
+        elif self.action_type == ActionType.BOUNCE:
+            frame_index %= max(1, int(10 / self.parameters.speed))
+        return ("parametric", self.action_type.value, astuple(self.parameters), width, height, frame_index)
+    
+    def _transform_frame_direct(
+        self,
+        pixels: List[Color],
+        width: int,
+        height: int,
+        frame_index: int
+    ) -> List[Color]:
+        """Transform frame pixels based on action type (reference implementation)"""
         
         if self.action_type == ActionType.SCROLL:
             return self._scroll(pixels, width, height, frame_index)
@@ -1,13 +1,38 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
 import json
+import logging
+import os
+import time
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .models import EffectDefinition, _normalise_keywords
 
+logger = logging.getLogger(__name__)
+
 _SUPPORTED_ASSET_EXTENSIONS = {".swf", ".json", ".yaml", ".yml"}
 _PREVIEW_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp"}
+_METADATA_SUFFIXES = (".json", ".yaml", ".yml")
+
+_INDEX_VERSION = 1
+# Timestamps this close to the time they were recorded may hide a later
+# change within the filesystem's timestamp resolution; such entries are
+# re-checked on the next scan.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def default_index_path(root: Path) -> Path:
+    """Per-root index file in the user config directory."""
+    try:
+        from PySide6.QtCore import QStandardPaths
+        base = Path(QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation)) / "UploadBridge"
+    except Exception:
+        base = Path.home() / ".upload_bridge"
+    digest = hashlib.sha1(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:12]
+    return base / f"effect_index_{digest}.json"
 
 
 class EffectLibrary:
@@ -18,21 +43,58 @@ class EffectLibrary:
     JSON/YAML files – if present they can override name/category/keywords.
     Adding new effects is as simple as dropping files in the `Res/effects`
     folder and pressing refresh in the UI.
+
+    Scan results are kept in a persistent JSON index (directory listings plus
+    per-asset stat signature and parsed metadata). A directory whose mtime is
+    unchanged is not listed again, so a cold start only stats directories.
+    ``reload(check_files=True)`` additionally stats each asset and its
+    metadata files to pick up in-place edits; only changed assets are parsed.
     """
 
-    def __init__(self, root: Path):
-        self._root = root
+    def __init__(self, root: Path, index_path: Optional[Path] = None, persist_index: bool = True):
+        """
+        Args:
+            root: Effects directory
+            index_path: Index file (default: per-root file in the user config directory)
+            persist_index: Read and write the index file; False keeps it in memory only
+        """
+        self._root = Path(root)
+        self._index_path = Path(index_path) if index_path else None
+        self._persist_index = persist_index
         self._effects: List[EffectDefinition] = []
-        self.reload()
+        self._dirs: Dict[str, dict] = {}
+        self._entries: Dict[str, dict] = {}
+        self._index_loaded = False
+        self._keyword_index: Dict[str, Set[str]] = {}
+        self._keyword_terms: List[str] = []
+        self._by_id: Dict[str, EffectDefinition] = {}
+        self.scan_stats: Dict[str, int] = {}
+        self.reload(check_files=False)
 
     @property
     def root(self) -> Path:
         return self._root
 
-    def reload(self) -> None:
+    @property
+    def index_path(self) -> Path:
+        if self._index_path is None:
+            self._index_path = default_index_path(self._root)
+        return self._index_path
+
+    def reload(self, check_files: bool = True) -> None:
+        """Rescan the effects tree.
+
+        Args:
+            check_files: Also stat every asset and its metadata files to catch
+                in-place edits. Without it only directories are stat'ed.
+        """
         self._root.mkdir(parents=True, exist_ok=True)
-        self._effects = list(self._scan_effects())
-        self._effects.sort(key=lambda eff: (eff.category.lower(), eff.name.lower()))
+        if not self._index_loaded:
+            self._load_index()
+        self._effects = list(self._scan_effects(check_files))
+        self._effects.sort(key=lambda eff: (eff.category.lower(), eff.name.lower(), eff.identifier))
+        self._by_id = {effect.identifier: effect for effect in self._effects}
+        self._build_keyword_index()
 
     def categories(self) -> List[str]:
         cats = sorted({e.category for e in self._effects})
@@ -41,47 +103,223 @@ class EffectLibrary:
     def effects(self) -> List[EffectDefinition]:
         return list(self._effects)
 
+    def get_effect(self, identifier: str) -> Optional[EffectDefinition]:
+        return self._by_id.get(identifier)
+
+    def list_effects(self) -> List[EffectDefinition]:
+        return self.effects()
+
+    def search(self, query: str, category: Optional[str] = None) -> List[EffectDefinition]:
+        """Effects matching every word of ``query`` as a keyword prefix.
+
+        Keywords cover the effect's name, category, path and metadata
+        keywords. Results keep library order.
+        """
+        terms = _normalise_keywords(query.split())
+        matches: Optional[Set[str]] = None
+        for term in terms:
+            found: Set[str] = set()
+            start = bisect.bisect_left(self._keyword_terms, term)
+            for keyword in self._keyword_terms[start:]:
+                if not keyword.startswith(term):
+                    break
+                found.update(self._keyword_index[keyword])
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [
+            effect for effect in self._effects
+            if (matches is None or effect.identifier in matches)
+            and (category is None or effect.category == category)
+        ]
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
-    def _scan_effects(self) -> Iterable[EffectDefinition]:
+    def _scan_effects(self, check_files: bool = True) -> Iterable[EffectDefinition]:
         if not self._root.exists():
             return []
 
+        stats = {"dirs_stat": 0, "dirs_listed": 0, "files_stat": 0, "files_parsed": 0}
+        self.scan_stats = stats
+        now = time.time_ns()
+        dirs: Dict[str, dict] = {}
+        entries: Dict[str, dict] = {}
         encountered: Dict[str, EffectDefinition] = {}
-        for path in self._root.rglob("*"):
-            if not path.is_file():
-                continue
-            if path.suffix.lower() not in _SUPPORTED_ASSET_EXTENSIONS:
-                continue
+        dirty = False
 
-            rel_path = path.relative_to(self._root)
-            identifier = str(rel_path).replace("\\", "/")
-            if identifier in encountered:
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            dir_path = self._root / rel_dir if rel_dir else self._root
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
                 continue
+            stats["dirs_stat"] += 1
+            listing = self._dirs.get(rel_dir)
+            dir_changed = not (listing and listing["mtime_ns"] == mtime_ns
+                               and listing["listed_ns"] - mtime_ns > _RACY_WINDOW_NS)
+            if dir_changed:
+                listing = self._list_directory(dir_path, mtime_ns, now)
+                stats["dirs_listed"] += 1
+                dirty = True
+            dirs[rel_dir] = listing
+            stack.extend(f"{rel_dir}/{name}" if rel_dir else name for name in reversed(listing["dirs"]))
 
-            metadata = self._load_metadata(path)
-            name = metadata.get("name") or path.stem.replace("_", " ").replace("-", " ")
-            category = metadata.get("category") or self._derive_category(rel_path)
-            keywords = _normalise_keywords(metadata.get("keywords", []))
-            keywords.update(_normalise_keywords(name.split()))
-            keywords.update(_normalise_keywords(category.split()))
-
-            preview_path = self._find_preview_for_asset(path, metadata)
-
-            effect = EffectDefinition(
-                identifier=identifier,
-                name=name,
-                category=category,
-                source_path=path,
-                preview_path=preview_path,
-                keywords=keywords,
-            )
-            encountered[identifier] = effect
+            present = set(listing["files"])
+            for file_name in listing["files"]:
+                if Path(file_name).suffix.lower() not in _SUPPORTED_ASSET_EXTENSIONS:
+                    continue
+                identifier = f"{rel_dir}/{file_name}" if rel_dir else file_name
+                if identifier in encountered:
+                    continue
+                entry = self._entries.get(identifier)
+                if entry is None or dir_changed or check_files or entry.get("racy"):
+                    entry, parsed = self._refresh_entry(identifier, present, entry, now, stats)
+                    dirty = dirty or parsed
+                if entry is None:
+                    continue
+                entries[identifier] = entry
+                encountered[identifier] = self._definition(identifier, entry)
 
+        dirty = dirty or len(entries) != len(self._entries) or len(dirs) != len(self._dirs)
+        self._dirs = dirs
+        self._entries = entries
+        if dirty:
+            self._save_index()
         return encountered.values()
 
+    def _list_directory(self, dir_path: Path, mtime_ns: int, now: int) -> dict:
+        files: List[str] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(dir_path) as it:
+                for item in it:
+                    if item.is_dir():
+                        subdirs.append(item.name)
+                    elif item.is_file():
+                        suffix = os.path.splitext(item.name)[1].lower()
+                        if suffix in _SUPPORTED_ASSET_EXTENSIONS or suffix in _PREVIEW_EXTENSIONS:
+                            files.append(item.name)
+        except OSError as e:
+            logger.debug(f"Cannot list effects directory {dir_path}: {e}")
+        return {"mtime_ns": mtime_ns, "listed_ns": now, "files": sorted(files), "dirs": sorted(subdirs)}
+
+    def _refresh_entry(
+        self, identifier: str, present: Set[str], entry: Optional[dict], now: int, stats: Dict[str, int]
+    ) -> Tuple[Optional[dict], bool]:
+        """Re-stat one asset; parse it again only if its signature changed.
+
+        Returns:
+            (entry or None if the asset vanished, whether it was parsed)
+        """
+        path = self._root / identifier
+        signature = []
+        newest = 0
+        for candidate in dict.fromkeys([path.name] + [path.stem + suffix for suffix in _METADATA_SUFFIXES]):
+            if candidate != path.name and candidate not in present:
+                continue
+            try:
+                st = os.stat(path.parent / candidate)
+            except OSError:
+                if candidate == path.name:
+                    return None, False
+                continue
+            stats["files_stat"] += 1
+            signature.append([candidate, st.st_mtime_ns, st.st_size])
+            newest = max(newest, st.st_mtime_ns)
+
+        racy = now - newest <= _RACY_WINDOW_NS
+        if entry is not None and entry["signature"] == signature and not entry.get("racy"):
+            # Sidecar previews may have come or gone with the directory
+            preview = self._find_preview_for_asset(path, entry.get("metadata", {}))
+            entry = dict(entry, preview=self._relative(preview), racy=racy)
+            return entry, False
+
+        stats["files_parsed"] += 1
+        rel_path = Path(identifier)
+        metadata = self._load_metadata(path)
+        name = metadata.get("name") or path.stem.replace("_", " ").replace("-", " ")
+        category = metadata.get("category") or self._derive_category(rel_path)
+        keywords = _normalise_keywords(metadata.get("keywords", []))
+        keywords.update(_normalise_keywords(name.split()))
+        keywords.update(_normalise_keywords(category.split()))
+        preview = self._find_preview_for_asset(path, metadata)
+        index_metadata = {"preview": metadata["preview"]} if "preview" in metadata else {}
+        entry = {
+            "signature": signature,
+            "name": name,
+            "category": category,
+            "keywords": sorted(keywords),
+            "preview": self._relative(preview),
+            "metadata": index_metadata,
+            "racy": racy,
+        }
+        return entry, True
+
+    def _definition(self, identifier: str, entry: dict) -> EffectDefinition:
+        preview = entry.get("preview")
+        return EffectDefinition(
+            identifier=identifier,
+            name=entry["name"],
+            category=entry["category"],
+            source_path=self._root / identifier,
+            preview_path=(self._root / preview) if preview else None,
+            keywords=set(entry["keywords"]),
+        )
+
+    def _relative(self, path: Optional[Path]) -> Optional[str]:
+        """Preview path stored relative to the root where possible"""
+        if path is None:
+            return None
+        try:
+            return path.relative_to(self._root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _build_keyword_index(self) -> None:
+        index: Dict[str, Set[str]] = {}
+        for effect in self._effects:
+            words = set(effect.keywords)
+            words.update(_normalise_keywords(Path(effect.identifier).with_suffix("").parts))
+            for word in words:
+                index.setdefault(word, set()).add(effect.identifier)
+        self._keyword_index = index
+        self._keyword_terms = sorted(index)
+
+    def _load_index(self) -> None:
+        self._index_loaded = True
+        if not self._persist_index or not self.index_path.exists():
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") != _INDEX_VERSION or data.get("root") != str(self._root.resolve()):
+                return
+            self._dirs = data.get("dirs", {})
+            self._entries = data.get("entries", {})
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable effect index {self.index_path}: {e}")
+            self._dirs, self._entries = {}, {}
+
+    def _save_index(self) -> None:
+        if not self._persist_index:
+            return
+        data = {
+            "version": _INDEX_VERSION,
+            "root": str(self._root.resolve()),
+            "dirs": self._dirs,
+            "entries": self._entries,
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.index_path.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            temp_file.replace(self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write effect index {self.index_path}: {e}")
+
     def _derive_category(self, rel_path: Path) -> str:
         # Use the immediate parent (excluding language folders) as category fallback.
         parts = [part for part in rel_path.parts[:-1] if part.lower() not in {"effect_en", "effects"}]
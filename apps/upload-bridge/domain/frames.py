@@ -60,7 +60,7 @@ class FrameManager(QObject):
         pattern = self._state.pattern()
         frame = self._state.create_blank_frame(duration_ms)
         insert_at = self._current_index + 1
-        pattern.frames.insert(insert_at, frame)
+        pattern.insert_frame(insert_at, frame)
         self._current_index = insert_at
         self.frame_inserted.emit(insert_at)
         self.frames_changed.emit()
@@ -72,7 +72,7 @@ class FrameManager(QObject):
         pattern = self._state.pattern()
         frame_copy = pattern.frames[index].copy()
         insert_at = index + 1
-        pattern.frames.insert(insert_at, frame_copy)
+        pattern.insert_frame(insert_at, frame_copy)
         self._current_index = insert_at
         self.frame_duplicated.emit(index, insert_at)
         self.frames_changed.emit()
@@ -84,7 +84,7 @@ class FrameManager(QObject):
         if len(pattern.frames) <= 1:
             return
         index = self._normalise_index(index if index is not None else self._current_index)
-        del pattern.frames[index]
+        pattern.delete_frame(index)
         if self._current_index >= len(pattern.frames):
             self._current_index = len(pattern.frames) - 1
         self.frame_deleted.emit(index)
@@ -97,8 +97,7 @@ class FrameManager(QObject):
         dest = max(0, min(len(pattern.frames) - 1, dest))
         if src == dest:
             return
-        frame = pattern.frames.pop(src)
-        pattern.frames.insert(dest, frame)
+        pattern.move_frame(src, dest)
         self._current_index = dest
         self.frame_moved.emit(src, dest)
         self.frames_changed.emit()
@@ -149,7 +148,7 @@ class FrameManager(QObject):
         for idx in sorted_indices:
             idx = self._normalise_index(idx)
             if 0 <= idx < len(pattern.frames):
-                del pattern.frames[idx]
+                pattern.delete_frame(idx)
                 self.frame_deleted.emit(idx)
         
         # Adjust current index
@@ -163,7 +162,7 @@ class FrameManager(QObject):
         index = self._normalise_index(index)
         frame = self._state.frames()[index]
         if frame.duration_ms != duration_ms:
-            frame.duration_ms = duration_ms
+            self._state.pattern().set_frame_duration(index, duration_ms)
             self.frame_duration_changed.emit(index, duration_ms)
 
     # Helpers ----------------------------------------------------------
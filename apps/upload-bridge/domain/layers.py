@@ -122,6 +122,13 @@ ACTION_PRIORITY = {
     "invert": 90,
 }
 
+# Actions that only move or blank pixels; compiled into cached gathers
+COMPILED_ACTIONS = {"scroll", "rotate", "mirror", "flip", "bounce", "reveal", "radial"}
+# Actions that move the alpha channel along with the pixels
+ALPHA_MOVING_ACTIONS = {"scroll", "rotate", "mirror", "flip", "bounce"}
+
+from domain.automation.compiler import freeze_params, get_automation_compiler
+
 # Import LayerAction for per-layer automation
 try:
     from domain.automation.layer_action import LayerAction, get_action_step
@@ -639,6 +646,10 @@ class LayerManager(QObject):
             # Migration failed - continue without migrating animations
             pass
 
+    def frame_count(self) -> int:
+        """Number of frames in the current pattern (0 when none is loaded)."""
+        return self._state.frame_count()
+    
     # NEW METHODS: Layer Track API
     
     def get_layer_tracks(self) -> List[LayerTrack]:
@@ -1327,6 +1338,7 @@ class LayerManager(QObject):
         # Rotate/mirror/flip operate on the result of earlier actions in the same frame
         # They do NOT accumulate across frames (use base-frame time logic), but they DO
         # participate in the same-frame pipeline
+        stages = []
         for action in sorted_actions:
             # Always check if action is active first (includes finalized check)
             if not action.is_active_at_frame(frame_index):
@@ -1342,12 +1354,11 @@ class LayerManager(QObject):
             if step is None:
                 continue
             
-            # Apply action to current pipeline result (not base pixels)
-            result = self._apply_action_transform(
-                result, action.type, action.params, step, width, height
-            )
+            # Queue action on the current pipeline result (not base pixels)
+            stages.append(self._action_stage(action.type, action.params, step, width, height))
         
-        return result
+        # Consecutive movement actions run as one compiled gather
+        return get_automation_compiler().apply(stages, result)
     
     def _apply_alpha_transform(
         self,
@@ -1384,6 +1395,7 @@ class LayerManager(QObject):
             key=lambda a: ACTION_PRIORITY.get(a.type.lower(), 100)
         )
         
+        stages = []
         for action in sorted_actions:
             if get_action_step:
                 step = get_action_step(action, frame_index)
@@ -1393,13 +1405,55 @@ class LayerManager(QObject):
                     continue
                 step = action.get_step(frame_index)
             
-            if step is not None:
+            # Only movement actions change alpha; the rest leave it as is
+            if step is not None and action.type.lower() in ALPHA_MOVING_ACTIONS:
                 # Transform alpha using same logic as pixels
-                result = self._apply_alpha_action_transform(
-                    result, action.type, action.params, step, width, height
-                )
+                stages.append(self._action_stage(action.type, action.params, step, width, height, alpha=True))
         
-        return result
+        return get_automation_compiler().apply(stages, result)
+    
+    def _action_stage(
+        self,
+        action_type: str,
+        params: Dict,
+        step: int,
+        width: int,
+        height: int,
+        alpha: bool = False
+    ):
+        """
+        Describe one action as an automation compiler stage.
+        
+        Movement actions get a cache key covering everything their geometry
+        depends on, so the compiler can reuse the traced gather across frames
+        and layers. Steps are reduced to the period the action actually uses.
+        Value-dependent actions get no key and run directly.
+        
+        Returns:
+            (key, transform) tuple for AutomationCompiler.apply()
+        """
+        action_type_lower = action_type.lower()
+        if alpha:
+            def transform(values):
+                return self._transform_action_alpha(values, action_type, params, step, width, height)
+        else:
+            def transform(values):
+                return self._transform_action_pixels(values, action_type, params, step, width, height)
+        
+        compiled = ALPHA_MOVING_ACTIONS if alpha else COMPILED_ACTIONS
+        if action_type_lower not in compiled:
+            return None, transform
+        if action_type_lower == "radial" and str(params.get("type", "Spiral")).lower() == "pulse":
+            return None, transform  # Pulse scales colours
+        
+        if action_type_lower == "rotate":
+            step = step % 4
+        elif action_type_lower == "bounce":
+            step = step % 2
+        elif action_type_lower in ("mirror", "flip", "radial"):
+            step = 0  # Same mapping every frame
+        key = ("alpha" if alpha else "pixels", action_type_lower, freeze_params(params), step, width, height)
+        return key, transform
     
     def _apply_alpha_action_transform(
         self,
@@ -1409,10 +1463,29 @@ class LayerManager(QObject):
         step: int,
         width: int,
         height: int
+    ) -> List[int]:
+        """
+        Apply action transformation to alpha channel via the automation compiler.
+        
+        See _transform_action_alpha() for the per-action behaviour.
+        """
+        stage = self._action_stage(action_type, params, step, width, height, alpha=True)
+        return get_automation_compiler().apply([stage], alpha)
+    
+    def _transform_action_alpha(
+        self,
+        alpha: List[int],
+        action_type: str,
+        params: Dict,
+        step: int,
+        width: int,
+        height: int
     ) -> List[int]:
         """
         Apply action transformation to alpha channel (same as pixels but preserve alpha values).
         
+        Reference implementation; movement actions are compiled from it.
+        
         For most transformations, alpha moves with pixels. For effects that modify color
         (invert, colour_cycle), alpha is unchanged.
         
@@ -1532,6 +1605,25 @@ class LayerManager(QObject):
         """
         Apply a single action transformation to pixels.
         
+        Movement actions (scroll, rotate, mirror, flip, bounce, reveal, radial
+        spiral) run as a cached gather compiled from _transform_action_pixels();
+        colour actions call it directly. Output is identical either way.
+        """
+        stage = self._action_stage(action_type, params, step, width, height)
+        return get_automation_compiler().apply([stage], pixels)
+    
+    def _transform_action_pixels(
+        self,
+        pixels: List[Color],
+        action_type: str,
+        params: Dict,
+        step: int,
+        width: int,
+        height: int
+    ) -> List[Color]:
+        """
+        Apply a single action transformation to pixels (reference implementation).
+        
         STATELESS FRAME-INDEX DRIVEN MODEL:
         - All transformations are stateless functions: transform(pixels, step, params)
         - step = frame_index - action.start_frame (number of frames since action started)
@@ -1866,8 +1958,8 @@ class LayerManager(QObject):
         height = self._state.height()
         expected = width * height
         
-        # Start with black background
-        final = [(0, 0, 0)] * expected
+        # Start with black background (None until the first layer is composited)
+        final = None
         
         # Sort layers by order (bottom to top)
         sorted_tracks = sorted(self._layer_tracks, key=lambda t: t.order)
@@ -1916,11 +2008,17 @@ class LayerManager(QObject):
             
             # Composite using black=transparent overwrite (LMS compositing)
             # Black pixels (0,0,0) are transparent and don't overwrite lower layers
+            if final is None and len(pixels) == expected:
+                # Over the black background the bottom layer is copied as-is
+                final = list(pixels)
+                continue
+            if final is None:
+                final = [(0, 0, 0)] * expected
             for i, pixel in enumerate(pixels):
                 if pixel != (0, 0, 0):
                     final[i] = pixel
         
-        return final
+        return final if final is not None else [(0, 0, 0)] * expected
     
     def _get_composite_pixels_simple(self, frame_index: int) -> List[Color]:
         """Simple alpha blend fallback (works with LayerTracks)"""
@@ -2013,6 +2111,42 @@ class LayerManager(QObject):
             self.frame_pixels_changed.emit(frame_index)
             self.layers_changed.emit(frame_index)
 
+    def replace_pixels_batch(self, updates: Dict[int, List[Color]], layer_index: int = 0) -> None:
+        """
+        Replace pixels in one layer track for many frames at once.
+
+        Like replace_pixels(), but each frame is composited once after all
+        writes and change signals are emitted once for the whole batch.
+
+        Args:
+            updates: Frame index -> new layer pixels, as a colour list or a
+                packed (N, 3) channel array (converted to colours once, here)
+            layer_index: Target layer index
+        """
+        try:
+            from domain.edit_context import assert_not_rendering
+            assert_not_rendering()
+        except ImportError:
+            pass
+
+        if not updates or not (0 <= layer_index < len(self._layer_tracks)):
+            return
+        track = self._layer_tracks[layer_index]
+        width = self._state.width()
+        height = self._state.height()
+        for frame_index, pixels in updates.items():
+            layer_frame = track.get_or_create_frame(frame_index, width, height)
+            if hasattr(pixels, "reshape"):
+                values = iter(pixels.reshape(-1).tolist())
+                layer_frame.pixels = list(zip(values, values, values))
+            else:
+                layer_frame.pixels = list(pixels)
+            layer_frame.ensure_alpha(len(layer_frame.pixels))
+        for frame_index in updates:
+            self.sync_frame_from_layers(frame_index)
+        self.frame_pixels_changed.emit(-1)
+        self.layers_changed.emit(-1)
+
     def import_gif_to_layer(self, frames_data: List[List[Tuple[int, int, int]]], layer_index: int = 0, start_frame: int = 0, duration_ms: Optional[int] = None) -> None:
         """
         Bulk import multiple frames (e.g. from a GIF) into a specific layer track.
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 
 def _slugify(value: str) -> str:
@@ -20,6 +21,10 @@ class BitmapFont:
     width: int = 5
     height: int = 7
     glyphs: Dict[str, List[List[bool]]] = field(default_factory=dict)
+    # Bumped by update_glyph; edit glyphs through it so content_key stays current
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+    _content_key: Optional[Tuple[Tuple[int, int, int], str]] = field(
+        default=None, init=False, repr=False, compare=False)
 
     def glyph(self, char: str) -> List[List[bool]]:
         """Return glyph grid (copy) for character."""
@@ -42,6 +47,18 @@ class BitmapFont:
         while len(normalized) < self.height:
             normalized.append([False] * self.width)
         self.glyphs[char.upper()] = normalized
+        self.revision += 1
+
+    def content_key(self) -> str:
+        """Digest of the size and glyph data, recomputed only after edits."""
+        state = (self.revision, self.width, self.height)
+        if self._content_key is None or self._content_key[0] != state:
+            digest = hashlib.blake2b(f"{self.width}x{self.height}".encode("utf-8"), digest_size=16)
+            for char, grid in sorted(self.glyphs.items()):
+                rows = "/".join("".join("1" if cell else "0" for cell in row) for row in grid)
+                digest.update(f"{len(char)}:{char}{rows};".encode("utf-8"))
+            self._content_key = (state, digest.hexdigest())
+        return self._content_key[1]
 
     def to_dict(self) -> Dict:
         return {
@@ -0,0 +1,102 @@
+"""
+Glyph Atlas
+-----------
+
+Caches glyphs as row bitmasks per font and size. `GlyphProvider.glyph`
+rescales the source bitmap on every call; the atlas does that once per
+character and keeps the result as one integer per row (bit ``x`` set when
+column ``x`` is lit) plus the lit offsets in stamping order, so placing a
+glyph is a single pass over its lit pixels.
+
+Atlases are shared between renderers. Built-in font atlases are keyed by
+size; custom `BitmapFont` atlases are keyed by `BitmapFont.content_key`, a
+digest of the glyph data that is only recomputed after an edit, so editing a
+font never serves stale glyphs.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+from domain.text.bitmap_font import BitmapFont
+from domain.text.glyph_provider import GlyphProvider
+
+# Distinct (font, size) atlases kept alive
+MAX_ATLASES = 32
+
+
+@dataclass(frozen=True)
+class AtlasGlyph:
+    """One rasterized glyph."""
+
+    rows: Tuple[int, ...]
+    points: Tuple[Tuple[int, int], ...]  # Lit (x, y) offsets, row by row
+
+    @classmethod
+    def from_matrix(cls, matrix, width: int, height: int) -> "AtlasGlyph":
+        rows = []
+        points = []
+        for gy in range(min(height, len(matrix))):
+            row = matrix[gy]
+            bits = 0
+            for gx in range(min(width, len(row))):
+                if row[gx]:
+                    bits |= 1 << gx
+                    points.append((gx, gy))
+            rows.append(bits)
+        return cls(rows=tuple(rows), points=tuple(points))
+
+
+class GlyphAtlas:
+    """Lazily filled glyph cache for one font at one size."""
+
+    def __init__(self, provider: GlyphProvider):
+        self.provider = provider
+        self.width = provider.width
+        self.height = provider.height
+        self._glyphs: Dict[str, AtlasGlyph] = {}
+
+    def glyph(self, char: str) -> AtlasGlyph:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = AtlasGlyph.from_matrix(self.provider.glyph(char), self.width, self.height)
+            self._glyphs[char] = glyph
+        return glyph
+
+
+_atlases: "OrderedDict[Hashable, GlyphAtlas]" = OrderedDict()
+
+
+def _font_key(font: Optional[BitmapFont]) -> Hashable:
+    if font is None:
+        return None
+    return font.content_key()
+
+
+def get_glyph_atlas(bitmap_font: Optional[BitmapFont], width: int, height: int) -> GlyphAtlas:
+    """Shared atlas for a font (None for the built-in 5×7 font) at a glyph size."""
+    key = (_font_key(bitmap_font), width, height)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        if bitmap_font is not None:
+            # Snapshot the glyph data the key was computed from
+            bitmap_font = BitmapFont(
+                name=bitmap_font.name,
+                width=bitmap_font.width,
+                height=bitmap_font.height,
+                glyphs={char: [list(row) for row in grid] for char, grid in bitmap_font.glyphs.items()},
+            )
+        atlas = GlyphAtlas(GlyphProvider(bitmap_font=bitmap_font, width=width, height=height))
+        _atlases[key] = atlas
+        if len(_atlases) > MAX_ATLASES:
+            _atlases.popitem(last=False)
+    else:
+        _atlases.move_to_end(key)
+    return atlas
+
+
+def clear_glyph_atlases() -> None:
+    """Drop every cached atlas."""
+    _atlases.clear()
@@ -11,11 +11,20 @@ and provides helpers for scrolling and typing animations.
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import List, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
 
 from domain.text.bitmap_font import BitmapFont
+from domain.text.glyph_atlas import AtlasGlyph, get_glyph_atlas
 from domain.text.glyph_provider import GlyphProvider
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 RGB = Tuple[int, int, int]
 
 
@@ -52,6 +61,62 @@ class TextScrollOptions:
     padding: int = 0
 
 
+class TextScrollStrip:
+    """
+    Scroll workspace rendered once; every frame is a window onto it.
+
+    ``frame`` builds a frame from row slices (pixel tuples are shared, not
+    re-created) and ``window`` returns a zero-copy NumPy view, so the cost
+    of a long ticker is in producing its output rather than in text layout.
+    """
+
+    def __init__(
+        self,
+        pixels: List[RGB],
+        width: int,
+        height: int,
+        view_width: int,
+        view_height: int,
+        offsets: List[Tuple[int, int]],
+    ):
+        self.width = width
+        self.height = height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.offsets = offsets
+        self.rows = [pixels[y * width:(y + 1) * width] for y in range(height)]
+        self._array = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def frame(self, offset: Tuple[int, int]) -> List[RGB]:
+        """Flattened frame pixels for a window offset."""
+        return TextRenderer._crop_rows(self.rows, self.width, self.view_width, self.view_height, offset)
+
+    def frames(self) -> Iterator[List[RGB]]:
+        for offset in self.offsets:
+            yield self.frame(offset)
+
+    def array(self):
+        """Whole workspace as an (height, width, 3) uint8 array."""
+        if self._array is None:
+            self._array = np.array(self.rows, dtype=np.uint8).reshape(self.height, self.width, 3)
+        return self._array
+
+    def window(self, offset: Tuple[int, int]):
+        """(view_height, view_width, 3) view of the workspace at an offset."""
+        ox, oy = offset
+        if 0 <= ox <= self.width - self.view_width and 0 <= oy <= self.height - self.view_height:
+            return self.array()[oy:oy + self.view_height, ox:ox + self.view_width]
+        # Partly outside the workspace: pad with black, as frame() does
+        return np.array(self.frame(offset), dtype=np.uint8).reshape(self.view_height, self.view_width, 3)
+
+    def windows(self) -> Iterator:
+        for offset in self.offsets:
+            yield self.window(offset)
+
+
 class TextRenderer:
     """Render text into RGB pixel buffers suitable for LED frames."""
 
@@ -86,8 +151,7 @@ class TextRenderer:
         if not text:
             return pixels
 
-        glyph_provider = self._glyph_provider_for_options(options)
-        char_width, char_height = self._char_dimensions(options, glyph_provider)
+        char_width, char_height = self._char_dimensions(options, self._provider)
         lines = self._prepare_lines(text, options)
         
         # Branch for System Font (PIL) rendering
@@ -95,6 +159,7 @@ class TextRenderer:
             drawn_points = self._render_via_pil(text, lines, options)
         else:
             # Traditional Bitmap rendering
+            atlas = get_glyph_atlas(options.bitmap_font, char_width, char_height)
             drawn_points = []
             content_height = self._compute_content_height(len(lines), char_height, options.line_spacing)
             start_y = self._align_vertical(height, content_height)
@@ -106,18 +171,15 @@ class TextRenderer:
                 cursor_y = start_y + line_idx * (char_height + options.line_spacing) - offset_y
 
                 for char in line:
-                    glyph = glyph_provider.glyph(char)
                     drawn_points.extend(
-                        self._stamp_glyph(
-                            glyph,
+                        self._place_glyph(
+                            atlas.glyph(char),
                             cursor_x,
                             cursor_y,
                             char_width,
                             char_height,
                             width,
                             height,
-                            pixels,
-                            record_only=True,
                         )
                     )
                     cursor_x += char_width + options.spacing
@@ -160,27 +222,27 @@ class TextRenderer:
         """Generate scrolling frames using a sliding window approach."""
         if not text:
             return [self.render_pixels("", options)]
+        return list(self.render_scroll_strip(text, options, scroll).frames())
 
-        glyph_provider = self._glyph_provider_for_options(options)
-        char_width, char_height = self._char_dimensions(options, glyph_provider)
+    def render_scroll_strip(
+        self,
+        text: str,
+        options: TextRenderOptions,
+        scroll: TextScrollOptions,
+    ) -> TextScrollStrip:
+        """Render the scroll workspace once, with the window offset of every frame."""
+        char_width, char_height = self._char_dimensions(options, self._provider)
         work_opts, total_steps = self._build_scroll_workspace(text, options, scroll, char_width, char_height)
         base_pixels = self.render_pixels(text, work_opts)
-        frames: List[List[Tuple[int, int, int]]] = []
-
-        for step in range(0, total_steps, max(1, scroll.step)):
-            offset = self._scroll_offset(step, scroll, work_opts, options)
-            cropped = self._crop_pixels(base_pixels, work_opts.width, options.width, options.height, offset)
-            frames.append(cropped)
-        return frames
+        offsets = [
+            self._scroll_offset(step, scroll, work_opts, options)
+            for step in range(0, total_steps, max(1, scroll.step))
+        ]
+        return TextScrollStrip(base_pixels, work_opts.width, work_opts.height, options.width, options.height, offsets)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _glyph_provider_for_options(self, options: TextRenderOptions) -> GlyphProvider:
-        char_width, char_height = self._char_dimensions(options, self._provider)
-        provider = GlyphProvider(bitmap_font=options.bitmap_font, width=char_width, height=char_height)
-        return provider
-
     @staticmethod
     def _char_dimensions(options: TextRenderOptions, provider: GlyphProvider) -> Tuple[int, int]:
         if options.bitmap_font:
@@ -226,32 +288,24 @@ class TextRenderer:
         return max(0, (height - content_height) // 2)
 
     @staticmethod
-    def _stamp_glyph(
-        glyph: Sequence[Sequence[bool]],
+    def _place_glyph(
+        glyph: AtlasGlyph,
         origin_x: int,
         origin_y: int,
         glyph_width: int,
         glyph_height: int,
         canvas_width: int,
         canvas_height: int,
-        pixels: List[RGB],
-        record_only: bool = False,
     ) -> List[Tuple[int, int]]:
-        drawn: List[Tuple[int, int]] = []
-        for gy in range(min(glyph_height, len(glyph))):
-            row = glyph[gy]
-            for gx in range(min(glyph_width, len(row))):
-                if not row[gx]:
-                    continue
-                x = origin_x + gx
-                y = origin_y + gy
-                if 0 <= x < canvas_width and 0 <= y < canvas_height:
-                    if record_only:
-                        drawn.append((x, y))
-                    else:
-                        idx = y * canvas_width + x
-                        pixels[idx] = (255, 255, 255)
-        return drawn
+        """Canvas coordinates of a glyph's lit pixels, row by row."""
+        if (0 <= origin_x and origin_x + glyph_width <= canvas_width
+                and 0 <= origin_y and origin_y + glyph_height <= canvas_height):
+            return [(origin_x + gx, origin_y + gy) for gx, gy in glyph.points]
+        return [
+            (x, y)
+            for x, y in ((origin_x + gx, origin_y + gy) for gx, gy in glyph.points)
+            if 0 <= x < canvas_width and 0 <= y < canvas_height
+        ]
 
     def _apply_shadow(
         self,
@@ -280,20 +334,30 @@ class TextRenderer:
     ) -> None:
         outline_color = options.outline_color or options.color
         thickness = max(1, options.outline_thickness)
-        point_set = set(points)
-        for x, y in list(points):
-            for dx in range(-thickness, thickness + 1):
-                for dy in range(-thickness, thickness + 1):
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx = x + dx
-                    ny = y + dy
-                    if (nx, ny) in point_set:
-                        continue
-                    if 0 <= nx < width and 0 <= ny < height:
-                        idx = ny * width + nx
-                        if pixels[idx] == options.background:
-                            pixels[idx] = outline_color
+        # Points lie on the canvas; dilate them as per-row bitmasks (the
+        # square neighbourhood is separable: widen rows, then OR nearby rows)
+        full = (1 << width) - 1
+        point_rows = [0] * height
+        for x, y in points:
+            point_rows[y] |= 1 << x
+        wide_rows = []
+        for bits in point_rows:
+            wide = bits
+            for d in range(1, thickness + 1):
+                wide |= (bits << d) | (bits >> d)
+            wide_rows.append(wide & full)
+        for y in range(height):
+            ring = 0
+            for ny in range(max(0, y - thickness), min(height, y + thickness + 1)):
+                ring |= wide_rows[ny]
+            ring &= ~point_rows[y]
+            if not ring:
+                continue
+            row_start = y * width
+            for x in _bit_positions(ring):
+                idx = row_start + x
+                if pixels[idx] == options.background:
+                    pixels[idx] = outline_color
 
     def _apply_fill(
         self,
@@ -309,9 +373,19 @@ class TextRenderer:
         max_y = max(y for _, y in points)
         min_x = min(x for x, _ in points)
         max_x = max(x for x, _ in points)
+        if not options.gradient:
+            for x, y in points:
+                pixels[y * width + x] = options.color
+            return
+        # Gradient colour depends on one axis only
+        horizontal = options.gradient_orientation == "horizontal"
+        colors = {}
         for x, y in points:
-            idx = y * width + x
-            pixels[idx] = self._pixel_color(x, y, min_x, max_x, min_y, max_y, options)
+            key = x if horizontal else y
+            color = colors.get(key)
+            if color is None:
+                color = colors[key] = self._pixel_color(x, y, min_x, max_x, min_y, max_y, options)
+            pixels[y * width + x] = color
 
     @staticmethod
     def _pixel_color(
@@ -384,86 +458,130 @@ class TextRenderer:
         target_height: int,
         offset: Tuple[int, int],
     ) -> List[RGB]:
+        source_height = len(pixels) // source_width
+        rows = [pixels[y * source_width:(y + 1) * source_width] for y in range(source_height)]
+        return TextRenderer._crop_rows(rows, source_width, target_width, target_height, offset)
+
+    @staticmethod
+    def _crop_rows(
+        rows: List[List[RGB]],
+        source_width: int,
+        target_width: int,
+        target_height: int,
+        offset: Tuple[int, int],
+    ) -> List[RGB]:
+        """Crop a window from row lists; areas outside the source are black."""
         ox, oy = offset
+        blank = [(0, 0, 0)] * target_width  # Default background
+        left = min(target_width, max(0, -ox))
+        start = max(0, ox)
+        stop = max(start, min(source_width, ox + target_width))
+        right = target_width - left - (stop - start)
         cropped: List[RGB] = []
-        source_height = len(pixels) // source_width
-        for row in range(target_height):
-            src_y = row + oy
-            # Corrected cropping bounds check
-            if 0 <= src_y < source_height:
-                for col in range(target_width):
-                    src_x = col + ox
-                    if 0 <= src_x < source_width:
-                        idx = src_y * source_width + src_x
-                        cropped.append(pixels[idx])
-                    else:
-                        cropped.append((0, 0, 0)) # Default background
+        for src_y in range(oy, oy + target_height):
+            if 0 <= src_y < len(rows):
+                if left:
+                    cropped.extend(blank[:left])
+                cropped.extend(rows[src_y][start:stop])
+                if right:
+                    cropped.extend(blank[:right])
             else:
-                for _ in range(target_width):
-                    cropped.append((0, 0, 0))
+                cropped.extend(blank)
         return cropped
 
     def _render_via_pil(self, text: str, lines: List[str], options: TextRenderOptions) -> List[Tuple[int, int]]:
         """Render text using PIL and return a list of lit pixel coordinates."""
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Try to load the font
+        return list(_rasterize_pil_lines(
+            tuple(lines),
+            options.font_name,
+            options.font_size,
+            options.alignment,
+            options.width,
+            options.height,
+            options.line_spacing,
+        ))
+
+
+def _bit_positions(bits: int) -> Iterator[int]:
+    """Indices of the set bits of a non-negative int, lowest first."""
+    binary = bin(bits)[:1:-1]
+    position = binary.find("1")
+    while position != -1:
+        yield position
+        position = binary.find("1", position + 1)
+
+
+@lru_cache(maxsize=16)
+def _load_pil_font(font_name: str, font_size: int):
+    from PIL import ImageFont
+
+    # Try to load the font
+    try:
+        # Handle possible family name or path
+        if not font_name.lower().endswith(('.ttf', '.otf')):
+            # Try common locations or just let PIL find it by name
+            return ImageFont.truetype(font_name, font_size)
+        return ImageFont.truetype(font_name, font_size)
+    except Exception:
         try:
-            # Handle possible family name or path
-            font_name = options.font_name
-            if not font_name.lower().endswith(('.ttf', '.otf')):
-                # Try common locations or just let PIL find it by name
-                font = ImageFont.truetype(font_name, options.font_size)
-            else:
-                font = ImageFont.truetype(font_name, options.font_size)
+            # Fallback to load by family name if path failed
+            return ImageFont.truetype("arial.ttf", font_size)
         except Exception:
-            try:
-                # Fallback to load by family name if path failed
-                font = ImageFont.truetype("arial.ttf", options.font_size)
-            except Exception:
-                font = ImageFont.load_default()
-
-        # Measure text to center it
-        # We render to a temporary high-res image and then extract points
-        # For simplicity, we create an image larger than the target and center it
-        temp_img = Image.new('L', (options.width * 2, options.height * 2), 0)
-        draw = ImageDraw.Draw(temp_img)
-        
-        # Calculate total height
-        total_height = 0
-        line_heights = []
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=font)
-            h = bbox[3] - bbox[1]
-            line_heights.append(h)
-            total_height += h + options.line_spacing
-        
-        start_y = (temp_img.height - total_height) // 2
-        
-        for i, line in enumerate(lines):
-            bbox = draw.textbbox((0, 0), line, font=font)
-            line_width = bbox[2] - bbox[0]
-            
-            if options.alignment == "left":
-                x = (temp_img.width - options.width) // 2
-            elif options.alignment == "right":
-                x = (temp_img.width + options.width) // 2 - line_width
-            else: # center
-                x = (temp_img.width - line_width) // 2
-                
-            draw.text((x, start_y), line, font=font, fill=255)
-            start_y += line_heights[i] + options.line_spacing
-            
-        # Extract points that fall within the central window
-        points = []
-        win_x = (temp_img.width - options.width) // 2
-        win_y = (temp_img.height - options.height) // 2
-        
-        for y in range(options.height):
-            for x in range(options.width):
-                if temp_img.getpixel((win_x + x, win_y + y)) > 128:
-                    points.append((x, y))
-                    
-        return points
-
+            return ImageFont.load_default()
+
+
+@lru_cache(maxsize=64)
+def _rasterize_pil_lines(
+    lines: Tuple[str, ...],
+    font_name: str,
+    font_size: int,
+    alignment: str,
+    width: int,
+    height: int,
+    line_spacing: int,
+) -> Tuple[Tuple[int, int], ...]:
+    """Lit pixel coordinates of system-font text (cached: PIL rasterization is slow)."""
+    from PIL import Image, ImageDraw
+
+    font = _load_pil_font(font_name, font_size)
+
+    # Measure text to center it
+    # We render to a temporary high-res image and then extract points
+    # For simplicity, we create an image larger than the target and center it
+    temp_img = Image.new('L', (width * 2, height * 2), 0)
+    draw = ImageDraw.Draw(temp_img)
+
+    # Calculate total height
+    total_height = 0
+    line_heights = []
+    for line in lines:
+        bbox = draw.textbbox((0, 0), line, font=font)
+        h = bbox[3] - bbox[1]
+        line_heights.append(h)
+        total_height += h + line_spacing
+
+    start_y = (temp_img.height - total_height) // 2
+
+    for i, line in enumerate(lines):
+        bbox = draw.textbbox((0, 0), line, font=font)
+        line_width = bbox[2] - bbox[0]
 
+        if alignment == "left":
+            x = (temp_img.width - width) // 2
+        elif alignment == "right":
+            x = (temp_img.width + width) // 2 - line_width
+        else: # center
+            x = (temp_img.width - line_width) // 2
+
+        draw.text((x, start_y), line, font=font, fill=255)
+        start_y += line_heights[i] + line_spacing
+
+    # Extract points that fall within the central window
+    win_x = (temp_img.width - width) // 2
+    win_y = (temp_img.height - height) // 2
+    if width <= 0 or height <= 0:
+        return ()
+    window = temp_img.crop((win_x, win_y, win_x + width, win_y + height)).tobytes()
+    return tuple(
+        (i % width, i // width) for i, value in enumerate(window) if value > 128
+    )
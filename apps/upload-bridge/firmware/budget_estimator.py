@@ -0,0 +1,351 @@
+"""
+Firmware Budget Estimator - Flash, RAM and timing budget before a build
+
+Runs the generator in a dry run (into a scratch directory, without touching
+the output project) and measures the result instead of guessing:
+
+- Flash: the frame data as the generator's encoder emits it (raw or
+  compressed) plus the brightness tables and speed keyframes.
+- RAM: the statically allocated globals of the generated player source,
+  with struct padding for the chip's word size (stack and library heap
+  are not included).
+- Frame render time: LED count against the LED protocol's bit timing.
+- Upload time: measured throughput of earlier uploads to the chip, from
+  the metrics collector.
+"""
+
+import logging
+import math
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.metrics_collector import MetricsCollector, get_metrics_collector
+from core.pattern import Pattern
+from .frame_codec import HEADER_BYTES
+from .universal_pattern_generator import UniversalPatternGenerator
+
+logger = logging.getLogger(__name__)
+
+BRIGHTNESS_LUT_BYTES = 3 * 256
+RAW_FRAME_DELAY_BYTES = 2  # Per-frame delay in the uncompressed layout
+RAM_WARNING_RATIO = 0.75  # Leave the rest for stack and libraries
+
+
+@dataclass(frozen=True)
+class LedProtocol:
+    """Wire timing of an LED chip"""
+    name: str
+    bit_rate_hz: int
+    bits_per_led: int
+    reset_us: float = 0.0
+    spi_frame_bits: bool = False  # APA102-style start/end frames
+
+    def frame_us(self, led_count: int) -> float:
+        """Microseconds to clock out one frame, including the latch/reset"""
+        bits = led_count * self.bits_per_led
+        if self.spi_frame_bits:
+            bits += 32 + 16 * math.ceil(led_count / 16)
+        return bits * 1_000_000 / self.bit_rate_hz + self.reset_us
+
+
+WS2812_PROTOCOL = LedProtocol("WS2812", 800_000, 24, reset_us=50)
+
+LED_PROTOCOLS: Dict[str, LedProtocol] = {
+    "ws2812": WS2812_PROTOCOL,
+    "ws2812b": LedProtocol("WS2812B", 800_000, 24, reset_us=280),
+    "neopixel": LedProtocol("WS2812B", 800_000, 24, reset_us=280),
+    "ws2811": LedProtocol("WS2811", 800_000, 24, reset_us=280),
+    "sk6812": LedProtocol("SK6812", 800_000, 24, reset_us=80),
+    "apa102": LedProtocol("APA102", 4_000_000, 32, spi_frame_bits=True),
+    "apa102c": LedProtocol("APA102", 4_000_000, 32, spi_frame_bits=True),
+    "dotstar": LedProtocol("APA102", 4_000_000, 32, spi_frame_bits=True),
+}
+
+_TYPE_SIZES = {
+    "bool": 1, "char": 1, "int8_t": 1, "uint8_t": 1,
+    "int16_t": 2, "uint16_t": 2,
+    "int": 2, "int32_t": 4, "uint32_t": 4, "float": 4,
+    "CRGB": 3,
+}
+_STRUCT = re.compile(r"(?:typedef\s+)?struct\s*(\w*)\s*\{([^{}]*)\}\s*(\w*)\s*;")
+_DECLARATION = re.compile(r"^(?:static\s+)?(?:volatile\s+)?(?:struct\s+)?(\w+)\s+(\w+)\s*(?:\[([^\]]+)\])?\s*(?:=[^;]*)?;$")
+_DEFINE = re.compile(r"^#define\s+(\w+)\s+\(?(\d+)\)?")
+
+
+def _word_bytes(chip_id: str) -> int:
+    """Struct alignment: 8-bit AVR/PIC cores pack structs, 32-bit cores align to 4"""
+    return 1 if chip_id.startswith(("atmega", "attiny", "pic")) else 4
+
+
+def _sizeof(type_name: str, structs: Dict[str, int], word: int) -> Optional[int]:
+    if type_name in structs:
+        return structs[type_name]
+    size = _TYPE_SIZES.get(type_name)
+    if type_name == "int" and word == 4:
+        size = 4
+    return size
+
+
+def _struct_sizes(source: str, word: int) -> Dict[str, int]:
+    """Sizes of the structs defined in ``source``, with natural alignment up to ``word``"""
+    structs: Dict[str, int] = {}
+    for match in _STRUCT.finditer(source):
+        offset = 0
+        largest = 1
+        for member in re.sub(r"//[^\n]*", "", match.group(2)).split(";"):
+            parts = member.split()
+            if len(parts) < 2:
+                continue
+            size = _sizeof(parts[-2], structs, word) or word
+            align = min(size, word)
+            largest = max(largest, align)
+            offset = -(-offset // align) * align + size
+        size = -(-offset // largest) * largest
+        for name in (match.group(1), match.group(3)):
+            if name:
+                structs[name] = size
+    return structs
+
+
+def _eval_dimension(expr: str, defines: Dict[str, int]) -> Optional[int]:
+    expr = re.sub(r"\b[A-Za-z_]\w*\b", lambda m: str(defines.get(m.group(0), m.group(0))), expr)
+    if not re.fullmatch(r"[\d\s+\-*/()]+", expr):
+        return None
+    return int(eval(expr, {"__builtins__": {}}))  # Digits and operators only
+
+
+def static_ram_bytes(source: str, chip_id: str, defines: Optional[Dict[str, int]] = None,
+                     enabled: Optional[set] = None) -> int:
+    """
+    Bytes of statically allocated RAM declared at file scope in C source
+
+    ``const`` and ``PROGMEM`` data is treated as flash. Preprocessor blocks
+    are followed for ``#ifdef``/``#ifndef`` on names in ``enabled`` or
+    ``defines``; other ``#if`` blocks are assumed active.
+
+    Args:
+        source: Player source
+        chip_id: Chip identifier (selects struct alignment)
+        defines: Numeric macros (LED_COUNT, ...); ``#define`` lines in the
+            source add to them
+        enabled: Extra macro names defined without a value
+    """
+    word = _word_bytes(chip_id)
+    defines = dict(defines or {})
+    enabled = set(enabled or ()) | set(defines)
+    structs = _struct_sizes(source, word)
+    total = 0
+    depth = 0
+    active = [True]
+    for raw_line in source.splitlines():
+        line = re.sub(r'"(?:\\.|[^"\\])*"', '""', raw_line.split("//")[0]).strip()
+        if line.startswith("#"):
+            directive = line.split()
+            keyword = directive[0]
+            if keyword in ("#ifdef", "#ifndef"):
+                hit = len(directive) > 1 and directive[1] in enabled
+                active.append(active[-1] and (hit if keyword == "#ifdef" else not hit))
+            elif keyword == "#if":
+                active.append(active[-1] and line != "#if 0")
+            elif keyword == "#else" and len(active) > 1:
+                active[-1] = active[-2] and not active[-1]
+            elif keyword == "#endif" and len(active) > 1:
+                active.pop()
+            elif keyword == "#define" and active[-1]:
+                match = _DEFINE.match(line)
+                if match and match.group(1) not in defines:
+                    defines[match.group(1)] = int(match.group(2))
+                if len(directive) > 1:
+                    enabled.add(directive[1])
+            continue
+
+        if active[-1] and depth == 0 and "const" not in line and "PROGMEM" not in line:
+            match = _DECLARATION.match(line)
+            if match and match.group(1) not in ("return", "typedef"):
+                size = _sizeof(match.group(1), structs, word)
+                count = 1
+                if match.group(3):
+                    count = _eval_dimension(match.group(3), defines)
+                if size is not None and count is not None:
+                    total += size * count
+        depth += line.count("{") - line.count("}")
+    return total
+
+
+@dataclass
+class FirmwareBudget:
+    """Flash, RAM and timing budget of a pattern on one chip"""
+    chip_id: str
+    led_count: int  # LEDs the firmware drives (after chip limits)
+    pattern_led_count: int  # LEDs in the pattern
+    max_leds: int  # Most LEDs the chip's player drives
+    frame_count: int
+    compressed: bool
+    data_bytes: int  # Frame data as emitted (raw or compressed)
+    table_bytes: int  # Brightness tables, speed keyframes and frame count
+    flash_budget_bytes: int  # Flash left for data after the player reserve
+    ram_bytes: int  # Player globals
+    ram_budget_bytes: int
+    protocol: str
+    frame_render_ms: float  # Time to clock one frame out to the LEDs
+    min_frame_ms: int  # Shortest frame duration in the pattern
+    upload_bytes: int  # Estimated firmware image size
+    upload_seconds: Optional[float] = None  # None without upload history for the chip
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def flash_bytes(self) -> int:
+        return self.data_bytes + self.table_bytes
+
+    @property
+    def fits_flash(self) -> bool:
+        return self.flash_bytes <= self.flash_budget_bytes
+
+    @property
+    def fits_ram(self) -> bool:
+        return self.ram_bytes <= self.ram_budget_bytes
+
+    @property
+    def fits_leds(self) -> bool:
+        return self.pattern_led_count <= self.max_leds
+
+    @property
+    def fits(self) -> bool:
+        return self.fits_leds and self.fits_flash and self.fits_ram
+
+    @property
+    def max_fps(self) -> float:
+        """Highest frame rate the LED protocol allows"""
+        return 1000.0 / self.frame_render_ms if self.frame_render_ms else math.inf
+
+    def summary(self) -> str:
+        upload = f"{self.upload_seconds:.0f}s upload" if self.upload_seconds is not None else "upload time unknown"
+        return (
+            f"{self.chip_id}: flash {self.flash_bytes}/{self.flash_budget_bytes} bytes"
+            f"{' (compressed)' if self.compressed else ''}, RAM {self.ram_bytes}/{self.ram_budget_bytes} bytes, "
+            f"{self.frame_render_ms:.2f} ms/frame ({self.protocol}), {upload}"
+        )
+
+
+class BudgetEstimator:
+    """
+    Estimates a pattern's firmware budget per chip from a generator dry run
+    """
+
+    def __init__(self, generator: Optional[UniversalPatternGenerator] = None,
+                 metrics: Optional[MetricsCollector] = None):
+        """
+        Args:
+            generator: Generator to dry-run (a fresh one by default)
+            metrics: Upload history (the global collector by default)
+        """
+        self.generator = generator or UniversalPatternGenerator()
+        self.metrics = metrics or get_metrics_collector()
+
+    def estimate(self, pattern: Pattern, chip_id: str, config: Optional[Dict] = None) -> FirmwareBudget:
+        """
+        Budget of ``pattern`` on ``chip_id``
+
+        Args:
+            pattern: Pattern to embed
+            chip_id: Target chip identifier
+            config: Generator configuration (compress_frames, palette_max_colors, ...)
+
+        Raises:
+            ValueError: Unsupported chip
+        """
+        if chip_id not in self.generator.chip_capabilities:
+            raise ValueError(f"Unsupported chip: {chip_id}")
+        capabilities = self.generator.chip_capabilities[chip_id]
+        config = dict(config or {})
+        config.setdefault('gpio_pin', 2)
+
+        with tempfile.TemporaryDirectory(prefix="budget_") as scratch:
+            main_file = Path(self.generator.generate_universal_firmware(pattern, chip_id, scratch, config))
+            source = main_file.read_text(encoding="utf-8")
+            header = (Path(scratch) / "pattern_data.h").read_text(encoding="utf-8")
+        compressed = "#define PATTERN_COMPRESSED 1" in header
+        report = self.generator.last_size_report
+        limited = self.generator._limit_pattern_for_chip(pattern, chip_id)
+        led_count = limited.led_count
+
+        enabled = {"PATTERN_COMPRESSED"} if compressed else set()
+        # The header defines the decoder's stream state type and holds no RAM data itself
+        ram_bytes = static_ram_bytes(header + "\n" + source, chip_id, {"LED_COUNT": led_count}, enabled)
+
+        keyframes = len(limited.metadata.speed_keyframes or [])
+        keyframe_size = 2 + (4 if capabilities['supports_float'] else 1)
+        keyframe_size = -(-keyframe_size // _word_bytes(chip_id)) * _word_bytes(chip_id)
+        table_bytes = BRIGHTNESS_LUT_BYTES + keyframes * keyframe_size + 2
+
+        led_type = str(getattr(pattern.metadata, 'led_type', None) or 'ws2812').lower()
+        protocol = LED_PROTOCOLS.get(led_type, WS2812_PROTOCOL)
+        render_ms = protocol.frame_us(led_count) / 1000.0
+        min_frame_ms = min((f.duration_ms for f in limited.frames), default=0)
+
+        data_bytes = report.compressed_bytes if compressed else report.raw_bytes
+        upload_bytes = capabilities['code_reserve_bytes'] + data_bytes + table_bytes
+        budget = FirmwareBudget(
+            chip_id=chip_id,
+            led_count=led_count,
+            pattern_led_count=pattern.led_count,
+            max_leds=capabilities['max_leds'],
+            frame_count=limited.frame_count,
+            compressed=compressed,
+            data_bytes=data_bytes,
+            table_bytes=table_bytes,
+            flash_budget_bytes=report.flash_budget_bytes,
+            ram_bytes=ram_bytes,
+            ram_budget_bytes=capabilities['ram_bytes'],
+            protocol=protocol.name,
+            frame_render_ms=render_ms,
+            min_frame_ms=min_frame_ms,
+            upload_bytes=upload_bytes,
+            upload_seconds=self.metrics.estimate_upload_seconds(upload_bytes, chip_id),
+        )
+        self._add_warnings(budget, report.fits_compressed)
+        logger.debug(budget.summary())
+        return budget
+
+    @staticmethod
+    def raw_data_bytes(pattern: Pattern) -> int:
+        """
+        Uncompressed frame data size, before any chip limits
+
+        Matches the raw layout the frame encoder reports: a stream header,
+        then a delay and RGB bytes for every frame.
+        """
+        return HEADER_BYTES + sum(RAW_FRAME_DELAY_BYTES + 3 * frame.led_count for frame in pattern.frames)
+
+    def estimate_all(self, pattern: Pattern, config: Optional[Dict] = None) -> List[FirmwareBudget]:
+        """``estimate`` for every chip the generator supports"""
+        return [self.estimate(pattern, chip_id, config) for chip_id in self.generator.chip_capabilities]
+
+    def _add_warnings(self, budget: FirmwareBudget, fits_compressed: bool) -> None:
+        if not budget.fits_leds:
+            budget.warnings.append(
+                f"Pattern has {budget.pattern_led_count} LEDs but {budget.chip_id} drives at most "
+                f"{budget.max_leds}; the remaining {budget.pattern_led_count - budget.max_leds} would be dropped"
+            )
+        if not budget.fits_flash:
+            hint = " (fits with compress_frames)" if not budget.compressed and fits_compressed else ""
+            budget.warnings.append(
+                f"Pattern data needs {budget.flash_bytes} bytes of flash but only "
+                f"{budget.flash_budget_bytes} are available{hint}"
+            )
+        if not budget.fits_ram:
+            budget.warnings.append(
+                f"Player needs {budget.ram_bytes} bytes of RAM but {budget.chip_id} has {budget.ram_budget_bytes}"
+            )
+        elif budget.ram_bytes > budget.ram_budget_bytes * RAM_WARNING_RATIO:
+            budget.warnings.append(
+                f"Player uses {budget.ram_bytes} of {budget.ram_budget_bytes} bytes of RAM; little is left for the stack"
+            )
+        if budget.min_frame_ms and budget.min_frame_ms < budget.frame_render_ms:
+            budget.warnings.append(
+                f"Frames as short as {budget.min_frame_ms} ms but {budget.led_count} {budget.protocol} LEDs "
+                f"take {budget.frame_render_ms:.2f} ms to update (max {budget.max_fps:.0f} FPS)"
+            )
@@ -0,0 +1,362 @@
+"""
+Firmware Build Cache - Content-addressed cache of built firmware artifacts
+
+Flashing the same pattern to the same chip twice should not rerun the
+toolchain. Artifacts are keyed by a hash of everything that determines the
+binary:
+
+- pattern content (frames, durations, metadata)
+- chip id
+- template version (hash of the template directory)
+- generator version (hash of the uploader and firmware generator sources)
+- build options (excluding input/output locations)
+- toolchain version (``UploaderBase.get_toolchain_version``)
+
+Artifacts live on disk with an LRU index and are evicted oldest-first once
+the cache exceeds its size budget.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import logging
+import threading
+import dataclasses
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+
+from core.pattern import Pattern
+from uploaders.base import BuildResult, UploaderBase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".upload_bridge" / "build_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Build options that only locate inputs/outputs; template content is hashed separately
+_LOCATION_OPTS = {'output_dir', 'project_dir', 'template_path', 'use_cache'}
+
+_version_lock = threading.Lock()
+_dir_hashes: Dict[str, tuple] = {}
+_file_hashes: Dict[str, tuple] = {}
+
+
+def pattern_fingerprint(pattern: Pattern) -> str:
+    """
+    Content hash of a pattern: frame pixels, durations and metadata.
+
+    Two patterns with the same fingerprint produce identical firmware.
+    """
+    digest = hashlib.sha256()
+    metadata = dataclasses.asdict(pattern.metadata)
+    digest.update(json.dumps(metadata, sort_keys=True, default=str).encode("utf-8"))
+    for frame in pattern.frames:
+        digest.update(frame.duration_ms.to_bytes(4, "little", signed=False))
+        digest.update(frame.to_bytes())
+    return digest.hexdigest()
+
+
+def _hash_file(path: Path) -> str:
+    """SHA256 of a file, memoized on (size, mtime)."""
+    stat = path.stat()
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    key = str(path)
+    with _version_lock:
+        cached = _file_hashes.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    value = hashlib.sha256(path.read_bytes()).hexdigest()
+    with _version_lock:
+        _file_hashes[key] = (stamp, value)
+    return value
+
+
+def template_version(template_dir: Optional[Path]) -> str:
+    """Hash of every file in a template directory (memoized on mtimes)."""
+    if not template_dir or not Path(template_dir).exists():
+        return "none"
+    template_dir = Path(template_dir)
+    files = sorted(p for p in template_dir.rglob("*") if p.is_file())
+    stamp = tuple((str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+    key = str(template_dir.resolve())
+    with _version_lock:
+        cached = _dir_hashes.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.relative_to(template_dir)).encode("utf-8"))
+        digest.update(_hash_file(path).encode("ascii"))
+    value = digest.hexdigest()
+    with _version_lock:
+        _dir_hashes[key] = (stamp, value)
+    return value
+
+
+def generator_version(uploader: UploaderBase) -> str:
+    """Hash of the uploader module and the firmware generator sources."""
+    digest = hashlib.sha256()
+    sources = [Path(inspect.getfile(type(uploader)))]
+    sources += sorted(Path(__file__).parent.glob("*.py"))
+    for path in sources:
+        if path.exists():
+            digest.update(_hash_file(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+@dataclasses.dataclass
+class BuildCacheStats:
+    """Hit/miss counters for one cache instance"""
+    hits: int = 0
+    misses: int = 0
+    time_saved_seconds: float = 0.0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "time_saved_seconds": round(self.time_saved_seconds, 3),
+            "evictions": self.evictions,
+        }
+
+
+class FirmwareBuildCache:
+    """
+    On-disk, size-bounded LRU cache of firmware artifacts
+
+    Layout: ``<cache_dir>/<key><suffix>`` plus ``index.json`` holding size,
+    last use time, original build time and BuildResult fields per key.
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize build cache
+
+        Args:
+            cache_dir: Cache directory (default: ~/.upload_bridge/build_cache)
+            max_bytes: Total artifact size budget
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.stats = BuildCacheStats()
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._load_index()
+
+    # Index persistence
+
+    def _index_path(self) -> Path:
+        return self.cache_dir / self.INDEX_NAME
+
+    def _load_index(self) -> None:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def _save_index(self) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._index_path().with_suffix(".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self._index_path())
+        except OSError as e:
+            logger.warning(f"Could not save build cache index: {e}")
+
+    # Keys
+
+    def make_key(self, pattern: Pattern, uploader: UploaderBase, build_opts: Dict[str, Any]) -> str:
+        """Compute the cache key for a build"""
+        template_path = build_opts.get('template_path')
+        if not template_path:
+            template_path = Path(__file__).parent / "templates" / uploader.chip_id
+        options = {k: v for k, v in build_opts.items() if k not in _LOCATION_OPTS}
+        parts = {
+            "pattern": pattern_fingerprint(pattern),
+            "chip_id": uploader.chip_id,
+            "template": template_version(Path(template_path)),
+            "generator": generator_version(uploader),
+            "options": options,
+            "toolchain": uploader.get_toolchain_version(),
+        }
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # Lookup / store
+
+    def get(self, key: str, output_dir: Optional[Path] = None) -> Optional[BuildResult]:
+        """
+        Look up an artifact
+
+        On a hit the artifact is copied into ``output_dir`` (when given) so
+        callers see the same file location as after a real build.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            path = self.cache_dir / entry["file"] if entry else None
+            if not entry or not path.exists():
+                if entry:
+                    del self._index[key]
+                self.stats.misses += 1
+                return None
+
+            entry["last_used"] = time.time()
+            self.stats.hits += 1
+            self.stats.time_saved_seconds += entry.get("build_seconds", 0.0)
+            self._save_index()
+
+        firmware_path = path
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            firmware_path = output_dir / entry["name"]
+            shutil.copy2(path, firmware_path)
+
+        return BuildResult(
+            success=True,
+            firmware_path=str(firmware_path),
+            binary_type=entry["binary_type"],
+            size_bytes=entry["size_bytes"],
+            chip_model=entry["chip_model"],
+            warnings=list(entry.get("warnings", [])),
+            cache_hit=True,
+            build_seconds=0.0,
+        )
+
+    def put(self, key: str, result: BuildResult, build_seconds: float) -> bool:
+        """
+        Store a successful build
+
+        Returns:
+            True if the artifact was cached
+        """
+        source = Path(result.firmware_path)
+        if not result.success or not source.is_file():
+            return False
+
+        size = source.stat().st_size
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            file_name = f"{key}{source.suffix}"
+            shutil.copy2(source, self.cache_dir / file_name)
+            self._index[key] = {
+                "file": file_name,
+                "name": source.name,
+                "size": size,
+                "last_used": time.time(),
+                "build_seconds": build_seconds,
+                "binary_type": result.binary_type,
+                "size_bytes": result.size_bytes,
+                "chip_model": result.chip_model,
+                "warnings": list(result.warnings or []),
+            }
+            self._evict()
+            self._save_index()
+        return True
+
+    def _evict(self) -> None:
+        """Drop least-recently-used artifacts until under budget (lock held)"""
+        total = sum(e["size"] for e in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                (self.cache_dir / entry["file"]).unlink()
+            except OSError:
+                pass
+            total -= entry["size"]
+            del self._index[key]
+            self.stats.evictions += 1
+
+    def total_bytes(self) -> int:
+        """Current artifact bytes on disk"""
+        with self._lock:
+            return sum(e["size"] for e in self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def clear(self) -> None:
+        """Remove all cached artifacts"""
+        with self._lock:
+            for entry in self._index.values():
+                try:
+                    (self.cache_dir / entry["file"]).unlink()
+                except OSError:
+                    pass
+            self._index = {}
+            self._save_index()
+
+    # Build wrapper
+
+    def build(self, uploader: UploaderBase, pattern: Pattern, build_opts: Dict[str, Any],
+              build_func: Optional[Callable[[Pattern, Dict[str, Any]], BuildResult]] = None) -> BuildResult:
+        """
+        Build through the cache
+
+        Skips the toolchain entirely on a hit. Uploaders that are not real
+        UploaderBase instances, or builds with ``use_cache=False``, bypass
+        the cache.
+        """
+        build_func = build_func or uploader.build_firmware
+        if not isinstance(uploader, UploaderBase) or not build_opts.get('use_cache', True):
+            return build_func(pattern, build_opts)
+
+        try:
+            key = self.make_key(pattern, uploader, build_opts)
+        except Exception as e:
+            logger.warning(f"Build cache key failed, building uncached: {e}")
+            return build_func(pattern, build_opts)
+
+        output_dir = build_opts.get('output_dir')
+        cached = self.get(key, Path(output_dir) if output_dir else None)
+        if cached:
+            logger.info(f"Firmware build cache hit for {uploader.chip_id} ({key[:12]})")
+            return cached
+
+        start = time.time()
+        result = build_func(pattern, build_opts)
+        elapsed = time.time() - start
+        if result is not None:
+            result.build_seconds = elapsed
+            self.put(key, result, elapsed)
+        return result
+
+
+_build_cache: Optional[FirmwareBuildCache] = None
+_build_cache_lock = threading.Lock()
+
+
+def get_build_cache() -> FirmwareBuildCache:
+    """Get the process-wide build cache"""
+    global _build_cache
+    with _build_cache_lock:
+        if _build_cache is None:
+            _build_cache = FirmwareBuildCache()
+        return _build_cache
+
+
+def set_build_cache(cache: Optional[FirmwareBuildCache]) -> None:
+    """Replace the process-wide build cache (None resets to default)"""
+    global _build_cache
+    with _build_cache_lock:
+        _build_cache = cache
@@ -19,6 +19,7 @@ except ImportError:  # pragma: no cover
 from core.pattern import Pattern
 from uploaders.base import BuildResult
 from .universal_pattern_generator import UniversalPatternGenerator
+from .build_cache import get_build_cache
 
 
 class FirmwareBuilder:
@@ -96,8 +97,8 @@ class FirmwareBuilder:
             **build_opts
         }
         
-        # Delegate to uploader's build method
-        result = uploader.build_firmware(pattern, build_config)
+        # Delegate to uploader's build method (through the artifact cache)
+        result = get_build_cache().build(uploader, pattern, build_config)
         
         return result
 
@@ -274,36 +275,6 @@ class FirmwareBuilder:
                 shutil.rmtree(self.build_dir)
             self.build_dir.mkdir(parents=True, exist_ok=True)
     
-    def estimate_build_time(self, chip_id: str, pattern: Pattern) -> float:
-        """
-        Estimate build time in seconds
-        
-        Args:
-            chip_id: Target chip
-            pattern: Pattern to embed
-        
-        Returns:
-            Estimated time in seconds
-        """
-        # Base time varies by chip family
-        base_times = {
-            "esp8266": 45,
-            "esp32": 60,
-            "atmega328p": 20,
-            "atmega2560": 25,
-            "stm32f030f4": 30,
-            "stm32f103c8": 35
-        }
-        
-        base_time = base_times.get(chip_id, 30)
-        
-        # Add time for large patterns (header generation)
-        pattern_size = pattern.estimate_memory_bytes()
-        if pattern_size > 100000:  # > 100KB
-            base_time += 10
-        
-        return base_time
-    
     def get_template_info(self, chip_id: str) -> Optional[Dict]:
         """
         Get detailed information about a template
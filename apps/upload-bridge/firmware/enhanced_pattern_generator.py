@@ -287,36 +287,25 @@ const struct SpeedKeyframe speed_keyframes[] = {{
         
         return template
     
-    def estimate_memory_usage(self, pattern: Pattern) -> Dict[str, int]:
+    def estimate_memory_usage(self, pattern: Pattern, chip_id: str = "esp32") -> Dict[str, int]:
         """
         Estimate memory usage for enhanced pattern
         
         Args:
             pattern: Pattern object
+            chip_id: Target chip
         
         Returns:
-            Dictionary with memory usage estimates
+            Dictionary with memory usage estimates (from BudgetEstimator)
         """
-        # Base pattern data
-        pattern_size = pattern.estimate_memory_bytes()
-        
-        # Metadata overhead
-        metadata_size = 64  # Approximate size of metadata
-        
-        # Keyframes overhead
-        keyframes_size = len(pattern.metadata.speed_keyframes) * 6  # 2 bytes frame + 4 bytes multiplier
-        
-        # Enhanced features overhead
-        features_size = 32  # Brightness curves, speed curves, etc.
-        
-        total_size = pattern_size + metadata_size + keyframes_size + features_size
+        from firmware.budget_estimator import BudgetEstimator
         
+        budget = BudgetEstimator().estimate(pattern, chip_id)
         return {
-            'pattern_data': pattern_size,
-            'metadata': metadata_size,
-            'keyframes': keyframes_size,
-            'features': features_size,
-            'total': total_size
+            'pattern_data': budget.data_bytes,
+            'tables': budget.table_bytes,
+            'ram': budget.ram_bytes,
+            'total': budget.flash_bytes
         }
 
 
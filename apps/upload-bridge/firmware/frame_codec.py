@@ -0,0 +1,302 @@
+"""
+Frame Codec - Compressed frame stream for generated firmware
+
+Raw frame data costs ``3 * LED_COUNT + 2`` bytes per frame, so small MCUs
+run out of flash after a few seconds of animation. The encoder picks the
+smallest of four encodings for each frame and the generated player decodes
+the stream sequentially into a RAM frame buffer (``C_DECODER``).
+
+Stream layout (integers little-endian)::
+
+    u16 led_count, u16 frame_count
+    per frame: u16 delay_ms, u8 encoding, payload
+
+Encodings:
+
+- RAW (0): ``3 * led_count`` RGB bytes
+- PALETTE (1): u8 colours - 1, colours * RGB, then one index per LED packed
+  LSB-first at 1, 2, 4 or 8 bits
+- RLE (2): runs of u8 length (1-255) + RGB until ``led_count`` LEDs
+- DELTA (3): changes against the previous decoded frame as u8 skip,
+  u8 count, count * RGB until ``led_count`` LEDs (the buffer is black
+  before the first frame)
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+ENC_RAW = 0
+ENC_PALETTE = 1
+ENC_RLE = 2
+ENC_DELTA = 3
+
+ENCODING_NAMES = {ENC_RAW: "raw", ENC_PALETTE: "palette", ENC_RLE: "rle", ENC_DELTA: "delta"}
+
+HEADER_BYTES = 4
+FRAME_HEADER_BYTES = 3  # Delay + encoding
+
+
+@dataclass
+class EncodedStream:
+    """Result of encoding a pattern's frames"""
+    data: bytes
+    led_count: int
+    frame_count: int
+    raw_bytes: int  # Size of the uncompressed layout for comparison
+    encodings: Counter = field(default_factory=Counter)  # Encoding name -> frame count
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a fraction of the raw size"""
+        return len(self.data) / self.raw_bytes if self.raw_bytes else 1.0
+
+
+def pack_frame(pixels: Sequence[Sequence[int]], led_count: int) -> bytes:
+    """Pack pixels to ``3 * led_count`` RGB bytes (truncated or padded with black)"""
+    data = bytes(chain.from_iterable(p[:3] for p in pixels[:led_count]))
+    return data.ljust(led_count * 3, b"\x00")
+
+
+def _palette_bits(colors: int) -> int:
+    for bits in (1, 2, 4):
+        if colors <= 1 << bits:
+            return bits
+    return 8
+
+
+def _encode_palette(frame: bytes, led_count: int) -> bytes:
+    """Palette payload, or b"" when the frame has more than 256 colours"""
+    palette: Dict[bytes, int] = {}
+    indices = []
+    for i in range(0, led_count * 3, 3):
+        color = frame[i:i + 3]
+        index = palette.get(color)
+        if index is None:
+            if len(palette) == 256:
+                return b""
+            index = palette[color] = len(palette)
+        indices.append(index)
+    bits = _palette_bits(len(palette))
+    per_byte = 8 // bits
+    packed = bytearray((led_count + per_byte - 1) // per_byte)
+    for i, index in enumerate(indices):
+        packed[i // per_byte] |= index << ((i % per_byte) * bits)
+    return bytes([len(palette) - 1]) + b"".join(palette) + bytes(packed)
+
+
+def _encode_rle(frame: bytes, led_count: int) -> bytes:
+    out = bytearray()
+    i = 0
+    while i < led_count:
+        color = frame[i * 3:i * 3 + 3]
+        run = 1
+        while i + run < led_count and run < 255 and frame[(i + run) * 3:(i + run) * 3 + 3] == color:
+            run += 1
+        out.append(run)
+        out += color
+        i += run
+    return bytes(out)
+
+
+def _encode_delta(frame: bytes, previous: bytes, led_count: int) -> bytes:
+    out = bytearray()
+    i = 0
+    while i < led_count:
+        skip = 0
+        while i + skip < led_count and skip < 255 and frame[(i + skip) * 3:(i + skip) * 3 + 3] == previous[(i + skip) * 3:(i + skip) * 3 + 3]:
+            skip += 1
+        i += skip
+        count = 0
+        while i + count < led_count and count < 255 and frame[(i + count) * 3:(i + count) * 3 + 3] != previous[(i + count) * 3:(i + count) * 3 + 3]:
+            count += 1
+        out.append(skip)
+        out.append(count)
+        out += frame[i * 3:(i + count) * 3]
+        i += count
+    return bytes(out)
+
+
+def encode_frame(frame: bytes, previous: bytes, led_count: int) -> Tuple[int, bytes]:
+    """
+    Encode one packed frame with whichever encoding is smallest
+
+    Args:
+        frame: ``3 * led_count`` RGB bytes
+        previous: The previous decoded frame (black before the first)
+        led_count: LEDs per frame
+
+    Returns:
+        (encoding, payload)
+    """
+    best = (ENC_RAW, frame)
+    candidates = (
+        (ENC_DELTA, _encode_delta(frame, previous, led_count)),
+        (ENC_RLE, _encode_rle(frame, led_count)),
+        (ENC_PALETTE, _encode_palette(frame, led_count)),
+    )
+    for encoding, payload in candidates:
+        if payload and len(payload) < len(best[1]):
+            best = (encoding, payload)
+    return best
+
+
+def encode_frames(frames: Sequence[bytes], delays: Sequence[int], led_count: int) -> EncodedStream:
+    """
+    Encode packed frames into a compressed stream
+
+    Args:
+        frames: Packed frames (see ``pack_frame``)
+        delays: Per-frame delay in milliseconds (clamped to u16)
+        led_count: LEDs per frame
+    """
+    out = bytearray()
+    out += (led_count & 0xFFFF).to_bytes(2, "little")
+    out += (len(frames) & 0xFFFF).to_bytes(2, "little")
+    previous = bytes(led_count * 3)
+    encodings: Counter = Counter()
+    for frame, delay in zip(frames, delays):
+        encoding, payload = encode_frame(frame, previous, led_count)
+        out += max(0, min(0xFFFF, int(delay))).to_bytes(2, "little")
+        out.append(encoding)
+        out += payload
+        encodings[ENCODING_NAMES[encoding]] += 1
+        previous = frame
+    raw_bytes = HEADER_BYTES + len(frames) * (2 + led_count * 3)
+    return EncodedStream(bytes(out), led_count, len(frames), raw_bytes, encodings)
+
+
+def decode_stream(data: bytes) -> List[Tuple[int, bytes]]:
+    """
+    Decode a stream back to (delay_ms, packed frame) pairs
+
+    Mirrors ``C_DECODER``; used to verify streams on the host.
+    """
+    led_count = int.from_bytes(data[0:2], "little")
+    frame_count = int.from_bytes(data[2:4], "little")
+    pos = HEADER_BYTES
+    rgb = bytearray(led_count * 3)
+    frames = []
+    for _ in range(frame_count):
+        delay = int.from_bytes(data[pos:pos + 2], "little")
+        encoding = data[pos + 2]
+        pos += FRAME_HEADER_BYTES
+        if encoding == ENC_RAW:
+            rgb[:] = data[pos:pos + led_count * 3]
+            pos += led_count * 3
+        elif encoding == ENC_PALETTE:
+            colors = data[pos] + 1
+            palette = pos + 1
+            pos = palette + colors * 3
+            bits = _palette_bits(colors)
+            per_byte = 8 // bits
+            mask = (1 << bits) - 1
+            for i in range(led_count):
+                index = (data[pos + i // per_byte] >> ((i % per_byte) * bits)) & mask
+                rgb[i * 3:i * 3 + 3] = data[palette + index * 3:palette + index * 3 + 3]
+            pos += (led_count + per_byte - 1) // per_byte
+        elif encoding == ENC_RLE:
+            i = 0
+            while i < led_count:
+                run, color = data[pos], data[pos + 1:pos + 4]
+                pos += 4
+                rgb[i * 3:(i + run) * 3] = color * run
+                i += run
+        elif encoding == ENC_DELTA:
+            i = 0
+            while i < led_count:
+                i += data[pos]
+                count = data[pos + 1]
+                pos += 2
+                rgb[i * 3:(i + count) * 3] = data[pos:pos + count * 3]
+                pos += count * 3
+                i += count
+        else:
+            raise ValueError(f"Unknown frame encoding {encoding} at offset {pos - 1}")
+        frames.append((delay, bytes(rgb)))
+    return frames
+
+
+# Streaming decoder emitted into pattern_data.h after the pattern_data
+# declaration. pgm_read_byte falls back to a plain read where flash is
+# memory-mapped.
+C_DECODER = r"""// Streaming frame decoder (see firmware/frame_codec.py for the format)
+#define FRAME_ENC_RAW 0
+#define FRAME_ENC_PALETTE 1
+#define FRAME_ENC_RLE 2
+#define FRAME_ENC_DELTA 3
+
+#ifndef pgm_read_byte
+#define pgm_read_byte(addr) (*(const uint8_t *)(addr))
+#endif
+
+typedef struct {
+    uint32_t offset;  // Read position in pattern_data
+    uint16_t frame;   // Index of the next frame
+} pattern_stream_t;
+
+static uint8_t pattern_stream_u8(pattern_stream_t *s) {
+    return pgm_read_byte(&pattern_data[s->offset++]);
+}
+
+// Restart at the first frame; rgb (led_count * 3 bytes) is cleared for DELTA frames
+static void pattern_stream_rewind(pattern_stream_t *s, uint8_t *rgb, uint16_t led_count) {
+    uint16_t i;
+    s->offset = 4;
+    s->frame = 0;
+    for (i = 0; i < led_count * 3; i++) rgb[i] = 0;
+}
+
+// Decode the next frame into rgb, wrapping at the end; returns its delay in ms
+static uint16_t pattern_stream_next(pattern_stream_t *s, uint8_t *rgb, uint16_t led_count) {
+    uint16_t delay_ms, i;
+    uint8_t encoding;
+    if (s->frame >= FRAME_COUNT) pattern_stream_rewind(s, rgb, led_count);
+    delay_ms = pattern_stream_u8(s);
+    delay_ms |= (uint16_t)pattern_stream_u8(s) << 8;
+    encoding = pattern_stream_u8(s);
+    if (encoding == FRAME_ENC_RAW) {
+        for (i = 0; i < led_count * 3; i++) rgb[i] = pattern_stream_u8(s);
+    } else if (encoding == FRAME_ENC_PALETTE) {
+        uint16_t colors = (uint16_t)pattern_stream_u8(s) + 1;
+        uint32_t palette = s->offset;
+        uint8_t bits = colors <= 2 ? 1 : colors <= 4 ? 2 : colors <= 16 ? 4 : 8;
+        uint8_t mask = (uint8_t)((1u << bits) - 1);
+        uint8_t packed = 0, shift = 8;
+        s->offset += colors * 3;
+        for (i = 0; i < led_count; i++) {
+            uint32_t entry;
+            if (shift >= 8) { packed = pattern_stream_u8(s); shift = 0; }
+            entry = palette + ((packed >> shift) & mask) * 3;
+            shift += bits;
+            rgb[i * 3] = pgm_read_byte(&pattern_data[entry]);
+            rgb[i * 3 + 1] = pgm_read_byte(&pattern_data[entry + 1]);
+            rgb[i * 3 + 2] = pgm_read_byte(&pattern_data[entry + 2]);
+        }
+    } else if (encoding == FRAME_ENC_RLE) {
+        i = 0;
+        while (i < led_count) {
+            uint8_t run = pattern_stream_u8(s);
+            uint8_t r = pattern_stream_u8(s), g = pattern_stream_u8(s), b = pattern_stream_u8(s);
+            for (; run > 0 && i < led_count; run--, i++) {
+                rgb[i * 3] = r; rgb[i * 3 + 1] = g; rgb[i * 3 + 2] = b;
+            }
+        }
+    } else {
+        i = 0;
+        while (i < led_count) {
+            uint8_t count;
+            i += pattern_stream_u8(s);
+            count = pattern_stream_u8(s);
+            for (; count > 0; count--, i++) {
+                rgb[i * 3] = pattern_stream_u8(s);
+                rgb[i * 3 + 1] = pattern_stream_u8(s);
+                rgb[i * 3 + 2] = pattern_stream_u8(s);
+            }
+        }
+    }
+    s->frame++;
+    return delay_ms;
+}
+"""
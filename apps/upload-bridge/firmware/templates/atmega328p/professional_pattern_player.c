@@ -63,13 +63,7 @@ bool variable_speed = false;
 bool interpolation_enabled = false;
 float interpolation_factor = 1.0;
 
-// Speed keyframes (max 8 keyframes for memory efficiency)
-struct SpeedKeyframe {
-    uint16_t frame;
-    float multiplier;
-};
-SpeedKeyframe speed_keyframes[8];
-uint8_t num_keyframes = 0;
+// Speed keyframes come from pattern_data.h (NUM_KEYFRAMES, speed_keyframes)
 
 // Interpolation buffer for smooth transitions
 uint8_t interpolation_buffer[MAX_LEDS * 3];
@@ -107,12 +101,35 @@ int main(void) {
     interpolation_enabled = interpolation_enabled;
     interpolation_factor = interpolation_factor / 10.0;
     
-    // Load speed keyframes
-    num_keyframes = num_keyframes;
-    for (uint8_t i = 0; i < num_keyframes && i < 8; i++) {
-        speed_keyframes[i].frame = speed_keyframes[i].frame;
-        speed_keyframes[i].multiplier = speed_keyframes[i].multiplier;
+#ifdef PATTERN_COMPRESSED
+#if LED_COUNT > MAX_LEDS
+#error "Compressed playback needs LED_COUNT <= MAX_LEDS"
+#endif
+    {
+        // Frames decode sequentially into interpolation_buffer (interpolation
+        // is off for compressed data); the stream wraps by itself
+        pattern_stream_t stream;
+        pattern_stream_rewind(&stream, interpolation_buffer, LED_COUNT);
+        while (1) {
+            uint16_t frame_idx = stream.frame < FRAME_COUNT ? stream.frame : 0;
+            uint16_t base_delay = pattern_stream_next(&stream, interpolation_buffer, LED_COUNT);
+            uint16_t frame_delay = get_frame_delay(base_delay, frame_idx, FRAME_COUNT);
+            for (uint16_t i = 0; i < LED_COUNT * 3; i += 3) {
+                uint8_t r = interpolation_buffer[i];
+                uint8_t g = interpolation_buffer[i + 1];
+                uint8_t b = interpolation_buffer[i + 2];
+                apply_brightness_to_pixel(&r, &g, &b, global_brightness);
+                led_buffer[i] = r;
+                led_buffer[i + 1] = g;
+                led_buffer[i + 2] = b;
+            }
+            ws2812_send(led_buffer, LED_COUNT * 3);
+            for (uint16_t ms = 0; ms < frame_delay; ms++) {
+                _delay_ms(1);
+            }
+        }
     }
+#endif
     
     // Main loop
     while (1) {
@@ -281,16 +298,24 @@ uint16_t get_frame_delay(uint16_t base_delay, uint32_t frame, uint32_t total_fra
     
     // Apply keyframes if available
     float keyframe_factor = 1.0;
-    for (uint8_t i = 0; i < num_keyframes; i++) {
+#if NUM_KEYFRAMES > 0
+    for (uint8_t i = 0; i < NUM_KEYFRAMES; i++) {
         if (frame >= speed_keyframes[i].frame) {
-            keyframe_factor = speed_keyframes[i].multiplier;
+            keyframe_factor = speed_keyframes[i].multiplier / SPEED_KEYFRAME_SCALE;
         }
     }
+#endif
     
     return (uint16_t)(base_delay / (curve_factor * keyframe_factor));
 }
 
 void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, float brightness) {
+#ifdef BRIGHTNESS_LUT_ENABLED
+    // Curve, per-channel scaling and LED correction are baked into the tables
+    *r = read_u8_pgm(brightness_lut[0], *r);
+    *g = read_u8_pgm(brightness_lut[1], *g);
+    *b = read_u8_pgm(brightness_lut[2], *b);
+#else
     if (per_channel_brightness) {
         // Per-channel brightness control
         *r = (uint8_t)(*r * brightness * red_brightness);
@@ -304,6 +329,7 @@ void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, float brightn
         *g = (uint8_t)(*g * curved_brightness);
         *b = (uint8_t)(*b * curved_brightness);
     }
+#endif
 }
 
 void interpolate_frames(uint8_t *frame1, uint8_t *frame2, uint8_t *output, float t, uint16_t led_count) {
@@ -53,13 +53,7 @@ bool variable_speed = false;
 bool interpolation_enabled = false;
 float interpolation_factor = 1.0;
 
-// Speed keyframes (max 12 keyframes for NUC123)
-struct SpeedKeyframe {
-    uint16_t frame;
-    float multiplier;
-};
-SpeedKeyframe speed_keyframes[12];
-uint8_t num_keyframes = 0;
+// Speed keyframes come from pattern_data.h (NUM_KEYFRAMES, speed_keyframes)
 
 // Interpolation buffer for smooth transitions
 uint8_t interpolation_buffer[MAX_LEDS * 3];
@@ -98,13 +92,6 @@ int main(void) {
     interpolation_enabled = interpolation_enabled;
     interpolation_factor = interpolation_factor / 10.0;
     
-    // Load speed keyframes
-    num_keyframes = num_keyframes;
-    for (uint8_t i = 0; i < num_keyframes && i < 12; i++) {
-        speed_keyframes[i].frame = speed_keyframes[i].frame;
-        speed_keyframes[i].multiplier = speed_keyframes[i].multiplier;
-    }
-    
     // Main loop
     while (1) {
         // Read pattern header
@@ -253,16 +240,24 @@ uint16_t get_frame_delay(uint16_t base_delay, uint32_t frame, uint32_t total_fra
     
     // Apply keyframes if available
     float keyframe_factor = 1.0;
-    for (uint8_t i = 0; i < num_keyframes; i++) {
+#if NUM_KEYFRAMES > 0
+    for (uint8_t i = 0; i < NUM_KEYFRAMES; i++) {
         if (frame >= speed_keyframes[i].frame) {
-            keyframe_factor = speed_keyframes[i].multiplier;
+            keyframe_factor = speed_keyframes[i].multiplier / SPEED_KEYFRAME_SCALE;
         }
     }
+#endif
     
     return (uint16_t)(base_delay / (curve_factor * keyframe_factor));
 }
 
 void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, float brightness) {
+#ifdef BRIGHTNESS_LUT_ENABLED
+    // Curve, per-channel scaling and LED correction are baked into the tables
+    *r = read_u8_pgm(brightness_lut[0], *r);
+    *g = read_u8_pgm(brightness_lut[1], *g);
+    *b = read_u8_pgm(brightness_lut[2], *b);
+#else
     if (per_channel_brightness) {
         // Per-channel brightness control
         *r = (uint8_t)(*r * brightness * red_brightness);
@@ -276,6 +271,7 @@ void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, float brightn
         *g = (uint8_t)(*g * curved_brightness);
         *b = (uint8_t)(*b * curved_brightness);
     }
+#endif
 }
 
 void interpolate_frames(uint8_t *frame1, uint8_t *frame2, uint8_t *output, float t, uint16_t led_count) {
@@ -54,13 +54,7 @@ struct {
     uint8_t interpolation : 1;     // 0 or 1
 } settings;
 
-// Speed keyframes (max 4 keyframes for memory efficiency)
-struct SpeedKeyframe {
-    uint8_t frame;
-    uint8_t multiplier;  // 0-255, represents 0.0-2.0
-};
-SpeedKeyframe speed_keyframes[4];
-uint8_t num_keyframes = 0;
+// Speed keyframes come from pattern_data.h (NUM_KEYFRAMES, speed_keyframes)
 
 // Function prototypes
 void ws2812_init(uint8_t pin);
@@ -90,15 +84,6 @@ int main(void) {
     settings.variable_speed = variable_speed;
     settings.interpolation = interpolation_enabled;
     
-    // Load speed keyframes
-    num_keyframes = num_keyframes;
-    if (num_keyframes > 4) num_keyframes = 4;  // Limit for memory
-    
-    for (uint8_t i = 0; i < num_keyframes; i++) {
-        speed_keyframes[i].frame = speed_keyframes[i].frame;
-        speed_keyframes[i].multiplier = speed_keyframes[i].multiplier;
-    }
-    
     // Main loop
     while (1) {
         // Read pattern header
@@ -218,11 +203,13 @@ uint8_t get_frame_delay(uint8_t base_delay, uint8_t frame, uint8_t total_frames)
     
     // Apply keyframes if available
     uint8_t keyframe_factor = 128;  // 1.0 in 8-bit
-    for (uint8_t i = 0; i < num_keyframes; i++) {
+#if NUM_KEYFRAMES > 0
+    for (uint8_t i = 0; i < NUM_KEYFRAMES; i++) {
         if (frame >= speed_keyframes[i].frame) {
             keyframe_factor = speed_keyframes[i].multiplier;
         }
     }
+#endif
     
     // Calculate final delay (avoid division)
     uint16_t result = (base_delay * 128) / ((curve_factor * keyframe_factor) >> 7);
@@ -230,6 +217,12 @@ uint8_t get_frame_delay(uint8_t base_delay, uint8_t frame, uint8_t total_frames)
 }
 
 void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, uint8_t brightness) {
+#ifdef BRIGHTNESS_LUT_ENABLED
+    // Curve, per-channel scaling and LED correction are baked into the tables
+    *r = read_u8_pgm(brightness_lut[0], *r);
+    *g = read_u8_pgm(brightness_lut[1], *g);
+    *b = read_u8_pgm(brightness_lut[2], *b);
+#else
     if (settings.per_channel) {
         // Per-channel brightness control (8-bit arithmetic)
         *r = (*r * brightness * settings.red_brightness) >> 14;  // Scale back
@@ -243,6 +236,7 @@ void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, uint8_t brigh
         *g = (*g * curved_brightness) >> 7;
         *b = (*b * curved_brightness) >> 7;
     }
+#endif
 }
 
 void ws2812_init(uint8_t pin) {
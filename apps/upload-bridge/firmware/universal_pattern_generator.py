@@ -5,11 +5,55 @@ Generates optimized firmware templates for all chip families with full advanced
 Adapts features based on chip capabilities and memory constraints
 """
 
+import hashlib
+import io
 import os
 import math
+import logging
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
+from core.brightness_lut import BrightnessLUT
+from core.export.palette import QuantizationReport, quantize_frames
 from core.pattern import Pattern, PatternMetadata, Frame
+from firmware.frame_codec import C_DECODER, EncodedStream, encode_frames, pack_frame
+
+logger = logging.getLogger(__name__)
+
+# Metadata settings emitted into pattern_data.h, carried over by _limit_pattern_for_chip
+FIRMWARE_SETTING_FIELDS = (
+    "color_order", "fps", "total_ms",
+    "brightness", "brightness_curve", "led_type", "per_channel_brightness",
+    "red_brightness", "green_brightness", "blue_brightness",
+    "speed_curve", "variable_speed", "interpolation_enabled", "interpolation_factor",
+)
+
+
+@dataclass
+class PatternSizeReport:
+    """Frame data size of a pattern on one chip"""
+    chip_id: str
+    raw_bytes: int
+    compressed_bytes: int
+    flash_budget_bytes: int
+    encodings: Dict[str, int] = field(default_factory=dict)  # Encoding name -> frame count
+    
+    @property
+    def fits_raw(self) -> bool:
+        return self.raw_bytes <= self.flash_budget_bytes
+    
+    @property
+    def fits_compressed(self) -> bool:
+        return self.compressed_bytes <= self.flash_budget_bytes
+    
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a fraction of the raw size"""
+        return self.compressed_bytes / self.raw_bytes if self.raw_bytes else 1.0
+    
+    def summary(self) -> str:
+        return (f"{self.chip_id}: raw {self.raw_bytes} B, compressed {self.compressed_bytes} B "
+                f"({self.ratio:.0%}), flash budget {self.flash_budget_bytes} B")
 
 
 class UniversalPatternGenerator:
@@ -19,6 +63,15 @@ class UniversalPatternGenerator:
     """
     
     def __init__(self):
+        # Names of files rewritten by the last generation call
+        self.last_changed_files: List[str] = []
+        # Frame data size against the chip's flash budget, from the last generation call
+        self.last_size_report: Optional[PatternSizeReport] = None
+        # Colour error of the last palette_max_colors reduction, if any
+        self.last_quantization_report: Optional[QuantizationReport] = None
+        self._encoded: Optional[Tuple[tuple, EncodedStream]] = None
+        # flash_bytes is the chip's program flash; code_reserve_bytes is a rough
+        # allowance for the player, libraries and bootloader; ram_bytes is SRAM
         self.chip_capabilities = {
             'esp8266': {
                 'max_leds': 1000,
@@ -28,7 +81,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': True,
                 'memory_optimized': False,
-                'template_type': 'arduino'
+                'template_type': 'arduino',
+                'flash_bytes': 4 * 1024 * 1024,
+                'code_reserve_bytes': 320 * 1024,
+                'ram_bytes': 80 * 1024,
+                'supports_compression': True
             },
             'esp32': {
                 'max_leds': 1000,
@@ -38,7 +95,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': True,
                 'memory_optimized': False,
-                'template_type': 'arduino'
+                'template_type': 'arduino',
+                'flash_bytes': 4 * 1024 * 1024,
+                'code_reserve_bytes': 320 * 1024,
+                'ram_bytes': 320 * 1024,
+                'supports_compression': True
             },
             'atmega328p': {
                 'max_leds': 200,
@@ -48,7 +109,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': False,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 32 * 1024,
+                'code_reserve_bytes': 4 * 1024,
+                'ram_bytes': 2 * 1024,
+                'supports_compression': True
             },
             'atmega2560': {
                 'max_leds': 300,
@@ -58,7 +123,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': False,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 256 * 1024,
+                'code_reserve_bytes': 8 * 1024,
+                'ram_bytes': 8 * 1024,
+                'supports_compression': True
             },
             'atmega32u4': {
                 'max_leds': 150,
@@ -68,7 +137,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': False,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 32 * 1024,
+                'code_reserve_bytes': 8 * 1024,
+                'ram_bytes': 2560,
+                'supports_compression': True
             },
             'attiny85': {
                 'max_leds': 50,
@@ -78,7 +151,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': False,
                 'supports_full_gamma': False,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 8 * 1024,
+                'code_reserve_bytes': 2 * 1024,
+                'ram_bytes': 512,
+                'supports_compression': True
             },
             'stm32f030f4': {
                 'max_leds': 100,
@@ -88,7 +165,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': True,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 16 * 1024,
+                'code_reserve_bytes': 4 * 1024,
+                'ram_bytes': 4 * 1024,
+                'supports_compression': True
             },
             'stm32f103c8': {
                 'max_leds': 300,
@@ -98,7 +179,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': True,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 64 * 1024,
+                'code_reserve_bytes': 8 * 1024,
+                'ram_bytes': 20 * 1024,
+                'supports_compression': True
             },
             'pic16f876a': {
                 'max_leds': 50,
@@ -108,7 +193,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': False,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 8 * 1024,
+                'code_reserve_bytes': 2 * 1024,
+                'ram_bytes': 368,
+                'supports_compression': False
             },
             'pic18f2550': {
                 'max_leds': 100,
@@ -118,7 +207,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': False,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 32 * 1024,
+                'code_reserve_bytes': 4 * 1024,
+                'ram_bytes': 2 * 1024,
+                'supports_compression': True
             },
             'numicro_m031': {
                 'max_leds': 200,
@@ -128,7 +221,11 @@ class UniversalPatternGenerator:
                 'supports_per_channel': True,
                 'supports_full_gamma': True,
                 'memory_optimized': True,
-                'template_type': 'c'
+                'template_type': 'c',
+                'flash_bytes': 64 * 1024,
+                'code_reserve_bytes': 8 * 1024,
+                'ram_bytes': 8 * 1024,
+                'supports_compression': True
             }
         }
     
@@ -137,11 +234,25 @@ class UniversalPatternGenerator:
         """
         Generate universal firmware for any chip with full advanced features
         
+        By default the frame data is emitted as its own compilation unit
+        (``pattern_data.c``, or ``pattern_data.cpp`` for Arduino sketches) and
+        ``pattern_data.h`` only carries configuration and extern declarations.
+        Files are rewritten only when their content changes, so regenerating
+        into the same directory with a new pattern leaves the template source,
+        header and Makefile untouched and make/arduino-cli only recompile the
+        data unit and relink.
+        
         Args:
             pattern: Pattern object with advanced features
             chip_id: Target chip identifier
             output_dir: Output directory for generated files
-            config: Additional configuration (GPIO pin, etc.)
+            config: Additional configuration (GPIO pin, etc.).
+                ``split_pattern_data=False`` embeds the frame data in the
+                header as before. ``compress_frames=True`` stores frames as
+                a palette/RLE/delta stream decoded by the player (frame
+                interpolation is unavailable in that mode).
+                ``palette_max_colors=N`` reduces the pattern to N colours
+                first so more frames fit the palette encodings.
         
         Returns:
             Path to generated main source file
@@ -150,6 +261,12 @@ class UniversalPatternGenerator:
             raise ValueError(f"Unsupported chip: {chip_id}")
         
         capabilities = self.chip_capabilities[chip_id]
+        split_data = config.get('split_pattern_data', True)
+        compress = self._compression_enabled(chip_id, config)
+        self.last_changed_files = []
+        pattern = self._quantize_colors(pattern, config)
+        self.last_size_report = self.size_report(pattern, chip_id)
+        self._check_flash_budget(self.last_size_report, compress)
         
         # Create output directory
         output_path = Path(output_dir)
@@ -157,7 +274,13 @@ class UniversalPatternGenerator:
         
         # Generate pattern data header
         pattern_data_path = output_path / "pattern_data.h"
-        self._generate_pattern_data_h(pattern, pattern_data_path, chip_id, config)
+        self._generate_pattern_data_h(pattern, pattern_data_path, chip_id, config, split_data)
+        
+        # Generate frame data compilation unit
+        if split_data:
+            self._generate_pattern_data_unit(pattern, output_path, chip_id, config, compress)
+        else:
+            self._remove_pattern_data_unit(output_path)
         
         # Generate main source file
         if capabilities['template_type'] == 'arduino':
@@ -168,112 +291,373 @@ class UniversalPatternGenerator:
         
         # Generate Makefile if needed
         if capabilities['template_type'] == 'c':
-            self._generate_makefile(chip_id, output_path)
+            self._generate_makefile(chip_id, output_path, split_data)
         
         # Generate README
         self._generate_readme(chip_id, output_path, capabilities)
         
         return str(main_file)
     
+    def generate_pattern_data(self, pattern: Pattern, chip_id: str, output_dir: str,
+                              config: Dict) -> Path:
+        """
+        Regenerate only the pattern data for an already generated project
+        
+        Fast path for re-flashing a new pattern: the template source, Makefile
+        and README are not touched. The header is rewritten only if the LED
+        count or settings changed, in which case the template recompiles too.
+        
+        Args:
+            pattern: Pattern object to embed
+            chip_id: Target chip identifier
+            output_dir: Directory previously passed to generate_universal_firmware
+            config: Additional configuration (GPIO pin, etc.)
+        
+        Returns:
+            Path to the frame data compilation unit
+        """
+        if chip_id not in self.chip_capabilities:
+            raise ValueError(f"Unsupported chip: {chip_id}")
+        
+        compress = self._compression_enabled(chip_id, config)
+        self.last_changed_files = []
+        pattern = self._quantize_colors(pattern, config)
+        self.last_size_report = self.size_report(pattern, chip_id)
+        self._check_flash_budget(self.last_size_report, compress)
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        self._generate_pattern_data_h(pattern, output_path / "pattern_data.h", chip_id, config, True)
+        return self._generate_pattern_data_unit(pattern, output_path, chip_id, config, compress)
+    
+    def size_report(self, pattern: Pattern, chip_id: str) -> PatternSizeReport:
+        """
+        Raw and compressed frame data size against a chip's flash budget
+        
+        Args:
+            pattern: Pattern to measure (limited to the chip's LED count)
+            chip_id: Target chip identifier
+        """
+        if chip_id not in self.chip_capabilities:
+            raise ValueError(f"Unsupported chip: {chip_id}")
+        capabilities = self.chip_capabilities[chip_id]
+        stream = self._encode_frames(self._limit_pattern_for_chip(pattern, chip_id))
+        return PatternSizeReport(
+            chip_id=chip_id,
+            raw_bytes=stream.raw_bytes,
+            compressed_bytes=len(stream.data),
+            flash_budget_bytes=capabilities['flash_bytes'] - capabilities['code_reserve_bytes'],
+            encodings=dict(stream.encodings),
+        )
+    
+    def size_reports(self, pattern: Pattern) -> List[PatternSizeReport]:
+        """``size_report`` for every supported chip"""
+        return [self.size_report(pattern, chip_id) for chip_id in self.chip_capabilities]
+    
+    def _compression_enabled(self, chip_id: str, config: Dict) -> bool:
+        """Whether to emit compressed frames (the chip's player must have the decoder)"""
+        if not config.get('compress_frames', False):
+            return False
+        if not self.chip_capabilities[chip_id].get('supports_compression', False):
+            logger.warning(f"{chip_id} player has no frame decoder; writing uncompressed frames")
+            return False
+        return True
+    
+    def _quantize_colors(self, pattern: Pattern, config: Dict) -> Pattern:
+        """Reduce the pattern to ``palette_max_colors`` colours when configured"""
+        max_colors = config.get('palette_max_colors')
+        self.last_quantization_report = None
+        if not max_colors:
+            return pattern
+        quantization = quantize_frames([f.pixels for f in pattern.frames], int(max_colors))
+        self.last_quantization_report = quantization.report
+        logger.info(f"Firmware palette: {quantization.report.summary()}")
+        if quantization.report.exact:
+            return pattern
+        frames = []
+        for segment in quantization.segments:
+            for offset, indices in enumerate(segment.frames):
+                source = pattern.frames[segment.start_frame + offset]
+                frames.append(Frame(pixels=[segment.palette[i] for i in indices], duration_ms=source.duration_ms))
+        return Pattern(name=pattern.name, metadata=pattern.metadata, frames=frames)
+    
+    def _check_flash_budget(self, report: PatternSizeReport, compress: bool) -> None:
+        fits = report.fits_compressed if compress else report.fits_raw
+        if fits:
+            logger.info(report.summary())
+        elif not compress and report.fits_compressed:
+            logger.warning(f"{report.summary()} - exceeds flash; enable compress_frames to fit")
+        else:
+            logger.warning(f"{report.summary()} - exceeds flash")
+    
+    def _write_if_changed(self, path: Path, content: str) -> bool:
+        """
+        Write a generated file only if its content differs
+        
+        Keeping the mtime of unchanged files lets make and arduino-cli reuse
+        the objects built from them.
+        
+        Returns:
+            True if the file was written
+        """
+        try:
+            if path.exists() and path.read_text(encoding='utf-8') == content:
+                return False
+        except (OSError, UnicodeDecodeError):
+            pass
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.last_changed_files.append(path.name)
+        return True
+    
+    def _pattern_data_unit_name(self, chip_id: str) -> str:
+        """File name of the frame data compilation unit for a chip"""
+        if self.chip_capabilities[chip_id]['template_type'] == 'arduino':
+            return "pattern_data.cpp"
+        return "pattern_data.c"
+    
+    def _remove_pattern_data_unit(self, output_path: Path) -> None:
+        """Remove a stale data unit so it isn't linked twice with an embedded header"""
+        for name in ("pattern_data.c", "pattern_data.cpp"):
+            stale = output_path / name
+            if stale.exists():
+                stale.unlink()
+    
+    def _write_pattern_array(self, f, limited_pattern: Pattern, declaration: str) -> None:
+        """Write the pattern_data byte array (header, then delay + RGB per frame)"""
+        f.write("// Pattern Data\n")
+        f.write(f"{declaration} = {{\n")
+        
+        # Write pattern header
+        f.write(f"    {limited_pattern.led_count & 0xFF}, {(limited_pattern.led_count >> 8) & 0xFF},  // LED count\n")
+        f.write(f"    {limited_pattern.frame_count & 0xFF}, {(limited_pattern.frame_count >> 8) & 0xFF},  // Frame count\n")
+        
+        # Write frame data
+        delay_ms = self._frame_delay_ms(limited_pattern)
+        for i, frame in enumerate(limited_pattern.frames):
+            f.write(f"    {delay_ms & 0xFF}, {(delay_ms >> 8) & 0xFF},  // Frame {i} delay\n")
+            
+            # Write RGB data
+            for led_idx, led in enumerate(frame.pixels):
+                r, g, b = led
+                f.write(f"    {r}, {g}, {b},")
+                if (i * limited_pattern.led_count + led_idx) % 8 == 7:
+                    f.write("  // LED data")
+                f.write("\n")
+        
+        f.write("};\n\n")
+    
+    def _write_brightness_lut(self, f, limited_pattern: Pattern, chip_id: str, config: Dict) -> None:
+        """Write the single definition of the brightness_lut tables"""
+        lut = BrightnessLUT.from_metadata(
+            limited_pattern.metadata,
+            per_channel=self.chip_capabilities[chip_id]['supports_per_channel'],
+            color_correction=config.get('color_correction', False),
+        )
+        f.write("// Brightness lookup tables (red, green, blue)\n")
+        f.write(lut.to_c_array("brightness_lut", qualifier="const"))
+        f.write("\n")
+    
+    def _write_speed_keyframes(self, f, limited_pattern: Pattern, chip_id: str) -> None:
+        """Write the single definition of the speed_keyframes table"""
+        speed_keyframes = limited_pattern.metadata.speed_keyframes or []
+        if not speed_keyframes:
+            return
+        supports_float = self.chip_capabilities[chip_id]['supports_float']
+        f.write("const struct SpeedKeyframe speed_keyframes[] PROGMEM = {\n")
+        for i, (frame, multiplier) in enumerate(speed_keyframes):
+            if supports_float:
+                f.write(f"    {{{frame}, {float(multiplier)}f}}")
+            else:
+                f.write(f"    {{{frame}, {int(multiplier * 128)}}}")
+            if i < len(speed_keyframes) - 1:
+                f.write(",")
+            f.write("\n")
+        f.write("};\n\n")
+    
+    def _frame_delay_ms(self, limited_pattern: Pattern) -> int:
+        """Per-frame delay written to the frame data"""
+        fps = limited_pattern.metadata.fps if limited_pattern.metadata.fps is not None else 20
+        return int(1000 / fps)
+    
+    def _encode_frames(self, limited_pattern: Pattern) -> EncodedStream:
+        """Compressed frame stream of a chip-limited pattern"""
+        led_count = limited_pattern.led_count
+        delay_ms = self._frame_delay_ms(limited_pattern)
+        frames = [pack_frame(frame.pixels, led_count) for frame in limited_pattern.frames]
+        # The size report, header and data unit of one generation share the encoding
+        key = (led_count, delay_ms, hashlib.blake2b(b"".join(frames), digest_size=16).digest())
+        if self._encoded is not None and self._encoded[0] == key:
+            return self._encoded[1]
+        stream = encode_frames(frames, [delay_ms] * len(frames), led_count)
+        self._encoded = (key, stream)
+        return stream
+    
+    def _write_compressed_array(self, f, limited_pattern: Pattern, declaration: str) -> None:
+        """Write pattern_data as a compressed frame stream (see firmware/frame_codec.py)"""
+        stream = self._encode_frames(limited_pattern)
+        encodings = ", ".join(f"{name} {count}" for name, count in sorted(stream.encodings.items()))
+        f.write(f"// Pattern Data (compressed: {len(stream.data)} of {stream.raw_bytes} bytes; {encodings})\n")
+        f.write(f"{declaration} = {{\n")
+        data = stream.data
+        for start in range(0, len(data), 16):
+            f.write("    " + ", ".join(str(b) for b in data[start:start + 16]) + ",\n")
+        f.write("};\n\n")
+    
+    def _generate_pattern_data_unit(self, pattern: Pattern, output_path: Path, chip_id: str,
+                                    config: Dict, compress: bool = False) -> Path:
+        """Generate the standalone compilation unit holding the frame data"""
+        limited_pattern = self._limit_pattern_for_chip(pattern, chip_id)
+        unit_path = output_path / self._pattern_data_unit_name(chip_id)
+        
+        f = io.StringIO()
+        f.write("/*\n")
+        f.write(" * Pattern Frame Data - Professional Edition\n")
+        f.write(f" * Generated for {chip_id.upper()}\n")
+        f.write(" * Upload Bridge v3.1\n")
+        f.write(" */\n\n")
+        
+        if unit_path.suffix == ".cpp":
+            f.write("#include <Arduino.h>\n")
+        else:
+            f.write("#if defined(__AVR__)\n")
+            f.write("#include <avr/pgmspace.h>\n")
+            f.write("#endif\n")
+        if compress:
+            # The decoder in the header is only needed by the player
+            f.write("#define PATTERN_DATA_UNIT\n")
+        f.write("#include \"pattern_data.h\"\n\n")
+        
+        f.write(f"const uint16_t pattern_frame_count = {limited_pattern.frame_count};\n\n")
+        self._write_brightness_lut(f, limited_pattern, chip_id, config)
+        self._write_speed_keyframes(f, limited_pattern, chip_id)
+        if compress:
+            self._write_compressed_array(f, limited_pattern, "const uint8_t pattern_data[] PROGMEM")
+        else:
+            self._write_pattern_array(f, limited_pattern, "const uint8_t pattern_data[] PROGMEM")
+        
+        self._write_if_changed(unit_path, f.getvalue())
+        return unit_path
+    
     def _generate_pattern_data_h(self, pattern: Pattern, output_path: Path, 
-                                chip_id: str, config: Dict) -> None:
+                                chip_id: str, config: Dict, split_data: bool = False) -> None:
         """Generate pattern_data.h with all advanced features"""
         capabilities = self.chip_capabilities[chip_id]
+        compress = self._compression_enabled(chip_id, config)
         
         # Limit features based on chip capabilities
         limited_pattern = self._limit_pattern_for_chip(pattern, chip_id)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("/*\n")
-            f.write(" * Pattern Data Header - Professional Edition\n")
-            f.write(f" * Generated for {chip_id.upper()}\n")
-            f.write(" * Upload Bridge v3.1\n")
-            f.write(" */\n\n")
-            
-            f.write("#ifndef PATTERN_DATA_H\n")
-            f.write("#define PATTERN_DATA_H\n\n")
-            
-            # Basic pattern info
-            f.write(f"#define LED_DATA_PIN {config.get('gpio_pin', 2)}\n")
-            f.write(f"#define LED_COUNT {limited_pattern.led_count}\n")
+        f = io.StringIO()
+        f.write("/*\n")
+        f.write(" * Pattern Data Header - Professional Edition\n")
+        f.write(f" * Generated for {chip_id.upper()}\n")
+        f.write(" * Upload Bridge v3.1\n")
+        f.write(" */\n\n")
+        
+        f.write("#ifndef PATTERN_DATA_H\n")
+        f.write("#define PATTERN_DATA_H\n\n")
+        
+        if split_data:
+            f.write("#include <stdint.h>\n\n")
+            f.write("#ifndef PROGMEM\n")
+            f.write("#define PROGMEM\n")
+            f.write("#endif\n\n")
+        
+        # Basic pattern info
+        f.write(f"#define LED_DATA_PIN {config.get('gpio_pin', 2)}\n")
+        f.write(f"#define LED_COUNT {limited_pattern.led_count}\n")
+        if split_data:
+            # Frame count lives in the data unit so new patterns don't touch this header
+            f.write("#define FRAME_COUNT pattern_frame_count\n\n")
+        else:
             f.write(f"#define FRAME_COUNT {limited_pattern.frame_count}\n\n")
-            
-            # Advanced brightness settings
-            f.write("// Advanced Brightness Control\n")
-            brightness = limited_pattern.metadata.brightness if limited_pattern.metadata.brightness is not None else 1.0
-            f.write(f"#define BRIGHTNESS {int(brightness * 255)}\n")
-            brightness_curve = limited_pattern.metadata.brightness_curve if limited_pattern.metadata.brightness_curve is not None else 'linear'
-            f.write(f"#define BRIGHTNESS_CURVE_TYPE \"{brightness_curve}\"\n")
-            led_type = limited_pattern.metadata.led_type if limited_pattern.metadata.led_type is not None else 'ws2812'
-            f.write(f"#define LED_TYPE \"{led_type}\"\n")
-            f.write(f"#define PER_CHANNEL_BRIGHTNESS_SETTING {1 if limited_pattern.metadata.per_channel_brightness else 0}\n")
-            red_brightness = limited_pattern.metadata.red_brightness if limited_pattern.metadata.red_brightness is not None else 1.0
-            f.write(f"#define RED_BRIGHTNESS_SETTING {int(red_brightness * 255)}\n")
-            green_brightness = limited_pattern.metadata.green_brightness if limited_pattern.metadata.green_brightness is not None else 1.0
-            f.write(f"#define GREEN_BRIGHTNESS_SETTING {int(green_brightness * 255)}\n")
-            blue_brightness = limited_pattern.metadata.blue_brightness if limited_pattern.metadata.blue_brightness is not None else 1.0
-            f.write(f"#define BLUE_BRIGHTNESS_SETTING {int(blue_brightness * 255)}\n\n")
-            
-            # Advanced speed settings
-            f.write("// Advanced Speed Control\n")
-            speed_curve = limited_pattern.metadata.speed_curve if limited_pattern.metadata.speed_curve is not None else 'linear'
-            f.write(f"#define SPEED_CURVE_TYPE \"{speed_curve}\"\n")
-            f.write(f"#define VARIABLE_SPEED_SETTING {1 if limited_pattern.metadata.variable_speed else 0}\n")
-            f.write(f"#define INTERPOLATION_ENABLED_SETTING {1 if limited_pattern.metadata.interpolation_enabled else 0}\n")
-            interpolation_factor = limited_pattern.metadata.interpolation_factor if limited_pattern.metadata.interpolation_factor is not None else 1.0
-            f.write(f"#define INTERPOLATION_FACTOR_SETTING {int(interpolation_factor * 10)}\n\n")
-            
-            # Speed keyframes
-            speed_keyframes = limited_pattern.metadata.speed_keyframes if limited_pattern.metadata.speed_keyframes is not None else []
-            f.write("// Speed Keyframes\n")
-            f.write(f"#define NUM_KEYFRAMES {len(speed_keyframes)}\n")
-            if speed_keyframes:
-                f.write("struct SpeedKeyframe {\n")
-                f.write("    uint16_t frame;\n")
-                if capabilities['supports_float']:
-                    f.write("    float multiplier;\n")
-                else:
-                    f.write("    uint8_t multiplier;  // 0-255, represents 0.0-2.0\n")
-                f.write("};\n\n")
-                
-                f.write("const struct SpeedKeyframe speed_keyframes[] PROGMEM = {\n")
-                for i, (frame, multiplier) in enumerate(speed_keyframes):
-                    if capabilities['supports_float']:
-                        f.write(f"    {{{frame}, {multiplier}f}}")
-                    else:
-                        f.write(f"    {{{frame}, {int(multiplier * 128)}}}")
-                    if i < len(speed_keyframes) - 1:
-                        f.write(",")
-                    f.write("\n")
-                f.write("};\n\n")
+        if compress:
+            f.write("// Frames are a compressed stream; play them with pattern_stream_next()\n")
+            f.write("#define PATTERN_COMPRESSED 1\n\n")
+        
+        # Advanced brightness settings
+        f.write("// Advanced Brightness Control\n")
+        brightness = limited_pattern.metadata.brightness if limited_pattern.metadata.brightness is not None else 1.0
+        f.write(f"#define BRIGHTNESS {int(brightness * 255)}\n")
+        brightness_curve = limited_pattern.metadata.brightness_curve if limited_pattern.metadata.brightness_curve is not None else 'linear'
+        f.write(f"#define BRIGHTNESS_CURVE_TYPE \"{brightness_curve}\"\n")
+        led_type = limited_pattern.metadata.led_type if limited_pattern.metadata.led_type is not None else 'ws2812'
+        f.write(f"#define LED_TYPE \"{led_type}\"\n")
+        f.write(f"#define PER_CHANNEL_BRIGHTNESS_SETTING {1 if limited_pattern.metadata.per_channel_brightness else 0}\n")
+        red_brightness = limited_pattern.metadata.red_brightness if limited_pattern.metadata.red_brightness is not None else 1.0
+        f.write(f"#define RED_BRIGHTNESS_SETTING {int(red_brightness * 255)}\n")
+        green_brightness = limited_pattern.metadata.green_brightness if limited_pattern.metadata.green_brightness is not None else 1.0
+        f.write(f"#define GREEN_BRIGHTNESS_SETTING {int(green_brightness * 255)}\n")
+        blue_brightness = limited_pattern.metadata.blue_brightness if limited_pattern.metadata.blue_brightness is not None else 1.0
+        f.write(f"#define BLUE_BRIGHTNESS_SETTING {int(blue_brightness * 255)}\n\n")
+        
+        # Curve, per-channel scaling and LED correction compiled to tables;
+        # the player maps each channel with a table read instead of float math
+        f.write("#define BRIGHTNESS_LUT_ENABLED 1\n")
+        if split_data:
+            f.write("// Brightness lookup tables (red, green, blue) are in the data unit\n\n")
+        else:
+            self._write_brightness_lut(f, limited_pattern, chip_id, config)
+        
+        # Advanced speed settings
+        f.write("// Advanced Speed Control\n")
+        speed_curve = limited_pattern.metadata.speed_curve if limited_pattern.metadata.speed_curve is not None else 'linear'
+        f.write(f"#define SPEED_CURVE_TYPE \"{speed_curve}\"\n")
+        f.write(f"#define VARIABLE_SPEED_SETTING {1 if limited_pattern.metadata.variable_speed else 0}\n")
+        # Compressed frames are decoded sequentially, so the next frame isn't available to blend with
+        interpolation_enabled = limited_pattern.metadata.interpolation_enabled and not compress
+        f.write(f"#define INTERPOLATION_ENABLED_SETTING {1 if interpolation_enabled else 0}\n")
+        interpolation_factor = limited_pattern.metadata.interpolation_factor if limited_pattern.metadata.interpolation_factor is not None else 1.0
+        f.write(f"#define INTERPOLATION_FACTOR_SETTING {int(interpolation_factor * 10)}\n\n")
+        
+        # Speed keyframes
+        speed_keyframes = limited_pattern.metadata.speed_keyframes if limited_pattern.metadata.speed_keyframes is not None else []
+        f.write("// Speed Keyframes\n")
+        f.write(f"#define NUM_KEYFRAMES {len(speed_keyframes)}\n")
+        if speed_keyframes:
+            f.write("struct SpeedKeyframe {\n")
+            f.write("    uint16_t frame;\n")
+            if capabilities['supports_float']:
+                f.write("    float multiplier;\n")
             else:
-                f.write("// No speed keyframes defined\n\n")
-            
-            # Pattern data
-            f.write("// Pattern Data\n")
-            f.write("const uint8_t pattern_data[] PROGMEM = {\n")
-            
-            # Write pattern header
-            f.write(f"    {limited_pattern.led_count & 0xFF}, {(limited_pattern.led_count >> 8) & 0xFF},  // LED count\n")
-            f.write(f"    {limited_pattern.frame_count & 0xFF}, {(limited_pattern.frame_count >> 8) & 0xFF},  // Frame count\n")
-            
-            # Write frame data
-            for i, frame in enumerate(limited_pattern.frames):
-                # Write frame delay - ensure fps is not None
-                fps = limited_pattern.metadata.fps if limited_pattern.metadata.fps is not None else 20
-                delay_ms = int(1000 / fps)
-                f.write(f"    {delay_ms & 0xFF}, {(delay_ms >> 8) & 0xFF},  // Frame {i} delay\n")
-                
-                # Write RGB data
-                for led_idx, led in enumerate(frame.pixels):
-                    r, g, b = led
-                    f.write(f"    {r}, {g}, {b},")
-                    if (i * limited_pattern.led_count + led_idx) % 8 == 7:
-                        f.write("  // LED data")
-                    f.write("\n")
-            
-            f.write("};\n\n")
-            f.write("#endif // PATTERN_DATA_H\n")
+                f.write("    uint8_t multiplier;  // 0-255, represents 0.0-2.0\n")
+            f.write("};\n")
+            # Divide multiplier by this to get the speed factor
+            f.write(f"#define SPEED_KEYFRAME_SCALE {'1.0f' if capabilities['supports_float'] else '128.0f'}\n\n")
+            if split_data:
+                f.write("// Keyframe table is in the data unit\n\n")
+            else:
+                self._write_speed_keyframes(f, limited_pattern, chip_id)
+        else:
+            f.write("// No speed keyframes defined\n\n")
+        
+        if split_data:
+            f.write("// Frame data (pattern_data.c / pattern_data.cpp)\n")
+            f.write("#ifdef __cplusplus\n")
+            f.write("extern \"C\" {\n")
+            f.write("#endif\n")
+            f.write("extern const uint16_t pattern_frame_count;\n")
+            f.write("extern const uint8_t pattern_data[] PROGMEM;\n")
+            f.write("extern const uint8_t brightness_lut[3][256] PROGMEM;\n")
+            if speed_keyframes:
+                f.write("extern const struct SpeedKeyframe speed_keyframes[] PROGMEM;\n")
+            f.write("#ifdef __cplusplus\n")
+            f.write("}\n")
+            f.write("#endif\n\n")
+        elif compress:
+            self._write_compressed_array(f, limited_pattern, "const uint8_t pattern_data[] PROGMEM")
+        else:
+            self._write_pattern_array(f, limited_pattern, "const uint8_t pattern_data[] PROGMEM")
+        
+        if compress:
+            f.write("#ifndef PATTERN_DATA_UNIT\n")
+            f.write(C_DECODER)
+            f.write("#endif // PATTERN_DATA_UNIT\n\n")
+        
+        f.write("#endif // PATTERN_DATA_H\n")
+        
+        self._write_if_changed(output_path, f.getvalue())
     
     def _limit_pattern_for_chip(self, pattern: Pattern, chip_id: str) -> Pattern:
         """Limit pattern features based on chip capabilities"""
@@ -283,29 +667,17 @@ class UniversalPatternGenerator:
         max_leds = capabilities['max_leds']
         led_count = pattern.led_count
         
+        settings = {name: getattr(pattern.metadata, name) for name in FIRMWARE_SETTING_FIELDS}
+        settings['speed_keyframes'] = list(pattern.metadata.speed_keyframes or [])
         frames = []
         if led_count > max_leds:
             for f in pattern.frames:
                 frames.append(Frame(pixels=f.pixels[:max_leds], duration_ms=f.duration_ms))
             # Use linear width for safety when trimming; preserves LED_COUNT for firmware
-            new_meta = PatternMetadata(
-                width=max_leds,
-                height=1,
-                color_order=pattern.metadata.color_order,
-                fps=pattern.metadata.fps,
-                total_ms=pattern.metadata.total_ms,
-                brightness=pattern.metadata.brightness,
-            )
+            new_meta = PatternMetadata(width=max_leds, height=1, **settings)
         else:
             frames = [Frame(pixels=f.pixels, duration_ms=f.duration_ms) for f in pattern.frames]
-            new_meta = PatternMetadata(
-                width=pattern.metadata.width,
-                height=pattern.metadata.height,
-                color_order=pattern.metadata.color_order,
-                fps=pattern.metadata.fps,
-                total_ms=pattern.metadata.total_ms,
-                brightness=pattern.metadata.brightness,
-            )
+            new_meta = PatternMetadata(width=pattern.metadata.width, height=pattern.metadata.height, **settings)
         
         limited_pattern = Pattern(name=pattern.name, metadata=new_meta, frames=frames)
         
@@ -322,13 +694,8 @@ class UniversalPatternGenerator:
         if not capabilities['supports_per_channel']:
             limited_pattern.metadata.per_channel_brightness = False
         
-        if not capabilities['supports_float']:
-            # Convert float values to fixed-point for 8-bit chips
-            limited_pattern.metadata.brightness = int(limited_pattern.metadata.brightness * 127)
-            limited_pattern.metadata.red_brightness = int(limited_pattern.metadata.red_brightness * 127)
-            limited_pattern.metadata.green_brightness = int(limited_pattern.metadata.green_brightness * 127)
-            limited_pattern.metadata.blue_brightness = int(limited_pattern.metadata.blue_brightness * 127)
-        
+        # Brightness stays 0.0-1.0: the header scales it to 0-255 and the
+        # brightness tables are compiled on the host
         return limited_pattern
     
     def _generate_arduino_template(self, pattern: Pattern, chip_id: str, 
@@ -348,13 +715,6 @@ class UniversalPatternGenerator:
 // FastLED library for professional LED control
 #include <FastLED.h>
 
-// Advanced brightness control
-#define BRIGHTNESS_CURVE_LINEAR 0
-#define BRIGHTNESS_CURVE_GAMMA_CORRECTED 1
-#define BRIGHTNESS_CURVE_LOGARITHMIC 2
-#define BRIGHTNESS_CURVE_EXPONENTIAL 3
-#define BRIGHTNESS_CURVE_S_CURVE 4
-
 // Speed control
 #define SPEED_CURVE_LINEAR 0
 #define SPEED_CURVE_EASE_IN_QUAD 1
@@ -368,35 +728,30 @@ class UniversalPatternGenerator:
 CRGB leds[LED_COUNT];
 
 // Global settings
-float global_brightness = 1.0;
-float red_brightness = 1.0;
-float green_brightness = 1.0;
-float blue_brightness = 1.0;
-bool per_channel_brightness = false;
-uint8_t brightness_curve = BRIGHTNESS_CURVE_GAMMA_CORRECTED;
 uint8_t speed_curve = SPEED_CURVE_LINEAR;
 bool variable_speed = false;
 bool interpolation_enabled = false;
 float interpolation_factor = 1.0;
 
-// Speed keyframes
-struct SpeedKeyframe {{
-    uint16_t frame;
-    float multiplier;
-}};
-SpeedKeyframe speed_keyframes[32];
-uint8_t num_keyframes = 0;
+// Speed keyframes come from pattern_data.h (NUM_KEYFRAMES, speed_keyframes)
 
 // Interpolation buffer
 CRGB interpolation_buffer[LED_COUNT];
 
+#ifdef PATTERN_COMPRESSED
+// Last decoded frame (delta frames patch it in place)
+uint8_t frame_buffer[LED_COUNT * 3];
+pattern_stream_t pattern_stream;
+#endif
+
 // Function prototypes
-float apply_brightness_curve(float value, uint8_t curve_type);
 float apply_speed_curve(float t, uint8_t curve_type);
 uint16_t get_frame_delay(uint16_t base_delay, uint32_t frame, uint32_t total_frames);
-void apply_brightness_to_pixel(CRGB &pixel, float brightness);
+void apply_brightness_to_pixel(CRGB &pixel);
 void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint16_t led_count);
 void process_frame_with_interpolation(uint16_t frame_idx, uint16_t total_frames, uint16_t led_count);
+void process_compressed_frame(uint16_t led_count);
+void wait_frame_delay(uint16_t delay_ms);
 
 void setup() {{
     // Initialize FastLED
@@ -404,19 +759,14 @@ void setup() {{
     FastLED.setBrightness(255);
     
     // Load advanced settings from pattern metadata
-    global_brightness = BRIGHTNESS / 255.0;
-    red_brightness = RED_BRIGHTNESS_SETTING / 255.0;
-    green_brightness = GREEN_BRIGHTNESS_SETTING / 255.0;
-    blue_brightness = BLUE_BRIGHTNESS_SETTING / 255.0;
-    per_channel_brightness = PER_CHANNEL_BRIGHTNESS_SETTING;
-    brightness_curve = BRIGHTNESS_CURVE_GAMMA_CORRECTED;  // Default, can be changed
     speed_curve = SPEED_CURVE_LINEAR;  // Default, can be changed
     variable_speed = VARIABLE_SPEED_SETTING;
     interpolation_enabled = INTERPOLATION_ENABLED_SETTING;
     interpolation_factor = INTERPOLATION_FACTOR_SETTING / 10.0;
     
-    // Load speed keyframes
-    num_keyframes = NUM_KEYFRAMES;
+#ifdef PATTERN_COMPRESSED
+    pattern_stream_rewind(&pattern_stream, frame_buffer, LED_COUNT);
+#endif
     
     // Initialize serial for debugging
     Serial.begin(115200);
@@ -425,11 +775,31 @@ void setup() {{
 }}
 
 void loop() {{
+#ifdef PATTERN_COMPRESSED
+    // Frames decode sequentially; the stream wraps to the first frame by itself
+    process_compressed_frame(LED_COUNT);
+#else
     // Play all frames with advanced features
     for (uint16_t frame = 0; frame < FRAME_COUNT; frame++) {{
         process_frame_with_interpolation(frame, FRAME_COUNT, LED_COUNT);
     }}
+#endif
+}}
+
+#ifdef PATTERN_COMPRESSED
+void process_compressed_frame(uint16_t led_count) {{
+    uint16_t frame_idx = pattern_stream.frame < FRAME_COUNT ? pattern_stream.frame : 0;
+    uint16_t base_delay = pattern_stream_next(&pattern_stream, frame_buffer, led_count);
+    
+    for (uint16_t led = 0; led < led_count; led++) {{
+        leds[led] = CRGB(frame_buffer[led * 3], frame_buffer[led * 3 + 1], frame_buffer[led * 3 + 2]);
+        apply_brightness_to_pixel(leds[led]);
+    }}
+    
+    FastLED.show();
+    wait_frame_delay(get_frame_delay(base_delay, frame_idx, FRAME_COUNT));
 }}
+#endif
 
 void process_frame_with_interpolation(uint16_t frame_idx, uint16_t total_frames, uint16_t led_count) {{
     // Read frame delay
@@ -447,7 +817,7 @@ void process_frame_with_interpolation(uint16_t frame_idx, uint16_t total_frames,
         
         // Apply advanced brightness
         leds[led] = CRGB(r, g, b);
-        apply_brightness_to_pixel(leds[led], global_brightness);
+        apply_brightness_to_pixel(leds[led]);
     }}
     
     // Apply interpolation if enabled
@@ -461,7 +831,7 @@ void process_frame_with_interpolation(uint16_t frame_idx, uint16_t total_frames,
             
             // Apply brightness to next frame
             interpolation_buffer[led] = CRGB(r, g, b);
-            apply_brightness_to_pixel(interpolation_buffer[led], global_brightness);
+            apply_brightness_to_pixel(interpolation_buffer[led]);
         }}
         
         // Interpolate between frames
@@ -472,6 +842,10 @@ void process_frame_with_interpolation(uint16_t frame_idx, uint16_t total_frames,
     // Show LEDs
     FastLED.show();
     
+    wait_frame_delay(delay_ms);
+}}
+
+void wait_frame_delay(uint16_t delay_ms) {{
     // Delay with watchdog feeding
     if (delay_ms >= 10) {{
         // Long delay: yield every 10ms to feed watchdog
@@ -491,32 +865,6 @@ void process_frame_with_interpolation(uint16_t frame_idx, uint16_t total_frames,
     }}
 }}
 
-float apply_brightness_curve(float value, uint8_t curve_type) {{
-    if (value < 0.0) value = 0.0;
-    if (value > 1.0) value = 1.0;
-    
-    switch (curve_type) {{
-        case BRIGHTNESS_CURVE_LINEAR:
-            return value;
-            
-        case BRIGHTNESS_CURVE_GAMMA_CORRECTED:
-            return pow(value, 1.0 / 2.2);
-            
-        case BRIGHTNESS_CURVE_LOGARITHMIC:
-            if (value == 0.0) return 0.0;
-            return log(1.0 + value * 9.0) / log(10.0);
-            
-        case BRIGHTNESS_CURVE_EXPONENTIAL:
-            return value * value;
-            
-        case BRIGHTNESS_CURVE_S_CURVE:
-            return 3.0 * value * value - 2.0 * value * value * value;
-            
-        default:
-            return value;
-    }}
-}}
-
 float apply_speed_curve(float t, uint8_t curve_type) {{
     if (t < 0.0) t = 0.0;
     if (t > 1.0) t = 1.0;
@@ -561,29 +909,22 @@ uint16_t get_frame_delay(uint16_t base_delay, uint32_t frame, uint32_t total_fra
     
     // Apply keyframes if available
     float keyframe_factor = 1.0;
-    for (uint8_t i = 0; i < num_keyframes; i++) {{
+#if NUM_KEYFRAMES > 0
+    for (uint8_t i = 0; i < NUM_KEYFRAMES; i++) {{
         if (frame >= speed_keyframes[i].frame) {{
-            keyframe_factor = speed_keyframes[i].multiplier;
+            keyframe_factor = speed_keyframes[i].multiplier / SPEED_KEYFRAME_SCALE;
         }}
     }}
+#endif
     
     return (uint16_t)(base_delay / (curve_factor * keyframe_factor));
 }}
 
-void apply_brightness_to_pixel(CRGB &pixel, float brightness) {{
-    if (per_channel_brightness) {{
-        // Per-channel brightness control
-        pixel.r = (uint8_t)(pixel.r * brightness * red_brightness);
-        pixel.g = (uint8_t)(pixel.g * brightness * green_brightness);
-        pixel.b = (uint8_t)(pixel.b * brightness * blue_brightness);
-    }} else {{
-        // Apply brightness curve
-        float curved_brightness = apply_brightness_curve(brightness, brightness_curve);
-        
-        pixel.r = (uint8_t)(pixel.r * curved_brightness);
-        pixel.g = (uint8_t)(pixel.g * curved_brightness);
-        pixel.b = (uint8_t)(pixel.b * curved_brightness);
-    }}
+void apply_brightness_to_pixel(CRGB &pixel) {{
+    // Curve, per-channel scaling and LED correction are baked into the tables
+    pixel.r = pgm_read_byte(&brightness_lut[0][pixel.r]);
+    pixel.g = pgm_read_byte(&brightness_lut[1][pixel.g]);
+    pixel.b = pgm_read_byte(&brightness_lut[2][pixel.b]);
 }}
 
 void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint16_t led_count) {{
@@ -596,8 +937,7 @@ void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint1
 '''
         
         main_file = output_path / f"{output_path.name}.ino"
-        with open(main_file, 'w', encoding='utf-8') as f:
-            f.write(template_content)
+        self._write_if_changed(main_file, template_content)
         
         return main_file
     
@@ -608,13 +948,13 @@ void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint1
         
         # Use the professional template we already created
         if chip_id == 'atmega328p':
-            template_file = Path("firmware/templates/atmega328p/professional_pattern_player.c")
+            template_file = Path(__file__).parent / "templates" / "atmega328p" / "professional_pattern_player.c"
         elif chip_id == 'stm32f103c8':
-            template_file = Path("firmware/templates/stm32f103c8/professional_pattern_player.c")
+            template_file = Path(__file__).parent / "templates" / "stm32f103c8" / "professional_pattern_player.c"
         elif chip_id == 'pic16f876a':
-            template_file = Path("firmware/templates/pic16f876a/professional_pattern_player.c")
+            template_file = Path(__file__).parent / "templates" / "pic16f876a" / "professional_pattern_player.c"
         elif chip_id == 'numicro_m031':
-            template_file = Path("firmware/templates/numicro_m031/professional_pattern_player.c")
+            template_file = Path(__file__).parent / "templates" / "numicro_m031" / "professional_pattern_player.c"
         else:
             # Generate generic C template
             template_file = self._generate_generic_c_template(pattern, chip_id, output_path, config)
@@ -622,8 +962,8 @@ void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint1
         
         # Copy the professional template
         main_file = output_path / f"professional_pattern_player.c"
-        with open(template_file, 'r', encoding='utf-8') as src, open(main_file, 'w', encoding='utf-8') as dst:
-            dst.write(src.read())
+        with open(template_file, 'r', encoding='utf-8') as src:
+            self._write_if_changed(main_file, src.read())
         
         return main_file
     
@@ -639,15 +979,9 @@ void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint1
  * Generated by Upload Bridge - Professional Edition
  */
 
+#include <stdbool.h>
 #include "pattern_data.h"
 
-// Advanced brightness control
-#define BRIGHTNESS_CURVE_LINEAR 0
-#define BRIGHTNESS_CURVE_GAMMA_CORRECTED 1
-#define BRIGHTNESS_CURVE_LOGARITHMIC 2
-#define BRIGHTNESS_CURVE_EXPONENTIAL 3
-#define BRIGHTNESS_CURVE_S_CURVE 4
-
 // Speed control
 #define SPEED_CURVE_LINEAR 0
 #define SPEED_CURVE_EASE_IN_QUAD 1
@@ -669,24 +1003,18 @@ void interpolate_frames(CRGB *frame1, CRGB *frame2, CRGB *output, float t, uint1
 uint8_t led_buffer[MAX_LEDS * 3];
 
 // Global settings
-float global_brightness = 1.0;
-float red_brightness = 1.0;
-float green_brightness = 1.0;
-float blue_brightness = 1.0;
-bool per_channel_brightness = false;
-uint8_t brightness_curve = BRIGHTNESS_CURVE_GAMMA_CORRECTED;
 uint8_t speed_curve = SPEED_CURVE_LINEAR;
 bool variable_speed = false;
 bool interpolation_enabled = false;
 float interpolation_factor = 1.0;
 
-// Speed keyframes
-struct SpeedKeyframe {{
-    uint16_t frame;
-    float multiplier;
-}};
-SpeedKeyframe speed_keyframes[{capabilities['max_keyframes']}];
-uint8_t num_keyframes = 0;
+// Speed keyframes come from pattern_data.h (NUM_KEYFRAMES, speed_keyframes)
+
+#ifdef PATTERN_COMPRESSED
+// Last decoded frame (delta frames patch it in place)
+uint8_t frame_buffer[LED_COUNT * 3];
+pattern_stream_t pattern_stream;
+#endif
 
 // Function prototypes
 void ws2812_init(uint8_t pin);
@@ -694,35 +1022,31 @@ void ws2812_send_byte(uint8_t byte);
 void ws2812_send(uint8_t *data, uint16_t len);
 uint16_t read_u16_pgm(const uint8_t *ptr, uint16_t idx);
 uint8_t read_u8_pgm(const uint8_t *ptr, uint16_t idx);
-float apply_brightness_curve(float value, uint8_t curve_type);
 float apply_speed_curve(float t, uint8_t curve_type);
 uint16_t get_frame_delay(uint16_t base_delay, uint32_t frame, uint32_t total_frames);
-void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, float brightness);
+void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b);
 void process_frame(const uint8_t *pattern_data, uint16_t frame_idx, uint16_t total_frames, uint16_t led_count);
+void process_compressed_frame(uint16_t led_count);
 void delay_ms(uint32_t ms);
+void delay_us(uint32_t us);
 
 int main(void) {{
     // Initialize WS2812 pin
     ws2812_init(DATA_PIN);
     
     // Load advanced settings from pattern metadata
-    global_brightness = BRIGHTNESS / 255.0;
-    red_brightness = red_brightness / 255.0;
-    green_brightness = green_brightness / 255.0;
-    blue_brightness = blue_brightness / 255.0;
-    per_channel_brightness = per_channel_brightness;
-    brightness_curve = brightness_curve;
     speed_curve = speed_curve;
     variable_speed = variable_speed;
     interpolation_enabled = interpolation_enabled;
     interpolation_factor = interpolation_factor / 10.0;
     
-    // Load speed keyframes
-    num_keyframes = num_keyframes;
-    for (uint8_t i = 0; i < num_keyframes && i < {capabilities['max_keyframes']}; i++) {{
-        speed_keyframes[i].frame = speed_keyframes[i].frame;
-        speed_keyframes[i].multiplier = speed_keyframes[i].multiplier;
+#ifdef PATTERN_COMPRESSED
+    // Frames decode sequentially; the stream wraps to the first frame by itself
+    pattern_stream_rewind(&pattern_stream, frame_buffer, LED_COUNT);
+    while (1) {{
+        process_compressed_frame(LED_COUNT);
     }}
+#endif
     
     // Main loop
     while (1) {{
@@ -753,7 +1077,7 @@ void process_frame(const uint8_t *pattern_data, uint16_t frame_idx, uint16_t tot
     uint16_t base_delay = read_u16_pgm(pattern_data, 4 + frame_idx * (led_count * 3 + 2));
     
     // Apply speed curve if enabled
-    uint16_t delay_ms = get_frame_delay(base_delay, frame_idx, total_frames);
+    uint16_t frame_delay = get_frame_delay(base_delay, frame_idx, total_frames);
     
     // Read current frame
     uint32_t frame_offset = 4 + frame_idx * (led_count * 3 + 2) + 2;
@@ -763,7 +1087,7 @@ void process_frame(const uint8_t *pattern_data, uint16_t frame_idx, uint16_t tot
         uint8_t b = read_u8_pgm(pattern_data, frame_offset + led * 3 + 2);
         
         // Apply advanced brightness
-        apply_brightness_to_pixel(&r, &g, &b, global_brightness);
+        apply_brightness_to_pixel(&r, &g, &b);
         
         // Store in buffer
         led_buffer[led * 3] = r;
@@ -775,34 +1099,26 @@ void process_frame(const uint8_t *pattern_data, uint16_t frame_idx, uint16_t tot
     ws2812_send(led_buffer, led_count * 3);
     
     // Delay
-    delay_ms(delay_ms);
+    delay_ms(frame_delay);
 }}
 
-float apply_brightness_curve(float value, uint8_t curve_type) {{
-    if (value < 0.0) value = 0.0;
-    if (value > 1.0) value = 1.0;
+#ifdef PATTERN_COMPRESSED
+void process_compressed_frame(uint16_t led_count) {{
+    uint16_t frame_idx = pattern_stream.frame < FRAME_COUNT ? pattern_stream.frame : 0;
+    uint16_t base_delay = pattern_stream_next(&pattern_stream, frame_buffer, led_count);
     
-    switch (curve_type) {{
-        case BRIGHTNESS_CURVE_LINEAR:
-            return value;
-            
-        case BRIGHTNESS_CURVE_GAMMA_CORRECTED:
-            return pow(value, 1.0 / 2.2);
-            
-        case BRIGHTNESS_CURVE_LOGARITHMIC:
-            if (value == 0.0) return 0.0;
-            return log(1.0 + value * 9.0) / log(10.0);
-            
-        case BRIGHTNESS_CURVE_EXPONENTIAL:
-            return value * value;
-            
-        case BRIGHTNESS_CURVE_S_CURVE:
-            return 3.0 * value * value - 2.0 * value * value * value;
-            
-        default:
-            return value;
+    for (uint16_t led = 0; led < led_count * 3; led += 3) {{
+        uint8_t r = frame_buffer[led], g = frame_buffer[led + 1], b = frame_buffer[led + 2];
+        apply_brightness_to_pixel(&r, &g, &b);
+        led_buffer[led] = r;
+        led_buffer[led + 1] = g;
+        led_buffer[led + 2] = b;
     }}
+    
+    ws2812_send(led_buffer, led_count * 3);
+    delay_ms(get_frame_delay(base_delay, frame_idx, FRAME_COUNT));
 }}
+#endif
 
 float apply_speed_curve(float t, uint8_t curve_type) {{
     if (t < 0.0) t = 0.0;
@@ -838,29 +1154,22 @@ uint16_t get_frame_delay(uint16_t base_delay, uint32_t frame, uint32_t total_fra
     
     // Apply keyframes if available
     float keyframe_factor = 1.0;
-    for (uint8_t i = 0; i < num_keyframes; i++) {{
+#if NUM_KEYFRAMES > 0
+    for (uint8_t i = 0; i < NUM_KEYFRAMES; i++) {{
         if (frame >= speed_keyframes[i].frame) {{
-            keyframe_factor = speed_keyframes[i].multiplier;
+            keyframe_factor = speed_keyframes[i].multiplier / SPEED_KEYFRAME_SCALE;
         }}
     }}
+#endif
     
     return (uint16_t)(base_delay / (curve_factor * keyframe_factor));
 }}
 
-void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b, float brightness) {{
-    if (per_channel_brightness) {{
-        // Per-channel brightness control
-        *r = (uint8_t)(*r * brightness * red_brightness);
-        *g = (uint8_t)(*g * brightness * green_brightness);
-        *b = (uint8_t)(*b * brightness * blue_brightness);
-    }} else {{
-        // Apply brightness curve
-        float curved_brightness = apply_brightness_curve(brightness, brightness_curve);
-        
-        *r = (uint8_t)(*r * curved_brightness);
-        *g = (uint8_t)(*g * curved_brightness);
-        *b = (uint8_t)(*b * curved_brightness);
-    }}
+void apply_brightness_to_pixel(uint8_t *r, uint8_t *g, uint8_t *b) {{
+    // Curve, per-channel scaling and LED correction are baked into the tables
+    *r = read_u8_pgm(brightness_lut[0], *r);
+    *g = read_u8_pgm(brightness_lut[1], *g);
+    *b = read_u8_pgm(brightness_lut[2], *b);
 }}
 
 // WS2812 bit-banging functions (implement for your specific chip)
@@ -887,6 +1196,11 @@ void delay_ms(uint32_t ms) {{
     // Implementation depends on your chip
 }}
 
+void delay_us(uint32_t us) {{
+    // Delay implementation
+    // Implementation depends on your chip
+}}
+
 // Helper functions
 uint16_t read_u16_pgm(const uint8_t *ptr, uint16_t idx) {{
     return ptr[idx] | (ptr[idx + 1] << 8);
@@ -898,14 +1212,16 @@ uint8_t read_u8_pgm(const uint8_t *ptr, uint16_t idx) {{
 '''
         
         main_file = output_path / f"professional_pattern_player.c"
-        with open(main_file, 'w', encoding='utf-8') as f:
-            f.write(template_content)
+        self._write_if_changed(main_file, template_content)
         
         return main_file
     
-    def _generate_makefile(self, chip_id: str, output_path: Path) -> None:
+    def _generate_makefile(self, chip_id: str, output_path: Path, split_data: bool = False) -> None:
         """Generate Makefile for C templates"""
         capabilities = self.chip_capabilities[chip_id]
+        sources = "professional_pattern_player.c"
+        if split_data:
+            sources += " pattern_data.c"
         
         makefile_content = f'''# Makefile for {chip_id.upper()} Professional Pattern Player
 # Upload Bridge v3.1
@@ -913,7 +1229,7 @@ uint8_t read_u8_pgm(const uint8_t *ptr, uint16_t idx) {{
 # Chip-specific settings
 CHIP = {chip_id}
 TARGET = professional_pattern_player
-SOURCES = professional_pattern_player.c
+SOURCES = {sources}
 
 # Compiler settings
 CC = gcc
@@ -937,6 +1253,9 @@ $(TARGET): $(OBJECTS)
 %.o: %.c
 \t$(CC) $(CFLAGS) $(INCLUDES) -c $< -o $@
 
+# Only the header is shared; a new pattern rebuilds pattern_data.o and relinks
+$(OBJECTS): pattern_data.h
+
 # Clean build files
 clean:
 \trm -f $(OBJECTS) $(TARGET)
@@ -949,8 +1268,7 @@ install: $(TARGET)
 '''
         
         makefile_path = output_path / "Makefile"
-        with open(makefile_path, 'w', encoding='utf-8') as f:
-            f.write(makefile_content)
+        self._write_if_changed(makefile_path, makefile_content)
     
     def _generate_readme(self, chip_id: str, output_path: Path, capabilities: Dict) -> None:
         """Generate README for the template"""
@@ -1045,8 +1363,7 @@ https://github.com/yourname/upload-bridge
 '''
         
         readme_path = output_path / "README.md"
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        self._write_if_changed(readme_path, readme_content)
     
     def get_chip_capabilities(self, chip_id: str) -> Dict:
         """Get capabilities for a specific chip"""
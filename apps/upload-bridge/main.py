@@ -431,4 +431,7 @@ def run_app():
 
 
 if __name__ == "__main__":
+    # Template preview workers are spawned processes (needed for frozen builds)
+    import multiprocessing
+    multiprocessing.freeze_support()
     run_app()
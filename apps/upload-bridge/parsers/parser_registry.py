@@ -3,7 +3,7 @@ Parser Registry - Auto-detects and dispatches to correct parser
 Real implementation with confidence scoring
 """
 
-from typing import Optional, List, Tuple
+from typing import TYPE_CHECKING, Optional, List, Tuple
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -18,20 +18,37 @@ from .raw_rgb_parser import RawRGBParser
 from .intel_hex_parser import IntelHexParser
 from .enhanced_binary_parser import EnhancedBinaryParser
 
+if TYPE_CHECKING:
+    from core.detection_cache import DetectionCache
+
 
 class ParserRegistry:
     """
     Registry of all available parsers with auto-detection
     """
     
-    def __init__(self):
-        """Initialize with all available parsers"""
+    def __init__(self, detection_cache: Optional["DetectionCache"] = None):
+        """
+        Initialize with all available parsers
+        
+        Args:
+            detection_cache: Optional cache of per-file detection results;
+                files seen before skip parser auto-detection
+        """
         self.parsers: List[ParserBase] = [
             StandardFormatParser(),
             IntelHexParser(),
             EnhancedBinaryParser(),  # Enhanced binary parser for large files
             RawRGBParser()  # Last because it's least specific
         ]
+        self.detection_cache = detection_cache
+    
+    def get_parser(self, format_name: str) -> Optional[ParserBase]:
+        """Parser whose format name is `format_name`, if registered"""
+        for parser in self.parsers:
+            if parser.get_format_name() == format_name:
+                return parser
+        return None
     
     def detect_format(self, data: bytes, filename: str = "",
                      suggested_leds: Optional[int] = None,
@@ -96,8 +113,29 @@ class ParserRegistry:
         if not data:
             raise ValueError("File is empty")
         
-        # Detect format
-        parser = self.detect_format(data, path.name, suggested_leds, suggested_frames)
+        # Reuse the parser chosen the last time this file was opened
+        # (suggested counts change how files parse, so those loads are not cached)
+        cache_key = None
+        cached = None
+        if self.detection_cache is not None and suggested_leds is None and suggested_frames is None:
+            from core.detection_cache import content_key
+            cache_key = content_key(data, path.suffix)
+            cached = self.detection_cache.get(cache_key)
+        
+        parser = self.get_parser(cached.format_name) if cached else None
+        pattern = None
+        if parser is not None:
+            try:
+                pattern = parser.parse(data, suggested_leds, suggested_frames)
+            except Exception as e:
+                # Stale entry (e.g. the parser changed since it was stored)
+                logger.debug(f"Cached parser {cached.format_name} failed for {path.name}: {e}")
+                self.detection_cache.delete(cache_key)
+                cached = None
+                parser = None
+        if parser is None:
+            # Detect format
+            parser = self.detect_format(data, path.name, suggested_leds, suggested_frames)
         
         if not parser:
             raise ValueError(
@@ -108,7 +146,8 @@ class ParserRegistry:
         
         # Parse
         try:
-            pattern = parser.parse(data, suggested_leds, suggested_frames)
+            if pattern is None:
+                pattern = parser.parse(data, suggested_leds, suggested_frames)
             format_name = parser.get_format_name()
             
             # Set pattern name from filename
@@ -128,6 +167,9 @@ class ParserRegistry:
             pattern.metadata.source_path = str(path)
             pattern.metadata.source_format = format_name.lower()
             
+            if cache_key is not None:
+                self._remember_detection(cache_key, cached, pattern, format_name)
+            
             return (pattern, format_name)
         
         except Exception as e:
@@ -135,6 +177,25 @@ class ParserRegistry:
                 f"Failed to parse as {parser.get_format_name()}: {str(e)}"
             )
     
+    def _remember_detection(self, cache_key: str, cached, pattern: Pattern, format_name: str) -> None:
+        """Store parse results for `cache_key` unless the cached entry still matches them"""
+        from core.detection_cache import DetectionRecord
+        
+        record = DetectionRecord(
+            format_name=format_name,
+            width=pattern.metadata.width,
+            height=pattern.metadata.height,
+            led_count=pattern.led_count,
+            frame_count=pattern.frame_count,
+        )
+        unchanged = cached is not None and (
+            (cached.format_name, cached.width, cached.height, cached.led_count, cached.frame_count)
+            == (record.format_name, record.width, record.height, record.led_count, record.frame_count)
+        )
+        if not unchanged:
+            self.detection_cache.put(cache_key, record)
+        pattern.metadata.source_content_key = cache_key
+    
     def list_supported_formats(self) -> List[Tuple[str, str]]:
         """
         Get list of supported formats
@@ -214,7 +275,8 @@ def get_registry() -> ParserRegistry:
     """Get global parser registry instance"""
     global _registry
     if _registry is None:
-        _registry = ParserRegistry()
+        from core.detection_cache import get_detection_cache
+        _registry = ParserRegistry(detection_cache=get_detection_cache())
     return _registry
 
 
@@ -29,6 +29,22 @@ from domain.layers import LayerManager
 from domain.pattern_state import PatternState
 
 
+@pytest.fixture(autouse=True)
+def _no_shared_detection_cache(monkeypatch):
+    """Keep tests from reading or writing the detection cache in the user's cache directory."""
+    import core.detection_cache as detection_cache
+
+    monkeypatch.setattr(detection_cache, "_shared_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def _no_user_firmware_projects(monkeypatch, tmp_path_factory):
+    """Keep uploader builds from generating projects in the user's home directory."""
+    import uploaders.base as uploader_base
+
+    monkeypatch.setattr(uploader_base, "DEFAULT_PROJECT_ROOT", tmp_path_factory.mktemp("projects"))
+
+
 @pytest.fixture
 def pattern_factory() -> Callable[[int, int, int], Pattern]:
     def factory(frame_count: int = 3, width: int = 4, height: int = 1) -> Pattern:
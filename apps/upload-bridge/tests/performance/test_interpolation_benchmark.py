@@ -0,0 +1,57 @@
+"""
+Performance tests for array-based frame interpolation.
+
+Interpolates a 1000-frame 64x64 pattern and checks the array path against
+the per-pixel path on a slice of the same pattern. Timings are left to
+``--durations``; nothing here asserts on wall-clock time.
+"""
+
+import random
+
+import pytest
+
+import core.pattern as pattern_module
+from core.pattern import Frame, Pattern, PatternMetadata
+
+pytestmark = pytest.mark.skipif(not pattern_module.NUMPY_AVAILABLE, reason="numpy required for array interpolation")
+
+WIDTH = HEIGHT = 64
+FRAME_COUNT = 1000
+
+
+def _pattern(frame_count, seed=0):
+    rng = random.Random(seed)
+    # Shared palette tuples keep the source pattern's memory small
+    palette = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(512)]
+    frames = []
+    for i in range(frame_count):
+        offset = rng.randrange(512)
+        pixels = [palette[(offset + p) % 512] for p in range(WIDTH * HEIGHT)]
+        frames.append(Frame(pixels=pixels, duration_ms=40))
+    return Pattern(name="Bench", metadata=PatternMetadata(width=WIDTH, height=HEIGHT), frames=frames)
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+class TestInterpolationBenchmark:
+    """1000-frame 64x64 interpolation benchmark."""
+
+    @pytest.mark.parametrize("mode", ["linear", "gamma"])
+    def test_interpolate_1000_frames(self, mode):
+        """Doubling a 1000-frame 64x64 pattern runs as array operations."""
+        pattern = _pattern(FRAME_COUNT)
+        pattern.interpolate_frames(2, mode=mode)
+        assert len(pattern.frames) == 2 * FRAME_COUNT - 1
+        assert len(pattern.frames[1].pixels) == WIDTH * HEIGHT
+
+    def test_matches_per_pixel(self, monkeypatch):
+        """The array path produces the per-pixel path's frames."""
+        sample = 50
+        vectorized = _pattern(sample, seed=1)
+        vectorized.interpolate_frames(2)
+
+        reference = _pattern(sample, seed=1)
+        monkeypatch.setattr(pattern_module, "NUMPY_AVAILABLE", False)
+        reference.interpolate_frames(2)
+
+        assert [f.pixels for f in vectorized.frames] == [f.pixels for f in reference.frames]
@@ -0,0 +1,164 @@
+"""
+Performance tests for the LED simulator's image-backed paint path.
+
+Renders LEDDisplayWidget headless (offscreen Qt platform) and measures
+frame time on a large matrix, and checks the fast path matches the
+per-LED painter output on small patterns.
+"""
+
+import os
+import random
+import statistics
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QImage, QColor
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from ui.widgets.enhanced_led_simulator import LEDDisplayWidget
+from ui.widgets.led_render_cache import NUMPY_AVAILABLE
+
+pytestmark = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy required for fast paint path")
+
+TARGET_FRAME_MS = 1000.0 / 60.0
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+def _random_pattern(width, height, frame_count=8, seed=0, **meta):
+    rng = random.Random(seed)
+    frames = [
+        Frame(pixels=[(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                      for _ in range(width * height)], duration_ms=16)
+        for _ in range(frame_count)
+    ]
+    return Pattern(name="Bench", metadata=PatternMetadata(width=width, height=height, **meta), frames=frames)
+
+
+def _widget(pattern, mode="Matrix", fast=True, size=(1100, 600)):
+    widget = LEDDisplayWidget()
+    widget.resize(*size)
+    widget.fast_render = fast
+    widget.set_display_mode(mode)
+    widget.load_pattern(pattern)
+    return widget
+
+
+def _render(widget):
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    widget.render(image)
+    return image
+
+
+class TestFastPaintBenchmark:
+    """Headless frame-time benchmark on a 128x64 matrix."""
+
+    @pytest.mark.parametrize("mode", ["Matrix", "Circle", "Radial"])
+    def test_large_matrix_sustains_60fps(self, qapp, mode):
+        """Mean repaint time stays within a 60 FPS frame budget."""
+        pattern = _random_pattern(128, 64)
+        widget = _widget(pattern, mode)
+        _render(widget)  # Warm-up builds the layout caches
+
+        times = []
+        for i in range(30):
+            widget.set_frame(i % pattern.frame_count)
+            _render(widget)
+            times.append(widget.last_paint_ms)
+
+        mean_ms = statistics.mean(times)
+        assert mean_ms < TARGET_FRAME_MS, f"{mode} 128x64: mean {mean_ms:.2f} ms, max {max(times):.2f} ms"
+
+    def test_geometry_built_once_per_layout(self, qapp):
+        """Frames reuse cached geometry; a resize builds a new layout."""
+        pattern = _random_pattern(32, 16)
+        widget = _widget(pattern, "Circle")
+        for i in range(5):
+            widget.set_frame(i)
+            _render(widget)
+        assert widget._render_cache.builds == 1
+
+        widget.resize(800, 500)
+        _render(widget)
+        assert widget._render_cache.builds == 2
+
+
+class TestFastPaintParity:
+    """The image-backed path draws the same LED colours as the painter path."""
+
+    def _cell_centers(self, widget, width, height):
+        led = int(widget.led_size * widget.zoom_factor)
+        start_x = (widget.width() - width * led) // 2
+        start_y = (widget.height() - height * led) // 2
+        for y in range(height):
+            for x in range(width):
+                yield y * width + x, start_x + x * led + led // 2, start_y + y * led + led // 2
+
+    def test_matrix_cells_match(self, qapp):
+        """Cell centres have the pixel colour in both paths."""
+        pattern = _random_pattern(6, 4, frame_count=1)
+        images = []
+        for fast in (True, False):
+            widget = _widget(pattern, fast=fast, size=(400, 300))
+            widget.set_show_path(False)
+            images.append(_render(widget))
+
+        for idx, cx, cy in self._cell_centers(widget, 6, 4):
+            expected = QColor(*pattern.frames[0].pixels[idx])
+            assert images[0].pixelColor(cx, cy) == expected
+            assert images[1].pixelColor(cx, cy) == expected
+
+    def test_ring_leds_match(self, qapp):
+        """LED disc centres have the pixel colour in both paths."""
+        pattern = _random_pattern(8, 2, frame_count=1)
+        images, widgets = [], []
+        for fast in (True, False):
+            widget = _widget(pattern, "Ring", fast=fast, size=(400, 400))
+            widget.led_size = 20
+            images.append(_render(widget))
+            widgets.append(widget)
+
+        key = next(iter(widgets[0]._geometry_cache))
+        positions, sources, _ = widgets[0]._geometry_cache[key]
+        for (px, py), src in zip(positions, sources):
+            expected = QColor(*pattern.frames[0].pixels[src])
+            assert images[0].pixelColor(int(px), int(py)) == expected
+            assert images[1].pixelColor(int(px), int(py)) == expected
+
+    def test_irregular_inactive_cells_hidden(self, qapp):
+        """Inactive cells of irregular shapes show the background."""
+        pattern = _random_pattern(4, 2, frame_count=1, layout_type="irregular",
+                                  irregular_shape_enabled=True,
+                                  active_cell_coordinates=[(0, 0), (1, 0), (2, 1)])
+        widget = _widget(pattern, "Auto", size=(200, 200))
+        widget.set_show_path(False)
+        image = _render(widget)
+
+        centers = {idx: (cx, cy) for idx, cx, cy in self._cell_centers(widget, 4, 2)}
+        assert image.pixelColor(*centers[0]) == QColor(*pattern.frames[0].pixels[0])
+        assert image.pixelColor(*centers[6]) == QColor(*pattern.frames[0].pixels[6])
+        assert image.pixelColor(*centers[3]) == widget._background_color
+
+    def test_mapped_circular_layout_matches(self, qapp):
+        """Metadata circular layouts colour each LED from its mapped grid cell."""
+        pattern = _random_pattern(8, 4, frame_count=1, layout_type="circle", circular_led_count=32)
+        images, widgets = [], []
+        for fast in (True, False):
+            widget = _widget(pattern, "Auto", fast=fast, size=(400, 400))
+            widget.led_size = 20
+            images.append(_render(widget))
+            widgets.append(widget)
+
+        key = next(k for k in widgets[0]._geometry_cache if k[0] == "circular")
+        positions, sources, _ = widgets[0]._geometry_cache[key]
+        for (px, py), src in zip(positions, sources):
+            expected = QColor(*pattern.frames[0].pixels[src])
+            assert images[0].pixelColor(int(px), int(py)) == expected
+            assert images[1].pixelColor(int(px), int(py)) == expected
@@ -0,0 +1,181 @@
+"""
+Performance tests for MatrixDesignCanvas dirty-region rendering.
+
+Renders the canvas headless (offscreen Qt platform) and checks that edits
+only repaint the touched tiles, that overlays are cached as layers, and
+that incremental repaints match a full repaint pixel for pixel.
+"""
+
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QImage
+from PySide6.QtCore import QPoint, QRect, Qt
+
+from core.pattern import PatternMetadata
+from core.mapping.circular_mapper import CircularMapper
+from ui.widgets.matrix_design_canvas import MatrixDesignCanvas
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+def _random_pixels(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(count)]
+
+
+def _canvas(width=8, height=8, pixel_size=16):
+    canvas = MatrixDesignCanvas(width, height, pixel_size=pixel_size)
+    canvas.resize(width * pixel_size + 40, height * pixel_size + 40)
+    canvas.set_frame_pixels(_random_pixels(width * height))
+    return canvas
+
+
+def _render(canvas):
+    image = QImage(canvas.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(0)
+    canvas.render(image)
+    return image
+
+
+class TestCellLayer:
+    """The backing pixmap is only updated for changed cells."""
+
+    def test_single_cell_edit_redraws_one_tile(self, qapp):
+        """Changing one cell repaints one tile of the cell layer."""
+        canvas = _canvas()
+        _render(canvas)
+        assert canvas._tiles_drawn == 64
+
+        canvas._grid[3][4] = (255, 0, 0)
+        _render(canvas)
+        assert canvas._tiles_drawn == 65
+
+        _render(canvas)
+        assert canvas._tiles_drawn == 65
+
+    @pytest.mark.parametrize("shape,border", [("square", 0), ("round", 3), ("rounded", 2)])
+    def test_incremental_matches_full_repaint(self, qapp, shape, border):
+        """Edited canvases look exactly like a freshly painted one."""
+        canvas = _canvas()
+        canvas.set_pixel_shape(shape)
+        canvas.set_border_width(border)
+        _render(canvas)
+
+        canvas._grid[0][0] = (255, 0, 0)
+        canvas._grid[5][2] = (0, 255, 0)
+        canvas._grid[7][7] = (0, 0, 255)
+        edited = _render(canvas)
+
+        fresh = _canvas()
+        fresh.set_pixel_shape(shape)
+        fresh.set_border_width(border)
+        fresh.set_frame_pixels(canvas.to_pixels())
+        assert edited == _render(fresh)
+
+    def test_metadata_epoch_rebuilds_layer(self, qapp):
+        """Active cells edited in place take effect when the metadata is set again."""
+        canvas = _canvas()
+        metadata = PatternMetadata(width=8, height=8)
+        metadata.layout_type = "irregular"
+        metadata.irregular_shape_enabled = True
+        metadata.active_cell_coordinates = [(x, y) for y in range(8) for x in range(8)]
+        canvas.set_pattern_metadata(metadata)
+        _render(canvas)
+        drawn = canvas._tiles_drawn
+        assert canvas._cell_active is not None and len(canvas._cell_active) == 64
+
+        metadata.active_cell_coordinates.remove((0, 0))
+        canvas.set_pattern_metadata(metadata)
+        _render(canvas)
+        assert len(canvas._cell_active) == 63
+        assert canvas._tiles_drawn > drawn
+
+    def test_style_change_rebuilds_layer(self, qapp):
+        """Pixel shape changes rebuild every tile."""
+        canvas = _canvas()
+        _render(canvas)
+        canvas.set_pixel_shape("round")
+        _render(canvas)
+        assert canvas._tiles_drawn == 128
+
+
+class TestPartialUpdates:
+    """Mouse interaction schedules repaints of touched tiles only."""
+
+    def _spy_updates(self, canvas, monkeypatch):
+        calls = []
+        monkeypatch.setattr(canvas, "update", lambda *args: calls.append(args))
+        return calls
+
+    def test_brush_stroke_updates_touched_tile(self, qapp, monkeypatch):
+        """Painting a cell requests a repaint of that cell's area only."""
+        canvas = _canvas(pixel_size=20)
+        calls = self._spy_updates(canvas, monkeypatch)
+
+        canvas._handle_paint_event(QPoint(3 * 20 + 5, 2 * 20 + 5), Qt.LeftButton)
+
+        assert len(calls) == 1
+        (rect,) = calls[0]
+        assert isinstance(rect, QRect)
+        assert rect.contains(QRect(60, 40, 20, 20))
+        assert rect.width() < 2 * 20 and rect.height() < 2 * 20
+
+    def test_hover_updates_old_and_new_cells(self, qapp, monkeypatch):
+        """Moving the hover highlight repaints the two affected cells."""
+        canvas = _canvas(pixel_size=20)
+        canvas._hover_cell = (1, 1)
+        calls = self._spy_updates(canvas, monkeypatch)
+
+        canvas._set_hover_cell((2, 1))
+
+        rects = [args[0] for args in calls]
+        assert len(rects) == 2
+        assert rects[0].contains(QRect(20, 20, 20, 20))
+        assert rects[1].contains(QRect(40, 20, 20, 20))
+
+
+class TestOverlayLayers:
+    """Overlays are cached and invalidated only on their own inputs."""
+
+    def test_geometry_overlay_cached(self, qapp):
+        """Pixel edits reuse the geometry layer; new metadata rebuilds it."""
+        canvas = _canvas()
+        metadata = PatternMetadata(width=8, height=8, layout_type="circle", circular_led_count=64)
+        metadata.circular_mapping_table = CircularMapper.generate_mapping_table(metadata)[:40]
+        canvas.set_pattern_metadata(metadata)
+        _render(canvas)
+        layer = canvas._geometry_layer
+
+        canvas._grid[1][1] = (255, 255, 255)
+        _render(canvas)
+        assert canvas._geometry_layer is layer
+
+        canvas.set_pattern_metadata(metadata)
+        _render(canvas)
+        assert canvas._geometry_layer is not layer
+
+    def test_onion_layer_cached(self, qapp):
+        """Onion skins are rendered once per set of frames."""
+        canvas = _canvas()
+        ghost = [[(10, 10, 10)] * 8 for _ in range(8)]
+        canvas.set_onion_skin_frames([ghost], [], [0.5], [])
+        _render(canvas)
+        layer = canvas._onion_layer
+
+        canvas._grid[2][2] = (255, 255, 255)
+        _render(canvas)
+        assert canvas._onion_layer is layer
+
+        canvas.set_onion_skin_frames([ghost], [ghost], [0.5], [0.3])
+        _render(canvas)
+        assert canvas._onion_layer is not layer
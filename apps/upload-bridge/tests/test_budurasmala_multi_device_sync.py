@@ -0,0 +1,99 @@
+"""
+Tests for clock-synchronized multi-device playback.
+"""
+
+import pytest
+from core.services.multi_device_coordinator import MultiDeviceCoordinator, SyncMode
+from core.services.simulated_devices import SimulatedDevice, SimulatedDeviceManager
+
+
+SKEW_BOUND_MS = 10.0
+
+
+@pytest.fixture
+def sim_manager():
+    """Three devices with large clock offsets and different latencies."""
+    manager = SimulatedDeviceManager(seed=1)
+    manager.add_simulated_device(SimulatedDevice("dev_a", clock_offset_s=12.5, latency_s=0.002, jitter_s=0.001))
+    manager.add_simulated_device(SimulatedDevice("dev_b", clock_offset_s=-3.25, latency_s=0.010, jitter_s=0.002))
+    manager.add_simulated_device(SimulatedDevice("dev_c", clock_offset_s=0.75, latency_s=0.020, jitter_s=0.002,
+                                                 upload_time_s=0.03))
+    return manager
+
+
+class TestClockOffsetEstimation:
+    """Test NTP-style offset estimation."""
+
+    def test_offset_within_half_rtt(self, sim_manager):
+        """Estimated offset is accurate to within half the best RTT."""
+        coordinator = MultiDeviceCoordinator(sim_manager)
+
+        for device_id, device in sim_manager.devices.items():
+            estimate = coordinator.estimate_clock_offset(device_id, rounds=5)
+            assert estimate.samples == 5
+            assert estimate.rtt_s <= estimate.max_rtt_s
+            assert abs(estimate.offset_s - device.clock_offset_s) <= estimate.uncertainty_s + 0.002
+
+    def test_unreachable_device(self, sim_manager):
+        """Unknown devices yield an invalid zero-offset estimate."""
+        coordinator = MultiDeviceCoordinator(sim_manager)
+        estimate = coordinator.estimate_clock_offset("missing", rounds=3)
+
+        assert not estimate.valid
+        assert estimate.offset_s == 0.0
+
+
+class TestSynchronizedPlayback:
+    """Test synchronized starts against simulated devices."""
+
+    @pytest.mark.parametrize("mode", [SyncMode.PEER_TO_PEER, SyncMode.MASTER_SLAVE])
+    def test_skew_within_bound(self, sim_manager, mode):
+        """All devices start within the skew bound despite offsets and latency."""
+        coordinator = MultiDeviceCoordinator(sim_manager)
+        coordinator.clock_sync_rounds = 5
+        coordinator.create_group("g1", "Group", list(sim_manager.devices), sync_mode=mode)
+
+        assert coordinator.play_synchronized("g1", b"\x00" * 30, "p1") is True
+
+        report = coordinator.get_sync_report("g1")
+        assert report.success
+        assert all(report.uploaded.values())
+        assert report.lead_time_s >= coordinator.min_lead_time_s
+
+        true_skew = sim_manager.true_skew_ms()
+        assert true_skew is not None
+        assert true_skew < SKEW_BOUND_MS
+        assert true_skew <= report.expected_skew_ms + 2.0
+
+        measured = coordinator.measure_achieved_skew("g1")
+        assert measured is not None
+        assert measured < SKEW_BOUND_MS
+
+    def test_cascade_spacing(self, sim_manager):
+        """Cascade starts are spaced by the configured delay on the local clock."""
+        coordinator = MultiDeviceCoordinator(sim_manager)
+        coordinator.clock_sync_rounds = 5
+        group = coordinator.create_group("g2", "Cascade", ["dev_a", "dev_b", "dev_c"],
+                                         sync_mode=SyncMode.CASCADE)
+        group.cascade_delay_ms = 50
+
+        assert coordinator.play_synchronized("g2", b"\x01" * 30, "p2") is True
+
+        starts = [sim_manager.devices[d].true_start_local() for d in group.device_ids]
+        for i in range(1, len(starts)):
+            gap_ms = (starts[i] - starts[i - 1]) * 1000.0
+            assert abs(gap_ms - 50) < SKEW_BOUND_MS
+
+        assert coordinator.measure_achieved_skew("g2") < SKEW_BOUND_MS
+
+    def test_patterns_prestaged_before_start(self, sim_manager):
+        """Every device holds the pattern before its start command."""
+        coordinator = MultiDeviceCoordinator(sim_manager)
+        coordinator.clock_sync_rounds = 2
+        coordinator.create_group("g3", "Group", list(sim_manager.devices), sync_mode=SyncMode.PEER_TO_PEER)
+
+        coordinator.play_synchronized("g3", b"data", "p3")
+
+        for device in sim_manager.devices.values():
+            assert device.patterns["p3"] == b"data"
+            assert device.commands[-1].command == "play_at"
@@ -0,0 +1,133 @@
+"""
+Unit tests for compiled automation transforms.
+
+Compiled gathers must reproduce the reference transforms exactly, fuse
+chained actions and be reused across frames.
+"""
+
+import random
+
+import pytest
+
+from domain.automation.compiler import AutomationCompiler, Gather
+from domain.automation.parametric_actions import ActionParameters, ActionType, ParametricAction
+from domain.layers import LayerManager
+from domain.pattern_state import PatternState
+
+WIDTH, HEIGHT = 6, 4
+
+
+def _pixels(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(count)]
+
+
+def _outcome(function, *args):
+    """Result of a call, or the exception type it raised"""
+    try:
+        return function(*args)
+    except Exception as exc:
+        return type(exc)
+
+
+@pytest.fixture
+def manager():
+    return LayerManager(PatternState())
+
+
+class TestGather:
+    """Test tracing and composition."""
+
+    def test_trace_records_fills(self):
+        gather = Gather.trace(lambda values: [values[2], (0, 0, 0), values[0], 255], 3)
+        assert gather.index == (2, -1, 0, -2)
+        assert gather.fills == ((0, 0, 0), 255)
+        assert gather.apply(["a", "b", "c"]) == ["c", (0, 0, 0), "a", 255]
+
+    def test_then_composes(self):
+        shift = Gather.trace(lambda values: [(0, 0, 0)] + values[:-1], 4)
+        reverse = Gather.trace(lambda values: values[::-1] + [9], 4)
+        values = [1, 2, 3, 4]
+        assert shift.then(reverse).apply(values) == reverse.apply(shift.apply(values))
+
+    def test_value_dependent_transform_rejected(self):
+        with pytest.raises(TypeError):
+            Gather.trace(lambda values: [(255 - r, g, b) for r, g, b in values], 2)
+
+
+class TestLayerAutomation:
+    """Test compiled layer actions against the reference implementation."""
+
+    ACTIONS = [
+        ("scroll", {"direction": "right", "offset": 1}),
+        ("scroll", {"direction": "up", "offset": 2}),
+        ("rotate", {"mode": "90° Clockwise"}),
+        ("mirror", {"axis": "vertical"}),
+        ("flip", {"axis": "horizontal"}),
+        ("bounce", {"axis": "Horizontal"}),
+        ("reveal", {"direction": "Bottom"}),
+        ("radial", {"type": "Spiral"}),
+        ("radial", {"type": "Pulse"}),
+        ("wipe", {"mode": "Right to Left"}),
+        ("invert", {}),
+    ]
+
+    @pytest.mark.parametrize("action_type,params", ACTIONS)
+    @pytest.mark.parametrize("length", [WIDTH * HEIGHT, WIDTH * HEIGHT - 3])
+    def test_single_action_matches_reference(self, manager, action_type, params, length):
+        pixels = _pixels(length)
+        alpha = [i * 7 % 256 for i in range(length)]
+        for step in range(6):
+            assert manager._apply_action_transform(list(pixels), action_type, params, step, WIDTH, HEIGHT) == \
+                manager._transform_action_pixels(list(pixels), action_type, params, step, WIDTH, HEIGHT)
+            # Alpha rotation only supports square frames; errors must match too
+            args = (action_type, params, step, WIDTH, HEIGHT)
+            assert _outcome(manager._apply_alpha_action_transform, list(alpha), *args) == \
+                _outcome(manager._transform_action_alpha, list(alpha), *args)
+
+    def test_chain_is_one_gather(self, manager):
+        """A stack of movement actions compiles to one cached gather."""
+        compiler = AutomationCompiler()
+        pixels = _pixels(WIDTH * HEIGHT)
+        chain = self.ACTIONS[:6]
+        for step in (3, 3):
+            expected = list(pixels)
+            for action_type, params in chain:
+                expected = manager._transform_action_pixels(expected, action_type, params, step, WIDTH, HEIGHT)
+            stages = [manager._action_stage(t, p, step, WIDTH, HEIGHT) for t, p in chain]
+            assert compiler.apply(stages, pixels) == expected
+        assert compiler.misses == 1 + len(chain)
+        assert compiler.hits == 1
+
+    def test_static_actions_share_entries(self, manager):
+        """Mirror ignores the step and rotation repeats every four steps."""
+        assert manager._action_stage("mirror", {}, 1, 8, 8)[0] == manager._action_stage("mirror", {}, 9, 8, 8)[0]
+        assert manager._action_stage("rotate", {}, 1, 8, 8)[0] == manager._action_stage("rotate", {}, 5, 8, 8)[0]
+        assert manager._action_stage("invert", {}, 1, 8, 8)[0] is None
+
+    def test_cache_is_bounded(self, manager):
+        compiler = AutomationCompiler(max_entries=4)
+        pixels = _pixels(WIDTH * HEIGHT)
+        for step in range(10):
+            compiler.apply([manager._action_stage("scroll", {"offset": 1}, step, WIDTH, HEIGHT)], pixels)
+        assert len(compiler._cache) == 4
+
+
+class TestParametricAutomation:
+    """Test compiled parametric actions against the reference implementation."""
+
+    @pytest.mark.parametrize("action_type", list(ActionType))
+    @pytest.mark.parametrize("direction", ["right", "up"])
+    def test_matches_reference(self, action_type, direction):
+        action = ParametricAction(action_type, ActionParameters(direction=direction, distance=2,
+                                                                speed=1.5, color=(1, 2, 3)))
+        pixels = _pixels(WIDTH * HEIGHT)
+        for frame_index in range(12):
+            assert action._transform_frame(list(pixels), WIDTH, HEIGHT, frame_index) == \
+                action._transform_frame_direct(list(pixels), WIDTH, HEIGHT, frame_index)
+
+    def test_invalid_length_still_raises(self):
+        """Inputs the reference code rejects are not hidden by compilation."""
+        action = ParametricAction(ActionType.SCROLL, ActionParameters())
+        with pytest.raises(IndexError):
+            action._transform_frame(_pixels(5), WIDTH, HEIGHT, 0)
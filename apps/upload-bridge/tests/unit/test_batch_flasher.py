@@ -0,0 +1,226 @@
+"""
+Unit tests for batch flashing.
+
+Uses fake uploaders with sleep-based timings so concurrency, artifact reuse
+and flash/verify pipelining can be checked without hardware.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from core.batch_flasher import (
+    BatchFlasher,
+    BatchFlashScheduler,
+    FlashJob,
+    artifact_key,
+    pattern_fingerprint,
+)
+from uploaders.base import BuildResult, UploadResult
+
+
+FLASH_TIME = 0.05
+VERIFY_TIME = 0.05
+
+
+class FakeUploader:
+    """Uploader stand-in that records concurrent flashes."""
+
+    def __init__(self, tracker, verify_ok=True):
+        self.tracker = tracker
+        self.verify_ok = verify_ok
+
+    def upload(self, firmware_path, port_params):
+        self.tracker.enter("flash", port_params['port'])
+        time.sleep(FLASH_TIME)
+        self.tracker.leave("flash", port_params['port'])
+        return UploadResult(success=True, duration_seconds=FLASH_TIME, bytes_written=1024, verified=False)
+
+    def verify(self, firmware_path, port_params):
+        self.tracker.enter("verify", port_params['port'])
+        time.sleep(VERIFY_TIME)
+        self.tracker.leave("verify", port_params['port'])
+        return self.verify_ok
+
+
+class Tracker:
+    """Tracks peak concurrency and per-port overlap."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {"flash": 0, "verify": 0}
+        self.peak = {"flash": 0, "verify": 0}
+        self.busy_ports = set()
+        self.port_conflicts = 0
+        self.overlap_seen = False
+
+    def enter(self, stage, port):
+        with self.lock:
+            if port in self.busy_ports:
+                self.port_conflicts += 1
+            self.busy_ports.add(port)
+            self.active[stage] += 1
+            self.peak[stage] = max(self.peak[stage], self.active[stage])
+            if self.active["flash"] and self.active["verify"]:
+                self.overlap_seen = True
+
+    def leave(self, stage, port):
+        with self.lock:
+            self.busy_ports.discard(port)
+            self.active[stage] -= 1
+
+
+@pytest.fixture
+def sample_pattern():
+    metadata = PatternMetadata(width=4, height=2)
+    return Pattern(name="Line", metadata=metadata,
+                   frames=[Frame(pixels=[(10, 20, 30)] * 8, duration_ms=100)])
+
+
+@pytest.fixture
+def builder(tmp_path):
+    calls = []
+
+    def _build(pattern, chip_id, opts):
+        calls.append((chip_id, dict(opts)))
+        path = tmp_path / f"build_{len(calls)}.bin"
+        path.write_bytes(b"\x00" * 1024)
+        return BuildResult(success=True, firmware_path=str(path), binary_type="bin",
+                           size_bytes=1024, chip_model=chip_id)
+
+    _build.calls = calls
+    return _build
+
+
+class TestArtifactKeys:
+    """Test pattern fingerprints and artifact keys."""
+
+    def test_fingerprint_tracks_content(self, sample_pattern):
+        """Equal content hashes equal; pixel edits change the hash."""
+        other = Pattern(name="Other name", metadata=PatternMetadata(width=4, height=2),
+                        frames=[Frame(pixels=[(10, 20, 30)] * 8, duration_ms=100)])
+        assert pattern_fingerprint(sample_pattern) == pattern_fingerprint(other)
+
+        other.frames[0].pixels[0] = (0, 0, 0)
+        assert pattern_fingerprint(sample_pattern) != pattern_fingerprint(other)
+
+    def test_key_includes_chip_and_options(self, sample_pattern):
+        """Chip and build options are part of the key."""
+        base = artifact_key(sample_pattern, "esp32", {"gpio_pin": 2})
+        assert base == artifact_key(sample_pattern, "esp32", {"gpio_pin": 2})
+        assert base != artifact_key(sample_pattern, "esp8266", {"gpio_pin": 2})
+        assert base != artifact_key(sample_pattern, "esp32", {"gpio_pin": 4})
+
+
+class TestBatchFlashScheduler:
+    """Test the production-line scheduler."""
+
+    def test_builds_once_and_reuses(self, sample_pattern, builder, tmp_path):
+        """One build serves every board and later runs with the same inputs."""
+        tracker = Tracker()
+        scheduler = BatchFlashScheduler(artifact_dir=str(tmp_path / "artifacts"), build_func=builder,
+                                        uploader_factory=lambda chip: FakeUploader(tracker))
+
+        scheduler.flash_ports(sample_pattern, "esp32", ["p0", "p1"], {"gpio_pin": 2})
+        scheduler.flash_ports(sample_pattern, "esp32", ["p0", "p1"], {"gpio_pin": 2})
+        assert len(builder.calls) == 1
+        assert scheduler.report.artifact_reuses == 1
+
+        scheduler.flash_ports(sample_pattern, "esp32", ["p0"], {"gpio_pin": 5})
+        assert len(builder.calls) == 2
+
+    def test_ports_flash_concurrently(self, sample_pattern, builder, tmp_path):
+        """All ports flash at once without touching a busy port."""
+        tracker = Tracker()
+        scheduler = BatchFlashScheduler(artifact_dir=str(tmp_path), build_func=builder,
+                                        uploader_factory=lambda chip: FakeUploader(tracker))
+        ports = [f"p{i}" for i in range(6)]
+
+        start = time.time()
+        results = scheduler.flash_ports(sample_pattern, "esp32", ports, boards_per_port=2)
+        elapsed = time.time() - start
+
+        assert len(results) == 12
+        assert all(r.success and r.verified for r in results)
+        assert tracker.peak["flash"] == 6
+        assert tracker.port_conflicts == 0
+        assert elapsed < 12 * (FLASH_TIME + VERIFY_TIME) / 2
+
+    def test_verify_pipelines_with_next_flash(self, sample_pattern, builder, tmp_path):
+        """With one flash slot, verifies overlap later flashes."""
+        tracker = Tracker()
+        scheduler = BatchFlashScheduler(max_concurrent_flashes=1, artifact_dir=str(tmp_path),
+                                        build_func=builder,
+                                        uploader_factory=lambda chip: FakeUploader(tracker))
+
+        results = scheduler.flash_ports(sample_pattern, "esp32", ["p0", "p1", "p2"])
+
+        assert all(r.success for r in results)
+        assert tracker.peak["flash"] == 1
+        assert tracker.overlap_seen
+        assert scheduler.report.wall_seconds < 3 * (FLASH_TIME + VERIFY_TIME)
+
+    def test_throughput_report(self, sample_pattern, builder, tmp_path):
+        """Report includes boards/hour and per-stage times."""
+        tracker = Tracker()
+        scheduler = BatchFlashScheduler(artifact_dir=str(tmp_path), build_func=builder,
+                                        uploader_factory=lambda chip: FakeUploader(tracker))
+        progress = []
+        scheduler.set_progress_callback(lambda done, left, result: progress.append((done, left)))
+
+        scheduler.flash_ports(sample_pattern, "esp32", ["p0", "p1"], boards_per_port=2)
+        report = scheduler.report.to_dict()
+
+        assert report["boards"] == 4
+        assert report["successful"] == 4
+        assert report["builds"] == 1
+        assert report["boards_per_hour"] > 0
+        assert report["avg_flash_seconds"] >= FLASH_TIME * 0.9
+        assert report["avg_verify_seconds"] >= VERIFY_TIME * 0.9
+        assert sorted(progress)[-1] == (4, 0)
+
+    def test_report_keeps_prior_build(self, sample_pattern, builder, tmp_path):
+        """A build done before flash_ports (as the batch tab does) stays in the report."""
+        tracker = Tracker()
+        scheduler = BatchFlashScheduler(artifact_dir=str(tmp_path), build_func=builder,
+                                        uploader_factory=lambda chip: FakeUploader(tracker))
+
+        scheduler.get_artifact(sample_pattern, "esp32", {"gpio_pin": 2})
+        scheduler.flash_ports(sample_pattern, "esp32", ["p0"], {"gpio_pin": 2})
+
+        assert len(builder.calls) == 1
+        assert scheduler.report.builds == 1
+        assert scheduler.report.artifact_reuses == 1
+        assert scheduler.report.boards == 1
+
+    def test_failed_verify_marks_board_failed(self, sample_pattern, builder, tmp_path):
+        """A board that fails verification is reported as failed."""
+        tracker = Tracker()
+        scheduler = BatchFlashScheduler(artifact_dir=str(tmp_path), build_func=builder,
+                                        uploader_factory=lambda chip: FakeUploader(tracker, verify_ok=False))
+
+        results = scheduler.flash_ports(sample_pattern, "esp32", ["p0"])
+
+        assert results[0].success is False
+        assert results[0].verified is False
+        assert results[0].error_message == "Verification failed"
+
+
+class TestBatchFlasher:
+    """Test the simple queue-based flasher."""
+
+    def test_workers_exit_without_idle_wait(self, monkeypatch):
+        """Workers stop as soon as the queue drains."""
+        tracker = Tracker()
+        monkeypatch.setattr("core.batch_flasher.get_uploader", lambda chip: FakeUploader(tracker))
+        flasher = BatchFlasher(max_concurrent=2)
+        for i in range(2):
+            flasher.add_job(FlashJob(job_id=f"j{i}", port=f"p{i}", chip_id="esp32", firmware_path="fw.bin"))
+
+        start = time.time()
+        results = flasher.flash_all()
+
+        assert len(results) == 2
+        assert time.time() - start < 0.5
@@ -0,0 +1,160 @@
+"""
+Unit tests for compiled brightness lookup tables.
+
+The tables must reproduce the per-pixel brightness maths exactly and be
+shared by preview, export and generated firmware.
+"""
+
+import re
+
+import numpy as np
+import pytest
+
+from core.brightness_lut import BRIGHTNESS_CURVES, BrightnessLUT, curve_level
+from core.pattern import BrightnessCurve, Frame, HardwareBrightnessMapper, Pattern, PatternMetadata
+from firmware.universal_pattern_generator import UniversalPatternGenerator
+
+
+def _pattern(frame_count=3, led_count=16):
+    frames = [
+        Frame(pixels=[((i * 37 + j * 11) % 256, (i * 5 + j * 29) % 256, (j * 53) % 256) for j in range(led_count)],
+              duration_ms=50)
+        for i in range(frame_count)
+    ]
+    return Pattern(name="LUT", metadata=PatternMetadata(width=led_count, height=1), frames=frames)
+
+
+def _reference(pixels, brightness, curve_type, per_channel=None):
+    """Per-pixel brightness maths the tables replace"""
+    scale = HardwareBrightnessMapper(BrightnessCurve(curve_type)).map_brightness(brightness) / 255.0
+    mults = per_channel or {}
+    red, green, blue = (mults.get(c, 1.0) for c in ('red', 'green', 'blue'))
+    out = []
+    for r, g, b in pixels:
+        out.append(tuple(max(0, min(255, int(v * scale * m))) for v, m in ((r, red), (g, green), (b, blue))))
+    return out
+
+
+class TestBrightnessLUT:
+    """Test table compilation and application."""
+
+    @pytest.mark.parametrize("curve_type", BRIGHTNESS_CURVES)
+    @pytest.mark.parametrize("brightness", [0.0, 0.33, 0.5, 1.0])
+    def test_matches_per_pixel_maths(self, curve_type, brightness):
+        """Every curve and level reproduces the per-pixel result exactly."""
+        pixels = [(v, 255 - v, (v * 7) % 256) for v in range(256)]
+        lut = BrightnessLUT.compile(brightness, curve_type)
+        assert lut.apply_pixels(pixels) == _reference(pixels, brightness, curve_type)
+
+        per_channel = {'red': 0.8, 'green': 0.6, 'blue': 0.4}
+        lut = BrightnessLUT.compile(brightness, curve_type, per_channel)
+        assert lut.apply_pixels(pixels) == _reference(pixels, brightness, curve_type, per_channel)
+
+    def test_pattern_brightness(self):
+        """apply_advanced_brightness translates frames through the tables."""
+        pattern = _pattern()
+        expected = [_reference(f.pixels, 0.7, "gamma_corrected") for f in pattern.frames]
+        pattern.apply_advanced_brightness(0.7, "gamma_corrected")
+        assert [f.pixels for f in pattern.frames] == expected
+
+        pattern = _pattern()
+        pattern.set_per_channel_brightness(red=0.8, green=0.6, blue=0.4)
+        expected = _reference(pattern.frames[0].pixels, 0.7, "linear", {'red': 0.8, 'green': 0.6, 'blue': 0.4})
+        pattern.apply_advanced_brightness(brightness=0.7, curve_type="linear", per_channel=True)
+        assert pattern.frames[0].pixels == expected
+
+    def test_array_matches_pixels(self):
+        """The numpy lookup on a frame tensor matches the per-frame path."""
+        pattern = _pattern()
+        lut = BrightnessLUT.compile(0.6, "s_curve", {'red': 1.0, 'green': 0.5, 'blue': 0.9})
+        mapped = lut.apply_array(pattern.frames_array())
+        assert mapped.dtype == np.uint8
+        for i, frame in enumerate(pattern.frames):
+            assert [tuple(p) for p in mapped[i].tolist()] == lut.apply_pixels(frame.pixels)
+
+    def test_out_of_range_pixels_clamped(self):
+        """Pixels that cannot be packed to bytes take the per-pixel path."""
+        lut = BrightnessLUT.compile(1.0, "linear")
+        assert lut.apply_pixels([(300, -5, 128), (1, 2, 3)]) == [(255, 0, 128), (1, 2, 3)]
+
+    def test_color_correction(self):
+        """LED-type correction scales channels only when requested."""
+        plain = BrightnessLUT.compile(1.0, "linear", led_type="ws2812")
+        corrected = BrightnessLUT.compile(1.0, "linear", led_type="ws2812", color_correction=True)
+        assert plain.apply_pixel((255, 255, 255)) == (255, 255, 255)
+        assert corrected.apply_pixel((255, 255, 255)) == (255, 176, 240)
+        assert BrightnessLUT.compile(1.0, "linear", led_type="generic", color_correction=True).red == plain.red
+
+    def test_tables_cached(self):
+        """Identical settings share compiled tables."""
+        a = BrightnessLUT.compile(0.5, "gamma_corrected", {'red': 0.5})
+        b = BrightnessLUT.compile(0.5, "gamma_corrected", {'red': 0.5})
+        assert a.red is b.red
+
+    def test_curve_level_validates(self):
+        """Brightness outside 0.0-1.0 is rejected."""
+        with pytest.raises(ValueError):
+            curve_level("linear", 1.5)
+        assert HardwareBrightnessMapper(BrightnessCurve.LINEAR).map_brightness(0.5) == 127
+
+    def test_mapper_apply_to_pixel(self):
+        """The static pixel helper uses the same tables."""
+        lut = BrightnessLUT.compile(0.5, "gamma_corrected")
+        assert HardwareBrightnessMapper.apply_to_pixel((255, 128, 64), 0.5, "ws2812", "gamma_corrected") == \
+            lut.apply_pixel((255, 128, 64))
+
+
+class TestFirmwareLUT:
+    """Test LUT emission in generated firmware."""
+
+    def test_tables_defined_once(self, tmp_path):
+        """The data unit defines the tables, pattern_data.h declares them and the player reads them."""
+        pattern = _pattern()
+        pattern.metadata.brightness = 0.5
+        pattern.metadata.brightness_curve = "linear"
+        UniversalPatternGenerator().generate_universal_firmware(pattern, "esp32", str(tmp_path), {'gpio_pin': 2})
+
+        header = (tmp_path / "pattern_data.h").read_text()
+        unit = (tmp_path / "pattern_data.cpp").read_text()
+        assert "#define BRIGHTNESS_LUT_ENABLED 1" in header
+        assert "extern const uint8_t brightness_lut[3][256] PROGMEM;" in header
+        assert "brightness_lut[3][256] PROGMEM = {" not in header
+        assert unit.count("const uint8_t brightness_lut[3][256] PROGMEM = {") == 1
+        assert "static" not in unit
+        lut = BrightnessLUT.compile(0.5, "linear")
+        assert ", ".join(str(v) for v in lut.red[240:256]) in unit
+
+        sketch = next(tmp_path.glob("*.ino")).read_text()
+        assert "pgm_read_byte(&brightness_lut[0][pixel.r])" in sketch
+        assert "apply_brightness_curve" not in sketch
+
+    def test_embedded_header_defines_tables(self, tmp_path):
+        """Without a data unit the header holds the one definition."""
+        UniversalPatternGenerator().generate_universal_firmware(
+            _pattern(), "esp32", str(tmp_path), {'gpio_pin': 2, 'split_pattern_data': False})
+        header = (tmp_path / "pattern_data.h").read_text()
+        assert header.count("const uint8_t brightness_lut[3][256] PROGMEM = {") == 1
+        assert "extern const uint8_t brightness_lut" not in header
+
+    def test_tables_from_chip_limited_settings(self, tmp_path):
+        """Tables follow the chip-limited metadata: no per-channel scaling where unsupported."""
+        pattern = _pattern()
+        pattern.metadata.brightness = 0.5
+        pattern.metadata.brightness_curve = "linear"
+        pattern.metadata.per_channel_brightness = True
+        pattern.metadata.red_brightness = 0.5
+        generator = UniversalPatternGenerator()
+        for chip_id in ("esp32", "atmega328p"):
+            generator.generate_universal_firmware(pattern, chip_id, str(tmp_path / chip_id), {'gpio_pin': 2})
+            unit = next((tmp_path / chip_id).glob("pattern_data.c*")).read_text()
+            per_channel = generator.chip_capabilities[chip_id]['supports_per_channel']
+            lut = BrightnessLUT.compile(0.5, "linear", {'red': 0.5} if per_channel else None)
+            assert lut.to_c_array("brightness_lut", qualifier="const") in unit
+
+    def test_c_array_layout(self):
+        """Tables are emitted as three rows of 256 values."""
+        source = BrightnessLUT.compile(1.0, "linear").to_c_array("lut")
+        body = re.sub(r"//.*", "", source[source.index("= {"):])
+        values = [int(v) for v in re.findall(r"\d+", body)]
+        assert len(values) == 768
+        assert values[:3] == [0, 1, 2]
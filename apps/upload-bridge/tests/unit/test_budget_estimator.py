@@ -0,0 +1,171 @@
+"""
+Unit tests for the firmware budget estimator.
+
+Flash figures come from the generator's encoder, RAM from the generated
+player source, render time from LED protocol timing and upload time from
+recorded upload throughput.
+"""
+
+import pytest
+
+from core.metrics_collector import MetricsCollector, UploadMetrics
+from core.pattern import Frame, Pattern, PatternMetadata
+from firmware.budget_estimator import LED_PROTOCOLS, BudgetEstimator, static_ram_bytes
+from firmware.universal_pattern_generator import UniversalPatternGenerator
+from uploaders.base import UploaderBase
+
+
+def _pattern(frame_count=20, led_count=30, duration_ms=50, led_type="ws2812"):
+    frames = [
+        Frame(pixels=[(255, 255, 255) if j == i % led_count else (0, 0, 20) for j in range(led_count)],
+              duration_ms=duration_ms)
+        for i in range(frame_count)
+    ]
+    metadata = PatternMetadata(width=led_count, height=1)
+    metadata.led_type = led_type
+    return Pattern(name="Budget", metadata=metadata, frames=frames)
+
+
+def _metrics(chip_id, samples):
+    metrics = MetricsCollector()
+    for size, seconds in samples:
+        metrics.record_upload(UploadMetrics(file_size=size, duration_seconds=seconds, success=True, chip_id=chip_id))
+    return metrics
+
+
+class TestStaticRam:
+    """Test RAM accounting of player source."""
+
+    SOURCE = """
+#define MAX_LEDS 10
+typedef struct {
+    uint16_t frame;
+    float multiplier;
+} SpeedKeyframe;
+uint8_t led_buffer[MAX_LEDS * 3];
+SpeedKeyframe speed_keyframes[4];
+const uint8_t table[] PROGMEM = {1, 2, 3};
+uint16_t counter = 0;
+#ifdef PATTERN_COMPRESSED
+uint8_t frame_buffer[LED_COUNT * 3];
+#endif
+void loop(void) {
+    uint8_t local[64];
+}
+"""
+
+    def test_counts_globals(self):
+        """File-scope arrays and scalars count; const data and locals do not."""
+        assert static_ram_bytes(self.SOURCE, "atmega328p", {"LED_COUNT": 5}) == 30 + 4 * 6 + 2
+        assert static_ram_bytes(self.SOURCE, "stm32f103c8", {"LED_COUNT": 5}) == 30 + 4 * 8 + 2
+
+    def test_follows_ifdef(self):
+        """Conditional buffers count only when their macro is enabled."""
+        base = static_ram_bytes(self.SOURCE, "atmega328p", {"LED_COUNT": 5})
+        assert static_ram_bytes(self.SOURCE, "atmega328p", {"LED_COUNT": 5}, {"PATTERN_COMPRESSED"}) == base + 15
+
+
+class TestBudgetEstimator:
+    """Test per-chip budgets."""
+
+    def test_protocol_timing(self):
+        """WS2812 clocks 24 bits per LED at 800 kHz."""
+        assert LED_PROTOCOLS["ws2812"].frame_us(100) == pytest.approx(100 * 30 + 50)
+        assert LED_PROTOCOLS["apa102"].frame_us(16) == pytest.approx((16 * 32 + 32 + 16) / 4)
+
+    def test_flash_from_encoder(self):
+        """Flash data matches the generator's raw and compressed encodings."""
+        pattern = _pattern()
+        generator = UniversalPatternGenerator()
+        report = generator.size_report(pattern, "atmega328p")
+        estimator = BudgetEstimator(metrics=MetricsCollector())
+
+        raw = estimator.estimate(pattern, "atmega328p")
+        compressed = estimator.estimate(pattern, "atmega328p", {'compress_frames': True})
+        assert not raw.compressed and raw.data_bytes == report.raw_bytes
+        assert compressed.compressed and compressed.data_bytes == report.compressed_bytes
+        assert compressed.flash_bytes < raw.flash_bytes
+        assert compressed.table_bytes == raw.table_bytes == 3 * 256 + 2
+
+    def test_raw_size_shared(self):
+        """Pattern and generator size estimates come from the budget estimator."""
+        from firmware.enhanced_pattern_generator import EnhancedPatternGenerator
+
+        pattern = _pattern()
+        raw_bytes = UniversalPatternGenerator().size_report(pattern, "esp32").raw_bytes
+        assert BudgetEstimator.raw_data_bytes(pattern) == raw_bytes
+        assert pattern.estimate_memory_bytes() == raw_bytes
+        budget = BudgetEstimator(metrics=MetricsCollector()).estimate(pattern, "esp32")
+        assert EnhancedPatternGenerator().estimate_memory_usage(pattern, "esp32")['total'] == budget.flash_bytes
+
+    def test_ram_from_player(self):
+        """Compressed playback adds the decode buffer to the player's RAM."""
+        estimator = BudgetEstimator(metrics=MetricsCollector())
+        raw = estimator.estimate(_pattern(), "esp32")
+        compressed = estimator.estimate(_pattern(), "esp32", {'compress_frames': True})
+        assert raw.ram_bytes > 2 * 30 * 3  # LED and interpolation buffers
+        assert compressed.ram_bytes - raw.ram_bytes == 30 * 3 + 8
+
+    def test_warnings(self):
+        """Budgets flag flash overflow and frames shorter than the LED update."""
+        estimator = BudgetEstimator(metrics=MetricsCollector())
+        budget = estimator.estimate(_pattern(frame_count=400, led_count=50, duration_ms=1), "attiny85")
+        assert not budget.fits_flash and not budget.fits
+        assert budget.frame_render_ms == pytest.approx((50 * 30 + 50) / 1000)
+        assert len(budget.warnings) == 2
+        assert "fits with compress_frames" in budget.warnings[0]
+        assert budget.max_fps == pytest.approx(1000 / budget.frame_render_ms)
+
+    def test_led_limit(self):
+        """A pattern with more LEDs than the chip drives does not fit."""
+        budget = BudgetEstimator(metrics=MetricsCollector()).estimate(_pattern(frame_count=2, led_count=1024), "esp32")
+        assert budget.led_count == budget.max_leds == 1000
+        assert budget.pattern_led_count == 1024
+        assert not budget.fits_leds and not budget.fits
+        assert "1024 LEDs" in budget.warnings[0]
+
+    def test_upload_time_from_history(self):
+        """Upload time uses measured throughput for the same chip only."""
+        metrics = _metrics("esp32", [(100_000, 12.0), (300_000, 32.0)])
+        budget = BudgetEstimator(metrics=metrics).estimate(_pattern(), "esp32")
+        assert budget.upload_seconds == pytest.approx(2.0 + budget.upload_bytes / 10_000)
+        assert BudgetEstimator(metrics=metrics).estimate(_pattern(), "esp8266").upload_seconds is None
+
+
+class TestUploadThroughput:
+    """Test throughput fitting in the metrics collector."""
+
+    def test_fit_separates_overhead(self):
+        metrics = _metrics("atmega328p", [(10_000, 6.0), (20_000, 11.0), (30_000, 16.0)])
+        rate, overhead = metrics.upload_throughput("atmega328p")
+        assert rate == pytest.approx(2000)
+        assert overhead == pytest.approx(1.0)
+        assert metrics.estimate_upload_seconds(40_000, "atmega328p") == pytest.approx(21.0)
+
+    def test_single_size_uses_average_rate(self):
+        metrics = _metrics("atmega328p", [(10_000, 5.0)])
+        metrics.record_upload(UploadMetrics(file_size=10_000, duration_seconds=1.0, success=False,
+                                            chip_id="atmega328p"))
+        assert metrics.upload_throughput("atmega328p") == (2000.0, 0.0)
+        assert metrics.upload_throughput("esp32") is None
+
+    def test_uploader_prefers_measured(self, monkeypatch):
+        """UploaderBase falls back to the nominal formula without history."""
+        metrics = _metrics("test_chip", [(10_000, 5.0)])
+        monkeypatch.setattr("core.metrics_collector._metrics_collector", metrics)
+
+        class _Uploader(UploaderBase):
+            def build_firmware(self, pattern, build_opts):
+                raise NotImplementedError
+
+            def upload(self, firmware_path, port_params):
+                raise NotImplementedError
+
+            def get_supported_chips(self):
+                return ["test_chip", "other_chip"]
+
+            def get_requirements(self):
+                return []
+
+        assert _Uploader("test_chip").estimate_upload_time(20_000) == pytest.approx(10.0)
+        assert _Uploader("other_chip").estimate_upload_time(11_520) == pytest.approx(31.0)
@@ -0,0 +1,175 @@
+"""
+Unit tests for the content-addressed firmware build cache.
+"""
+
+import pytest
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from core.export.build_manifest import BuildManifest
+from firmware.build_cache import FirmwareBuildCache, pattern_fingerprint
+from uploaders.base import UploaderBase, BuildResult, UploadResult
+
+
+class CountingUploader(UploaderBase):
+    """Uploader whose 'compile' writes a file sized by the pattern."""
+
+    toolchain = "gcc 1.0"
+
+    def __init__(self, chip_id="fakechip", size=1000):
+        super().__init__(chip_id)
+        self.compiles = 0
+        self.size = size
+
+    def build_firmware(self, pattern, build_opts):
+        self.compiles += 1
+        out = build_opts['output_dir'] / "firmware.bin"
+        out.write_bytes(bytes([pattern.frames[0].pixels[0][0]]) * self.size)
+        return BuildResult(success=True, firmware_path=str(out), binary_type="bin",
+                           size_bytes=self.size, chip_model=self.chip_id)
+
+    def upload(self, firmware_path, port_params):
+        return UploadResult(success=True, duration_seconds=0, bytes_written=0, verified=False)
+
+    def get_supported_chips(self):
+        return [self.chip_id]
+
+    def get_requirements(self):
+        return []
+
+    def get_toolchain_version(self):
+        return self.toolchain
+
+
+def _pattern(red=10):
+    return Pattern(name="P", metadata=PatternMetadata(width=2, height=1),
+                   frames=[Frame(pixels=[(red, 0, 0), (0, 0, 0)], duration_ms=50)])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FirmwareBuildCache(cache_dir=tmp_path / "cache", max_bytes=10_000)
+
+
+@pytest.fixture
+def opts(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    return {'output_dir': out, 'gpio_pin': 2, 'template_path': str(tmp_path / "tpl")}
+
+
+class TestBuildCache:
+    """Test cache hits, keys and eviction."""
+
+    def test_hit_skips_compile(self, cache, opts):
+        """Second identical build is served from the cache."""
+        uploader = CountingUploader()
+
+        first = cache.build(uploader, _pattern(), opts)
+        second = cache.build(uploader, _pattern(), opts)
+
+        assert uploader.compiles == 1
+        assert first.cache_hit is False
+        assert second.cache_hit is True
+        assert second.firmware_path == first.firmware_path
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    def test_key_inputs_invalidate(self, cache, opts, tmp_path):
+        """Pattern, options, toolchain and template changes force a rebuild."""
+        uploader = CountingUploader()
+        cache.build(uploader, _pattern(), opts)
+
+        cache.build(uploader, _pattern(red=99), opts)
+        assert uploader.compiles == 2
+
+        cache.build(uploader, _pattern(), {**opts, 'gpio_pin': 5})
+        assert uploader.compiles == 3
+
+        uploader.toolchain = "gcc 2.0"
+        cache.build(uploader, _pattern(), opts)
+        assert uploader.compiles == 4
+
+        template = tmp_path / "tpl"
+        template.mkdir()
+        (template / "main.c").write_text("int main(){}")
+        cache.build(uploader, _pattern(), opts)
+        assert uploader.compiles == 5
+
+    def test_output_dir_not_in_key(self, cache, opts, tmp_path):
+        """Building into another directory still hits and copies the artifact there."""
+        uploader = CountingUploader()
+        cache.build(uploader, _pattern(), opts)
+
+        other = tmp_path / "other"
+        result = cache.build(uploader, _pattern(), {**opts, 'output_dir': other})
+
+        assert uploader.compiles == 1
+        assert result.firmware_path == str(other / "firmware.bin")
+        assert (other / "firmware.bin").read_bytes() == bytes([10]) * 1000
+
+    def test_persistent_across_instances(self, cache, opts):
+        """A new cache instance over the same directory sees earlier builds."""
+        uploader = CountingUploader()
+        cache.build(uploader, _pattern(), opts)
+
+        reopened = FirmwareBuildCache(cache_dir=cache.cache_dir, max_bytes=cache.max_bytes)
+        result = reopened.build(uploader, _pattern(), opts)
+
+        assert result.cache_hit is True
+        assert uploader.compiles == 1
+
+    def test_lru_eviction(self, cache, opts):
+        """Least-recently-used artifacts are evicted when over budget."""
+        uploader = CountingUploader(size=3000)
+        for red in (1, 2, 3):
+            cache.build(uploader, _pattern(red), opts)
+        cache.build(uploader, _pattern(1), opts)  # touch 1 so 2 is oldest
+        cache.build(uploader, _pattern(4), opts)
+
+        assert cache.total_bytes() <= cache.max_bytes
+        assert cache.stats.evictions == 1
+
+        compiles = uploader.compiles
+        cache.build(uploader, _pattern(1), opts)
+        assert uploader.compiles == compiles
+        cache.build(uploader, _pattern(2), opts)
+        assert uploader.compiles == compiles + 1
+
+    def test_use_cache_false_bypasses(self, cache, opts):
+        """use_cache=False always compiles."""
+        uploader = CountingUploader()
+        cache.build(uploader, _pattern(), {**opts, 'use_cache': False})
+        cache.build(uploader, _pattern(), {**opts, 'use_cache': False})
+
+        assert uploader.compiles == 2
+        assert len(cache) == 0
+
+
+class TestManifestReport:
+    """Test cache reporting in the build manifest."""
+
+    def test_manifest_reports_cache(self, cache, opts):
+        """Hit rate and time saved appear in build_info."""
+        uploader = CountingUploader()
+        cache.build(uploader, _pattern(), opts)
+        result = cache.build(uploader, _pattern(), opts)
+
+        manifest = BuildManifest(_pattern(), build_result=result,
+                                 build_cache_stats=cache.stats.to_dict())
+        info = manifest.to_dict()["build_info"]["cache"]
+
+        assert info["cache_hit"] is True
+        assert info["hit_rate"] == 0.5
+        assert "time_saved_seconds" in info
+
+    def test_manifest_without_build(self):
+        """Plain exports carry no cache section."""
+        assert "cache" not in BuildManifest(_pattern()).to_dict()["build_info"]
+
+
+def test_fingerprint_ignores_name():
+    """Pattern name doesn't affect the firmware fingerprint."""
+    a, b = _pattern(), _pattern()
+    b.name = "Renamed"
+    assert pattern_fingerprint(a) == pattern_fingerprint(b)
@@ -0,0 +1,112 @@
+"""
+Unit tests for the cached circular layout index.
+
+Reverse lookups must agree with a scan of the mapping table, KD-tree queries
+with brute force, rings must follow the LED geometry, and cached indexes must
+follow mapping-table changes.
+"""
+
+import math
+import random
+
+from core.mapping.circular_layout_index import (
+    CircularLayoutIndex,
+    KDTree2D,
+    clear_layout_indexes,
+)
+from core.mapping.circular_mapper import CircularMapper
+from core.pattern import PatternMetadata
+
+
+def _multi_ring():
+    return PatternMetadata(width=21, height=21, layout_type="multi_ring", multi_ring_count=3,
+                           ring_led_counts=[12, 24, 36], ring_radii=[3.0, 6.0, 9.0])
+
+
+class TestKDTree:
+    """Test KD-tree queries against brute force."""
+
+    def test_nearest(self):
+        rng = random.Random(11)
+        points = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(300)]
+        points += points[:20]  # Duplicates resolve to the lower index
+        tree = KDTree2D(points)
+        for _ in range(200):
+            x, y = rng.uniform(-6, 6), rng.uniform(-6, 6)
+            distances = [(px - x) ** 2 + (py - y) ** 2 for px, py in points]
+            assert tree.nearest(x, y) == distances.index(min(distances))
+
+    def test_empty(self):
+        tree = KDTree2D([])
+        assert tree.nearest(0, 0) is None
+
+
+class TestCircularLayoutIndex:
+    """Test reverse lookups and caching."""
+
+    def test_matches_table_scan(self):
+        layouts = [
+            _multi_ring(),
+            PatternMetadata(width=24, height=8, layout_type="circle"),
+            PatternMetadata(width=12, height=6, layout_type="radial_rays"),
+        ]
+        for metadata in layouts:
+            table = metadata.circular_mapping_table
+            for y in range(-1, metadata.height + 1):
+                for x in range(-1, metadata.width + 1):
+                    expected = next((i for i, cell in enumerate(table) if cell == (x, y)), None)
+                    assert CircularMapper.grid_to_led_index(x, y, metadata) == expected
+                    assert CircularMapper.is_mapped(x, y, metadata) == (expected is not None)
+
+    def test_cached_by_layout_and_table(self):
+        clear_layout_indexes()
+        metadata = _multi_ring()
+        index = CircularLayoutIndex.for_metadata(metadata)
+        # Regenerated metadata with an equal table reuses the index
+        assert CircularLayoutIndex.for_metadata(_multi_ring()) is index
+
+        metadata.circular_mapping_table = list(reversed(metadata.circular_mapping_table))
+        rebuilt = CircularLayoutIndex.for_metadata(metadata)
+        assert rebuilt is not index
+        assert rebuilt.led_at(*metadata.circular_mapping_table[0]) == 0
+
+    def test_preview_positions_memoized(self):
+        metadata = _multi_ring()
+        expected = CircularMapper._compute_led_positions_for_preview(metadata, 100.0, 80.0, 60.0)
+        first = CircularMapper.generate_led_positions_for_preview(metadata, 100.0, 80.0, 60.0)
+        assert first == expected
+        first.clear()  # Callers get their own list
+        assert CircularMapper.generate_led_positions_for_preview(metadata, 100.0, 80.0, 60.0) == expected
+
+    def test_rings_ordered_by_angle(self):
+        index = CircularLayoutIndex.for_metadata(_multi_ring())
+        assert [len(leds) for leds in index.rings] == [12, 24, 36]
+        assert index.rings[0] == list(range(12))
+        for angles in index.ring_angles:
+            assert angles == sorted(angles)
+        assert all(index.rings[index.ring_of[i]][index.slot_of[i]] == i for i in range(72))
+
+    def test_polar_nearest(self):
+        index = CircularLayoutIndex.for_metadata(_multi_ring())
+        inner, middle = index.ring_radii[0], index.ring_radii[1]
+        assert index.led_at_polar(0.0, inner) == 0
+        assert index.led_at_polar(31.0, inner * 1.1) == 1  # LEDs sit every 360/11 degrees
+        assert index.led_at_polar(359.0, middle) in (12, 35)  # Ring ends share angle 0
+        assert index.ring_of[index.led_at_polar(90.0, (inner + middle) / 2 + 0.01)] == 1
+        for led_idx, (x, y) in enumerate(index.unit_positions):
+            angle = math.degrees(math.atan2(y, x))
+            assert index.led_at_polar(angle, math.hypot(x, y)) == led_idx
+
+    def test_ring_shifts_follow_angle(self):
+        index = CircularLayoutIndex.for_metadata(_multi_ring())
+        assert index.ring_shifts(30.0) == [1, 2, 3]
+        assert index.ring_shifts(-90.0) == [-3, -6, -9]
+        assert all(math.isclose(shift * 360.0 / len(leds), 30.0)
+                   for shift, leds in zip(index.ring_shifts(30.0), index.rings))
+
+    def test_unknown_geometry_uses_grid_cells(self):
+        metadata = _multi_ring()
+        metadata.ring_radii = []  # No preview positions without ring radii
+        index = CircularLayoutIndex(metadata)
+        assert len(index.unit_positions) == index.led_count == 72
+        assert sum(len(leds) for leds in index.rings) == 72
@@ -0,0 +1,84 @@
+"""
+Unit tests for circular text on the shared circular layout index.
+
+Text must land on the LEDs a scan of the mapping table finds, and rotating
+text must move along rings by index shifts.
+"""
+
+from core.mapping.circular_layout_index import CircularLayoutIndex, clear_layout_indexes
+from core.pattern import Frame, PatternMetadata
+from core.text.circular_text_renderer import CircularTextRenderer
+
+
+def _multi_ring():
+    return PatternMetadata(width=21, height=21, layout_type="multi_ring", multi_ring_count=3,
+                           ring_led_counts=[12, 24, 36], ring_radii=[3.0, 6.0, 9.0])
+
+
+def _scan(metadata, x, y):
+    for led_idx, cell in enumerate(metadata.circular_mapping_table):
+        if cell == (x, y):
+            return led_idx
+    return None
+
+
+class TestGridLookup:
+    """Test grid lookups."""
+
+    def test_grid_matches_table_scan(self):
+        renderer = CircularTextRenderer()
+        layouts = [
+            _multi_ring(),
+            PatternMetadata(width=24, height=8, layout_type="circle"),
+            PatternMetadata(width=16, height=16, layout_type="arc", circular_led_count=40,
+                            circular_start_angle=30.0, circular_end_angle=300.0),
+        ]
+        for metadata in layouts:
+            for y in range(metadata.height):
+                for x in range(metadata.width):
+                    assert renderer._find_led_for_grid(metadata, x, y) == _scan(metadata, x, y)
+
+    def test_follows_table_changes(self):
+        clear_layout_indexes()
+        metadata = _multi_ring()
+        renderer = CircularTextRenderer()
+        first = metadata.circular_mapping_table[0]
+        assert renderer._find_led_for_grid(metadata, *first) == 0
+
+        metadata.circular_mapping_table = list(reversed(metadata.circular_mapping_table))
+        assert renderer._find_led_for_grid(metadata, *first) == _scan(metadata, *first)
+
+
+class TestRotatingText:
+    """Test rotation by index shift."""
+
+    def _lit(self, frame):
+        return {i for i, pixel in enumerate(frame.pixels) if pixel == (255, 0, 0)}
+
+    def test_first_frame_matches_static_render(self):
+        metadata = _multi_ring()
+        renderer = CircularTextRenderer()
+        background = Frame(pixels=[(0, 0, 9)] * 72, duration_ms=40)
+        frames = renderer.render_rotating_text_frames("OM", metadata, background, 6, (255, 0, 0), radius=6.0)
+        assert len(frames) == 6
+        assert frames[0].pixels == renderer.render_text_on_circular_matrix(
+            "OM", metadata, background, (255, 0, 0), radius=6.0).pixels
+        assert all(frame.duration_ms == 40 for frame in frames)
+        assert background.pixels == [(0, 0, 9)] * 72
+
+    def test_shift_moves_along_rings(self):
+        metadata = PatternMetadata(width=24, height=8, layout_type="circle")
+        renderer = CircularTextRenderer()
+        index = CircularLayoutIndex.for_metadata(metadata)
+        background = Frame(pixels=[(0, 0, 0)] * 192, duration_ms=50)
+        frames = renderer.render_rotating_text_frames("A", metadata, background, 24, (255, 0, 0),
+                                                      radius=3.0, font_size=3)
+        start = self._lit(frames[0])
+        assert start
+        for step, frame in enumerate(frames):
+            expected = {index.rings[index.ring_of[i]][(index.slot_of[i] + step) % 24] for i in start}
+            assert self._lit(frame) == expected
+        # A full turn comes back to the start
+        turned = renderer.render_rotating_text_frames("A", metadata, background, 2, (255, 0, 0),
+                                                      angle_step=360.0, radius=3.0, font_size=3)
+        assert self._lit(turned[1]) == start
@@ -0,0 +1,182 @@
+"""
+Unit tests for the persistent, content-keyed detection cache.
+
+Reopening a known file must reuse the stored parser choice and wiring
+detection, while changed content or edited frames are detected afresh.
+"""
+
+import pytest
+
+import core.detection_cache as detection_cache
+from core.detection_cache import (
+    DetectionCache,
+    DetectionRecord,
+    content_key,
+    file_content_key,
+    set_detection_cache,
+)
+from core.file_format_detector import detect_file_format_with_confidence
+from parsers.parser_registry import ParserRegistry
+
+
+def _record(name="Raw RGB", width=8, height=8):
+    return DetectionRecord(format_name=name, width=width, height=height, led_count=width * height, frame_count=2)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = DetectionCache(tmp_path / "detections.db")
+    monkeypatch.setattr(detection_cache, "_shared_cache", cache)
+    return cache
+
+
+def _write_pattern(path, frames=2, leds=64):
+    data = bytes((i * 7 + f * 3) % 256 for f in range(frames) for i in range(leds * 3))
+    path.write_bytes(data)
+    return data
+
+
+class TestContentKey:
+    """Test the head/tail content hash."""
+
+    def test_file_and_memory_keys_agree(self, tmp_path):
+        for size in (0, 100, 1000, 5000):
+            path = tmp_path / f"p{size}.bin"
+            data = bytes(i % 251 for i in range(size))
+            path.write_bytes(data)
+            assert file_content_key(path, sample_bytes=1024) == content_key(data, ".bin", sample_bytes=1024)
+
+    def test_key_covers_ends_size_and_extension(self):
+        data = bytes(5000)
+        key = content_key(data, ".bin", sample_bytes=1024)
+        assert content_key(b"\x01" + data[1:], ".bin", sample_bytes=1024) != key
+        assert content_key(data[:-1] + b"\x01", ".bin", sample_bytes=1024) != key
+        assert content_key(data + b"\x00", ".bin", sample_bytes=1024) != key
+        assert content_key(data, ".hex", sample_bytes=1024) != key
+        # Only the sampled ends are hashed
+        assert content_key(data[:2500] + b"\x01" + data[2501:], ".bin", sample_bytes=1024) == key
+
+
+class TestDetectionCache:
+    """Test storage and LRU eviction."""
+
+    def test_round_trip_and_persistence(self, tmp_path):
+        cache = DetectionCache(tmp_path / "d.db")
+        assert cache.get("a") is None
+        cache.put("a", _record())
+        assert cache.record_wiring("a", "Serpentine", "RB", 0.65, "heuristic", "digest")
+        assert not cache.record_wiring("missing", "Serpentine", "RB", 0.65, "heuristic", "digest")
+
+        reopened = DetectionCache(tmp_path / "d.db")
+        record = reopened.get("a")
+        assert (record.format_name, record.width, record.wiring_mode, record.data_in_corner) == (
+            "Raw RGB", 8, "Serpentine", "RB")
+        assert record.has_wiring and record.confidence == 0.65
+        assert reopened.stats == {"hits": 1, "misses": 0, "evictions": 0}
+
+    def test_lru_eviction(self, tmp_path):
+        cache = DetectionCache(tmp_path / "d.db", max_entries=3)
+        for key in "abc":
+            cache.put(key, _record())
+        cache.get("a")  # Most recently used now
+        cache.put("d", _record())
+        assert len(cache) == 3
+        assert cache.get("b") is None
+        assert all(cache.get(key) is not None for key in "acd")
+        assert cache.stats["evictions"] == 1
+
+    def test_version_change_discards_entries(self, tmp_path, monkeypatch):
+        DetectionCache(tmp_path / "d.db").put("a", _record())
+        monkeypatch.setattr(detection_cache, "DETECTION_CACHE_VERSION", detection_cache.DETECTION_CACHE_VERSION + 1)
+        assert DetectionCache(tmp_path / "d.db").get("a") is None
+
+    def test_unusable_database_is_a_miss(self, tmp_path):
+        (tmp_path / "d.db").write_bytes(b"not a database" * 100)
+        cache = DetectionCache(tmp_path / "d.db")
+        cache.put("a", _record())
+        assert cache.get("a") is None
+
+
+class TestRegistryIntegration:
+    """Test that known files skip detection."""
+
+    def test_reopen_skips_parser_detection(self, tmp_path, cache, monkeypatch):
+        path = tmp_path / "pattern.bin"
+        _write_pattern(path)
+        registry = ParserRegistry(detection_cache=cache)
+        first, format_name = registry.parse_file(str(path))
+        assert first.metadata.source_content_key
+
+        monkeypatch.setattr(registry, "detect_format", lambda *args, **kwargs: pytest.fail("detection ran"))
+        second, second_format = registry.parse_file(str(path))
+        assert second_format == format_name
+        assert second.metadata.source_content_key == first.metadata.source_content_key
+        assert (second.metadata.width, second.metadata.height) == (first.metadata.width, first.metadata.height)
+        assert [f.pixels for f in second.frames] == [f.pixels for f in first.frames]
+
+    def test_changed_content_is_detected(self, tmp_path, cache):
+        path = tmp_path / "pattern.bin"
+        _write_pattern(path)
+        registry = ParserRegistry(detection_cache=cache)
+        first, _ = registry.parse_file(str(path))
+        _write_pattern(path, frames=3)
+        second, _ = registry.parse_file(str(path))
+        assert second.metadata.source_content_key != first.metadata.source_content_key
+        assert len(cache) == 2
+
+    def test_suggested_counts_bypass_cache(self, tmp_path, cache):
+        path = tmp_path / "pattern.bin"
+        _write_pattern(path)
+        pattern, _ = ParserRegistry(detection_cache=cache).parse_file(str(path), suggested_leds=64)
+        assert pattern.metadata.source_content_key is None
+        assert len(cache) == 0
+
+    def test_wiring_detection_reused(self, tmp_path, cache, monkeypatch):
+        import core.file_format_detector as file_format_detector
+
+        path = tmp_path / "pattern.bin"
+        _write_pattern(path)
+        registry = ParserRegistry(detection_cache=cache)
+        pattern, _ = registry.parse_file(str(path))
+        expected = detect_file_format_with_confidence(pattern)
+        assert cache.get(pattern.metadata.source_content_key).wiring_mode == expected[0]
+
+        calls = []
+        detect = file_format_detector.detect_file_format
+        monkeypatch.setattr(file_format_detector, "detect_file_format",
+                            lambda p: (calls.append(1), detect(p))[1])
+        reopened, _ = registry.parse_file(str(path))
+        assert detect_file_format_with_confidence(reopened) == expected
+        assert calls == []
+
+        # Edited frames no longer match the cached inputs
+        reopened.frames[0].pixels[0] = (255, 255, 255)
+        detect_file_format_with_confidence(reopened)
+        assert calls == [1]
+
+    def test_stale_parser_choice_is_detected(self, tmp_path, cache, monkeypatch):
+        path = tmp_path / "pattern.bin"
+        _write_pattern(path)
+        expected, format_name = ParserRegistry(detection_cache=cache).parse_file(str(path))
+        key = expected.metadata.source_content_key
+        stale = next(p.get_format_name() for p in ParserRegistry().parsers
+                     if p.get_format_name() != format_name)
+        cache.put(key, _record(name=stale))
+
+        registry = ParserRegistry(detection_cache=cache)
+        def fail(*args):
+            raise ValueError("bad data")
+
+        monkeypatch.setattr(registry.get_parser(stale), "parse", fail)
+        pattern, reparsed_format = registry.parse_file(str(path))
+        assert reparsed_format == format_name
+        assert [f.pixels for f in pattern.frames] == [f.pixels for f in expected.frames]
+        assert cache.get(key).format_name == format_name
+
+    def test_disabled_shared_cache(self, tmp_path, cache):
+        path = tmp_path / "pattern.bin"
+        _write_pattern(path)
+        pattern, _ = ParserRegistry(detection_cache=cache).parse_file(str(path))
+        set_detection_cache(None)  # Restored by the fixture's monkeypatch
+        assert detect_file_format_with_confidence(pattern)[0]
+        assert not cache.get(pattern.metadata.source_content_key).has_wiring
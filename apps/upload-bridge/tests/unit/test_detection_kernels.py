@@ -0,0 +1,134 @@
+"""
+Unit tests for the batched wiring and dimension detection kernels.
+
+The array computations must reproduce the per-candidate helpers exactly, so
+detection choices do not change.
+"""
+
+import random
+
+import pytest
+
+import core.dimension_scorer as dimension_scorer
+import core.file_format_detector as file_format_detector
+from core.dimension_scorer import _pixel_alignment_bonus, _pixel_alignment_bonuses, generate_layout_candidates
+from core.file_format_detector import (
+    WIRING_CANDIDATES,
+    _average_neighbor_diff,
+    _contiguity_bonus,
+    _corner_marker_bonus,
+    _design_permutations,
+    _frame_candidate_components,
+    detect_file_format,
+    score_wiring_candidates,
+)
+from core.matrix_mapper import MatrixMappingOptions, get_linear_index, unwrap_pixels_to_design_order
+from core.pattern import Frame, Pattern, PatternMetadata
+
+pytest.importorskip("numpy")
+
+
+def _random_frame(rng, count, top=255):
+    return [tuple(rng.randint(0, top) for _ in range(3)) for _ in range(count)]
+
+
+def _no_numpy(monkeypatch):
+    monkeypatch.setattr(file_format_detector, "NUMPY_AVAILABLE", False)
+    monkeypatch.setattr(dimension_scorer, "NUMPY_AVAILABLE", False)
+
+
+class TestCandidateKernels:
+    """Test batched candidate scoring against the per-candidate helpers."""
+
+    def test_permutations_match_linear_index(self):
+        for width, height in [(5, 4), (3, 7), (1, 4), (6, 1)]:
+            perms = _design_permutations(width, height)
+            for row, (order, serpentine, origin) in enumerate(WIRING_CANDIDATES):
+                options = MatrixMappingOptions(width, height, order, serpentine, origin)
+                expected = [get_linear_index(x, y, options) for y in range(height) for x in range(width)]
+                assert perms[row].tolist() == expected
+
+    @pytest.mark.parametrize("top", [1, 255, 4000])
+    def test_components_match_helpers(self, top):
+        rng = random.Random(top)
+        for width, height in [(5, 4), (8, 8), (2, 9), (12, 1)]:
+            frames = [_random_frame(rng, width * height, top) for _ in range(3)]
+            frames[1][0] = (255, 0, 0)  # Corner markers exercise the marker bonus
+            batched = _frame_candidate_components(frames, width, height)
+            assert len(batched) == 3
+            for frame, components in zip(frames, batched):
+                for order, serpentine, origin in WIRING_CANDIDATES:
+                    options = MatrixMappingOptions(width, height, order, serpentine, origin)
+                    design = unwrap_pixels_to_design_order(frame, options)
+                    assert components[(order, serpentine, origin)] == (
+                        _pixel_alignment_bonus(design, width),
+                        _contiguity_bonus(design, width, height, order),
+                        _corner_marker_bonus(design, width, height),
+                    )
+
+    def test_mismatched_frames_skipped(self):
+        rng = random.Random(3)
+        frames = [_random_frame(rng, 20), _random_frame(rng, 19), _random_frame(rng, 20)]
+        assert len(_frame_candidate_components(frames, 5, 4)) == 2
+
+    def test_neighbor_diff(self, monkeypatch):
+        rng = random.Random(4)
+        pixels = _random_frame(rng, 60)
+        vectorized = [_average_neighbor_diff(pixels, step) for step in (0, 1, 6, 10, 59, 60)]
+        _no_numpy(monkeypatch)
+        assert vectorized == [_average_neighbor_diff(pixels, step) for step in (0, 1, 6, 10, 59, 60)]
+
+    def test_detection_unchanged_without_numpy(self, monkeypatch):
+        rng = random.Random(6)
+        patterns = []
+        for width, height in [(5, 4), (16, 8), (7, 3)]:
+            frames = [Frame(pixels=_random_frame(rng, width * height, 3), duration_ms=10) for _ in range(4)]
+            patterns.append(Pattern(name="p", metadata=PatternMetadata(width=width, height=height), frames=frames))
+        vectorized = [(detect_file_format(p), score_wiring_candidates(p)) for p in patterns]
+        _no_numpy(monkeypatch)
+        assert vectorized == [(detect_file_format(p), score_wiring_candidates(p)) for p in patterns]
+
+
+class TestCandidateScoreDump:
+    """Test the per-candidate score dump."""
+
+    def test_dump_lists_every_candidate(self):
+        from tests.unit.test_file_format_detection import _build_pattern
+
+        pattern = _build_pattern(12, 6, "Column-serpentine", "RB")
+        table = score_wiring_candidates(pattern)
+        assert len(table) == len(WIRING_CANDIDATES)
+        assert {(row["wiring_mode"], row["corner"]) for row in table} == {
+            (mode, corner)
+            for mode in ("Row-major", "Serpentine", "Column-major", "Column-serpentine")
+            for corner in ("LT", "RT", "LB", "RB")
+        }
+        scores = [row["score"] for row in table]
+        assert scores == sorted(scores, reverse=True)
+        best = table[0]
+        assert (best["wiring_mode"], best["corner"]) == detect_file_format(pattern)
+        assert best["score"] == pytest.approx(best["alignment"] + best["contiguity"] + best["marker"])
+
+    def test_empty_pattern(self):
+        assert score_wiring_candidates(Pattern(name="e", metadata=PatternMetadata(width=4, height=4), frames=[])) == []
+
+
+class TestAlignmentAcrossWidths:
+    """Test alignment bonuses computed once for several widths."""
+
+    def test_matches_single_width(self, monkeypatch):
+        rng = random.Random(8)
+        frame = _random_frame(rng, 48)
+        for row in range(0, 48, 8):
+            frame[row] = (250, 250, 250)
+        widths = list(range(0, 50))
+        batched = _pixel_alignment_bonuses(frame, widths)
+        assert batched[8] > 0
+        _no_numpy(monkeypatch)
+        assert batched == {width: _pixel_alignment_bonus(frame, width) for width in widths}
+
+    def test_layout_candidates_accept_any_iterable(self):
+        rng = random.Random(9)
+        frame = _random_frame(rng, 96)
+        expected = generate_layout_candidates(96, frame, include_strips=True)
+        assert generate_layout_candidates(96, tuple(frame), include_strips=True) == expected
@@ -0,0 +1,111 @@
+"""
+Unit tests for the array kernels behind procedural effects.
+
+The kernels must reproduce the scalar per-pixel helpers exactly, and layer
+writes must be composited once per frame at the end of a run.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from core.pattern import Frame, Pattern, PatternMetadata
+from domain.effects import apply as effects_apply
+from domain.effects import apply_effect_to_frames, generate_effect_preview
+from domain.effects.models import EffectDefinition
+
+pytest.importorskip("numpy")
+
+
+def _effect(*keywords, identifier="effects/test"):
+    return EffectDefinition(identifier=identifier, name="Test", category="Test",
+                            source_path=Path("test.swf"), keywords=set(keywords))
+
+
+def _scalar(pixels, width, height, effect, offset, intensity):
+    palette = effects_apply._build_palette(effect)
+    style = effects_apply._derive_style(effect)
+    return effects_apply._apply_style_to_pixels(pixels, width, height, palette, style, offset, intensity,
+                                                random.Random(effect.identifier))
+
+
+class TestStyleKernel:
+    """Test kernels against the scalar reference."""
+
+    @pytest.mark.parametrize("keywords", [
+        ("radial", "red"), ("mirror", "blue", "green"), ("down", "cyan"),
+        ("left",), ("gradient", "gold", "pink", "teal"),
+    ])
+    @pytest.mark.parametrize("width,height", [(7, 3), (16, 16), (1, 5)])
+    def test_matches_scalar(self, keywords, width, height):
+        effect = _effect(*keywords)
+        rng = random.Random(4)
+        for intensity in (0.0, 0.35, 1.0, 1.5):
+            render = effects_apply._style_renderer(
+                effect, effects_apply._build_palette(effect), effects_apply._derive_style(effect),
+                width, height, intensity,
+            )
+            for step in range(8):
+                offset = step * (0.05 + intensity * 0.45)
+                noise = [(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                         for _ in range(width * height)]
+                uniform = [(12, 200, 7)] * (width * height)
+                for pixels in (noise, uniform):
+                    assert render(pixels, offset) == _scalar(pixels, width, height, effect, offset, intensity)
+
+    def test_preview_is_deterministic(self):
+        effect = _effect("radial", "purple")
+        assert generate_effect_preview(effect) == generate_effect_preview(_effect("radial", "purple"))
+        assert generate_effect_preview(effect) == _scalar([(0, 0, 0)] * 64, 8, 8, effect, 0.0, 0.6)
+
+    def test_rng_seeded_from_identifier(self):
+        first = effects_apply._effect_rng(_effect("left", identifier="effects/a")).integers(0, 1 << 30, 4)
+        again = effects_apply._effect_rng(_effect("radial", identifier="effects/a")).integers(0, 1 << 30, 4)
+        other = effects_apply._effect_rng(_effect("left", identifier="effects/b")).integers(0, 1 << 30, 4)
+        assert first.tolist() == again.tolist() != other.tolist()
+
+
+class TestApplyEffect:
+    """Test frame and layer application."""
+
+    def _pattern(self, frame_count=5, width=6, height=4):
+        frames = [Frame(pixels=[(i * 10 % 256, j % 256, 30) for j in range(width * height)], duration_ms=50)
+                  for i in range(frame_count)]
+        return Pattern(name="Effects", metadata=PatternMetadata(width=width, height=height), frames=frames)
+
+    def test_frames_match_scalar(self):
+        pattern = self._pattern()
+        effect = _effect("left", "orange")
+        expected = [
+            _scalar(frame.pixels, 6, 4, effect, step * (0.05 + 0.5 * 0.45), 0.5)
+            for step, frame in enumerate(pattern.frames)
+        ]
+        apply_effect_to_frames(pattern, effect, range(5), 0.5)
+        assert [frame.pixels for frame in pattern.frames] == expected
+
+    def test_layer_sync_batched(self, monkeypatch):
+        """Each frame is composited once, after all layer writes."""
+        from domain.layers import LayerManager
+        from domain.pattern_state import PatternState
+
+        pattern = self._pattern()
+        state = PatternState()
+        state.set_pattern(pattern)
+        manager = LayerManager(state)
+        manager.set_pattern(pattern)
+        synced = []
+        original = manager.sync_frame_from_layers
+        monkeypatch.setattr(manager, "sync_frame_from_layers",
+                            lambda index: (synced.append(index), original(index)))
+
+        effect = _effect("down", "teal")
+        before = [list(frame.pixels) for frame in pattern.frames]
+        apply_effect_to_frames(pattern, effect, [0, 2, 2, 4], 0.7, layer_manager=manager)
+
+        assert synced == [0, 2, 4]
+        offsets = [step * (0.05 + 0.7 * 0.45) for step in range(4)]
+        twice = _scalar(_scalar(before[2], 6, 4, effect, offsets[1], 0.7), 6, 4, effect, offsets[2], 0.7)
+        assert manager.get_layers(2)[0].pixels == twice
+        assert all(type(pixel) is tuple for pixel in manager.get_layers(2)[0].pixels)
+        assert pattern.frames[4].pixels == manager.render_frame(4)
@@ -0,0 +1,107 @@
+"""
+Unit tests for the persistent effect library index.
+
+Warm starts reuse directory listings and parsed metadata, rescans touch
+only changed files, and search goes through the keyword index.
+"""
+
+import json
+import os
+import time
+
+from domain.effects.library import EffectLibrary
+
+
+def _backdate(*paths, seconds=60):
+    """Move timestamps out of the window the index treats as possibly racy"""
+    stamp = time.time() - seconds
+    for path in paths:
+        os.utime(path, (stamp, stamp))
+
+
+def _age(root):
+    _backdate(*sorted(root.rglob("*"), key=lambda p: len(p.parts), reverse=True), root)
+
+
+def _tree(tmp_path):
+    root = tmp_path / "effects"
+    (root / "Effect_en" / "Linear effect").mkdir(parents=True)
+    (root / "Effect_en" / "Radial").mkdir(parents=True)
+    (root / "Effect_en" / "Linear effect" / "Cyan Tail.swf").write_bytes(b"FWS")
+    (root / "Effect_en" / "Linear effect" / "Red_white.swf").write_bytes(b"FWS")
+    (root / "Effect_en" / "Radial" / "burst.swf").write_bytes(b"FWS")
+    (root / "Effect_en" / "Radial" / "burst.json").write_text(
+        json.dumps({"name": "Golden Burst", "keywords": ["gold", "sparkle"]}), encoding="utf-8")
+    (root / "Effect_en" / "Radial" / "preview.png").write_bytes(b"PNG")
+    _age(root)
+    return root
+
+
+def _library(root, tmp_path, **kwargs):
+    return EffectLibrary(root, index_path=tmp_path / "index.json", **kwargs)
+
+
+class TestEffectIndex:
+    """Test incremental scanning."""
+
+    def test_warm_start_only_stats_directories(self, tmp_path):
+        root = _tree(tmp_path)
+        first = _library(root, tmp_path)
+        assert first.scan_stats["files_parsed"] == 4  # burst.json is an asset too
+
+        second = _library(root, tmp_path)
+        assert second.scan_stats == {"dirs_stat": 4, "dirs_listed": 0, "files_stat": 0, "files_parsed": 0}
+        assert [(e.identifier, e.name, e.category, e.preview_path, e.keywords) for e in second.effects()] == \
+            [(e.identifier, e.name, e.category, e.preview_path, e.keywords) for e in first.effects()]
+
+    def test_check_files_reparses_edited_asset(self, tmp_path):
+        root = _tree(tmp_path)
+        library = _library(root, tmp_path)
+        meta = root / "Effect_en" / "Radial" / "burst.json"
+        meta.write_text(json.dumps({"name": "Silver Burst"}), encoding="utf-8")
+        _backdate(meta, seconds=30)
+
+        library.reload(check_files=False)
+        assert library.scan_stats["files_parsed"] == 0  # In-place edits need a file check
+
+        library.reload(check_files=True)
+        # burst.swf and burst.json (itself an asset) read the edited file
+        assert library.scan_stats["files_parsed"] == 2
+        assert library.get_effect("Effect_en/Radial/burst.swf").name == "Silver Burst"
+
+    def test_added_and_removed_files(self, tmp_path):
+        root = _tree(tmp_path)
+        library = _library(root, tmp_path)
+        (root / "Effect_en" / "Radial" / "ring.swf").write_bytes(b"FWS")
+        (root / "Effect_en" / "Linear effect" / "Red_white.swf").unlink()
+        _backdate(root / "Effect_en" / "Radial" / "ring.swf", root / "Effect_en" / "Radial",
+                  root / "Effect_en" / "Linear effect", seconds=30)
+
+        library = _library(root, tmp_path)
+        assert library.scan_stats["dirs_listed"] == 2
+        assert library.scan_stats["files_parsed"] == 1
+        identifiers = {e.identifier for e in library.effects()}
+        assert "Effect_en/Radial/ring.swf" in identifiers
+        assert "Effect_en/Linear effect/Red_white.swf" not in identifiers
+
+    def test_unreadable_index_rebuilt(self, tmp_path):
+        root = _tree(tmp_path)
+        (tmp_path / "index.json").write_text("{not json", encoding="utf-8")
+        library = _library(root, tmp_path)
+        assert len(library.effects()) == 4
+        assert json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))["version"] == 1
+
+
+class TestEffectSearch:
+    """Test keyword-index search."""
+
+    def test_prefix_terms(self, tmp_path):
+        library = _library(_tree(tmp_path), tmp_path, persist_index=False)
+        assert [e.name for e in library.search("cya")] == ["Cyan Tail"]
+        assert [e.identifier for e in library.search("burst")] == [
+            "Effect_en/Radial/burst.json", "Effect_en/Radial/burst.swf",
+        ]
+        assert len(library.search("spark gold")) == 2
+        assert library.search("cyan gold") == []
+        assert len(library.search("")) == 4
+        assert [e.name for e in library.search("linear", category="Linear effect")] == ["Cyan Tail", "Red white"]
@@ -9,7 +9,7 @@ from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 from core.pattern import Pattern, PatternMetadata, Frame
-from core.services.flash_service import FlashService
+from core.services.flash_service import FlashService, firmware_image_bytes
 from uploaders.base import BuildResult, UploadResult
 
 
@@ -241,3 +241,72 @@ class TestFlashServiceIsChipSupported:
         
         assert flash_service.is_chip_supported("unsupported_chip") is False
 
+
+
+class TestFlashServiceBuildManifest:
+    """Test the manifest written alongside saved firmware."""
+    
+    def test_create_build_manifest(self, flash_service, sample_pattern, tmp_path):
+        """Manifest carries the firmware hash and build cache report."""
+        firmware = tmp_path / "firmware.bin"
+        firmware.write_bytes(b"\x01\x02\x03")
+        build_result = BuildResult(
+            success=True,
+            firmware_path=str(firmware),
+            binary_type="bin",
+            size_bytes=3,
+            chip_model="esp32",
+            cache_hit=True
+        )
+        
+        manifest = flash_service.create_build_manifest(sample_pattern, "esp32", build_result)
+        info = manifest.to_dict()
+        
+        assert info["device_profiles"] == ["esp32"]
+        assert info["firmware_hash"] == manifest.compute_firmware_hash(b"\x01\x02\x03")
+        assert info["build_info"]["cache"]["cache_hit"] is True
+
+
+class TestFlashServiceBudget:
+    """Test budget estimates and upload metrics."""
+    
+    def test_budget_uses_build_layout(self, flash_service, sample_pattern):
+        """The estimate sees the generator options the uploader's build forwards."""
+        raw = flash_service.estimate_budget(sample_pattern, "atmega328p", {'gpio_pin': 2})
+        compressed = flash_service.estimate_budget(
+            sample_pattern, "atmega328p", {'gpio_pin': 2, 'compress_frames': True, 'output_dir': 'unused'}
+        )
+        
+        assert not raw.compressed
+        assert compressed.compressed
+    
+    def test_hex_image_bytes(self, tmp_path):
+        """Intel HEX uploads are measured by their data records, not file size."""
+        hex_file = tmp_path / "firmware.hex"
+        hex_file.write_text(
+            ":10000000000102030405060708090A0B0C0D0E0F78\n"
+            ":0400100010111213A2\n"
+            ":00000001FF\n"
+        )
+        bin_file = tmp_path / "firmware.bin"
+        bin_file.write_bytes(b"\x00" * 20)
+        
+        assert firmware_image_bytes(str(hex_file)) == 20
+        assert firmware_image_bytes(str(bin_file)) == 20
+        assert firmware_image_bytes(str(tmp_path / "missing.hex")) == 0
+    
+    @patch('core.services.flash_service.record_upload')
+    @patch('core.services.flash_service.get_uploader')
+    def test_upload_metrics_record_image_bytes(self, mock_get_uploader, mock_record, flash_service, tmp_path):
+        """Without a written byte count the metrics get the HEX image size."""
+        hex_file = tmp_path / "firmware.hex"
+        hex_file.write_text(":0400000001020304F2\n:00000001FF\n")
+        mock_uploader = Mock()
+        mock_uploader.upload.return_value = UploadResult(
+            success=True, bytes_written=0, duration_seconds=1.0, verified=True
+        )
+        mock_get_uploader.return_value = mock_uploader
+        
+        flash_service.upload_firmware(str(hex_file), "atmega328p", port="COM3")
+        
+        assert mock_record.call_args.kwargs['file_size'] == 4
@@ -0,0 +1,31 @@
+"""
+Unit tests for the flash tab's build thread.
+"""
+
+from unittest.mock import Mock
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from uploaders.base import BuildResult, UploadResult
+from ui.tabs.flash_tab import FlashThread
+
+
+def _pattern():
+    return Pattern(name="P", metadata=PatternMetadata(width=2, height=1),
+                   frames=[Frame(pixels=[(1, 2, 3)] * 2, duration_ms=50)])
+
+
+def test_build_options_reach_build():
+    """Options shown in the flash tab (compression) are passed to the real build."""
+    service = Mock()
+    service.is_chip_supported.return_value = True
+    service.build_firmware.return_value = BuildResult(
+        success=True, firmware_path="fw.hex", binary_type="hex", size_bytes=10, chip_model="atmega328p"
+    )
+    service.upload_firmware.return_value = UploadResult(
+        success=True, duration_seconds=1.0, bytes_written=10, verified=False
+    )
+    config = {'gpio_pin': 4, 'compress_frames': True}
+
+    FlashThread(service, _pattern(), "atmega328p", "COM3", 4, False, config).run()
+
+    assert service.build_firmware.call_args.kwargs['config'] == config
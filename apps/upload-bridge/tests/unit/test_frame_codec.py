@@ -0,0 +1,165 @@
+"""
+Unit tests for compressed firmware frame data.
+
+Covers per-frame encoding choice, host-side round trips, the flash size
+report and the C decoder emitted into generated headers.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from core.pattern import Frame, Pattern, PatternMetadata
+from firmware.frame_codec import (
+    ENC_DELTA, ENC_PALETTE, ENC_RAW, ENC_RLE, decode_stream, encode_frame, encode_frames, pack_frame,
+)
+from firmware.universal_pattern_generator import UniversalPatternGenerator
+
+
+def _pattern(frames, width):
+    return Pattern(
+        name="Codec",
+        metadata=PatternMetadata(width=width, height=1),
+        frames=[Frame(pixels=pixels, duration_ms=50) for pixels in frames],
+    )
+
+
+def _chase(frame_count=40, width=30):
+    """A lit LED moving over a two-colour background"""
+    frames = []
+    for i in range(frame_count):
+        pixels = [(0, 0, 40) if j % 2 else (0, 20, 0) for j in range(width)]
+        pixels[i % width] = (255, 255, 255)
+        frames.append(pixels)
+    return frames
+
+
+def _noise(frame_count=5, width=30):
+    return [[((i * 97 + j * 31) % 256, (i * 13 + j * 71) % 256, (j * 53 + i) % 256) for j in range(width)]
+            for i in range(frame_count)]
+
+
+def _roundtrip(frames, width):
+    packed = [pack_frame(pixels, width) for pixels in frames]
+    stream = encode_frames(packed, [50] * len(packed), width)
+    decoded = decode_stream(stream.data)
+    assert [data for _, data in decoded] == packed
+    assert all(delay == 50 for delay, _ in decoded)
+    return stream
+
+
+class TestFrameCodec:
+    """Test encoding choice and round trips."""
+
+    def test_encoding_choice(self):
+        """Each frame uses the smallest encoding."""
+        width = 32
+        black = bytes(width * 3)
+        solid = pack_frame([(10, 20, 30)] * width, width)
+        two_colour = pack_frame([(255, 0, 0) if j % 2 else (0, 0, 255) for j in range(width)], width)
+        noise = pack_frame(_noise(1, width)[0], width)
+        one_changed = bytearray(noise)
+        one_changed[:3] = b"\x01\x02\x03"
+
+        assert encode_frame(solid, black, width)[0] == ENC_RLE
+        assert encode_frame(two_colour, black, width)[0] == ENC_PALETTE
+        assert encode_frame(bytes(one_changed), noise, width)[0] == ENC_DELTA
+        assert encode_frame(noise, b"\xff" * width * 3, width) == (ENC_RAW, noise)
+
+    @pytest.mark.parametrize("frames,width", [
+        (_chase(), 30),
+        (_noise(), 30),
+        ([[(j % 7 * 30, 0, 0) for j in range(300)]] * 3, 300),
+        ([[(1, 2, 3)] * 600], 600),
+    ])
+    def test_roundtrip(self, frames, width):
+        """Decoding restores every frame exactly."""
+        _roundtrip(frames, width)
+
+    def test_palette_widths(self):
+        """Palettes of 2, 4, 16 and 256 colours round-trip."""
+        for colours in (2, 3, 4, 5, 16, 17, 200):
+            frames = [[(j % colours, (j % colours) * 2 % 256, 7) for j in range(256)]]
+            _roundtrip(frames, 256)
+
+    def test_chase_compresses(self):
+        """Mostly-static animations shrink well below the raw size."""
+        stream = _roundtrip(_chase(), 30)
+        assert stream.ratio < 0.2
+        assert set(stream.encodings) <= {"delta", "palette", "rle"}
+
+    def test_pack_frame_pads(self):
+        """Short frames are padded with black and long ones truncated."""
+        assert pack_frame([(1, 2, 3)], 2) == bytes([1, 2, 3, 0, 0, 0])
+        assert pack_frame([(1, 2, 3)] * 3, 1) == bytes([1, 2, 3])
+
+
+class TestCompressedFirmware:
+    """Test compressed output from the universal generator."""
+
+    def test_size_report(self):
+        """Compression lets a long animation fit the ATtiny85 budget."""
+        generator = UniversalPatternGenerator()
+        pattern = _pattern(_chase(frame_count=300, width=30), 30)
+        report = generator.size_report(pattern, "attiny85")
+
+        assert report.raw_bytes == 4 + 300 * (2 + 90)
+        assert not report.fits_raw
+        assert report.fits_compressed
+        assert report.flash_budget_bytes == 6 * 1024
+        assert {r.chip_id for r in generator.size_reports(pattern)} == set(generator.chip_capabilities)
+
+    def test_compressed_data_unit(self, tmp_path):
+        """The data unit holds the stream and the header carries the decoder."""
+        generator = UniversalPatternGenerator()
+        pattern = _pattern(_chase(), 30)
+        generator.generate_universal_firmware(pattern, "attiny85", str(tmp_path),
+                                              {'gpio_pin': 2, 'compress_frames': True})
+
+        header = (tmp_path / "pattern_data.h").read_text()
+        unit = (tmp_path / "pattern_data.c").read_text()
+        assert "#define PATTERN_COMPRESSED 1" in header
+        assert "static uint16_t pattern_stream_next(" in header
+        assert "#define PATTERN_DATA_UNIT" in unit
+        assert "// Pattern Data (compressed:" in unit
+        assert "process_compressed_frame(LED_COUNT);" in (tmp_path / "professional_pattern_player.c").read_text()
+        assert generator.last_size_report.compressed_bytes < generator.last_size_report.raw_bytes
+
+    def test_unsupported_chip_stays_raw(self, tmp_path):
+        """Chips whose player has no decoder get raw frames."""
+        generator = UniversalPatternGenerator()
+        generator.generate_universal_firmware(_pattern(_chase(), 30), "pic16f876a", str(tmp_path),
+                                              {'gpio_pin': 2, 'compress_frames': True})
+        assert "PATTERN_COMPRESSED" not in (tmp_path / "pattern_data.h").read_text()
+
+    @pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc not available")
+    def test_c_decoder_matches_host(self, tmp_path):
+        """The generated C decoder reproduces the host decoder's frames."""
+        frames = _chase(frame_count=12, width=20) + _noise(frame_count=3, width=20)
+        pattern = _pattern(frames, 20)
+        UniversalPatternGenerator().generate_pattern_data(pattern, "atmega2560", str(tmp_path),
+                                                          {'gpio_pin': 2, 'compress_frames': True})
+        (tmp_path / "harness.c").write_text(
+            "#include <stdio.h>\n"
+            "#include \"pattern_data.h\"\n"
+            "int main(void) {\n"
+            "    static uint8_t rgb[LED_COUNT * 3];\n"
+            "    pattern_stream_t s;\n"
+            "    pattern_stream_rewind(&s, rgb, LED_COUNT);\n"
+            "    for (int f = 0; f < FRAME_COUNT + 1; f++) {\n"
+            "        printf(\"%u:\", pattern_stream_next(&s, rgb, LED_COUNT));\n"
+            "        for (int i = 0; i < LED_COUNT * 3; i++) printf(\"%02x\", rgb[i]);\n"
+            "        printf(\"\\n\");\n"
+            "    }\n"
+            "    return 0;\n"
+            "}\n"
+        )
+        binary = tmp_path / "harness"
+        subprocess.run(["gcc", "-w", "-o", str(binary), "harness.c", "pattern_data.c"],
+                       cwd=tmp_path, check=True, capture_output=True)
+        output = subprocess.run([str(binary)], check=True, capture_output=True, text=True).stdout.split()
+
+        expected = [f"50:{pack_frame(pixels, 20).hex()}" for pixels in frames]
+        # One extra frame shows the stream wrapping to the start
+        assert output == expected + expected[:1]
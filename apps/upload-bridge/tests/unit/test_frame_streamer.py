@@ -0,0 +1,187 @@
+"""
+Unit tests for the UDP frame streamer.
+
+Covers DDP/E1.31 packet encoding, fragmentation, multi-universe mapping,
+pacing statistics and loopback reception.
+"""
+
+import pytest
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from core.services.frame_streamer import (
+    FrameStreamer,
+    LoopbackReceiver,
+    StreamProtocol,
+    StreamTarget,
+    DDP_MAX_DATA,
+    E131_PIXELS_PER_UNIVERSE,
+    build_ddp_packets,
+    parse_ddp_packet,
+    build_e131_packets,
+    parse_e131_packet,
+    pixels_to_bytes,
+    layer_manager_source,
+    audio_reactive_source,
+)
+
+
+def _gradient(count, seed=0):
+    return [((i + seed) % 256, (i * 3) % 256, (i * 7 + seed) % 256) for i in range(count)]
+
+
+class TestPacketEncoding:
+    """Test protocol packet builders."""
+
+    def test_pixels_to_bytes_color_order(self):
+        """Channel order is applied per pixel."""
+        assert pixels_to_bytes([(1, 2, 3)], "RGB") == b"\x01\x02\x03"
+        assert pixels_to_bytes([(1, 2, 3)], "GRB") == b"\x02\x01\x03"
+
+    def test_ddp_fragmentation(self):
+        """Large frames are split by offset and only the last packet pushes."""
+        data = pixels_to_bytes(_gradient(64 * 32))
+        packets = build_ddp_packets(data, sequence=3)
+
+        assert len(packets) == -(-len(data) // DDP_MAX_DATA)
+        rebuilt = bytearray(len(data))
+        for i, packet in enumerate(packets):
+            offset, payload, push = parse_ddp_packet(packet)
+            rebuilt[offset:offset + len(payload)] = payload
+            assert push == (i == len(packets) - 1)
+        assert bytes(rebuilt) == data
+
+    def test_e131_multi_universe(self):
+        """Pixels are mapped onto consecutive universes of 170 pixels."""
+        pixels = _gradient(500)
+        data = pixels_to_bytes(pixels)
+        packets = build_e131_packets(data, start_universe=7, sequence=1, cid=b"\x00" * 16)
+
+        assert len(packets) == 3
+        universes = [parse_e131_packet(p)[0] for p in packets]
+        assert universes == [7, 8, 9]
+        first = parse_e131_packet(packets[0])[1]
+        assert len(first) == E131_PIXELS_PER_UNIVERSE * 3
+        assert b"".join(parse_e131_packet(p)[1] for p in packets) == data
+
+
+class TestLoopbackStreaming:
+    """Stream to a local receiver and compare frames."""
+
+    @pytest.mark.parametrize("protocol", [StreamProtocol.DDP, StreamProtocol.E131])
+    def test_round_trip(self, protocol):
+        """Frames arrive intact over both protocols."""
+        led_count = 64 * 16
+        receiver = LoopbackReceiver(protocol=protocol, led_count=led_count)
+        receiver.start()
+        streamer = FrameStreamer([receiver.target()], fps=200)
+        try:
+            frames = [_gradient(led_count, seed=s) for s in range(3)]
+            stats = streamer.stream(lambda i: frames[i] if i < len(frames) else None)
+
+            assert receiver.wait_for_frames(3)
+            for i, frame in enumerate(frames):
+                assert receiver.frame_pixels(i) == frame
+            assert stats.frames_sent == 3
+            assert stats.packets_sent >= 3
+        finally:
+            streamer.stop()
+            receiver.stop()
+
+    def test_target_slice(self):
+        """A target only receives its slice of the frame."""
+        receiver = LoopbackReceiver(led_count=10)
+        receiver.start()
+        streamer = FrameStreamer([receiver.target(led_offset=5, led_count=10)], fps=100)
+        try:
+            frame = _gradient(30)
+            streamer.send_frame(frame)
+            assert receiver.wait_for_frames(1)
+            assert receiver.frame_pixels(0) == frame[5:15]
+        finally:
+            streamer.stop()
+            receiver.stop()
+
+
+class TestPacing:
+    """Test frame pacing and statistics."""
+
+    def test_stats_reported(self):
+        """Achieved FPS and jitter are tracked."""
+        streamer = FrameStreamer([StreamTarget(host="127.0.0.1", port=9)], fps=100)
+        try:
+            stats = streamer.stream(lambda i: [(0, 0, 0)] * 16, max_frames=20)
+        finally:
+            streamer.stop()
+
+        assert stats.frames_sent + stats.frames_dropped == 20
+        assert 50 < stats.achieved_fps < 150
+        assert stats.jitter_ms >= 0.0
+        summary = stats.to_dict()
+        assert summary["frames_sent"] == stats.frames_sent
+
+    def test_slow_source_drops_frames(self):
+        """A source slower than the frame period causes drops, not drift."""
+        import time
+
+        def slow_source(index):
+            time.sleep(0.025)
+            return [(1, 1, 1)] * 4
+
+        streamer = FrameStreamer([StreamTarget(host="127.0.0.1", port=9)], fps=100)
+        try:
+            start = time.monotonic()
+            stats = streamer.stream(slow_source, max_frames=20)
+            elapsed = time.monotonic() - start
+        finally:
+            streamer.stop()
+
+        assert stats.frames_dropped > 0
+        assert stats.frames_sent + stats.frames_dropped == 20
+        assert elapsed < 0.5
+
+
+class TestFrameSources:
+    """Test frame source adapters."""
+
+    def test_layer_manager_source(self):
+        """Frames are rendered from a LayerManager and loop."""
+        from domain.pattern_state import PatternState
+        from domain.layers import LayerManager
+
+        pattern = Pattern(
+            name="Stream",
+            metadata=PatternMetadata(width=2, height=2),
+            frames=[
+                Frame(pixels=[(255, 0, 0)] * 4, duration_ms=50),
+                Frame(pixels=[(0, 255, 0)] * 4, duration_ms=50),
+            ],
+        )
+        manager = LayerManager(PatternState(pattern))
+        manager.set_pattern(pattern)
+
+        source = layer_manager_source(manager)
+        assert source(0) == [(255, 0, 0)] * 4
+        assert source(3) == [(0, 255, 0)] * 4
+        assert layer_manager_source(manager, loop=False)(2) is None
+
+    def test_audio_reactive_source(self):
+        """Audio chunks go through the generator's public analysis API."""
+
+        class FakeGenerator:
+            led_count = 3
+
+            def __init__(self):
+                self.chunks = [None, b"chunk"]
+
+            def read_audio_chunk(self):
+                return self.chunks.pop(0)
+
+            def analyze_audio(self, audio_data):
+                return {"volume": 0.5}
+
+            def generate_frame_pixels(self, analysis, mode):
+                return [(int(analysis["volume"] * 255), 0, 0)] * self.led_count if mode == "spectrum" else []
+
+        source = audio_reactive_source(FakeGenerator(), "spectrum")
+        assert source(0) == [(0, 0, 0)] * 3
+        assert source(1) == [(127, 0, 0)] * 3
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import pytest
+
+from core.pattern import Frame, Pattern, PatternMetadata
+
+
+def _pattern(durations):
+    frames = [Frame(pixels=[(0, 0, 0)], duration_ms=d) for d in durations]
+    return Pattern(name="Timing", metadata=PatternMetadata(width=1), frames=frames)
+
+
+def _linear_frame_at(pattern, time_ms):
+    if time_ms < 0 or not pattern.frames:
+        return None
+    elapsed = 0
+    for i, frame in enumerate(pattern.frames):
+        elapsed += frame.duration_ms
+        if time_ms < elapsed:
+            return i
+    return len(pattern.frames) - 1
+
+
+def test_lookup_matches_linear_scan():
+    pattern = _pattern([10, 0, 25, 5, 40])
+    for t in range(-2, 90):
+        assert pattern.get_frame_at_time(t) == _linear_frame_at(pattern, t)
+    assert pattern.duration_ms == 80
+    assert pattern.frame_start_ms(2) == 10
+    assert pattern.frame_start_ms(5) == 80
+    assert _pattern([]).get_frame_at_time(0) is None
+
+
+def test_batch_lookup():
+    pattern = _pattern([100, 50, 50])
+    assert list(pattern.frames_at_times([-5, 0, 99.5, 100, 175, 1000])) == [-1, 0, 0, 1, 2, 2]
+
+
+def test_mutators_update_index_incrementally():
+    pattern = _pattern([10] * 6)
+    assert pattern.get_frame_at_time(35) == 3
+
+    pattern.set_frame_duration(4, 30)
+    assert pattern._time_index._valid == 4
+    assert pattern.duration_ms == 80
+
+    pattern.insert_frame(1, Frame(pixels=[(1, 1, 1)], duration_ms=5))
+    assert pattern._time_index._valid == 1
+    assert pattern.get_frame_at_time(12) == 1
+
+    pattern.move_frame(1, 6)
+    pattern.delete_frame(0)
+    for t in range(0, 90):
+        assert pattern.get_frame_at_time(t) == _linear_frame_at(pattern, t)
+
+
+def test_direct_edits_are_detected():
+    pattern = _pattern([10] * 4)
+    assert pattern.duration_ms == 40
+
+    pattern.frames[0].duration_ms = 20
+    assert pattern.get_frame_at_time(15) == 0
+
+    pattern.frames.append(Frame(pixels=[(0, 0, 0)], duration_ms=10))
+    assert pattern.duration_ms == 60
+
+    pattern.frames = pattern.frames[:2]
+    assert pattern.duration_ms == 30
+
+    pattern.scale_speed(2.0)
+    pattern.apply_variable_speed([(0, 1.0), (2, 4.0)])
+    for t in range(0, 70):
+        assert pattern.get_frame_at_time(t) == _linear_frame_at(pattern, t)
+
+
+def test_index_not_compared_or_shown():
+    first, second = _pattern([10, 10]), _pattern([10, 10])
+    second.id = first.id
+    first.get_frame_at_time(5)
+    assert first == second
+    assert "_time_index" not in repr(first)
+
+
+def test_gif_delays_follow_timeline(tmp_path):
+    from PIL import Image
+    from core.image_exporter import ImageExporter
+
+    pattern = _pattern([33, 33, 34, 5, 100])
+    assert ImageExporter._gif_ticks(pattern) == [4, 3, 3, 1, 10]
+
+    path = tmp_path / "timeline.gif"
+    for i, frame in enumerate(pattern.frames):
+        frame.pixels = [(i * 40, 0, 0)]
+    ImageExporter.export_animation_as_gif(pattern, str(path))
+    with Image.open(path) as image:
+        delays = []
+        for index in range(image.n_frames):
+            image.seek(index)
+            delays.append(image.info["duration"])
+    assert delays == [40, 30, 30, 10, 100]
+
+
+def test_xlights_resampled_at_sequence_fps(tmp_path):
+    import json
+    from core.export.exporters import PatternExporter
+
+    pattern = _pattern([100, 50, 50])
+    pattern.metadata.fps = 20
+    for i, frame in enumerate(pattern.frames):
+        frame.pixels = [(i * 100, 0, 0)]
+    path = PatternExporter().export_xlights(pattern, tmp_path / "show.json", generate_manifest=False)
+    frames = json.loads(path.read_text())["sequence"]["frames"]
+    assert [(f["time_ms"], f["duration_ms"]) for f in frames] == [(0, 50), (50, 50), (100, 50), (150, 50)]
+    assert [f["pixels"][0][0] for f in frames] == [0, 0, 100, 200]
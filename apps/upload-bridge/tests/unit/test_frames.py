@@ -40,3 +40,16 @@ def test_move_and_delete_frame(frame_manager: FrameManager, pattern_state: Patte
     frame_manager.delete()
     assert pattern_state.frame_count() == current_count - 1
 
+
+
+def test_frame_timing_follows_mutations(frame_manager: FrameManager, pattern_state: PatternState):
+    while pattern_state.frame_count() < 3:
+        frame_manager.add_blank_after_current(60)
+    pattern = pattern_state.pattern()
+
+    frame_manager.set_duration(0, 200)
+    assert pattern.get_frame_at_time(199) == 0
+    assert pattern.duration_ms == sum(f.duration_ms for f in pattern.frames)
+
+    frame_manager.move(0, 2)
+    assert pattern.get_frame_at_time(pattern.duration_ms - 1) == 2
@@ -0,0 +1,113 @@
+"""
+Unit tests for compact mapping tables and the shared mapping-table service.
+
+Tables must behave like the lists of (x, y) tuples they replace, each layout
+is generated once, and validation is memoized per table.
+"""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from core.mapping.circular_mapper import CircularMapper
+from core.mapping.mapping_table import MappingTable, mapping_tables
+from core.pattern import Frame, Pattern, PatternMetadata
+
+
+def _multi_ring(size=21):
+    return PatternMetadata(width=size, height=size, layout_type="multi_ring", multi_ring_count=2,
+                           ring_led_counts=[8, 16], ring_radii=[4.0, 8.0])
+
+
+class TestMappingTable:
+    """Test the sequence behaviour of compact tables."""
+
+    def test_sequence_protocol(self):
+        cells = [(1, 2), (3, 4), (5, 6), (3, 4)]
+        table = MappingTable(cells)
+        assert len(table) == 4
+        assert list(table) == cells
+        assert table[1] == (3, 4) and table[-1] == (3, 4)
+        assert table[1:3] == [(3, 4), (5, 6)]
+        assert isinstance(table[1:3], MappingTable)
+        assert table[::2] == [(1, 2), (5, 6)]
+        assert list(reversed(table)) == cells[::-1]
+        assert (5, 6) in table and (6, 5) not in table
+        assert table.index((3, 4)) == 1
+        x, y = table[0]
+        assert (x, y) == (1, 2)
+        with pytest.raises(IndexError):
+            table[4]
+
+    def test_equality_and_copies(self):
+        table = MappingTable([(1, 2), (3, 4)])
+        assert table == [(1, 2), (3, 4)]
+        assert table != [[1, 2], [3, 4]]  # Same rule as a list of tuples
+        assert table == MappingTable([(1, 2), (3, 4)])
+        assert hash(table) == hash(MappingTable([(1, 2), (3, 4)]))
+        assert copy.deepcopy(table) is table
+        assert pickle.loads(pickle.dumps(table)) == table
+
+    def test_coerce(self):
+        assert isinstance(MappingTable.coerce([[1, 2], [3, 4]]), MappingTable)
+        for table in ([[1, -2]], [[1.5, 2]], [[1, 2, 3]], [[70000, 0]], [[True, 0]]):
+            assert MappingTable.coerce(table) is table
+        assert MappingTable.coerce(None) is None
+
+    def test_helpers(self):
+        table = MappingTable([(1, 0), (0, 2), (3, 1)])
+        assert table.grid_indices(4) == [1, 8, 7]
+        np = pytest.importorskip("numpy")
+        assert table.as_array().tolist() == [[1, 0], [0, 2], [3, 1]]
+        assert table.as_array().dtype == np.uint16
+
+
+class TestMappingTableService:
+    """Test shared generation and memoized validation."""
+
+    def test_generated_once_per_layout(self, monkeypatch):
+        mapping_tables.clear()
+        calls = []
+        build = CircularMapper._build_mapping_table
+        monkeypatch.setattr(CircularMapper, "_build_mapping_table",
+                            staticmethod(lambda metadata: (calls.append(1), build(metadata))[1]))
+        first = _multi_ring()
+        second = _multi_ring()
+        assert len(calls) == 1
+        assert second.circular_mapping_table is first.circular_mapping_table
+        assert isinstance(first.circular_mapping_table, MappingTable)
+        # Fields filled in by generation are replayed on cache hits
+        assert second.circular_led_count == 24
+
+        _multi_ring(23)
+        assert len(calls) == 2
+
+    def test_validation_memoized(self, monkeypatch):
+        metadata = _multi_ring()
+        mapping_tables.clear()
+        calls = []
+        check = CircularMapper._check_mapping_table
+        monkeypatch.setattr(CircularMapper, "_check_mapping_table",
+                            staticmethod(lambda m: (calls.append(1), check(m))[1]))
+        for _ in range(5):
+            assert CircularMapper.validate_mapping_table(metadata) == (True, None)
+        assert len(calls) == 1
+
+        metadata.circular_mapping_table = [(0, 0)] * 24  # Coerced on assignment
+        assert CircularMapper.validate_mapping_table(metadata) == (True, None)
+        assert len(calls) == 2
+
+        metadata.circular_mapping_table = [(0, 0)] * 23 + [(-1, 0)]
+        assert CircularMapper.validate_mapping_table(metadata)[0] is False
+
+    def test_serialization_compatible(self):
+        metadata = _multi_ring()
+        pattern = Pattern(name="Rings", metadata=metadata,
+                          frames=[Frame(pixels=[(0, 0, 0)] * (21 * 21), duration_ms=20)])
+        data = json.loads(json.dumps(pattern.to_dict()))
+        table = data["metadata"]["circular_mapping_table"]
+        assert table == [list(cell) for cell in metadata.circular_mapping_table]
+        restored = Pattern.from_dict(data)
+        assert restored.metadata.circular_mapping_table == metadata.circular_mapping_table
@@ -0,0 +1,164 @@
+"""
+Unit tests for palette-quantized export.
+"""
+
+import random
+import struct
+
+import pytest
+
+from core.export.encoders import build_binary_payload, build_c_header, encode_frame_bytes
+from core.export.palette import index_bits, pack_indices, quantize_frames, unpack_indices
+from core.export.validator import generate_export_preview
+from core.export_options import ExportOptions
+from core.pattern import Frame, Pattern, PatternMetadata
+
+
+def _pattern(frame_count=6, width=8, height=4, colors=5):
+    """Frames cycling through a small set of colours"""
+    swatches = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 0, 0), (10, 20, 30)]
+    frames = [
+        Frame(pixels=[swatches[(i + j) % colors] for j in range(width * height)], duration_ms=40 + i)
+        for i in range(frame_count)
+    ]
+    return Pattern(name="Palette", metadata=PatternMetadata(width=width, height=height), frames=frames)
+
+
+def _decode_binary(payload):
+    """Reference reader for the indexed-colour binary layout"""
+    led_count, frame_count, bits, bpp, segments = struct.unpack_from("<HHBBH", payload, 0)
+    offset = 8
+    frames = []
+    for _ in range(segments):
+        seg_frames, colors = struct.unpack_from("<HH", payload, offset)
+        offset += 4
+        palette = [payload[offset + i * bpp:offset + (i + 1) * bpp] for i in range(colors)]
+        offset += colors * bpp
+        index_len = (led_count * bits + 7) // 8
+        for _ in range(seg_frames):
+            delay, = struct.unpack_from("<H", payload, offset)
+            indices = unpack_indices(payload[offset + 2:offset + 2 + index_len], bits, led_count)
+            frames.append((delay, b"".join(palette[i] for i in indices)))
+            offset += 2 + index_len
+    assert offset == len(payload) and len(frames) == frame_count
+    return frames
+
+
+class TestQuantization:
+    """Test palette building and index packing."""
+
+    def test_index_packing(self):
+        """Indices round-trip at every width."""
+        for bits in (1, 2, 4, 8):
+            indices = [i % (1 << bits) for i in range(37)]
+            packed = pack_indices(indices, bits)
+            assert len(packed) == (37 * bits + 7) // 8
+            assert unpack_indices(packed, bits, 37) == indices
+        assert [index_bits(n) for n in (1, 2, 3, 4, 5, 16, 17, 256)] == [1, 1, 2, 2, 4, 4, 8, 8]
+
+    def test_exact_palette(self):
+        """Patterns within the palette size are lossless."""
+        frames = [[(1, 2, 3), (4, 5, 6), (1, 2, 3)], [(7, 8, 9), (1, 2, 3), (1, 2, 3)]]
+        result = quantize_frames(frames)
+        assert result.report.exact
+        assert result.index_bits == 2
+        palette = result.segments[0].palette
+        assert palette[0] == (1, 2, 3)  # Most used colour first
+        assert [[palette[i] for i in f] for f in result.segments[0].frames] == frames
+
+    def test_quantized_palette_reports_error(self):
+        """Too many colours are quantized to the limit and the error is reported."""
+        rng = random.Random(3)
+        frames = [[(rng.randrange(256), rng.randrange(256), 128) for _ in range(400)] for _ in range(3)]
+        result = quantize_frames(frames, max_colors=16)
+        report = result.report
+        assert not report.exact
+        assert len(result.segments[0].palette) <= 16 and result.index_bits == 4
+        assert report.source_colors > 16
+        assert 0 < report.mean_error < 40
+        assert report.max_error >= report.mean_error
+        assert 10 < report.psnr < 60
+
+        palette = result.segments[0].palette
+        for pixels, indices in zip(frames, result.segments[0].frames):
+            for pixel, index in zip(pixels, indices):
+                nearest = min(sum((a - b) ** 2 for a, b in zip(pixel, c)) for c in palette)
+                assert sum((a - b) ** 2 for a, b in zip(pixel, palette[index])) == nearest
+
+    def test_segments(self):
+        """Segment mode builds one palette per run of frames."""
+        frames = [[(i, 0, 0)] * 4 for i in range(10)]
+        result = quantize_frames(frames, segment_frames=4)
+        assert [s.start_frame for s in result.segments] == [0, 4, 8]
+        assert [len(s.palette) for s in result.segments] == [4, 4, 2]
+        assert result.segment_of(9) == 2
+
+    def test_palette_size_validated(self):
+        with pytest.raises(ValueError):
+            quantize_frames([[(0, 0, 0)]], max_colors=300)
+
+
+class TestPaletteExport:
+    """Test indexed-colour output of the export encoders."""
+
+    @pytest.mark.parametrize("options", [
+        ExportOptions(palette_mode="Global"),
+        ExportOptions(palette_mode="Segment", palette_segment_frames=2),
+        ExportOptions(palette_mode="Global", rgb_order="GRB", serpentine=True, color_space="RGB565"),
+    ])
+    def test_binary_roundtrip(self, options):
+        """Decoding the palette payload restores the 24-bit frame encoding."""
+        pattern = _pattern()
+        decoded = _decode_binary(build_binary_payload(pattern, options))
+        assert [delay for delay, _ in decoded] == [f.duration_ms for f in pattern.frames]
+        assert [data for _, data in decoded] == [encode_frame_bytes(pattern, f, options) for f in pattern.frames]
+
+    def test_binary_smaller(self):
+        """Few-colour content shrinks several times."""
+        pattern = _pattern(frame_count=20, width=16, height=16, colors=4)
+        raw = build_binary_payload(pattern, ExportOptions())
+        indexed = build_binary_payload(pattern, ExportOptions(palette_mode="Global"))
+        assert len(raw) / len(indexed) > 10
+
+    def test_c_header(self):
+        """The header holds palette and packed index arrays."""
+        pattern = _pattern(frame_count=3, width=4, height=1, colors=2)
+        header = build_c_header(pattern, ExportOptions(palette_mode="Global"), "Demo")
+        assert "static const uint8_t Demo_INDEX_BITS = 1;" in header
+        assert "static const uint32_t Demo_Palette0[] PROGMEM = {" in header
+        assert "static const uint8_t Demo_Frame2[] PROGMEM = {" in header
+        assert "Demo_FramePalette" not in header
+
+        header = build_c_header(pattern, ExportOptions(palette_mode="Segment", palette_segment_frames=2), "Demo")
+        assert "Demo_Palette1[]" in header
+        assert "    0, 0, 1" in header
+
+    def test_preview_reports_quantization(self):
+        """The binary preview reports palette size and quantization error."""
+        rng = random.Random(5)
+        pattern = _pattern(frame_count=2, width=16, height=16)
+        for frame in pattern.frames:
+            frame.pixels = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in frame.pixels]
+        options = ExportOptions(palette_mode="Global", palette_max_colors=64)
+        preview = generate_export_preview(pattern, "Binary Format", options)
+        assert preview.total_bytes == len(build_binary_payload(pattern, options))
+        assert any("PSNR" in line for line in preview.detail_lines)
+        assert preview.warnings
+
+    def test_firmware_palette_reduction(self, tmp_path):
+        """palette_max_colors shrinks the compressed firmware stream."""
+        from firmware.universal_pattern_generator import UniversalPatternGenerator
+
+        rng = random.Random(7)
+        frames = [Frame(pixels=[(rng.randrange(256), rng.randrange(256), 0) for _ in range(30)], duration_ms=50)
+                  for _ in range(10)]
+        pattern = Pattern(name="Noise", metadata=PatternMetadata(width=30, height=1), frames=frames)
+        generator = UniversalPatternGenerator()
+        config = {'gpio_pin': 2, 'compress_frames': True}
+        generator.generate_universal_firmware(pattern, "attiny85", str(tmp_path / "full"), config)
+        full = generator.last_size_report.compressed_bytes
+
+        generator.generate_universal_firmware(pattern, "attiny85", str(tmp_path / "reduced"),
+                                              dict(config, palette_max_colors=4))
+        assert generator.last_quantization_report.palette_colors <= 4
+        assert generator.last_size_report.compressed_bytes < full / 2
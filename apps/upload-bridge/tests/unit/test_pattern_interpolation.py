@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import core.pattern as pattern_module
+from core.pattern import Frame, Pattern, PatternMetadata, SpeedController
+
+np = pytest.importorskip("numpy")
+
+
+def _pattern(frame_count=5, led_count=6, seed=0):
+    rng = random.Random(seed)
+    frames = [
+        Frame(pixels=[(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(led_count)],
+              duration_ms=rng.randrange(1, 200))
+        for _ in range(frame_count)
+    ]
+    return Pattern(id="interp", metadata=PatternMetadata(width=led_count), frames=frames)
+
+
+def _without_numpy(monkeypatch, action):
+    monkeypatch.setattr(pattern_module, "NUMPY_AVAILABLE", False)
+    return action()
+
+
+@pytest.mark.parametrize("factor", [2, 3, 2.5])
+@pytest.mark.parametrize("mode", ["linear", "gamma"])
+def test_array_path_matches_per_pixel_path(monkeypatch, factor, mode):
+    vectorized = _pattern()
+    vectorized.interpolate_frames(factor, mode=mode)
+
+    reference = _pattern()
+    _without_numpy(monkeypatch, lambda: reference.interpolate_frames(factor, mode=mode))
+
+    assert len(vectorized.frames) == len(reference.frames) == 4 * int(factor) + 1
+    assert [f.duration_ms for f in vectorized.frames] == [f.duration_ms for f in reference.frames]
+    for a, b in zip(vectorized.frames, reference.frames):
+        assert np.abs(np.array(a.pixels, dtype=int) - np.array(b.pixels, dtype=int)).max() <= (0 if mode == "linear" else 1)
+
+
+def test_gamma_blend_brightens_midpoint():
+    frames = [Frame(pixels=[(0, 0, 0)], duration_ms=100), Frame(pixels=[(255, 255, 255)], duration_ms=100)]
+    linear = Pattern(metadata=PatternMetadata(width=1), frames=[f.copy() for f in frames])
+    gamma = Pattern(metadata=PatternMetadata(width=1), frames=[f.copy() for f in frames])
+    linear.interpolate_frames(2)
+    gamma.interpolate_frames(2, mode="gamma")
+
+    assert linear.frames[1].pixels == [(127, 127, 127)]
+    assert gamma.frames[1].pixels == [(186, 186, 186)]
+    assert gamma.frames[0].pixels == [(0, 0, 0)] and gamma.frames[2].pixels == [(255, 255, 255)]
+
+    with pytest.raises(ValueError):
+        linear.interpolate_frames(2, mode="cubic")
+
+
+def test_ragged_frames_fall_back():
+    pattern = _pattern(frame_count=3, led_count=4)
+    pattern.frames[1].pixels = pattern.frames[1].pixels[:2]
+    with pytest.raises(ValueError):
+        pattern.frames_array()
+    pattern.interpolate_frames(2)
+    assert len(pattern.frames) == 5
+    assert len(pattern.frames[1].pixels) == 2
+
+
+@pytest.mark.parametrize("curve", ["linear", "ease_in_quad", "ease_out_quad", "ease_in_out_quad",
+                                   "ease_in_cubic", "ease_out_cubic", "ease_in_out_cubic", "unknown"])
+def test_curve_vector_matches_scalar(monkeypatch, curve):
+    t = np.linspace(0.0, 1.0, 101)
+    scalar = SpeedController.evaluate_curve(curve, t.tolist())
+    assert np.allclose(SpeedController.evaluate_curve(curve, t), scalar, rtol=0, atol=1e-12)
+
+    vectorized = _pattern(frame_count=40)
+    vectorized.apply_speed_curve(curve)
+    reference = _pattern(frame_count=40)
+    _without_numpy(monkeypatch, lambda: reference.apply_speed_curve(curve))
+    diffs = [abs(a.duration_ms - b.duration_ms) for a, b in zip(vectorized.frames, reference.frames)]
+    assert max(diffs) <= 1
+
+
+def test_variable_speed_matches_per_frame(monkeypatch):
+    keyframes = [(0, 1.0), (10, 3.0), (25, 0.5)]
+    vectorized = _pattern(frame_count=30)
+    vectorized.apply_variable_speed(list(keyframes))
+    reference = _pattern(frame_count=30)
+    _without_numpy(monkeypatch, lambda: reference.apply_variable_speed(list(keyframes)))
+    assert [f.duration_ms for f in vectorized.frames] == [f.duration_ms for f in reference.frames]
+    assert vectorized.frames[29].duration_ms == _pattern(frame_count=30).frames[29].duration_ms
@@ -0,0 +1,267 @@
+"""
+Unit tests for the clock-driven playback engine and frame prefetch.
+
+The engine's clock is replaced by a fake so ticks land at exact times.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from core.lazy_frame_loader import LazyFrameLoader
+from core.pattern import Frame, Pattern, PatternMetadata
+from domain.layers import LayerManager
+from domain.pattern_state import PatternState
+from ui.widgets.enhanced_led_simulator import EnhancedLEDSimulatorWidget
+from ui.widgets.playback_engine import FramePrefetcher, PlaybackEngine
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance_ms(self, ms):
+        self.now += ms / 1000.0
+
+
+def _engine(durations, clock):
+    engine = PlaybackEngine(clock=clock)
+    engine.set_durations(durations)
+    shown = []
+    engine.frame_due.connect(shown.append)
+    return engine, shown
+
+
+def _pattern(frame_count, durations=None, led_count=4):
+    durations = durations or [50] * frame_count
+    frames = [Frame(pixels=[(i % 256, 0, 0)] * led_count, duration_ms=durations[i]) for i in range(frame_count)]
+    return Pattern(name="Playback", metadata=PatternMetadata(width=led_count, height=1), frames=frames)
+
+
+class TestPlaybackEngine:
+    """Test frame scheduling against the clock."""
+
+    def test_frame_at(self, qapp):
+        """Media time maps onto frame slots."""
+        engine, _ = _engine([10, 0, 20, 5], FakeClock())
+        assert engine.total_ms == 35
+        assert [engine.frame_at(t) for t in (0, 9.9, 10, 29.9, 30, 34, 99)] == [0, 0, 2, 2, 3, 3, 3]
+
+    def test_short_frames_play_at_true_timing(self, qapp):
+        """Variable durations below a timer tick are honoured exactly."""
+        clock = FakeClock()
+        durations = [5, 3, 12, 1, 7]
+        engine, shown = _engine(durations, clock)
+        engine.start(0)
+        for duration in durations[:-1]:
+            clock.advance_ms(duration)
+            engine._tick()
+
+        assert shown == [0, 1, 2, 3, 4]
+        assert engine.stats.dropped_frames == 0
+        assert engine.stats.jitter_ms == pytest.approx(0.0, abs=1e-3)
+        assert engine.position_ms() == pytest.approx(21)
+
+    def test_late_tick_skips_frames(self, qapp):
+        """A late tick presents the frame due now and counts the ones skipped."""
+        clock = FakeClock()
+        engine, shown = _engine([10] * 10, clock)
+        engine.start(0)
+        clock.advance_ms(43)
+        engine._tick()
+
+        assert shown == [0, 4]
+        assert engine.stats.dropped_frames == 3
+        assert engine.stats.mean_lateness_ms == pytest.approx(1.5, abs=0.01)
+
+        # No drift: the next boundary is still at 50 ms
+        clock.advance_ms(7)
+        engine._tick()
+        assert shown[-1] == 5
+
+    def test_speed_and_reverse(self, qapp):
+        """Speed scales media time and negative speed plays backwards."""
+        clock = FakeClock()
+        engine, shown = _engine([10] * 6, clock)
+        engine.set_speed(2.0)
+        engine.start(0)
+        clock.advance_ms(5)
+        engine._tick()
+        assert shown == [0, 1]
+
+        engine.set_speed(-1.0)
+        clock.advance_ms(4)
+        engine._tick()
+        assert shown == [0, 1, 0]
+        assert engine.direction == -1
+
+        with pytest.raises(ValueError):
+            engine.set_speed(0)
+
+    def test_end_of_pattern(self, qapp):
+        """Single-pass playback finishes; looping wraps to the start."""
+        clock = FakeClock()
+        engine, shown = _engine([10, 10], clock)
+        finished = []
+        engine.finished.connect(lambda: finished.append(True))
+        engine.start(0)
+        clock.advance_ms(25)
+        engine._tick()
+        assert finished == [True]
+        assert not engine.is_active()
+
+        engine.loop = True
+        shown.clear()
+        engine.start(0)
+        clock.advance_ms(25)
+        engine._tick()
+        assert shown == [0, 0]
+        assert engine.stats.dropped_frames == 1
+
+    def test_prefetch_follows_direction(self, qapp):
+        """Upcoming frames in the playhead's direction are rendered ahead."""
+        clock = FakeClock()
+        engine, _ = _engine([10] * 20, clock)
+        engine.prefetch_count = 3
+        rendered = []
+        engine.prefetcher = FramePrefetcher(lambda idx: rendered.append(idx) or idx)
+        try:
+            engine.start(10)
+            assert engine.prefetcher.wait_idle()
+            assert rendered == [11, 12, 13]
+            assert engine.prefetcher.take(11) == 11
+            assert engine.prefetcher.take(11) is None
+
+            engine.set_speed(-1.0)
+            engine.seek(10)
+            assert engine.prefetcher.wait_idle()
+            assert rendered[3:] == [9, 8, 7]
+        finally:
+            engine.prefetcher.stop()
+
+
+class TestFramePrefetcher:
+    """Test the idle-time prefetcher."""
+
+    def test_renders_on_gui_thread(self, qapp):
+        """Queued frames are rendered by the event loop, not a worker."""
+        threads = set()
+
+        def render(idx):
+            threads.add(threading.get_ident())
+            return idx
+
+        prefetcher = FramePrefetcher(render)
+        prefetcher.prefetch([4, 5, 6])
+        for _ in range(100):
+            qapp.processEvents()
+            if not prefetcher._pending:
+                break
+            time.sleep(0.005)
+        assert prefetcher.take(6) == 6
+        assert threads == {threading.get_ident()}
+
+    def test_invalidate_drops_frames(self, qapp):
+        """Prefetched frames are discarded when the pattern changes."""
+        prefetcher = FramePrefetcher(lambda idx: idx * 2, capacity=2)
+        try:
+            prefetcher.prefetch([1, 2, 3])
+            assert prefetcher.wait_idle()
+            assert prefetcher.take(1) is None  # Evicted by capacity
+            assert prefetcher.take(3) == 6
+
+            prefetcher.invalidate()
+            assert prefetcher.take(2) is None
+        finally:
+            prefetcher.stop()
+
+
+class TestLazyFrameLoader:
+    """Test lazy loader caching and direction-aware prefetch."""
+
+    def test_frames_not_copied(self):
+        """Cached frames are the pattern's own frames."""
+        pattern = _pattern(20)
+        loader = LazyFrameLoader(pattern, cache_size=8)
+        assert loader.load_frame(3) is pattern.frames[3]
+
+    def test_prefetch_ahead(self):
+        """Frames ahead of the playhead are loaded, nearest most recent."""
+        pattern = _pattern(20)
+        loader = LazyFrameLoader(pattern, cache_size=8)
+        loader.prefetch_ahead(10, direction=-1, count=3, behind=1)
+        assert {7, 8, 9, 10, 11} <= set(loader.frame_cache)
+        assert list(loader.frame_cache)[-1] == 10
+
+
+class TestSimulatorPlayback:
+    """Test the simulator driving playback through the engine."""
+
+    def test_play_uses_true_durations(self, qapp):
+        """Durations are passed through without a minimum interval."""
+        simulator = EnhancedLEDSimulatorWidget()
+        simulator.load_pattern(_pattern(3, durations=[5, 8, 13]))
+        assert simulator.playback_engine.total_ms == 26
+
+        simulator.play()
+        assert simulator.playback_engine.is_active()
+        simulator.pause()
+        assert not simulator.playback_engine.is_active()
+
+    def test_prefetched_frame_is_displayed(self, qapp):
+        """Frames scheduled by the engine use the prefetched composite."""
+        simulator = EnhancedLEDSimulatorWidget()
+        simulator.load_pattern(_pattern(4))
+        prefetched = Frame(pixels=[(9, 9, 9)] * 4, duration_ms=50)
+        simulator.led_display.set_frame(2, prefetched=prefetched)
+        assert simulator.led_display._composite_frame(simulator.pattern.frames[2]) is prefetched
+
+        simulator.led_display.set_frame(1)
+        assert simulator.led_display._composite_frame(simulator.pattern.frames[1]) is simulator.pattern.frames[1]
+
+    def test_layer_edits_invalidate_prefetch(self, qapp):
+        """Prefetched composites are dropped when the layers change."""
+        pattern = _pattern(4)
+        manager = LayerManager(PatternState(pattern))
+        manager.set_pattern(pattern)
+        simulator = EnhancedLEDSimulatorWidget()
+        simulator.load_pattern(pattern, layer_manager=manager)
+        prefetcher = simulator.playback_engine.prefetcher
+        prefetcher.prefetch([1, 2])
+        assert prefetcher.wait_idle()
+
+        manager.set_layer_track_visible(0, False)
+        assert prefetcher.take(1) is None
+
+        # A replaced layer manager no longer invalidates
+        simulator.load_pattern(pattern, layer_manager=None)
+        prefetcher.prefetch([1])
+        assert prefetcher.wait_idle()
+        manager.set_layer_track_visible(0, True)
+        assert prefetcher.take(1) is not None
+
+    def test_stop_with_lazy_loader(self, qapp):
+        """Stop rewinds through the lazy loader."""
+        pattern = _pattern(4)
+        simulator = EnhancedLEDSimulatorWidget()
+        simulator.load_pattern(pattern)
+        simulator.set_frame(3)
+        simulator.stop(lazy_loader=LazyFrameLoader(pattern))
+        assert simulator.current_frame == 0
+        assert simulator.playback_engine.current_frame == 0
+        assert set(simulator.playback_stats()) >= {"achieved_fps", "jitter_ms", "dropped_frames"}
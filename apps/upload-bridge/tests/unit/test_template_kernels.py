@@ -0,0 +1,98 @@
+"""
+Unit tests for the array implementations of pattern templates.
+
+Kernels must reproduce the per-pixel reference loops exactly, including
+the global random state they leave behind and the errors they raise.
+"""
+
+import random
+
+import pytest
+
+import core.pattern_templates as pattern_templates
+from core.pattern import Frame
+from core.pattern_templates import TemplateLibrary
+
+np = pytest.importorskip("numpy")
+from core import template_kernels  # noqa: E402
+
+KERNEL_TEMPLATES = [
+    "Fire Effect", "Rain Effect", "Matrix Rain", "Color Cycle", "Spiral", "Pulse", "Fade",
+    "Random Pixels", "Ray Rotation", "Pulsing Halo", "Twinkling Stars", "Wave Propagation",
+    "Color Gradient Rotation", "Lotus Pattern", "Dharma Wheel", "Vesak Stars",
+]
+
+VARIANT = {
+    "frames": 9, "speed": 3, "intensity": 0.9, "thickness": 0, "ray_count": 5, "ring_count": 2,
+    "wave_count": 2, "density": 0.3, "columns": 40, "fade_type": "in_out", "center_x": 0.2,
+    "gradient_colors": [(255, 0, 0), (0, 0, 255)], "rotation_speed": 2.5, "twinkle_speed": 1.3,
+}
+
+
+def _outcome(library, name, width, height, **params):
+    """Frames (or the error) plus the next global random draw"""
+    random.seed(7)
+    try:
+        pattern = library.generate_pattern(name, width, height, **params)
+        result = (pattern.name, [(frame.pixels, frame.duration_ms) for frame in pattern.frames])
+    except Exception as exc:
+        result = (type(exc), str(exc))
+    return result, random.random()
+
+
+@pytest.fixture
+def library():
+    return TemplateLibrary()
+
+
+class TestTemplateKernels:
+    """Test kernels against the scalar generators."""
+
+    @pytest.mark.parametrize("name", KERNEL_TEMPLATES)
+    @pytest.mark.parametrize("width,height", [(16, 16), (23, 9), (5, 31), (1, 1)])
+    def test_matches_scalar(self, library, monkeypatch, name, width, height):
+        template = library.get_template(name)
+        variant = {k: v for k, v in VARIANT.items() if k in template.parameters}
+        for params in ({}, variant):
+            expected = None
+            for numpy_available in (False, True):
+                monkeypatch.setattr(pattern_templates, "NUMPY_AVAILABLE", numpy_available)
+                outcome = _outcome(library, name, width, height, **params)
+                if expected is None:
+                    expected = outcome
+            assert outcome == expected
+
+    def test_out_of_range_reports_same_pixel(self, library, monkeypatch):
+        """An intensity above 1 drives the top rows negative, as in the loops."""
+        monkeypatch.setattr(pattern_templates, "NUMPY_AVAILABLE", True)
+        with pytest.raises(ValueError, match="Frame pixel 160 invalid R value: -13"):
+            library.generate_pattern("Fire Effect", 16, 16, intensity=1.7)
+
+    def test_tuple_hash(self):
+        xs = np.arange(40)[None, :]
+        ys = np.arange(30)[:, None]
+        if not template_kernels.TUPLE_HASH_EXACT:
+            pytest.skip("Tuple hash layout differs on this interpreter")
+        hashed = template_kernels.tuple_hash(xs, ys, 17)
+        assert hashed.tolist() == [[hash((x, y, 17)) for x in range(40)] for y in range(30)]
+
+    def test_plot_last_write_wins(self):
+        canvas = np.zeros((4, 3), dtype=np.int64)
+        colors = np.array([[1, 1, 1], [2, 2, 2], [3, 3, 3], [4, 4, 4]])
+        template_kernels._plot(canvas, 2, 2, np.array([0, 1, 0, 5]), np.array([0, 0, 0, 0]), colors)
+        assert canvas.tolist() == [[3, 3, 3], [2, 2, 2], [0, 0, 0], [0, 0, 0]]
+
+
+class TestInternedFrames:
+    """Test shared colour tuples in Frame.from_array."""
+
+    def test_intern_matches_plain(self):
+        rng = np.random.default_rng(3)
+        flat = rng.choice(np.array([[0, 0, 0], [255, 10, 3]], dtype=np.uint8), size=200)
+        varied = rng.integers(0, 256, size=(50, 3), dtype=np.uint8)
+        for rgb in (flat, varied, np.zeros((0, 3), dtype=np.uint8)):
+            assert Frame.from_array(rgb, 40, intern=True).pixels == Frame.from_array(rgb, 40).pixels
+
+    def test_intern_shares_tuples(self):
+        frame = Frame.from_array(np.zeros((64, 3), dtype=np.uint8), 40, intern=True)
+        assert all(pixel is frame.pixels[0] for pixel in frame.pixels)
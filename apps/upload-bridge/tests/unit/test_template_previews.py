@@ -0,0 +1,58 @@
+"""
+Unit tests for template gallery previews.
+
+Previews render in worker processes, match direct generation and small
+ones are served from the on-disk cache.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from core import template_previews  # noqa: E402
+from core.pattern_templates import TemplateLibrary  # noqa: E402
+from core.template_previews import TemplatePreviewCache, render_template_previews  # noqa: E402
+
+NAMES = ["Fire Effect", "Pulse", "Vesak Stars"]
+
+
+def _frames(pattern):
+    return [(frame.pixels, frame.duration_ms) for frame in pattern.frames]
+
+
+class TestTemplatePreviews:
+    """Test pooled rendering and the preview cache."""
+
+    def test_pool_matches_direct(self, tmp_path):
+        library = TemplateLibrary()
+        previews = render_template_previews(NAMES, 12, 8, params={"Pulse": {"frames": 5}}, max_workers=2,
+                                            cache=TemplatePreviewCache(tmp_path))
+        assert list(previews) == NAMES
+        assert _frames(previews["Pulse"]) == _frames(library.generate_pattern("Pulse", 12, 8, frames=5))
+        for name in ("Fire Effect", "Vesak Stars"):
+            assert previews[name].name == library.generate_pattern(name, 12, 8).name
+            assert _frames(previews[name]) == _frames(library.generate_pattern(name, 12, 8))
+
+    def test_small_previews_cached(self, tmp_path, monkeypatch):
+        cache = TemplatePreviewCache(tmp_path)
+        first = render_template_previews(NAMES, 8, 8, max_workers=1, cache=cache)
+        assert len(list(tmp_path.glob("*.npz"))) == len(NAMES)
+
+        def fail(*args):
+            raise AssertionError("cached preview rendered again")
+
+        monkeypatch.setattr(template_previews, "_render_payload", fail)
+        second = render_template_previews(NAMES, 8, 8, max_workers=1, cache=cache)
+        assert {name: _frames(p) for name, p in second.items()} == {name: _frames(p) for name, p in first.items()}
+
+    def test_cache_key_rules(self, tmp_path):
+        cache = TemplatePreviewCache(tmp_path, max_leds=64)
+        assert cache.key("Pulse", 8, 8, {"frames": 5}) != cache.key("Pulse", 8, 8, {"frames": 6})
+        assert cache.key("Pulse", 16, 8, {}) is None  # Too large to cache
+        assert cache.key("Clock", 8, 8, {}) is None  # Depends on the time of day
+
+    def test_failed_template_left_out(self, tmp_path):
+        previews = render_template_previews(["Fire Effect", "Missing", "Pulse"], 8, 8,
+                                            params={"Fire Effect": {"intensity": 5.0}}, max_workers=1,
+                                            cache=TemplatePreviewCache(tmp_path))
+        assert list(previews) == ["Pulse"]
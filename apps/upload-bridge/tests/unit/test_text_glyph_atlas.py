@@ -0,0 +1,125 @@
+"""
+Unit tests for the glyph atlas and scroll strips of the text renderer.
+"""
+
+import random
+
+import pytest
+
+from domain.text import text_renderer as text_renderer_module
+from domain.text.bitmap_font import BitmapFont
+from domain.text.glyph_atlas import get_glyph_atlas
+from domain.text.glyph_provider import GlyphProvider
+from domain.text.text_renderer import TextRenderer, TextRenderOptions, TextScrollOptions
+
+
+def _naive_crop(pixels, source_width, target_width, target_height, offset):
+    ox, oy = offset
+    source_height = len(pixels) // source_width
+    cropped = []
+    for row in range(target_height):
+        for col in range(target_width):
+            x, y = col + ox, row + oy
+            inside = 0 <= x < source_width and 0 <= y < source_height
+            cropped.append(pixels[y * source_width + x] if inside else (0, 0, 0))
+    return cropped
+
+
+def _naive_points(glyph, width, height):
+    return [(gx, gy) for gy in range(min(height, len(glyph)))
+            for gx in range(min(width, len(glyph[gy]))) if glyph[gy][gx]]
+
+
+def _naive_outline(points, options, pixels, width, height):
+    thickness = max(1, options.outline_thickness)
+    point_set = set(points)
+    for x, y in points:
+        for dx in range(-thickness, thickness + 1):
+            for dy in range(-thickness, thickness + 1):
+                nx, ny = x + dx, y + dy
+                if (dx or dy) and (nx, ny) not in point_set and 0 <= nx < width and 0 <= ny < height:
+                    if pixels[ny * width + nx] == options.background:
+                        pixels[ny * width + nx] = options.outline_color
+
+
+class TestGlyphAtlas:
+    """Test cached glyph bitmasks."""
+
+    @pytest.mark.parametrize("size", [(5, 7), (3, 5), (8, 11)])
+    def test_points_match_bitmap(self, size):
+        atlas = get_glyph_atlas(None, *size)
+        provider = GlyphProvider(width=size[0], height=size[1])
+        for char in "AZgq09!? ":
+            assert list(atlas.glyph(char).points) == _naive_points(provider.glyph(char), *size)
+            assert atlas.glyph(char) is atlas.glyph(char)
+
+    def test_shared_per_font_and_size(self):
+        assert get_glyph_atlas(None, 5, 7) is get_glyph_atlas(None, 5, 7)
+        assert get_glyph_atlas(None, 5, 7) is not get_glyph_atlas(None, 4, 7)
+
+    def test_edited_font_not_stale(self):
+        font = BitmapFont(name="edit", width=3, height=3)
+        font.update_glyph("A", [[True, False, False]])
+        before = get_glyph_atlas(font, 3, 3).glyph("A")
+        font.update_glyph("A", [[False, False, True]])
+        after = get_glyph_atlas(font, 3, 3).glyph("A")
+        assert before.points == ((0, 0),)
+        assert after.points == ((2, 0),)
+
+    def test_font_key_cached_until_edit(self):
+        font = BitmapFont(name="key", width=3, height=3)
+        font.update_glyph("A", [[True]])
+        key = font.content_key()
+        assert font.content_key() is key
+        assert BitmapFont(name="copy", width=3, height=3, glyphs={"A": [list(row) for row in font.glyphs["A"]]}
+                          ).content_key() == key
+        font.update_glyph("A", [[True]])
+        assert font.content_key() == key  # Same data after the edit
+        font.update_glyph("B", [[True]])
+        assert font.content_key() != key
+
+
+class TestRendererEffects:
+    """Test the bitmask outline against the per-neighbour reference."""
+
+    @pytest.mark.parametrize("thickness", [1, 2, 3])
+    def test_outline_matches_reference(self, thickness):
+        rng = random.Random(thickness)
+        width, height = 17, 9
+        options = TextRenderOptions(width=width, height=height, outline_thickness=thickness, outline_color=(9, 9, 9))
+        for _ in range(20):
+            points = [(rng.randrange(width), rng.randrange(height)) for _ in range(rng.randrange(1, 12))]
+            canvas = [rng.choice([(0, 0, 0), (0, 0, 0), (4, 4, 4)]) for _ in range(width * height)]
+            expected = list(canvas)
+            _naive_outline(points, options, expected, width, height)
+            TextRenderer()._apply_outline(points, options, canvas, width, height)
+            assert canvas == expected
+
+    def test_crop_matches_reference(self):
+        pixels = [(i % 256, i // 256, 7) for i in range(11 * 6)]
+        for offset in [(0, 0), (3, 1), (-2, 0), (9, -3), (14, 2), (-20, 8)]:
+            assert TextRenderer._crop_pixels(pixels, 11, 5, 4, offset) == _naive_crop(pixels, 11, 5, 4, offset)
+
+
+class TestScrollStrip:
+    """Test sliding-window scroll frames."""
+
+    @pytest.mark.parametrize("direction", ["left", "right", "up", "down"])
+    def test_windows_are_views(self, direction):
+        np = pytest.importorskip("numpy")
+        renderer = TextRenderer()
+        options = TextRenderOptions(width=12, height=8, color=(0, 255, 0), outline=True)
+        strip = renderer.render_scroll_strip("HI\nYO", options, TextScrollOptions(direction=direction, step=2))
+        frames = renderer.render_scroll_frames("HI\nYO", options, TextScrollOptions(direction=direction, step=2))
+        assert len(strip) == len(frames)
+        for window, frame, offset in zip(strip.windows(), frames, strip.offsets):
+            assert np.shares_memory(window, strip.array())
+            assert [tuple(p) for p in window.reshape(-1, 3).tolist()] == frame == strip.frame(offset)
+
+    def test_system_font_rasterized_once(self):
+        renderer = TextRenderer()
+        options = TextRenderOptions(width=20, height=10, font_name="DejaVuSans.ttf", font_size=9)
+        text_renderer_module._rasterize_pil_lines.cache_clear()
+        first = renderer.render_pixels("Hi", options)
+        assert renderer.render_pixels("Hi", options) == first
+        assert text_renderer_module._rasterize_pil_lines.cache_info().hits == 1
@@ -0,0 +1,186 @@
+"""
+Unit tests for the background timeline thumbnail service.
+
+Covers visible-first ordering, content-hash memoization, the LRU byte
+budget and delivery to the timeline widget.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from ui.widgets.thumbnail_service import ThumbnailService, content_key, frame_bytes
+from ui.widgets.timeline_widget import TimelineWidget
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def service(qapp):
+    service = ThumbnailService()
+    yield service
+    service.stop()
+
+
+def _frames(count, width=4, height=4):
+    return [[((i * 10) % 256, i % 256, 255 - i % 256)] * (width * height) for i in range(count)]
+
+
+def _collect(service, qapp):
+    received = []
+    service.thumbnail_ready.connect(lambda idx, pixmap: received.append((idx, pixmap)))
+    return received
+
+
+def _drain(service, qapp):
+    assert service.wait_idle()
+    qapp.processEvents()
+
+
+class TestThumbnailService:
+    """Test thumbnail rendering and caching."""
+
+    def test_visible_frames_first(self, service, qapp):
+        """Visible frames are delivered before the rest, then by playhead distance."""
+        frames = _frames(10)
+        received = _collect(service, qapp)
+        service.request(10, frames.__getitem__, 4, 4, QSize(16, 16), visible=range(6, 8), playhead=2)
+        _drain(service, qapp)
+
+        order = [idx for idx, _ in received]
+        assert order[:2] == [6, 7]
+        assert order[2:5] == [2, 1, 3]
+        assert sorted(order) == list(range(10))
+        assert service.thumbnail(6).size() == QSize(16, 16)
+
+    def test_pixels_rendered(self, service, qapp):
+        """Thumbnails show the frame colours."""
+        frames = [[(255, 0, 0)] * 8 + [(0, 0, 255)] * 8]
+        service.request(1, frames.__getitem__, 4, 4, QSize(4, 4))
+        _drain(service, qapp)
+
+        image = service.thumbnail(0).toImage()
+        assert image.pixelColor(0, 0) == QColor(255, 0, 0)
+        assert image.pixelColor(3, 3) == QColor(0, 0, 255)
+
+    def test_edit_regenerates_one_thumbnail(self, service, qapp):
+        """Only the edited frame is re-rendered and re-delivered."""
+        frames = _frames(6)
+        service.request(6, frames.__getitem__, 4, 4, QSize(16, 16))
+        _drain(service, qapp)
+        assert service.renders == 6
+
+        received = _collect(service, qapp)
+        frames[3] = [(1, 2, 3)] * 16
+        service.request(6, frames.__getitem__, 4, 4, QSize(16, 16))
+        _drain(service, qapp)
+
+        assert service.renders == 7
+        assert service.hits == 5
+        assert [idx for idx, _ in received] == [3]
+
+    def test_identical_frames_share_cache(self, service, qapp):
+        """Frames with the same content are rendered once."""
+        frames = [[(9, 9, 9)] * 16] * 5
+        service.request(5, frames.__getitem__, 4, 4, QSize(16, 16))
+        _drain(service, qapp)
+
+        assert service.renders == 1
+        assert all(service.thumbnail(i) is not None for i in range(5))
+
+    def test_byte_budget_evicts_oldest(self, qapp):
+        """The cache stays within its byte budget."""
+        frames = _frames(20)
+        one = 16 * 16 * 3
+        service = ThumbnailService(budget_bytes=one * 4)
+        try:
+            service.request(20, frames.__getitem__, 4, 4, QSize(16, 16))
+            _drain(service, qapp)
+            assert service.cache_bytes <= one * 4
+            assert len(service._memo) < 20
+        finally:
+            service.stop()
+
+    def test_source_errors_skipped(self, service, qapp):
+        """A failing source does not stop the worker."""
+        frames = _frames(3)
+
+        def source(idx):
+            if idx == 1:
+                raise IndexError("frame removed")
+            return frames[idx]
+
+        service.request(3, source, 4, 4, QSize(8, 8))
+        _drain(service, qapp)
+        assert service.thumbnail(0) is not None
+        assert service.thumbnail(1) is None
+        assert service.thumbnail(2) is not None
+
+    def test_source_read_on_gui_thread(self, service, qapp):
+        """Frame pixels are read by the event loop, never by the worker."""
+        frames = _frames(8)
+        threads = set()
+
+        def source(idx):
+            threads.add(threading.get_ident())
+            return frames[idx]
+
+        service.request(8, source, 4, 4, QSize(8, 8))
+        for _ in range(500):
+            qapp.processEvents()
+            if all(service.thumbnail(i) is not None for i in range(8)):
+                break
+            time.sleep(0.01)
+        assert all(service.thumbnail(i) is not None for i in range(8))
+        assert threads == {threading.get_ident()}
+
+    def test_content_key(self):
+        """Keys depend on pixels, frame size and thumbnail size."""
+        data = frame_bytes([(1, 2, 3)] * 4, 4)
+        assert data == bytes([1, 2, 3]) * 4
+        assert frame_bytes([(1, 2, 3), None], 3) == bytes([1, 2, 3]) + bytes(6)
+        key = content_key(data, 2, 2, QSize(8, 8))
+        assert key == content_key(data, 2, 2, QSize(8, 8))
+        assert key != content_key(data, 4, 1, QSize(8, 8))
+        assert key != content_key(data, 2, 2, QSize(16, 16))
+
+
+class TestTimelineThumbnails:
+    """Test timeline thumbnail delivery hooks."""
+
+    def test_set_frame_thumbnail(self, qapp):
+        """A single frame's thumbnail can be replaced in place."""
+        timeline = TimelineWidget()
+        timeline.set_frames([("Frame 1", None), ("Frame 2", None)])
+        pixmap = QPixmap(8, 8)
+
+        timeline.set_frame_thumbnail(1, pixmap)
+        timeline.set_frame_thumbnail(5, pixmap)
+
+        assert timeline._frames[1] == ("Frame 2", pixmap)
+        assert timeline._frames[0] == ("Frame 1", None)
+
+    def test_visible_frame_range(self, qapp):
+        """Only frames inside the visible area are reported."""
+        timeline = TimelineWidget()
+        timeline.set_frames([(f"Frame {i}", None) for i in range(50)])
+        assert timeline.visible_frame_range() == range(0)
+
+        timeline.resize(timeline.sizeHint().width() // 2, timeline.sizeHint().height())
+        timeline.show()
+        visible = timeline.visible_frame_range()
+        timeline.hide()
+        assert visible.start == 0
+        assert 0 < len(visible) < 50
@@ -0,0 +1,121 @@
+"""
+Unit tests for split pattern data in the universal pattern generator.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from firmware.universal_pattern_generator import UniversalPatternGenerator
+
+
+def _pattern(red=10, frames=2, width=4):
+    return Pattern(
+        name="P",
+        metadata=PatternMetadata(width=width, height=1),
+        frames=[Frame(pixels=[(red, i, 0)] * width, duration_ms=50) for i in range(frames)],
+    )
+
+
+def _keyframe_pattern():
+    pattern = _pattern(frames=4, width=8)
+    pattern.metadata.variable_speed = True
+    pattern.metadata.speed_keyframes = [(0, 1.0), (2, 1.5)]
+    return pattern
+
+
+@pytest.fixture
+def generator():
+    return UniversalPatternGenerator()
+
+
+class TestSplitPatternData:
+    """Frame data is emitted as its own compilation unit."""
+
+    @pytest.mark.parametrize("chip_id,unit", [("esp32", "pattern_data.cpp"), ("atmega2560", "pattern_data.c")])
+    def test_data_unit_separate(self, generator, tmp_path, chip_id, unit):
+        """Header only declares the data; the unit defines it."""
+        generator.generate_universal_firmware(_pattern(), chip_id, str(tmp_path), {'gpio_pin': 2})
+
+        header = (tmp_path / "pattern_data.h").read_text()
+        data = (tmp_path / unit).read_text()
+        assert "extern const uint8_t pattern_data[] PROGMEM;" in header
+        assert "#define FRAME_COUNT pattern_frame_count" in header
+        assert "const uint8_t pattern_data[] PROGMEM = {" not in header
+        assert "const uint8_t pattern_data[] PROGMEM = {" in data
+        assert "const uint16_t pattern_frame_count = 2;" in data
+
+    def test_new_pattern_only_touches_data(self, generator, tmp_path):
+        """Re-generating with a new pattern leaves template, header and Makefile alone."""
+        generator.generate_universal_firmware(_pattern(), "atmega2560", str(tmp_path), {'gpio_pin': 2})
+        stable = ["pattern_data.h", "professional_pattern_player.c", "Makefile", "README.md"]
+        mtimes = {name: (tmp_path / name).stat().st_mtime_ns for name in stable}
+
+        generator.generate_universal_firmware(_pattern(red=200, frames=5), "atmega2560", str(tmp_path), {'gpio_pin': 2})
+
+        assert generator.last_changed_files == ["pattern_data.c"]
+        for name in stable:
+            assert (tmp_path / name).stat().st_mtime_ns == mtimes[name]
+
+    def test_led_count_change_rewrites_header(self, generator, tmp_path):
+        """Geometry lives in the header, so a new LED count rewrites it."""
+        generator.generate_universal_firmware(_pattern(), "esp32", str(tmp_path), {'gpio_pin': 2})
+        generator.generate_pattern_data(_pattern(width=8), "esp32", str(tmp_path), {'gpio_pin': 2})
+
+        assert set(generator.last_changed_files) == {"pattern_data.h", "pattern_data.cpp"}
+        assert "#define LED_COUNT 8" in (tmp_path / "pattern_data.h").read_text()
+
+    def test_makefile_links_data_unit(self, generator, tmp_path):
+        """The Makefile builds both objects and tracks the header dependency."""
+        generator.generate_universal_firmware(_pattern(), "atmega2560", str(tmp_path), {'gpio_pin': 2})
+        makefile = (tmp_path / "Makefile").read_text()
+
+        assert "SOURCES = professional_pattern_player.c pattern_data.c" in makefile
+        assert "$(OBJECTS): pattern_data.h" in makefile
+
+    def test_embedded_mode(self, generator, tmp_path):
+        """split_pattern_data=False keeps the single-header layout."""
+        generator.generate_universal_firmware(_pattern(), "esp32", str(tmp_path), {'gpio_pin': 2})
+        generator.generate_universal_firmware(_pattern(), "esp32", str(tmp_path),
+                                              {'gpio_pin': 2, 'split_pattern_data': False})
+
+        header = (tmp_path / "pattern_data.h").read_text()
+        assert "const uint8_t pattern_data[] PROGMEM = {" in header
+        assert "#define FRAME_COUNT 2" in header
+        assert not (tmp_path / "pattern_data.cpp").exists()
+
+
+class TestSpeedKeyframes:
+    """The speed keyframe table has exactly one definition."""
+
+    def test_split_header_declares_table(self, generator, tmp_path):
+        """Split mode keeps the type in the header and the table in the unit."""
+        generator.generate_universal_firmware(_keyframe_pattern(), "atmega2560", str(tmp_path), {'gpio_pin': 2})
+
+        header = (tmp_path / "pattern_data.h").read_text()
+        data = (tmp_path / "pattern_data.c").read_text()
+        assert "struct SpeedKeyframe {" in header
+        assert "extern const struct SpeedKeyframe speed_keyframes[] PROGMEM;" in header
+        assert "speed_keyframes[] PROGMEM = {" not in header
+        assert data.count("const struct SpeedKeyframe speed_keyframes[] PROGMEM = {") == 1
+
+    def test_embedded_header_defines_table(self, generator, tmp_path):
+        """Without a data unit the header holds the table."""
+        generator.generate_universal_firmware(_keyframe_pattern(), "esp32", str(tmp_path),
+                                              {'gpio_pin': 2, 'split_pattern_data': False})
+
+        header = (tmp_path / "pattern_data.h").read_text()
+        assert "const struct SpeedKeyframe speed_keyframes[] PROGMEM = {" in header
+        assert "extern const struct SpeedKeyframe" not in header
+
+    @pytest.mark.skipif(not (shutil.which("make") and shutil.which("gcc")), reason="make/gcc not available")
+    def test_split_project_links(self, generator, tmp_path):
+        """A split-mode project with keyframes compiles and links."""
+        generator.generate_universal_firmware(_keyframe_pattern(), "atmega2560", str(tmp_path), {'gpio_pin': 2})
+
+        result = subprocess.run(["make", "-C", str(tmp_path)], capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / "professional_pattern_player").exists()
@@ -0,0 +1,78 @@
+"""
+Unit tests for the persistent firmware projects uploaders build in.
+"""
+
+import shutil
+
+import pytest
+
+from core.pattern import Pattern, PatternMetadata, Frame
+from uploaders.avr_uploader import AvrUploader
+from uploaders.esp_uploader import EspUploader
+
+
+def _pattern(red=10, frames=2):
+    return Pattern(name="P", metadata=PatternMetadata(width=4, height=1),
+                   frames=[Frame(pixels=[(red, i, 0)] * 4, duration_ms=50) for i in range(frames)])
+
+
+HOST_TOOLCHAIN = {"CC": "gcc", "CFLAGS": "-O2 -std=c99"}
+
+
+class TestUploaderProjects:
+    """Uploaders generate into one project per chip and rebuild only the data."""
+
+    def test_default_project_dir_per_chip(self, tmp_path, monkeypatch):
+        import uploaders.base as base
+        monkeypatch.setattr(base, "DEFAULT_PROJECT_ROOT", tmp_path)
+
+        assert AvrUploader("atmega2560").get_project_dir({}) == tmp_path / "atmega2560"
+        assert EspUploader("esp32").get_project_dir({'project_dir': tmp_path / "x"}) == tmp_path / "x"
+
+    def test_unsupported_chip_skips_generator(self, tmp_path):
+        """Chips without a generator profile fall back to the template build."""
+        assert AvrUploader("atmega168")._generate_project(_pattern(), {'project_dir': tmp_path}) is None
+
+    def test_generator_options_forwarded(self, tmp_path):
+        """Build options reach the generator; the sketch is named after its folder."""
+        project = tmp_path / "esp32"
+        uploader = EspUploader("esp32")
+        uploader._generate_project(_pattern(), {'project_dir': project, 'gpio_pin': 5, 'compress_frames': True}, 3)
+
+        header = (project / "pattern_data.h").read_text()
+        assert "#define LED_DATA_PIN 5" in header
+        assert "#define PATTERN_COMPRESSED 1" in header
+        assert (project / "esp32.ino").exists()
+
+    @pytest.mark.skipif(not (shutil.which("make") and shutil.which("gcc")), reason="make/gcc not available")
+    def test_new_pattern_rebuilds_only_data(self, tmp_path):
+        """A second build with a new pattern recompiles pattern_data.o and relinks."""
+        project = tmp_path / "atmega2560"
+        uploader = AvrUploader("atmega2560")
+        opts = {'project_dir': project}
+
+        uploader._generate_project(_pattern(), opts)
+        assert uploader._make_project(project, HOST_TOOLCHAIN).returncode == 0
+        player_obj = (project / "professional_pattern_player.o").stat().st_mtime_ns
+        data_obj = (project / "pattern_data.o").stat().st_mtime_ns
+
+        uploader._generate_project(_pattern(red=200, frames=5), opts)
+        result = uploader._make_project(project, HOST_TOOLCHAIN)
+
+        assert result.returncode == 0
+        assert "professional_pattern_player.c" not in result.stdout
+        assert (project / "professional_pattern_player.o").stat().st_mtime_ns == player_obj
+        assert (project / "pattern_data.o").stat().st_mtime_ns != data_obj
+
+    @pytest.mark.skipif(not (shutil.which("make") and shutil.which("gcc")), reason="make/gcc not available")
+    def test_toolchain_change_cleans_objects(self, tmp_path):
+        """New compiler flags rebuild every object."""
+        project = tmp_path / "atmega2560"
+        uploader = AvrUploader("atmega2560")
+        uploader._generate_project(_pattern(), {'project_dir': project})
+        uploader._make_project(project, HOST_TOOLCHAIN)
+
+        result = uploader._make_project(project, {"CC": "gcc", "CFLAGS": "-O0 -std=c99"})
+
+        assert result.returncode == 0
+        assert "professional_pattern_player.c" in result.stdout
@@ -2116,8 +2116,18 @@ class EditorController(QMainWindow):
         
         # Save settings
         self.settings.setValue("geometry", self.saveGeometry())
+        self._cleanup_tabs()
         event.accept()
     
+    def _cleanup_tabs(self):
+        """Stop background work owned by initialized tabs"""
+        for tab in (self.design_tab,):
+            if tab and hasattr(tab, 'cleanup'):
+                try:
+                    tab.cleanup()
+                except Exception as e:
+                    logging.getLogger(__name__).warning(f"Failed to clean up {type(tab).__name__}: {e}")
+    
     def _save_all_tab_states(self):
         """Save state for all initialized tabs"""
         tab_map = {
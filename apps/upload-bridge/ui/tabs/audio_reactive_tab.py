@@ -368,7 +368,7 @@ class AudioReactiveTab(QWidget):
             
             # Generate preview pixels
             mode = self.mode_combo.currentText().lower().replace(" ", "_")
-            pixels = self.generator._generate_frame_pixels(analysis, mode)
+            pixels = self.generator.generate_frame_pixels(analysis, mode)
             
             # Update preview label (simplified text representation)
             volume = analysis['volume']
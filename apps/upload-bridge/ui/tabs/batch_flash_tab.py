@@ -18,9 +18,8 @@ import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from core.pattern import Pattern
-from core.batch_flasher import BatchFlasher, FlashJob, FlashJobResult
+from core.batch_flasher import BatchFlashScheduler, FlashJobResult
 from uploaders.uploader_registry import UploaderRegistry
-from firmware.builder import FirmwareBuilder
 import serial.tools.list_ports
 import logging
 
@@ -45,15 +44,15 @@ class BatchFlashWorker(QThread):
     def run(self):
         """Execute batch flash"""
         try:
-            # Step 1: Build firmware once
+            # Step 1: Build firmware once (reused across every board)
             self.log.emit("Building firmware...")
-            builder = FirmwareBuilder()
-            build_result = builder.build(self.pattern, self.chip_id, {
-                'gpio_pin': self.gpio_pin
-            })
-            
-            if not build_result.success:
-                self.log.emit(f"Build failed: {build_result.error_message}")
+            scheduler = BatchFlashScheduler(max_concurrent_flashes=self.max_concurrent)
+            scheduler.set_progress_callback(self.on_progress)
+            build_opts = {'gpio_pin': self.gpio_pin}
+            try:
+                build_result = scheduler.get_artifact(self.pattern, self.chip_id, build_opts)
+            except Exception as e:
+                self.log.emit(str(e))
                 self.finished.emit([])
                 return
             
@@ -61,36 +60,22 @@ class BatchFlashWorker(QThread):
             self.log.emit(f"Build successful: {build_result.firmware_path}")
             self.log.emit(f"Firmware size: {build_result.size_bytes} bytes")
             
-            # Step 2: Create batch flasher
-            flasher = BatchFlasher(max_concurrent=self.max_concurrent)
-            flasher.set_progress_callback(self.on_progress)
-            
-            # Step 3: Add jobs
-            self.log.emit(f"Adding {len(self.ports)} flash jobs...")
-            for i, port in enumerate(self.ports):
-                job = FlashJob(
-                    job_id=f"job_{i}",
-                    port=port,
-                    chip_id=self.chip_id,
-                    firmware_path=self.firmware_path,
-                    gpio_pin=self.gpio_pin
-                )
-                flasher.add_job(job)
-                self.log.emit(f"Added job for {port}")
-            
-            # Step 4: Execute all
-            self.log.emit("Starting batch flash...")
-            results = flasher.flash_all()
+            # Step 2: Flash all ports concurrently (one worker per port)
+            self.log.emit(f"Starting batch flash on {len(self.ports)} port(s)...")
+            results = scheduler.flash_ports(self.pattern, self.chip_id, self.ports, build_opts)
             
-            # Step 5: Report summary
-            summary = flasher.get_summary()
+            # Step 3: Report summary
+            report = scheduler.report.to_dict()
             self.log.emit("=" * 70)
             self.log.emit("Batch Flash Summary:")
-            self.log.emit(f"  Total: {summary['total_jobs']}")
-            self.log.emit(f"  Successful: {summary['successful']}")
-            self.log.emit(f"  Failed: {summary['failed']}")
-            self.log.emit(f"  Success Rate: {summary['success_rate']*100:.1f}%")
-            self.log.emit(f"  Total Duration: {summary['total_duration_seconds']:.1f}s")
+            self.log.emit(f"  Total: {report['boards']}")
+            self.log.emit(f"  Successful: {report['successful']}")
+            self.log.emit(f"  Failed: {report['failed']}")
+            self.log.emit(f"  Wall Time: {report['wall_seconds']:.1f}s")
+            self.log.emit(f"  Throughput: {report['boards_per_hour']:.0f} boards/hour")
+            self.log.emit(f"  Avg Flash: {report['avg_flash_seconds']:.1f}s  "
+                          f"Avg Verify: {report['avg_verify_seconds']:.1f}s  "
+                          f"Avg Wait: {report['avg_wait_seconds']:.1f}s")
             self.log.emit("=" * 70)
             
             self.finished.emit(results)
@@ -108,6 +108,7 @@ from ui.widgets.timeline_widget import (
     TimelineOverlay,
     TimelineLayerTrack,
 )  # noqa: E402
+from ui.widgets.thumbnail_service import ThumbnailService  # noqa: E402
 from domain.actions import DesignAction  # noqa: E402
 from domain.pattern_state import PatternState  # noqa: E402
 from domain.frames import FrameManager  # noqa: E402
@@ -493,6 +494,8 @@ class DesignToolsTab(QWidget):
         self._playback_timer.timeout.connect(self._on_playback_tick)
         self._playback_fps_default = 24
         self._thumbnail_size = QSize(72, 72)
+        self._thumbnail_service = ThumbnailService(self)
+        self._thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
         self.canvas_group: Optional[QGroupBox] = None
         self._frame_size_mismatch_indices: List[int] = []
         self._frame_size_warning_shown = False
@@ -510,6 +513,11 @@ class DesignToolsTab(QWidget):
         self.pattern_modified.connect(self._mark_dirty)
         self.frame_manager.frames_changed.connect(self._sync_detached_preview)
 
+    def cleanup(self):
+        """Stop playback and the background thumbnail worker."""
+        self._playback_timer.stop()
+        self._thumbnail_service.stop()
+
     # ------------------------------------------------------------------
     # UI setup
     # ------------------------------------------------------------------
@@ -974,6 +982,7 @@ class DesignToolsTab(QWidget):
         timeline_scroll.setWidgetResizable(True)
         timeline_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         timeline_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded) # Enabled vertical scroll for layer intensive timelines
+        timeline_scroll.horizontalScrollBar().valueChanged.connect(self._prioritize_visible_thumbnails)
         timeline_scroll.setFrameShape(QScrollArea.Shape.NoFrame)
         timeline_scroll.setStyleSheet("background-color: #1A1A1A; border-radius: 4px;")
         
@@ -2097,11 +2106,15 @@ class DesignToolsTab(QWidget):
         self._refresh_effects_library()
         return tab
 
-    def _refresh_effects_library(self) -> None:
+    def _refresh_effects_library(self, check_files: bool = False) -> None:
         if not self.effects_widget:
             return
-        self.effects_library.reload()
-        self.effects_widget.set_effects(self.effects_library.effects(), self.effects_library.categories())
+        self.effects_library.reload(check_files=check_files)
+        self.effects_widget.set_effects(
+            self.effects_library.effects(),
+            self.effects_library.categories(),
+            search=self.effects_library.search,
+        )
         self._set_effect_info(self._effects_info_default)
 
     def _refresh_lms_frame_bindings(self) -> None:
@@ -4809,7 +4822,8 @@ class DesignToolsTab(QWidget):
         self._apply_effect_definition(effect, intensity)
 
     def _on_effects_refresh_requested(self):
-        self._refresh_effects_library()
+        # Explicit refresh also picks up in-place edits to effect files
+        self._refresh_effects_library(check_files=True)
 
     def _on_effects_open_folder(self):
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.effects_library.root.resolve())))
@@ -6188,6 +6202,38 @@ class DesignToolsTab(QWidget):
         number_format_layout.addStretch()
         advanced_layout.addLayout(number_format_layout)
         
+        # Indexed colour (palette + per-LED indices)
+        palette_layout = QHBoxLayout()
+        palette_layout.addWidget(QLabel("Palette:"))
+        self.export_palette_mode_combo = QComboBox()
+        self.export_palette_mode_combo.addItems(["Off", "Global", "Segment"])
+        self.export_palette_mode_combo.setToolTip(
+            "Export a colour palette and per-LED indices instead of RGB.\n"
+            "Segment: a new palette every N frames."
+        )
+        palette_layout.addWidget(self.export_palette_mode_combo)
+        palette_layout.addWidget(QLabel("Max Colours:"))
+        self.export_palette_colors_spin = QSpinBox()
+        self.export_palette_colors_spin.setRange(2, 256)
+        self.export_palette_colors_spin.setValue(256)
+        self.export_palette_colors_spin.setToolTip("Colours beyond this are quantized")
+        palette_layout.addWidget(self.export_palette_colors_spin)
+        palette_layout.addWidget(QLabel("Frames/Palette:"))
+        self.export_palette_segment_spin = QSpinBox()
+        self.export_palette_segment_spin.setRange(1, 1024)
+        self.export_palette_segment_spin.setValue(16)
+        palette_layout.addWidget(self.export_palette_segment_spin)
+        palette_layout.addStretch()
+        advanced_layout.addLayout(palette_layout)
+        
+        def _update_palette_controls() -> None:
+            mode = self.export_palette_mode_combo.currentText()
+            self.export_palette_colors_spin.setEnabled(mode != "Off")
+            self.export_palette_segment_spin.setEnabled(mode == "Segment")
+        
+        self.export_palette_mode_combo.currentTextChanged.connect(lambda _text: _update_palette_controls())
+        _update_palette_controls()
+        
         advanced_group.setLayout(advanced_layout)
         layout.addWidget(advanced_group)
         
@@ -6247,6 +6293,9 @@ class DesignToolsTab(QWidget):
                 color_space=self.export_color_space_combo.currentText(),
                 bytes_per_line=self.export_bytes_per_line_spin.value(),
                 number_format=self.export_number_format_combo.currentText(),
+                palette_mode=self.export_palette_mode_combo.currentText(),
+                palette_max_colors=self.export_palette_colors_spin.value(),
+                palette_segment_frames=self.export_palette_segment_spin.value(),
             )
 
         def _apply_preview(preview: ExportPreview) -> None:
@@ -6342,6 +6391,9 @@ class DesignToolsTab(QWidget):
         self.export_color_space_combo.currentTextChanged.connect(_update_hardware_preview)
         self.export_bytes_per_line_spin.valueChanged.connect(lambda _value: _update_preview())
         self.export_number_format_combo.currentTextChanged.connect(_update_preview)
+        self.export_palette_mode_combo.currentTextChanged.connect(_update_preview)
+        self.export_palette_colors_spin.valueChanged.connect(lambda _value: _update_preview())
+        self.export_palette_segment_spin.valueChanged.connect(lambda _value: _update_preview())
 
         _update_preview()
         
@@ -6366,18 +6418,8 @@ class DesignToolsTab(QWidget):
                         filepath += extension.replace('*', '')
                     
                     try:
-                        # Create export options
-                        options = ExportOptions(
-                            bit_order_msb_lsb=self.export_bit_order_combo.currentText(),
-                            bit_order_position=self.export_bit_position_combo.currentText(),
-                            scan_direction=self.export_scan_direction_combo.currentText(),
-                            scan_order=self.export_scan_order_combo.currentText(),
-                            serpentine=self.export_serpentine_checkbox.isChecked(),
-                            rgb_order=self.export_rgb_order_combo.currentText(),
-                            color_space=self.export_color_space_combo.currentText(),
-                            bytes_per_line=self.export_bytes_per_line_spin.value(),
-                            number_format=self.export_number_format_combo.currentText()
-                        )
+                        # Same options the preview was generated from
+                        options = _collect_options()
                         
                         # Update ExportService with options
                         self.export_service.set_export_options(options)
@@ -6485,6 +6527,7 @@ class DesignToolsTab(QWidget):
         timeline_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         timeline_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         timeline_scroll.setFrameShape(QScrollArea.Shape.NoFrame)  # Remove border
+        timeline_scroll.horizontalScrollBar().valueChanged.connect(self._prioritize_visible_thumbnails)
         
         frame_layout.addWidget(timeline_scroll, stretch=1)
 
@@ -11366,14 +11409,15 @@ class DesignToolsTab(QWidget):
                 pixel_count = len(frame.pixels) if frame.pixels else 0
                 display = f"Frame {idx + 1:02d}  •  {frame.duration_ms} ms  •  {pixel_count} px"
                 
-                # Generate composite thumbnail from layers
-                composite_thumbnail = self._make_composite_frame_thumbnail(idx)
+                # Show the last rendered thumbnail until the background render completes
+                composite_thumbnail = self._thumbnail_service.thumbnail(idx)
                 frames_data.append((display, composite_thumbnail))
                 frame_durations.append(frame.duration_ms)
             
             self.timeline.set_frames(frames_data)
             self.timeline.set_frame_durations(frame_durations)
             self.timeline.set_playhead(self._current_frame_index)
+            self._request_timeline_thumbnails()
 
             total_frames = len(self._pattern.frames)
             self.frame_start_spin.setMaximum(total_frames)
@@ -11401,46 +11445,43 @@ class DesignToolsTab(QWidget):
         finally:
             self._frame_switch_locked = False
     
-    def _make_composite_frame_thumbnail(self, frame_idx: int) -> Optional[QPixmap]:
+    def _request_timeline_thumbnails(self) -> None:
         """
-        Generate composite thumbnail from all visible layers for a frame.
+        Queue composite thumbnails for every frame on the background service.
         
-        NEW: Uses render_frame() to get composite pixels (derived, not stored).
+        Composites come from render_frame() (derived, not stored), which the
+        service calls on the GUI thread a few frames per event-loop turn;
+        only the packed pixels reach its worker. Visible frames are rendered
+        first; frames whose pixels did not change are served from the
+        service cache and keep their current thumbnail.
         """
-        if not self._pattern or frame_idx >= len(self._pattern.frames):
-            return None
-        
-        # Use render_frame() to get composite pixels (order-only rendering)
-        composite_pixels = self.layer_manager.render_frame(frame_idx)
-        
-        if not composite_pixels:
-            return None
+        if not self._pattern or not self._pattern.frames:
+            return
         
-        # Create thumbnail image
-        if self._pattern and self._pattern.metadata:
+        if self._pattern.metadata:
             width = max(1, self._pattern.metadata.width)
             height = max(1, self._pattern.metadata.height)
         else:
-            width = max(1, int(len(composite_pixels) ** 0.5))
-            height = max(1, len(composite_pixels) // width)
-        
-        image = QImage(width, height, QImage.Format_RGB32)
-        image.fill(QColor(0, 0, 0))
-        limit = width * height
-        
-        for idx, pixel in enumerate(composite_pixels[:limit]):
-            if pixel is None:
-                continue
-            x = idx % width
-            y = idx // width
-            r, g, b = pixel[:3] if isinstance(pixel, (list, tuple)) and len(pixel) >= 3 else (0, 0, 0)
-            image.setPixel(x, y, QColor(r, g, b).rgb())
-        
-        # Convert to pixmap and scale to thumbnail size
-        pixmap = QPixmap.fromImage(image)
-        thumbnail_size = self._thumbnail_size
-        scaled = pixmap.scaled(thumbnail_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        return scaled
+            pixel_count = len(self._pattern.frames[0].pixels or [])
+            width = max(1, int(pixel_count ** 0.5))
+            height = max(1, pixel_count // width)
+        
+        self._thumbnail_service.request(
+            len(self._pattern.frames),
+            self.layer_manager.render_frame,
+            width,
+            height,
+            self._thumbnail_size,
+            visible=self.timeline.visible_frame_range(),
+            playhead=self._current_frame_index,
+        )
+    
+    def _prioritize_visible_thumbnails(self, *_args) -> None:
+        """Render thumbnails scrolled into view before the rest."""
+        self._thumbnail_service.prioritize(self.timeline.visible_frame_range(), self._current_frame_index)
+    
+    def _on_thumbnail_ready(self, frame_idx: int, thumbnail: QPixmap) -> None:
+        self.timeline.set_frame_thumbnail(frame_idx, thumbnail)
 
     def _on_layers_structure_updated(self, *args):
         if self._suspend_timeline_refresh:
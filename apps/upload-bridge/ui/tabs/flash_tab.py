@@ -32,7 +32,7 @@ class FlashThread(QThread):
     log = Signal(str)  # log message
     build_result_ready = Signal(object)  # build_result object
     
-    def __init__(self, flash_service, pattern, chip_id, port, gpio, verify):
+    def __init__(self, flash_service, pattern, chip_id, port, gpio, verify, build_config=None):
         super().__init__()
         self.flash_service = flash_service
         self.pattern = pattern
@@ -40,6 +40,7 @@ class FlashThread(QThread):
         self.port = port
         self.gpio = gpio
         self.verify = verify
+        self.build_config = build_config or {'gpio_pin': gpio}
     
     def run(self):
         """Execute build and flash process"""
@@ -54,14 +55,10 @@ class FlashThread(QThread):
             self.log.emit("Building firmware...")
             self.progress.emit("building", 0.0, "Building firmware...")
             
-            build_config = {
-                'gpio_pin': self.gpio
-            }
-            
             build_result = self.flash_service.build_firmware(
                 self.pattern,
                 self.chip_id,
-                config=build_config
+                config=dict(self.build_config)
             )
             
             if not build_result.success:
@@ -155,6 +152,7 @@ class FlashTab(QWidget):
         self.pattern: Pattern = None
         self.flash_thread: FlashThread = None
         self.last_build_result = None  # Store build result for save/view
+        self._last_build_source = None  # (pattern, chip_id) the last build came from
         
         # Guard flag to prevent recursion during pattern loading
         self._loading_pattern = False
@@ -245,6 +243,14 @@ class FlashTab(QWidget):
         
         config_layout.addStretch()
         
+        self.compress_checkbox = QCheckBox("Compress frames")
+        self.compress_checkbox.setToolTip(
+            "Store frames as a palette/RLE/delta stream decoded by the player.\n"
+            "Fits much longer animations in flash; frame interpolation is disabled."
+        )
+        self.compress_checkbox.setChecked(False)
+        config_layout.addWidget(self.compress_checkbox)
+        
         self.verify_checkbox = QCheckBox("Verify after flash")
         self.verify_checkbox.setChecked(True)
         config_layout.addWidget(self.verify_checkbox)
@@ -493,6 +499,8 @@ class FlashTab(QWidget):
                 state['gpio'] = self.gpio_spin.value()
             if hasattr(self, 'verify_checkbox') and self.verify_checkbox:
                 state['verify'] = self.verify_checkbox.isChecked()
+            if hasattr(self, 'compress_checkbox') and self.compress_checkbox:
+                state['compress_frames'] = self.compress_checkbox.isChecked()
         except Exception as e:
             import logging
             logging.getLogger(__name__).warning(f"Failed to get FlashTab state: {e}")
@@ -513,6 +521,8 @@ class FlashTab(QWidget):
                 self.gpio_spin.setValue(state['gpio'])
             if 'verify' in state and hasattr(self, 'verify_checkbox') and self.verify_checkbox:
                 self.verify_checkbox.setChecked(state['verify'])
+            if 'compress_frames' in state and hasattr(self, 'compress_checkbox') and self.compress_checkbox:
+                self.compress_checkbox.setChecked(state['compress_frames'])
         except Exception as e:
             import logging
             logging.getLogger(__name__).warning(f"Failed to restore FlashTab state: {e}")
@@ -847,17 +857,65 @@ class FlashTab(QWidget):
         except Exception as e:
             self.log(f"Warning: wiring mapping failed ({e}); proceeding without remap")
         
+        # Check flash/RAM/timing budget before spending time on a build
+        build_config = self._build_config(gpio)
+        if not self._check_firmware_budget(pattern_copy, chip_id, build_config):
+            self.flash_button.setEnabled(True)
+            self.chip_combo.setEnabled(True)
+            self.port_combo.setEnabled(True)
+            self._pattern_locked = False
+            self.log("Flash cancelled: pattern does not fit the target chip")
+            return
+        
         # Emit firmware building signal
         self.firmware_building.emit()
         
         # Start flash thread with pattern copy
-        self.flash_thread = FlashThread(self.flash_service, pattern_copy, chip_id, port, gpio, verify)
+        self.flash_thread = FlashThread(self.flash_service, pattern_copy, chip_id, port, gpio, verify, build_config)
         self.flash_thread.progress.connect(self.on_progress)
         self.flash_thread.finished.connect(self.on_flash_complete)
         self.flash_thread.log.connect(self.log)
         self.flash_thread.build_result_ready.connect(self.on_build_result_ready)
         self.flash_thread.start()
     
+    def _build_config(self, gpio: int) -> dict:
+        """Build options shared by the budget check and the build"""
+        return {
+            'gpio_pin': gpio,
+            'compress_frames': self.compress_checkbox.isChecked(),
+        }
+    
+    def _check_firmware_budget(self, pattern: Pattern, chip_id: str, build_config: dict) -> bool:
+        """
+        Estimate the firmware budget and confirm with the user if it does not fit.
+        
+        Returns:
+            True to continue with the build
+        """
+        try:
+            budget = self.flash_service.estimate_budget(pattern, chip_id, build_config)
+        except Exception as e:
+            # Chips outside the universal generator (or estimator errors) skip the check
+            self.log(f"Budget estimate unavailable for {chip_id}: {e}")
+            return True
+        
+        self.log(f"📏 Budget: {budget.summary()}")
+        for warning in budget.warnings:
+            self.log(f"⚠️ {warning}")
+        if budget.fits:
+            return True
+        
+        reply = QMessageBox.warning(
+            self,
+            "Pattern Too Large",
+            "The pattern does not fit the target chip:\n\n" +
+            "\n".join(f"• {w}" for w in budget.warnings) +
+            "\n\nBuild anyway?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+    
     def on_progress(self, status: str, progress: float, message: str):
         """Update progress during flash"""
         self.progress_label.setText(message)
@@ -965,6 +1023,8 @@ class FlashTab(QWidget):
     def on_build_result_ready(self, build_result):
         """Store build result and enable save/view buttons"""
         self.last_build_result = build_result
+        if self.flash_thread is not None:
+            self._last_build_source = (self.flash_thread.pattern, self.flash_thread.chip_id)
         self.save_firmware_btn.setEnabled(True)
         self.view_firmware_btn.setEnabled(True)
         # Emit firmware_built signal with firmware path
@@ -1019,6 +1079,14 @@ class FlashTab(QWidget):
                 shutil.copy2(ino_file, dest_ino)
                 self.log(f"Saved {ino_file.name}: {dest_ino}")
             
+            # Build manifest (firmware hash and build cache report)
+            if self._last_build_source is not None:
+                pattern, chip_id = self._last_build_source
+                manifest = self.flash_service.create_build_manifest(pattern, chip_id, self.last_build_result)
+                dest_manifest = save_dir / f"{firmware_path.stem}.manifest.json"
+                manifest.save(dest_manifest)
+                self.log(f"Saved build manifest: {dest_manifest}")
+            
             QMessageBox.information(
                 self,
                 "Firmware Saved",
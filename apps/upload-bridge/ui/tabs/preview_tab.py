@@ -57,6 +57,7 @@ class PreviewTab(QWidget):
         self._base_pattern: Pattern = None  # Base pattern for preview rebuild
         self._preview_pattern: Pattern = None  # Processed preview pattern
         self._lazy_loader = None  # Lazy frame loader for large patterns
+        self._last_frame_idx = 0  # Previous playhead frame (prefetch direction)
         self._syncing_playback = False  # Flag to prevent signal loops
         self._syncing_frame = False  # Flag to prevent frame sync loops
         self._updating_from_repository = False  # Flag to prevent circular updates from repository signals
@@ -718,11 +719,10 @@ class PreviewTab(QWidget):
         """Handle frame change from simulator (with lazy loading support)"""
         # Preload nearby frames if using lazy loader
         if self._lazy_loader:
-            # Preload current frame and nearby frames for smooth scrubbing
-            preload_range = 5
-            start_idx = max(0, frame_idx - preload_range)
-            end_idx = min(self.pattern.frame_count, frame_idx + preload_range + 1)
-            self._lazy_loader.preload_range(start_idx, end_idx)
+            # Preload frames in the direction the playhead is moving
+            direction = -1 if frame_idx < self._last_frame_idx else 1
+            self._lazy_loader.prefetch_ahead(frame_idx, direction=direction, count=5, behind=1)
+        self._last_frame_idx = frame_idx
         
         # Update slider without triggering signal
         self.frame_slider.blockSignals(True)
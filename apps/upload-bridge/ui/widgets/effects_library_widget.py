@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import math
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor, QImage, QPixmap
@@ -42,6 +42,7 @@ class EffectsLibraryWidget(QWidget):
         self._filtered: List[EffectDefinition] = []
         self._thumbnails: Dict[str, QPixmap] = {}
         self._selected_id: Optional[str] = None
+        self._search: Optional[Callable[[str], List[EffectDefinition]]] = None
 
         self._build_ui()
 
@@ -49,8 +50,15 @@ class EffectsLibraryWidget(QWidget):
     # Public API
     # ------------------------------------------------------------------
 
-    def set_effects(self, effects: Iterable[EffectDefinition], categories: Iterable[str]) -> None:
+    def set_effects(
+        self,
+        effects: Iterable[EffectDefinition],
+        categories: Iterable[str],
+        search: Optional[Callable[[str], List[EffectDefinition]]] = None,
+    ) -> None:
+        """Show ``effects``; ``search`` (e.g. EffectLibrary.search) backs the search box."""
         self._effects = list(effects)
+        self._search = search
         self._effects.sort(key=lambda eff: (eff.category.lower(), eff.name.lower()))
         self._populate_category_combo(categories)
         self._refresh_effect_grid()
@@ -184,13 +192,19 @@ class EffectsLibraryWidget(QWidget):
 
         category_filter = self.category_combo.currentData()
         search = self.search_edit.text().strip().lower()
+        matched = None
+        if search and self._search is not None:
+            matched = {effect.identifier for effect in self._search(search)}
         self._filtered = []
         row = col = 0
         max_columns = 2
         for effect in self._effects:
             if category_filter and category_filter != "__all__" and effect.category != category_filter:
                 continue
-            if search and search not in effect.name.lower() and search not in effect.identifier.lower():
+            if matched is not None:
+                if effect.identifier not in matched:
+                    continue
+            elif search and search not in effect.name.lower() and search not in effect.identifier.lower():
                 continue
             self._filtered.append(effect)
             card = _EffectCard(effect, self._thumbnail_for(effect))
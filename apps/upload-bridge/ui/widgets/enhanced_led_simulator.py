@@ -14,6 +14,7 @@ from PySide6.QtCore import Qt, QTimer, Signal, QSize
 from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont
 import sys
 import os
+import time
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
@@ -21,6 +22,26 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from core.pattern import Pattern, Frame, PatternMetadata
 from core.matrix_detector import MatrixDetector, MatrixLayout
 from core.mapping.circular_mapper import CircularMapper
+from core.mapping.circular_layout_index import CircularLayoutIndex
+from ui.widgets.led_render_cache import LEDRenderCache, NUMPY_AVAILABLE
+from ui.widgets.playback_engine import PlaybackEngine, FramePrefetcher
+
+# Metadata fields that change preview geometry (cached per layout)
+_LAYOUT_FIELDS = (
+    "layout_type", "width", "height", "circular_led_count", "circular_radius",
+    "circular_inner_radius", "circular_start_angle", "circular_end_angle",
+    "circular_led_spacing", "multi_ring_count", "ring_led_counts", "ring_radii",
+    "ring_spacing", "ray_count", "leds_per_ray", "ray_spacing_angle",
+    "custom_led_positions", "led_position_units", "custom_position_center_x",
+    "custom_position_center_y", "matrix_style", "irregular_shape_enabled",
+    "active_cell_coordinates",
+)
+
+# LayerManager signals after which prefetched composites are stale
+_LAYER_CHANGE_SIGNALS = (
+    "pixel_changed", "frame_pixels_changed", "layers_changed", "layer_added",
+    "layer_removed", "layer_moved", "group_changed",
+)
 
 
 class EnhancedLEDSimulatorWidget(QWidget):
@@ -44,10 +65,15 @@ class EnhancedLEDSimulatorWidget(QWidget):
         super().__init__(parent)
         
         self.pattern: Pattern = None
+        self.layer_manager = None
         self.current_frame = 0
         self.is_playing = False
-        self.playback_timer = QTimer()
-        self.playback_timer.timeout.connect(self.next_frame)
+        
+        # Clock-driven playback with composite frames prefetched between ticks
+        self.playback_engine = PlaybackEngine(self)
+        self.playback_engine.prefetcher = FramePrefetcher(self._render_playback_frame)
+        self.playback_engine.frame_due.connect(self._on_playback_frame)
+        self.playback_engine.finished.connect(self._on_playback_finished)
         
         # Display settings
         self.led_size = 8  # Size of each LED in pixels
@@ -223,8 +249,9 @@ class EnhancedLEDSimulatorWidget(QWidget):
         self.setLayout(layout)
     
     def setup_timer(self):
-        """Setup playback timer"""
-        self.playback_timer.setSingleShot(False)
+        """Setup playback engine timing from the loaded pattern"""
+        frames = self.pattern.frames if self.pattern else []
+        self.playback_engine.set_durations([frame.duration_ms for frame in frames])
     
     def load_pattern(self, pattern: Pattern, layer_manager=None):
         """Load pattern for display
@@ -234,7 +261,8 @@ class EnhancedLEDSimulatorWidget(QWidget):
             layer_manager: Optional LayerManager for animations
         """
         self.pattern = pattern
-        self.layer_manager = layer_manager
+        self._watch_layer_manager(layer_manager)
+        self.setup_timer()
         
         if not pattern:
             self.led_display.clear()
@@ -406,17 +434,15 @@ class EnhancedLEDSimulatorWidget(QWidget):
         self.pause_button.setEnabled(True)
         self.stop_button.setEnabled(True)
         
-        # Start timer with current frame duration
-        if self.current_frame < len(self.pattern.frames):
-            frame = self.pattern.frames[self.current_frame]
-            self.playback_timer.start(max(20, frame.duration_ms))  # At least 20ms
+        # Frames play at their true durations against a monotonic clock
+        self.playback_engine.start(self.current_frame)
         
         self.playback_state_changed.emit(True)
     
     def pause(self):
         """Pause playback"""
         self.is_playing = False
-        self.playback_timer.stop()
+        self.playback_engine.stop()
         self.play_button.setEnabled(True)
         self.pause_button.setEnabled(False)
         
@@ -425,7 +451,7 @@ class EnhancedLEDSimulatorWidget(QWidget):
     def stop(self, lazy_loader=None):
         """Stop playback and reset to first frame"""
         self.is_playing = False
-        self.playback_timer.stop()
+        self.playback_engine.stop()
         self.play_button.setEnabled(True)
         self.pause_button.setEnabled(False)
         self.stop_button.setEnabled(False)
@@ -438,27 +464,76 @@ class EnhancedLEDSimulatorWidget(QWidget):
         if not self.pattern:
             return
         
-        next_frame = (self.current_frame + 1) % self.pattern.frame_count
-        self.set_frame(next_frame)
-        
-        # Continue playing if not at end
-        if self.is_playing and next_frame != 0:
-            if self.current_frame < len(self.pattern.frames):
-                frame = self.pattern.frames[self.current_frame]
-                self.playback_timer.start(max(20, frame.duration_ms))
-        else:
-            # End of pattern
-            self.pause()
+        self.set_frame((self.current_frame + 1) % self.pattern.frame_count)
+    
+    def set_playback_speed(self, speed: float):
+        """Set playback rate (negative plays backwards)"""
+        self.playback_engine.set_speed(speed)
+    
+    def playback_stats(self) -> Dict[str, float]:
+        """Achieved FPS, jitter and dropped-frame counts of the current playback"""
+        stats = self.playback_engine.stats.to_dict()
+        prefetcher = self.playback_engine.prefetcher
+        stats["prefetch_hits"] = prefetcher.hits
+        stats["prefetch_misses"] = prefetcher.misses
+        return stats
+    
+    def _watch_layer_manager(self, layer_manager):
+        """Drop prefetched composites whenever the layers they were built from change"""
+        if self.layer_manager is layer_manager:
+            return
+        invalidate = self.playback_engine.prefetcher.invalidate
+        for manager, connect in ((self.layer_manager, False), (layer_manager, True)):
+            if manager is None:
+                continue
+            for name in _LAYER_CHANGE_SIGNALS:
+                signal = getattr(manager, name, None)
+                if signal is None:
+                    continue
+                try:
+                    if connect:
+                        signal.connect(invalidate)
+                    else:
+                        signal.disconnect(invalidate)
+                except (RuntimeError, TypeError):
+                    pass
+        self.layer_manager = layer_manager
+    
+    def _render_playback_frame(self, frame_idx: int) -> Frame:
+        """Build the display-ready frame for an index (prefetched on the GUI thread)"""
+        frame = self.pattern.frames[frame_idx]
+        return self.led_display.composite_frame(frame, frame_idx)
+    
+    def _on_playback_frame(self, frame_idx: int):
+        """Present the frame the playback engine scheduled"""
+        if not self.pattern or frame_idx >= self.pattern.frame_count:
+            return
+        prefetched = self.playback_engine.prefetcher.take(frame_idx)
+        self.set_frame(frame_idx, prefetched=prefetched)
     
-    def set_frame(self, frame_idx: int):
-        """Set current frame"""
+    def _on_playback_finished(self):
+        """End of pattern: rewind and stop, as a single pass"""
+        self.set_frame(0)
+        self.pause()
+    
+    def set_frame(self, frame_idx: int, lazy_loader=None, prefetched: Frame = None):
+        """Set current frame
+        
+        Args:
+            frame_idx: Frame index
+            lazy_loader: Optional LazyFrameLoader for large patterns
+            prefetched: Display-ready frame produced ahead of time by the playback engine
+        """
         if not self.pattern:
             return
         
         self.current_frame = max(0, min(frame_idx, self.pattern.frame_count - 1))
+        if self.current_frame != self.playback_engine.current_frame:
+            # Scrubbing (or a reload) moves the playhead; playback continues from here
+            self.playback_engine.seek(self.current_frame)
         
         # Update display
-        self.led_display.set_frame(self.current_frame)
+        self.led_display.set_frame(self.current_frame, lazy_loader=lazy_loader, prefetched=prefetched)
         
         # Update controls
         self.frame_spin.blockSignals(True)
@@ -683,6 +758,14 @@ class LEDDisplayWidget(QWidget):
         self._grid_light_color = QColor("#c8c8c8")
         self._grid_dark_color = QColor("#646464")
         self._number_color = QColor("#111111")
+        self.layer_manager = None
+        self._prefetched = None
+        
+        # Image-backed paint path with per-layout geometry caches
+        self.fast_render = NUMPY_AVAILABLE
+        self._render_cache = LEDRenderCache()
+        self._geometry_cache: Dict[tuple, tuple] = {}
+        self.last_paint_ms = 0.0
         
         # Set minimum size
         self.setMinimumSize(400, 300)
@@ -702,14 +785,22 @@ class LEDDisplayWidget(QWidget):
         self.detected_layout = detected_layout
         self.layer_manager = layer_manager
         self.current_frame = 0
+        self._prefetched = None
         self.update()
     
-    def set_frame(self, frame_idx: int, lazy_loader=None):
-        """Set current frame with optional lazy loading support"""
+    def set_frame(self, frame_idx: int, lazy_loader=None, prefetched: Frame = None):
+        """Set current frame with optional lazy loading support
+        
+        Args:
+            frame_idx: Frame index
+            lazy_loader: Optional LazyFrameLoader for large patterns
+            prefetched: Composite frame already rendered for this index
+        """
         if not self.pattern:
             return
         
         self.current_frame = max(0, min(frame_idx, self.pattern.frame_count - 1))
+        self._prefetched = (self.current_frame, prefetched) if prefetched is not None else None
         
         # If lazy loader is provided, use it to load frame on-demand
         if lazy_loader and hasattr(self, 'pattern'):
@@ -795,7 +886,16 @@ class LEDDisplayWidget(QWidget):
         if not self.pattern or not self.pattern.frames:
             return
         
+        paint_start = time.perf_counter()
         painter = QPainter(self)
+        try:
+            self._paint_frame(painter)
+        finally:
+            painter.end()
+        self.last_paint_ms = (time.perf_counter() - paint_start) * 1000.0
+    
+    def _paint_frame(self, painter: QPainter):
+        """Paint the current frame with the active display mode"""
         painter.setRenderHint(QPainter.Antialiasing)
         
         # Fill background with theme-aware color
@@ -805,22 +905,9 @@ class LEDDisplayWidget(QWidget):
         if self.current_frame >= len(self.pattern.frames):
             return
         
-        frame = self.pattern.frames[self.current_frame]
-        
-        # Get composite pixels with animations if layer_manager is available
-        pixels_to_use = None
-        if self.layer_manager:
-            try:
-                composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                if composite and len(composite) == len(frame.pixels):
-                    pixels_to_use = composite
-            except Exception:
-                # Fallback to frame.pixels if composite fails
-                pass
-        
-        # Use composite pixels if available, otherwise use frame.pixels
-        if pixels_to_use is None:
-            pixels_to_use = frame.pixels
+        # Composite pixels (with animations) are fetched once per repaint
+        frame = self._composite_frame(self.pattern.frames[self.current_frame])
+        pixels_to_use = frame.pixels
         
         width, height = self._current_dimensions()
         if width == 0 or height == 0:
@@ -914,18 +1001,82 @@ class LEDDisplayWidget(QWidget):
                         painter.drawText(led_x + 2, led_y + led_height - 2, str(led_idx))
         else:
             metadata = self.pattern.metadata if self.pattern and hasattr(self.pattern, 'metadata') else None
-            # Get composite pixels for matrix painting
-            pixels_to_use = frame.pixels
-            if self.layer_manager:
-                try:
-                    composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                    if composite and len(composite) == len(frame.pixels):
-                        pixels_to_use = composite
-                except Exception:
-                    pass
-            # Create a temporary frame with composite pixels for matrix painting
-            temp_frame = Frame(pixels=list(pixels_to_use), duration_ms=frame.duration_ms)
-            self._paint_matrix(painter, temp_frame, width, height, led_width, led_height, self.rect(), metadata=metadata)
+            self._paint_matrix(painter, frame, width, height, led_width, led_height, self.rect(), metadata=metadata)
+    
+    def _composite_frame(self, frame: Frame) -> Frame:
+        """Return the current frame with layer composite pixels (animations) applied"""
+        if self._prefetched is not None and self._prefetched[0] == self.current_frame:
+            return self._prefetched[1]
+        return self.composite_frame(frame, self.current_frame)
+    
+    def composite_frame(self, frame: Frame, frame_idx: int) -> Frame:
+        """Return a frame with layer composite pixels (animations) applied"""
+        if self.layer_manager:
+            try:
+                composite = self.layer_manager.get_composite_pixels(frame_idx)
+                if composite and len(composite) == len(frame.pixels):
+                    return Frame(pixels=composite, duration_ms=frame.duration_ms)
+            except Exception:
+                # Fallback to frame.pixels if composite fails
+                pass
+        return frame
+    
+    def _layout_signature(self, metadata) -> tuple:
+        """Hashable summary of the metadata fields that shape the preview geometry"""
+        if metadata is None:
+            return ()
+        return tuple(repr(getattr(metadata, name, None)) for name in _LAYOUT_FIELDS)
+    
+    def _color_key(self) -> tuple:
+        """Theme colours baked into cached overlays"""
+        return (self._cell_border_color.rgba(), self._grid_light_color.rgba(),
+                self._grid_dark_color.rgba())
+    
+    def _point_geometry(self, key: tuple, builder):
+        """
+        Get cached LED geometry for a point layout
+        
+        Returns:
+            Tuple of (positions relative to the rect, source pixel indices, labels)
+        """
+        geometry = self._geometry_cache.get(key)
+        if geometry is None:
+            if len(self._geometry_cache) >= 8:
+                self._geometry_cache.clear()
+            geometry = builder()
+            self._geometry_cache[key] = geometry
+        return geometry
+    
+    def _paint_points(self, painter: QPainter, key: tuple, rect, builder, pixels, pixel_size: int,
+                      label_background: bool = True):
+        """Paint LEDs as discs using cached geometry (image-backed when available)"""
+        positions, sources, labels = self._point_geometry(key, builder)
+        if self.fast_render:
+            layout = self._render_cache.point_layout(
+                key, (rect.width(), rect.height()), positions, sources,
+                pixel_size, self._cell_border_color, labels)
+            self._render_cache.paint_points(painter, layout, pixels, rect.x(), rect.y())
+            return
+        
+        count = len(pixels)
+        for (px, py), src, idx in zip(positions, sources, range(len(positions))):
+            r, g, b = pixels[src] if 0 <= src < count else (0, 0, 0)
+            x = rect.x() + int(px) - pixel_size // 2
+            y = rect.y() + int(py) - pixel_size // 2
+            painter.setBrush(QBrush(QColor(r, g, b)))
+            painter.setPen(QPen(self._cell_border_color, 1))
+            painter.drawEllipse(x, y, pixel_size, pixel_size)
+            
+            # Draw LED index if enabled
+            if labels and pixel_size > 12:
+                painter.setPen(QPen(Qt.white, 1))
+                font = QFont()
+                font.setPointSize(max(6, pixel_size // 4))
+                painter.setFont(font)
+                if label_background:
+                    text_rect = painter.boundingRect(x, y, pixel_size, pixel_size, Qt.AlignCenter, labels[idx])
+                    painter.fillRect(text_rect, QColor(0, 0, 0, 180))
+                painter.drawText(x, y, pixel_size, pixel_size, Qt.AlignCenter, labels[idx])
     
     def sizeHint(self):
         """Return preferred size"""
@@ -954,15 +1105,7 @@ class LEDDisplayWidget(QWidget):
         Args:
             metadata: Optional PatternMetadata for irregular shape support
         """
-        # Get composite pixels with animations if layer_manager is available
         pixels_to_use = frame.pixels
-        if self.layer_manager:
-            try:
-                composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                if composite and len(composite) == len(frame.pixels):
-                    pixels_to_use = composite
-            except Exception:
-                pass
         
         # Compute centering based on rect
         total_w = width * led_w
@@ -975,6 +1118,36 @@ class LEDDisplayWidget(QWidget):
                        getattr(metadata, 'irregular_shape_enabled', False) and
                        getattr(metadata, 'layout_type', 'rectangular') == 'irregular')
         
+        if self.fast_render and led_w > 0 and led_h > 0:
+            # Image-backed path: one scaled blit plus a cached overlay per layout
+            key = ("matrix", width, height, led_w, led_h, bool(is_irregular), self.show_grid,
+                   self.grid_style, self.show_numbers, self.show_path, self.show_din,
+                   self.wiring_mode, self.data_in_corner, self._color_key(),
+                   self._layout_signature(metadata) if is_irregular else ())
+            
+            layout = self._render_cache.get(key)
+            if layout is None:
+                active_cells = None
+                if is_irregular:
+                    from core.mapping.irregular_shape_mapper import IrregularShapeMapper
+                    active_cells = [(x, y) for y in range(height) for x in range(width)
+                                    if IrregularShapeMapper.is_cell_active(x, y, metadata)]
+                if self.show_grid:
+                    line_color = self._grid_light_color if self.grid_style == "Light Grid" else self._grid_dark_color
+                else:
+                    line_color = self._cell_border_color
+                path = self._compute_display_path(width, height) if self.show_path else None
+                if path and active_cells is not None:
+                    active_set = set(active_cells)
+                    path = [cell for cell in path if cell in active_set]
+                layout = self._render_cache.matrix_layout(
+                    key, width, height, led_w, led_h, line_color, active_cells=active_cells,
+                    path=path, show_din=self.show_din, din_border_color=self._cell_border_color,
+                    show_numbers=self.show_numbers)
+            
+            self._render_cache.paint_matrix(painter, layout, pixels_to_use, start_x, start_y)
+            return
+        
         # LAYER 1 + 2: Draw base matrix with design pixels
         # Simple sequential mapping: cell index = y * width + x
         for y in range(height):
@@ -1069,40 +1242,29 @@ class LEDDisplayWidget(QWidget):
 
     def _paint_circle(self, painter: QPainter, frame: Frame, width: int, height: int, rect=None, *, inner_ratio: float = 0.0):
         """Render the pattern as concentric rings to approximate circular matrices."""
-        # Get composite pixels with animations if layer_manager is available
-        pixels_to_use = frame.pixels
-        if self.layer_manager:
-            try:
-                composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                if composite and len(composite) == len(frame.pixels):
-                    pixels_to_use = composite
-            except Exception:
-                pass
-        
         rect = rect or self.rect()
         outer_radius = min(rect.width(), rect.height()) / 2 - 16
         if outer_radius <= 0:
             return
-        inner_radius = max(0.0, outer_radius * inner_ratio)
-        radius_steps = max(1, height - 1)
-        radius_delta = (outer_radius - inner_radius) / radius_steps if radius_steps else 0
         pixel_size = max(4, int(self.led_size * self.zoom_factor * 0.8))
-        center_x = rect.x() + rect.width() / 2
-        center_y = rect.y() + rect.height() / 2
-
-        for row in range(height):
-            radius = inner_radius + radius_delta * row
-            for col in range(width):
-                idx = row * width + col
-                if idx >= len(pixels_to_use):
-                    continue
-                angle = -pi / 2 + (2 * pi) * (col / max(1, width))
-                x = center_x + radius * cos(angle)
-                y = center_y + radius * sin(angle)
-                r_val, g_val, b_val = pixels_to_use[idx]
-                painter.setBrush(QBrush(QColor(r_val, g_val, b_val)))
-                painter.setPen(QPen(self._cell_border_color, 1))
-                painter.drawEllipse(int(x) - pixel_size // 2, int(y) - pixel_size // 2, pixel_size, pixel_size)
+        
+        def build():
+            inner_radius = max(0.0, outer_radius * inner_ratio)
+            radius_steps = max(1, height - 1)
+            radius_delta = (outer_radius - inner_radius) / radius_steps if radius_steps else 0
+            center_x = rect.width() / 2
+            center_y = rect.height() / 2
+            positions, sources = [], []
+            for row in range(height):
+                radius = inner_radius + radius_delta * row
+                for col in range(width):
+                    angle = -pi / 2 + (2 * pi) * (col / max(1, width))
+                    positions.append((center_x + radius * cos(angle), center_y + radius * sin(angle)))
+                    sources.append(row * width + col)
+            return positions, sources, None
+        
+        key = ("circle", rect.width(), rect.height(), width, height, inner_ratio, pixel_size, self._color_key())
+        self._paint_points(painter, key, rect, build, frame.pixels, pixel_size)
 
     def _paint_ring(self, painter: QPainter, frame: Frame, width: int, height: int, rect=None):
         """Draw hollow ring preview (useful for circular LED strips)."""
@@ -1110,40 +1272,29 @@ class LEDDisplayWidget(QWidget):
 
     def _paint_radial(self, painter: QPainter, frame: Frame, width: int, height: int, rect=None):
         """Render semi-circular previews for arc / fan layouts."""
-        # Get composite pixels with animations if layer_manager is available
-        pixels_to_use = frame.pixels
-        if self.layer_manager:
-            try:
-                composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                if composite and len(composite) == len(frame.pixels):
-                    pixels_to_use = composite
-            except Exception:
-                pass
-        
         rect = rect or self.rect()
         outer_radius = min(rect.width() / 2, rect.height()) - 24
         if outer_radius <= 0:
             return
-        inner_radius = outer_radius * 0.15
-        radius_steps = max(1, height - 1)
-        radius_delta = (outer_radius - inner_radius) / radius_steps if radius_steps else 0
         pixel_size = max(4, int(self.led_size * self.zoom_factor * 0.8))
-        center_x = rect.x() + rect.width() / 2
-        center_y = rect.bottom() - 12  # anchor at bottom to mimic physical mounts
-
-        for row in range(height):
-            radius = inner_radius + radius_delta * row
-            for col in range(width):
-                idx = row * width + col
-                if idx >= len(pixels_to_use):
-                    continue
-                angle = pi + (pi * (col / max(1, width)))  # sweep 180°
-                x = center_x + radius * cos(angle)
-                y = center_y + radius * sin(angle)
-                r_val, g_val, b_val = pixels_to_use[idx]
-                painter.setBrush(QBrush(QColor(r_val, g_val, b_val)))
-                painter.setPen(QPen(self._cell_border_color, 1))
-                painter.drawEllipse(int(x) - pixel_size // 2, int(y) - pixel_size // 2, pixel_size, pixel_size)
+        
+        def build():
+            inner_radius = outer_radius * 0.15
+            radius_steps = max(1, height - 1)
+            radius_delta = (outer_radius - inner_radius) / radius_steps if radius_steps else 0
+            center_x = rect.width() / 2
+            center_y = rect.height() - 1 - 12  # anchor at bottom to mimic physical mounts
+            positions, sources = [], []
+            for row in range(height):
+                radius = inner_radius + radius_delta * row
+                for col in range(width):
+                    angle = pi + (pi * (col / max(1, width)))  # sweep 180°
+                    positions.append((center_x + radius * cos(angle), center_y + radius * sin(angle)))
+                    sources.append(row * width + col)
+            return positions, sources, None
+        
+        key = ("radial", rect.width(), rect.height(), width, height, pixel_size, self._color_key())
+        self._paint_points(painter, key, rect, build, frame.pixels, pixel_size)
     
     def _paint_circular_layout(self, painter: QPainter, frame: Frame, metadata: PatternMetadata, rect):
         """
@@ -1161,85 +1312,57 @@ class LEDDisplayWidget(QWidget):
         This follows the "lens, not new world" philosophy - the grid is primary,
         circular layout is an interpretation layer.
         
+        LED positions and the grid index feeding each LED are computed once per
+        layout (metadata geometry, rect size, LED size) and reused across frames.
+        
         Args:
             painter: QPainter instance
             frame: Frame with pixel data (grid-based)
             metadata: PatternMetadata with circular layout configuration
             rect: Drawing rectangle
         """
+        pixel_size = max(4, int(self.led_size * self.zoom_factor * 0.8))
+        key = ("circular", rect.width(), rect.height(), pixel_size, self.show_numbers,
+               self._color_key(), self._layout_signature(metadata))
+        
         # Handle radial layout type (LMS-style: rows = circles, cols = LEDs per circle)
         if metadata.layout_type == "radial":
-            # Use row/column interpretation (LMS-style)
-            num_circles = metadata.height
-            leds_per_circle = metadata.width
-            
-            # Calculate display parameters
-            pixel_size = max(4, int(self.led_size * self.zoom_factor * 0.8))
-            center_x = rect.x() + rect.width() / 2
-            center_y = rect.y() + rect.height() / 2
-            
-            # Calculate radius range
-            outer_radius = min(rect.width(), rect.height()) / 2 - 16
-            inner_radius = outer_radius * 0.15
-            radius_delta = (outer_radius - inner_radius) / max(1, num_circles - 1) if num_circles > 1 else 0
-            
-            # Render concentric circles
-            for row in range(num_circles):
-                # Calculate radius for this circle
-                radius = inner_radius + radius_delta * row
+            def build_radial():
+                # Use row/column interpretation (LMS-style)
+                num_circles = metadata.height
+                leds_per_circle = metadata.width
+                center_x = rect.width() / 2
+                center_y = rect.height() / 2
                 
-                # Render LEDs around this circle
-                for col in range(leds_per_circle):
-                    # Calculate angle for this LED position
-                    angle = 2 * pi * (col / max(1, leds_per_circle))
-                    
-                    # Calculate LED position
-                    x = center_x + radius * cos(angle)
-                    y = center_y + radius * sin(angle)
-                    
-                    # Get composite pixels with animations if layer_manager is available
-                    pixels_to_use = frame.pixels
-                    if self.layer_manager:
-                        try:
-                            composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                            if composite and len(composite) == len(frame.pixels):
-                                pixels_to_use = composite
-                        except Exception:
-                            pass
-                    
-                    # Read pixel color directly from grid (row/column interpretation)
-                    grid_idx = row * metadata.width + col
-                    if grid_idx < len(pixels_to_use):
-                        r, g, b = pixels_to_use[grid_idx]
-                    else:
-                        r, g, b = (0, 0, 0)
-                    
-                    # Draw LED
-                    color = QColor(r, g, b)
-                    painter.setBrush(QBrush(color))
-                    painter.setPen(QPen(self._cell_border_color, 1))
-                    painter.drawEllipse(int(x) - pixel_size // 2, int(y) - pixel_size // 2, pixel_size, pixel_size)
-                    
-                    # Draw LED index if enabled
-                    if self.show_numbers and pixel_size > 12:
-                        painter.setPen(QPen(Qt.white, 1))
-                        font = QFont()
-                        font.setPointSize(max(6, pixel_size // 4))
-                        painter.setFont(font)
-                        led_num = row * leds_per_circle + col
-                        painter.drawText(int(x) - pixel_size // 2, int(y) - pixel_size // 2, 
-                                        pixel_size, pixel_size, Qt.AlignCenter, str(led_num))
+                # Calculate radius range
+                outer_radius = min(rect.width(), rect.height()) / 2 - 16
+                inner_radius = outer_radius * 0.15
+                radius_delta = (outer_radius - inner_radius) / max(1, num_circles - 1) if num_circles > 1 else 0
+                
+                positions, sources, labels = [], [], []
+                for row in range(num_circles):
+                    radius = inner_radius + radius_delta * row
+                    for col in range(leds_per_circle):
+                        angle = 2 * pi * (col / max(1, leds_per_circle))
+                        positions.append((center_x + radius * cos(angle), center_y + radius * sin(angle)))
+                        # Read pixel color directly from grid (row/column interpretation)
+                        sources.append(row * metadata.width + col)
+                        labels.append(str(row * leds_per_circle + col))
+                return positions, sources, labels if self.show_numbers else None
             
+            self._paint_points(painter, key, rect, build_radial, frame.pixels, pixel_size,
+                               label_background=False)
             return
         
-        # Ensure mapping table exists and is up-to-date (regenerate to pick up any logic changes)
-        # This handles edge cases like loading old patterns or mapping logic updates
-        try:
-            # Force regeneration to ensure we have the latest mapping logic
-            metadata.circular_mapping_table = CircularMapper.generate_mapping_table(metadata)
-        except Exception as e:
-            import logging
-            logging.warning(f"Failed to regenerate mapping table: {e}")
+        # Ensure mapping table exists and is up-to-date (regenerate to pick up any logic changes).
+        # This handles edge cases like loading old patterns or mapping logic updates; it runs
+        # once per layout rather than on every repaint.
+        if key not in self._geometry_cache:
+            try:
+                metadata.circular_mapping_table = CircularMapper.generate_mapping_table(metadata)
+            except Exception as e:
+                import logging
+                logging.warning(f"Failed to regenerate mapping table: {e}")
         
         if not CircularMapper.ensure_mapping_table(metadata):
             # Fallback to matrix rendering if mapping generation fails
@@ -1254,86 +1377,51 @@ class LEDDisplayWidget(QWidget):
                              int(self.led_size * self.zoom_factor), rect, metadata=metadata)
             return
         
-        # Calculate display parameters
-        led_count = metadata.circular_led_count or len(metadata.circular_mapping_table)
-        pixel_size = max(4, int(self.led_size * self.zoom_factor * 0.8))
-        
-        # Calculate center and radius
-        center_x = rect.x() + rect.width() / 2
-        center_y = rect.y() + rect.height() / 2
-        max_radius = min(rect.width(), rect.height()) / 2 - 16
-        
-        # Use generate_led_positions_for_preview for proper ray-based rendering of circular/ring layouts
-        # This handles the row/column interpretation correctly (top row = outer circle, bottom row = inner circle)
-        led_positions = CircularMapper.generate_led_positions_for_preview(
-            metadata=metadata,
-            center_x=center_x,
-            center_y=center_y,
-            max_radius=max_radius
-        )
-        
-        # Draw each LED in index order (0 → N-1)
-        # This matches the physical wiring order
-        for led_idx in range(led_count):
-            if led_idx >= len(metadata.circular_mapping_table):
-                # Missing mapping - skip this LED
-                continue
-            
-            # CRITICAL: Use mapping table to get grid coordinate (single source of truth)
-            grid_pos = metadata.circular_mapping_table[led_idx]
-            if grid_pos is None:
-                continue
+        def build_mapped():
+            # Calculate display parameters
+            led_count = metadata.circular_led_count or len(metadata.circular_mapping_table)
+            center_x = rect.width() / 2
+            center_y = rect.height() / 2
+            max_radius = min(rect.width(), rect.height()) / 2 - 16
             
-            grid_x, grid_y = grid_pos
+            # Preview positions give proper ray-based rendering of circular/ring layouts
+            # This handles the row/column interpretation correctly (top row = outer circle, bottom row = inner circle)
+            # The shared layout index memoizes them per layout and geometry
+            index = CircularLayoutIndex.for_metadata(metadata)
+            led_positions = index.preview_positions(metadata, center_x, center_y, max_radius)
             
-            # Get composite pixels with animations if layer_manager is available
-            pixels_to_use = frame.pixels
-            if self.layer_manager:
-                try:
-                    composite = self.layer_manager.get_composite_pixels(self.current_frame)
-                    if composite and len(composite) == len(frame.pixels):
-                        pixels_to_use = composite
-                except Exception:
-                    pass
-            
-            # Get pixel color from grid using mapping table lookup
-            # This is the key: we read from grid, not from live calculations
-            if 0 <= grid_y < metadata.height and 0 <= grid_x < metadata.width:
-                grid_idx = grid_y * metadata.width + grid_x
-                if grid_idx < len(pixels_to_use):
-                    r, g, b = pixels_to_use[grid_idx]
+            # LEDs in index order (0 → N-1), matching the physical wiring order
+            positions, sources, labels = [], [], []
+            for led_idx in range(led_count):
+                if led_idx >= len(metadata.circular_mapping_table):
+                    # Missing mapping - skip this LED
+                    continue
+                
+                # CRITICAL: Use mapping table to get grid coordinate (single source of truth)
+                grid_pos = metadata.circular_mapping_table[led_idx]
+                if grid_pos is None:
+                    continue
+                
+                grid_x, grid_y = grid_pos
+                
+                # Pixel color comes from the grid via the mapping table lookup
+                if 0 <= grid_y < metadata.height and 0 <= grid_x < metadata.width:
+                    sources.append(grid_y * metadata.width + grid_x)
                 else:
-                    r, g, b = (0, 0, 0)
-            else:
-                r, g, b = (0, 0, 0)
-            
-            # Get LED position from preview generation (handles ray-based layouts correctly)
-            if led_idx < len(led_positions):
-                x, y = led_positions[led_idx]
-            else:
-                # Fallback: simple circular arrangement if positions not available
-                angle = 2 * pi * (led_idx / led_count) if led_count > 0 else 0
-                radius = max_radius * 0.8
-                x = center_x + radius * cos(angle)
-                y = center_y + radius * sin(angle)
-            
-            # Draw LED
-            color = QColor(r, g, b)
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(self._cell_border_color, 1))
-            painter.drawEllipse(int(x) - pixel_size // 2, int(y) - pixel_size // 2, pixel_size, pixel_size)
-            
-            # Draw LED index if enabled
-            if self.show_numbers and pixel_size > 12:
-                painter.setPen(QPen(Qt.white, 1))
-                font = QFont()
-                font.setPointSize(max(6, pixel_size // 4))
-                painter.setFont(font)
-                text_rect = painter.boundingRect(int(x) - pixel_size // 2, int(y) - pixel_size // 2, 
-                                                pixel_size, pixel_size, Qt.AlignCenter, str(led_idx))
-                painter.fillRect(text_rect, QColor(0, 0, 0, 180))
-                painter.drawText(int(x) - pixel_size // 2, int(y) - pixel_size // 2, 
-                               pixel_size, pixel_size, Qt.AlignCenter, str(led_idx))
+                    sources.append(-1)
+                
+                # Get LED position from preview generation (handles ray-based layouts correctly)
+                if led_idx < len(led_positions):
+                    positions.append(led_positions[led_idx])
+                else:
+                    # Fallback: simple circular arrangement if positions not available
+                    angle = 2 * pi * (led_idx / led_count) if led_count > 0 else 0
+                    radius = max_radius * 0.8
+                    positions.append((center_x + radius * cos(angle), center_y + radius * sin(angle)))
+                labels.append(str(led_idx))
+            return positions, sources, labels if self.show_numbers else None
+        
+        self._paint_points(painter, key, rect, build_mapped, frame.pixels, pixel_size)
 
     def _compute_display_path(self, w: int, h: int):
         """
@@ -0,0 +1,339 @@
+"""
+LED Render Cache - Image-backed fast paint path for LED previews.
+
+Drawing every LED with its own antialiased QPainter call costs tens of
+milliseconds on large matrices. This module converts a frame buffer into a
+QImage in one bulk copy and composites it with geometry that is built once
+per layout:
+
+- Matrix layouts: the W x H frame image is blitted scaled (nearest
+  neighbour) into the cell area, then a cached overlay pixmap with cell
+  borders, grid, numbers and the wiring path is drawn on top.
+- Point layouts (circle, ring, radial, circular mappings): a label map
+  assigns every screen pixel to an LED slot (or background). Each frame is
+  a single numpy gather of the LED colours through that map, followed by a
+  cached antialiased outline overlay stamped from one LED sprite.
+
+A frame therefore costs a constant number of QPainter calls regardless of
+LED count.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import Qt, QLine, QPointF, QRect
+from PySide6.QtGui import QBrush, QColor, QFont, QImage, QPainter, QPen, QPixmap
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+RGB = Tuple[int, int, int]
+
+# Layouts kept before the cache is cleared (resizes create new keys)
+MAX_CACHED_LAYOUTS = 8
+
+# Byte positions of R, G, B and A in a native 32-bit ARGB pixel
+if sys.byteorder == "little":
+    _RGB, _ALPHA = [2, 1, 0], 3
+else:
+    _RGB, _ALPHA = [1, 2, 3], 0
+
+
+def pixels_to_array(pixels: Sequence[RGB], count: int) -> "np.ndarray":
+    """
+    Convert a pixel list to a (count, 3) uint8 array.
+
+    Short buffers are padded with black; longer buffers are truncated.
+    """
+    if count <= 0:
+        return np.zeros((0, 3), dtype=np.uint8)
+    if isinstance(pixels, np.ndarray):
+        arr = pixels.reshape(-1, pixels.shape[-1])[:, :3].astype(np.uint8, copy=False)
+    elif pixels:
+        arr = np.asarray(pixels, dtype=np.uint8).reshape(-1, 3)
+    else:
+        arr = np.zeros((0, 3), dtype=np.uint8)
+    if len(arr) >= count:
+        return arr[:count]
+    padded = np.zeros((count, 3), dtype=np.uint8)
+    padded[:len(arr)] = arr
+    return padded
+
+
+def pixels_to_qimage(pixels: Sequence[RGB], width: int, height: int,
+                     alpha: Optional["np.ndarray"] = None) -> QImage:
+    """
+    Build a width x height QImage from row-major pixels in one bulk copy.
+
+    Args:
+        pixels: Row-major RGB tuples
+        width: Image width
+        height: Image height
+        alpha: Optional (height, width) uint8 alpha mask (0 hides a cell)
+
+    Returns:
+        QImage that owns its pixel buffer
+    """
+    rgb = pixels_to_array(pixels, width * height).reshape(height, width, 3)
+    if alpha is None:
+        data = np.ascontiguousarray(rgb)
+        image = QImage(data.data, width, height, width * 3, QImage.Format_RGB888)
+    else:
+        data = np.empty((height, width, 4), dtype=np.uint8)
+        data[..., :3] = rgb
+        data[..., 3] = alpha
+        image = QImage(data.data, width, height, width * 4, QImage.Format_RGBA8888)
+    # Detach from the numpy buffer before it goes out of scope
+    return image.copy()
+
+
+@dataclass
+class MatrixRenderLayout:
+    """Precomputed geometry for a W x H cell matrix"""
+    width: int
+    height: int
+    led_w: int
+    led_h: int
+    alpha: Optional["np.ndarray"]  # (height, width) uint8, None when all cells are active
+    overlay: QPixmap  # Borders, grid, numbers and wiring path
+
+
+@dataclass
+class PointRenderLayout:
+    """Precomputed geometry for LEDs drawn as discs at arbitrary positions"""
+    offset: Tuple[int, int]  # Top-left of the LED bounding box within the rect
+    size: Tuple[int, int]
+    label: "np.ndarray"  # (height, width) int32; 0 = background, i + 1 = LED slot i
+    sources: "np.ndarray"  # (slots,) int64 pixel index per slot, -1 for black
+    overlay: QPixmap  # Antialiased outlines and numbers
+    positions: List[Tuple[float, float]] = field(default_factory=list)
+
+
+class LEDRenderCache:
+    """
+    Per-widget cache of layout geometry for the image-backed paint path.
+
+    Layouts are looked up by a caller-supplied hashable key that must cover
+    everything that affects geometry or overlays (dimensions, rect size,
+    LED size, colours, wiring settings). Frame content is never part of
+    the key.
+    """
+
+    def __init__(self, max_layouts: int = MAX_CACHED_LAYOUTS):
+        self.max_layouts = max_layouts
+        self._layouts: Dict[Hashable, object] = {}
+        self.builds = 0
+
+    def clear(self) -> None:
+        """Drop all cached layouts"""
+        self._layouts.clear()
+
+    def get(self, key: Hashable):
+        """Return a cached layout, or None"""
+        return self._layouts.get(key)
+
+    def _get(self, key: Hashable, factory: Callable[[], object]):
+        layout = self._layouts.get(key)
+        if layout is None:
+            if len(self._layouts) >= self.max_layouts:
+                self._layouts.clear()
+            layout = factory()
+            self._layouts[key] = layout
+            self.builds += 1
+        return layout
+
+    # Matrix layouts
+
+    def matrix_layout(self, key: Hashable, width: int, height: int, led_w: int, led_h: int,
+                      line_color: QColor, active_cells: Optional[Sequence[Tuple[int, int]]] = None,
+                      path: Optional[Sequence[Tuple[int, int]]] = None, show_din: bool = False,
+                      din_border_color: Optional[QColor] = None, show_numbers: bool = False) -> MatrixRenderLayout:
+        """Get or build the geometry for a cell matrix"""
+        return self._get(key, lambda: self._build_matrix_layout(
+            width, height, led_w, led_h, line_color, active_cells, path, show_din,
+            din_border_color or line_color, show_numbers))
+
+    def _build_matrix_layout(self, width, height, led_w, led_h, line_color, active_cells,
+                             path, show_din, din_border_color, show_numbers) -> MatrixRenderLayout:
+        alpha = None
+        active = None
+        if active_cells is not None:
+            active = set(active_cells)
+            alpha = np.zeros((height, width), dtype=np.uint8)
+            for x, y in active:
+                if 0 <= x < width and 0 <= y < height:
+                    alpha[y, x] = 255
+
+        overlay = QPixmap(width * led_w + 1, height * led_h + 1)
+        overlay.fill(Qt.transparent)
+        painter = QPainter(overlay)
+        try:
+            painter.setPen(QPen(line_color, 1))
+            painter.setBrush(Qt.NoBrush)
+            # Batched calls: one per primitive type, not one per cell
+            if active is None:
+                lines = [QLine(x * led_w, 0, x * led_w, height * led_h) for x in range(width + 1)]
+                lines += [QLine(0, y * led_h, width * led_w, y * led_h) for y in range(height + 1)]
+                painter.drawLines(lines)
+            elif active:
+                painter.drawRects([QRect(x * led_w, y * led_h, led_w, led_h) for x, y in active])
+
+            if show_numbers and led_w > 12:
+                font = QFont()
+                font.setPointSize(max(6, led_w // 4))
+                painter.setFont(font)
+                painter.setPen(QPen(Qt.white, 1))
+                for y in range(height):
+                    for x in range(width):
+                        if active is not None and (x, y) not in active:
+                            continue
+                        text = str(y * width + x)
+                        text_rect = painter.boundingRect(x * led_w, y * led_h, led_w, led_h, Qt.AlignCenter, text)
+                        painter.fillRect(text_rect, QColor(0, 0, 0, 180))
+                        painter.drawText(x * led_w, y * led_h, led_w, led_h, Qt.AlignCenter, text)
+
+            if path:
+                painter.setRenderHint(QPainter.Antialiasing)
+                centers = [QPointF(x * led_w + led_w // 2, y * led_h + led_h // 2) for (x, y) in path]
+                painter.setPen(QPen(QColor(255, 0, 0, 160), 2))
+                painter.drawPolyline(centers)
+                if show_din:
+                    scx, scy = int(centers[0].x()), int(centers[0].y())
+                    size = max(6, min(led_w, led_h) // 2)
+                    painter.setBrush(QBrush(QColor(0, 200, 0)))
+                    painter.setPen(QPen(din_border_color, 1))
+                    painter.drawEllipse(scx - size // 2, scy - size // 2, size, size)
+                    painter.setPen(QPen(QColor(0, 200, 0)))
+                    painter.drawText(scx + size // 2 + 3, scy, "DIN")
+        finally:
+            painter.end()
+
+        return MatrixRenderLayout(width, height, led_w, led_h, alpha, overlay)
+
+    def paint_matrix(self, painter: QPainter, layout: MatrixRenderLayout, pixels: Sequence[RGB],
+                     start_x: int, start_y: int) -> None:
+        """Blit one frame into a matrix layout at (start_x, start_y)"""
+        image = pixels_to_qimage(pixels, layout.width, layout.height, layout.alpha)
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+        target = QRect(start_x, start_y, layout.width * layout.led_w, layout.height * layout.led_h)
+        painter.drawImage(target, image)
+        painter.drawPixmap(start_x, start_y, layout.overlay)
+        painter.restore()
+
+    # Point layouts
+
+    def point_layout(self, key: Hashable, size: Tuple[int, int],
+                     positions: Sequence[Tuple[float, float]], sources: Sequence[int],
+                     pixel_size: int, border_color: QColor,
+                     labels: Optional[Sequence[str]] = None) -> PointRenderLayout:
+        """
+        Get or build the geometry for LEDs drawn as discs
+
+        Args:
+            key: Cache key
+            size: (width, height) of the target rect
+            positions: LED centres relative to the rect origin
+            sources: Pixel index feeding each LED (-1 for black)
+            pixel_size: Disc diameter
+            border_color: Outline colour
+            labels: Optional text drawn on each LED
+        """
+        return self._get(key, lambda: self._build_point_layout(
+            size, positions, sources, pixel_size, border_color, labels))
+
+    def _build_point_layout(self, size, positions, sources, pixel_size, border_color, labels) -> PointRenderLayout:
+        # LED sprite matching drawEllipse(x - d//2, y - d//2, d, d): a filled
+        # disc for the label map and an antialiased 1px ring for the outline
+        d = max(1, int(pixel_size))
+        yy, xx = np.mgrid[0:d, 0:d]
+        radius = d / 2.0
+        dist = np.hypot(xx + 0.5 - radius, yy + 0.5 - radius)
+        disc = dist <= radius
+        ring = (np.clip(1.0 - np.abs(dist - (radius - 0.5)), 0.0, 1.0) * 255).astype(np.uint8)
+
+        # Only the bounding box of the LEDs (clipped to the rect) is stored and blitted
+        rect_w, rect_h = max(1, int(size[0])), max(1, int(size[1]))
+        if positions:
+            xs = [int(px) - d // 2 for px, _ in positions]
+            ys = [int(py) - d // 2 for _, py in positions]
+            left, top = max(0, min(xs)), max(0, min(ys))
+            right, bottom = min(rect_w, max(xs) + d), min(rect_h, max(ys) + d)
+        else:
+            left = top = 0
+            right = bottom = 1
+        width, height = max(1, right - left), max(1, bottom - top)
+        label = np.zeros((height, width), dtype=np.int32)
+        outline = np.zeros((height, width), dtype=np.uint8)
+
+        for slot, (px, py) in enumerate(positions):
+            x0 = int(px) - d // 2 - left
+            y0 = int(py) - d // 2 - top
+            sx0, sy0 = max(0, -x0), max(0, -y0)
+            sx1, sy1 = min(d, width - x0), min(d, height - y0)
+            if sx0 >= sx1 or sy0 >= sy1:
+                continue
+            rows = slice(y0 + sy0, y0 + sy1)
+            cols = slice(x0 + sx0, x0 + sx1)
+            label[rows, cols][disc[sy0:sy1, sx0:sx1]] = slot + 1
+            np.maximum(outline[rows, cols], ring[sy0:sy1, sx0:sx1], out=outline[rows, cols])
+
+        rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        rgba[..., 0] = border_color.red()
+        rgba[..., 1] = border_color.green()
+        rgba[..., 2] = border_color.blue()
+        rgba[..., 3] = (outline.astype(np.uint16) * border_color.alpha() // 255).astype(np.uint8)
+        overlay_image = QImage(rgba.data, width, height, width * 4, QImage.Format_RGBA8888)
+        overlay = QPixmap.fromImage(overlay_image.convertToFormat(QImage.Format_ARGB32_Premultiplied))
+
+        if labels and d > 12:
+            painter = QPainter(overlay)
+            try:
+                font = QFont()
+                font.setPointSize(max(6, d // 4))
+                painter.setFont(font)
+                painter.setPen(QPen(Qt.white, 1))
+                for (px, py), text in zip(positions, labels):
+                    x, y = int(px) - d // 2 - left, int(py) - d // 2 - top
+                    text_rect = painter.boundingRect(x, y, d, d, Qt.AlignCenter, text)
+                    painter.fillRect(text_rect, QColor(0, 0, 0, 180))
+                    painter.drawText(x, y, d, d, Qt.AlignCenter, text)
+            finally:
+                painter.end()
+
+        return PointRenderLayout(
+            offset=(left, top),
+            size=(width, height),
+            label=label,
+            sources=np.asarray(list(sources), dtype=np.int64),
+            overlay=overlay,
+            positions=list(positions),
+        )
+
+    def paint_points(self, painter: QPainter, layout: PointRenderLayout, pixels: Sequence[RGB],
+                     origin_x: int, origin_y: int) -> None:
+        """Colour every LED disc through the label map and blit with outlines"""
+        count = len(pixels)
+        colors = pixels_to_array(pixels, count)
+        slots = len(layout.sources)
+        lut = np.zeros((slots + 1, 4), dtype=np.uint8)
+        if slots:
+            valid = (layout.sources >= 0) & (layout.sources < count)
+            slot_colors = np.zeros((slots, 3), dtype=np.uint8)
+            slot_colors[valid] = colors[layout.sources[valid]]
+            lut[1:, _RGB] = slot_colors
+            lut[1:, _ALPHA] = 255
+        # One 32-bit gather per screen pixel
+        argb = np.take(lut.view(np.uint32).ravel(), layout.label)
+        width, height = layout.size
+        image = QImage(argb.data, width, height, width * 4, QImage.Format_ARGB32_Premultiplied)
+        x = origin_x + layout.offset[0]
+        y = origin_y + layout.offset[1]
+        painter.drawImage(x, y, image)
+        painter.drawPixmap(x, y, layout.overlay)
@@ -118,8 +118,20 @@ class MatrixDesignCanvas(QWidget):
         self._gradient_preview_mode: bool = False
         self._gradient_dragging_handle: Optional[str] = None  # "start" or "end" or None
         self._gradient_press_pos: Optional[QPoint] = None  # Track mouse press position for drag detection
-        self._dirty_regions: List[Tuple[int, int, int, int]] = []  # (x, y, w, h) dirty rectangles
-        self._full_repaint_needed = False
+        # Offscreen layers: cell tiles are redrawn only where the grid changed,
+        # overlays only when their own inputs change
+        # Bumped by set_pattern_metadata; layer keys use it instead of comparing metadata lists
+        self._metadata_epoch = 0
+        self._cell_layer: Optional[QPixmap] = None
+        self._cell_layer_key: Optional[tuple] = None
+        self._cell_snapshot: List[List[RGB]] = []  # Colours currently drawn in the cell layer
+        self._cell_active: Optional[set] = None  # Active cells of irregular shapes (None = all)
+        self._tiles_drawn = 0
+        self._background_pixmap: Optional[tuple] = None  # (key, scaled QPixmap)
+        self._geometry_layer: Optional[Tuple[QPixmap, QPixmap]] = None  # (clear mask, outline)
+        self._geometry_layer_key: Optional[tuple] = None
+        self._onion_layer: Optional[QPixmap] = None
+        self._onion_layer_key: Optional[tuple] = None
         self._bucket_fill_tolerance: int = 0  # Color tolerance for bucket fill (0-255)
         self._bucket_fill_contiguous: bool = True  # Contiguous fill vs global replacement
         self._border_width: int = 0  # Pixel border width (0 = no border, 1-3 = border width)
@@ -201,7 +213,6 @@ class MatrixDesignCanvas(QWidget):
             for x in range(self._matrix_width):
                 self._grid[y][x] = tuple(pixels[idx])
                 idx += 1
-        self._full_repaint_needed = True
         self.update()
 
     def to_pixels(self) -> List[RGB]:
@@ -242,6 +253,9 @@ class MatrixDesignCanvas(QWidget):
         """
         Mark a region as dirty for optimized repainting.
         
+        Only the widget area covering the region is scheduled for repaint;
+        the cell layer redraws the tiles whose colours changed.
+        
         Args:
             x: X coordinate of dirty region
             y: Y coordinate of dirty region
@@ -254,8 +268,13 @@ class MatrixDesignCanvas(QWidget):
         width = max(1, min(width, self._matrix_width - x))
         height = max(1, min(height, self._matrix_height - y))
         
-        self._dirty_regions.append((x, y, width, height))
-        self.update()
+        self.update(self._cells_to_widget_rect(x, y, width, height))
+    
+    def _cells_to_widget_rect(self, x: int, y: int, width: int = 1, height: int = 1) -> QRect:
+        """Widget-space rectangle covering a cell region (with room for the hover pen)."""
+        size = self._pixel_size
+        rect = QRect(x * size, y * size, width * size + 1, height * size + 1)
+        return rect.translated(self._pan_offset).adjusted(-2, -2, 2, 2)
     
     def set_brush_size(self, size: int):
         """Set brush size (1-8)."""
@@ -275,7 +294,6 @@ class MatrixDesignCanvas(QWidget):
         if shape == self._pixel_shape:
             return
         self._pixel_shape = shape
-        self._full_repaint_needed = True
         self.update()
     
     def set_border_width(self, width: int):
@@ -284,7 +302,6 @@ class MatrixDesignCanvas(QWidget):
         if width == self._border_width:
             return
         self._border_width = width
-        self._full_repaint_needed = True
         self.update()
 
     def set_geometry_overlay(self, mode: GeometryOverlay | str):
@@ -366,47 +383,164 @@ class MatrixDesignCanvas(QWidget):
             self._pixel_size * self._matrix_height + 2,
         )
 
-    def _draw_background_image(self, painter: QPainter, bounds):
-        """Draw background image if available for irregular shapes."""
-        if not self._pattern_metadata or not self._pattern_metadata.irregular_shape_enabled:
-            return
+    def _background_image_pixmap(self) -> Optional[QPixmap]:
+        """Load and scale the irregular-shape background image once per path/scale."""
+        metadata = self._pattern_metadata
+        if not metadata or not metadata.irregular_shape_enabled:
+            return None
         
-        if not self._pattern_metadata.background_image_path:
-            return
+        if not metadata.background_image_path:
+            return None
         
+        key = (metadata.background_image_path, metadata.background_image_scale)
+        if self._background_pixmap is not None and self._background_pixmap[0] == key:
+            return self._background_pixmap[1]
+        
+        pixmap = None
         try:
-            from PySide6.QtGui import QPixmap
-            from pathlib import Path
-            
-            image_path = Path(self._pattern_metadata.background_image_path)
-            if not image_path.exists():
-                return
-            
-            pixmap = QPixmap(str(image_path))
-            if pixmap.isNull():
-                return
-            
-            # Apply scale and offset
-            scale = self._pattern_metadata.background_image_scale
-            offset_x = self._pattern_metadata.background_image_offset_x
-            offset_y = self._pattern_metadata.background_image_offset_y
-            
-            # Scale pixmap
-            if scale != 1.0:
-                scaled_size = pixmap.size() * scale
-                pixmap = pixmap.scaled(scaled_size.toSize(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            
-            # Draw semi-transparent background image
-            painter.setOpacity(0.3)
-            painter.drawPixmap(
-                int(bounds.x() + offset_x),
-                int(bounds.y() + offset_y),
-                pixmap
-            )
-            painter.setOpacity(1.0)
+            image_path = Path(metadata.background_image_path)
+            if image_path.exists():
+                pixmap = QPixmap(str(image_path))
+                if pixmap.isNull():
+                    pixmap = None
+                elif key[1] != 1.0:
+                    scaled_size = pixmap.size() * key[1]
+                    pixmap = pixmap.scaled(scaled_size.toSize(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
         except Exception as e:
             import logging
             logging.warning(f"Failed to draw background image: {e}")
+            pixmap = None
+        
+        self._background_pixmap = (key, pixmap)
+        return pixmap
+    
+    def _draw_background_image(self, painter: QPainter, bounds):
+        """Draw background image if available for irregular shapes."""
+        pixmap = self._background_image_pixmap()
+        if pixmap is None:
+            return
+        
+        # Draw semi-transparent background image
+        painter.setOpacity(0.3)
+        painter.drawPixmap(
+            int(bounds.x() + self._pattern_metadata.background_image_offset_x),
+            int(bounds.y() + self._pattern_metadata.background_image_offset_y),
+            pixmap
+        )
+        painter.setOpacity(1.0)
+    
+    def _new_layer(self, width: int, height: int) -> QPixmap:
+        """Create a transparent offscreen layer matching the screen pixel ratio."""
+        ratio = self.devicePixelRatioF()
+        layer = QPixmap(max(1, int(width * ratio)), max(1, int(height * ratio)))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(Qt.transparent)
+        return layer
+    
+    def _is_irregular_layout(self) -> bool:
+        return bool(self._pattern_metadata and
+                    getattr(self._pattern_metadata, 'irregular_shape_enabled', False) and
+                    getattr(self._pattern_metadata, 'layout_type', 'rectangular') == 'irregular')
+    
+    def _cell_layer_signature(self) -> tuple:
+        """Everything that changes how tiles look, apart from their colours."""
+        metadata = self._pattern_metadata
+        shape = None
+        if metadata is not None:
+            # Active cells are covered by the metadata epoch
+            shape = (
+                self._is_irregular_layout(),
+                getattr(metadata, 'irregular_shape_enabled', False),
+                getattr(metadata, 'background_image_path', None),
+                getattr(metadata, 'background_image_scale', 1.0),
+                getattr(metadata, 'background_image_offset_x', 0),
+                getattr(metadata, 'background_image_offset_y', 0),
+            )
+        return (
+            self._matrix_width, self._matrix_height, self._pixel_size, self.devicePixelRatioF(),
+            self._pixel_shape, self._border_width, self._background_color.rgba(),
+            self._grid_color.rgba(), self._pixel_border_color.isValid(), self._pixel_border_color.rgba(),
+            self._metadata_epoch, shape,
+        )
+    
+    def _active_cell_set(self) -> Optional[set]:
+        """Active cells of an irregular layout, or None when every cell is drawn."""
+        if not self._is_irregular_layout():
+            return None
+        coords = self._pattern_metadata.active_cell_coordinates
+        if coords is None:
+            return None
+        return {tuple(cell) for cell in coords}
+    
+    def _sync_cell_layer(self, display_grid: List[List[RGB]]) -> QPixmap:
+        """
+        Bring the offscreen cell layer up to date with ``display_grid``.
+        
+        The layer is rebuilt when its geometry or style changes. Otherwise
+        each row is compared with the colours already drawn and only the
+        changed span of tiles is repainted.
+        """
+        key = self._cell_layer_signature()
+        if self._cell_layer is None or key != self._cell_layer_key:
+            self._cell_layer = self._new_layer(
+                self._matrix_width * self._pixel_size + 1,
+                self._matrix_height * self._pixel_size + 1,
+            )
+            self._cell_layer_key = key
+            self._cell_active = self._active_cell_set()
+            self._cell_snapshot = [list(row) for row in display_grid]
+            spans = [(0, 0, self._matrix_width, self._matrix_height)]
+        else:
+            spans = []
+            for y, (row, drawn) in enumerate(zip(display_grid, self._cell_snapshot)):
+                if row == drawn:
+                    continue
+                changed = [x for x in range(self._matrix_width) if row[x] != drawn[x]]
+                spans.append((changed[0], y, changed[-1] - changed[0] + 1, 1))
+                drawn[:] = row
+        
+        if spans:
+            painter = QPainter(self._cell_layer)
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            for span in spans:
+                self._render_cell_tiles(painter, display_grid, *span)
+            painter.end()
+        return self._cell_layer
+    
+    def _render_cell_tiles(self, painter: QPainter, grid: List[List[RGB]], x0: int, y0: int, width: int, height: int):
+        """Repaint a cell region of the cell layer: background, tiles, then grid lines."""
+        size = self._pixel_size
+        width_px = self._matrix_width * size
+        height_px = self._matrix_height * size
+        clip = QRect(x0 * size, y0 * size, width * size + 1, height * size + 1)
+        
+        painter.save()
+        painter.setClipRect(clip)
+        painter.fillRect(clip, self._background_color)
+        self._draw_background_image(painter, QRect(0, 0, width_px, height_px))
+        
+        # Wide border pens can cross the clip edge; redraw neighbouring tiles
+        # so the region ends up exactly as in a full repaint
+        margin = 1 if self._border_width > 1 else 0
+        painter.setPen(self._tile_pen())
+        active = self._cell_active
+        for y in range(max(0, y0 - margin), min(self._matrix_height, y0 + height + margin)):
+            row = grid[y]
+            for x in range(max(0, x0 - margin), min(self._matrix_width, x0 + width + margin)):
+                # Skip inactive cells for irregular shapes - leave them transparent
+                if active is not None and (x, y) not in active:
+                    continue
+                painter.setBrush(QColor(*row[x]))
+                self._draw_tile_shape(painter, x * size + 1, y * size + 1, size - 2, size - 2)
+                self._tiles_drawn += 1
+        
+        # Draw grid lines
+        painter.setPen(QPen(self._grid_color, 1))
+        for x in range(x0, x0 + width + 1):
+            painter.drawLine(x * size, 0, x * size, height_px)
+        for y in range(y0, y0 + height + 1):
+            painter.drawLine(0, y * size, width_px, y * size)
+        painter.restore()
     
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -418,87 +552,10 @@ class MatrixDesignCanvas(QWidget):
         # Apply pan offset translation
         painter.translate(self._pan_offset)
         
-        # Calculate bounds for background image
-        width_px = self._matrix_width * self._pixel_size
-        height_px = self._matrix_height * self._pixel_size
-        bounds = painter.viewport().adjusted(0, 0, width_px, height_px)
-        
-        # Draw background image (before pixels, so it appears behind)
-        self._draw_background_image(painter, bounds)
-
-        # Draw pixels (use preview grid if available, otherwise use actual grid)
+        # Pixels (use preview grid if available, otherwise use actual grid),
+        # background image and grid lines all come from the cached cell layer
         display_grid = self._preview_grid if self._preview_grid is not None else self._grid
-        
-        # Check if irregular shape layout is enabled
-        is_irregular = (self._pattern_metadata and 
-                       getattr(self._pattern_metadata, 'irregular_shape_enabled', False) and
-                       getattr(self._pattern_metadata, 'layout_type', 'rectangular') == 'irregular')
-        
-        # Optimize: only repaint dirty regions if not doing full repaint
-        if self._full_repaint_needed or not self._dirty_regions:
-            # Full repaint
-            for y in range(self._matrix_height):
-                for x in range(self._matrix_width):
-                    # Skip inactive cells for irregular shapes - don't draw them at all
-                    if is_irregular:
-                        from core.mapping.irregular_shape_mapper import IrregularShapeMapper
-                        if not IrregularShapeMapper.is_cell_active(x, y, self._pattern_metadata):
-                            continue  # Skip inactive cells - make them transparent
-                    
-                    color = display_grid[y][x]
-                    rect_x = x * self._pixel_size + 1
-                    rect_y = y * self._pixel_size + 1
-                    rect_w = self._pixel_size - 2
-                    rect_h = self._pixel_size - 2
-
-                    self._draw_pixel_tile(painter, rect_x, rect_y, rect_w, rect_h, color)
-            
-            # Draw grid lines
-            painter.setPen(QPen(self._grid_color, 1))
-            width_px = self._matrix_width * self._pixel_size
-            height_px = self._matrix_height * self._pixel_size
-            for x in range(self._matrix_width + 1):
-                painter.drawLine(x * self._pixel_size, 0, x * self._pixel_size, height_px)
-            for y in range(self._matrix_height + 1):
-                painter.drawLine(0, y * self._pixel_size, width_px, y * self._pixel_size)
-            
-            self._full_repaint_needed = False
-            self._dirty_regions.clear()
-        else:
-            # Partial repaint - only dirty regions
-            for x, y, w, h in self._dirty_regions:
-                for py in range(y, min(y + h, self._matrix_height)):
-                    for px in range(x, min(x + w, self._matrix_width)):
-                        # Skip inactive cells for irregular shapes - don't draw them at all
-                        if is_irregular:
-                            from core.mapping.irregular_shape_mapper import IrregularShapeMapper
-                            if not IrregularShapeMapper.is_cell_active(px, py, self._pattern_metadata):
-                                continue  # Skip inactive cells - make them transparent
-                        
-                        color = display_grid[py][px]
-                        rect_x = px * self._pixel_size + 1
-                        rect_y = py * self._pixel_size + 1
-                        rect_w = self._pixel_size - 2
-                        rect_h = self._pixel_size - 2
-                        self._draw_pixel_tile(painter, rect_x, rect_y, rect_w, rect_h, color)
-            self._dirty_regions.clear()
-
-        # Draw gradient preview line and handles (Photoshop-like)
-        if self._drawing_mode == DrawingMode.GRADIENT and self._gradient_preview_mode:
-            if self._gradient_start_point and self._gradient_end_point:
-                # Draw gradient line
-                painter.setPen(QPen(QColor(255, 255, 0), 2, Qt.DashLine))
-                painter.drawLine(self._gradient_start_point, self._gradient_end_point)
-                
-                # Draw handles (start and end points)
-                painter.setBrush(QBrush(QColor(255, 255, 0)))
-                painter.setPen(QPen(QColor(0, 0, 0), 1))
-                handle_radius = 5
-                painter.drawEllipse(self._gradient_start_point, handle_radius, handle_radius)
-                painter.drawEllipse(self._gradient_end_point, handle_radius, handle_radius)
-                
-                # Draw gradient preview along the line
-                self._draw_gradient_preview(painter)
+        painter.drawPixmap(0, 0, self._sync_cell_layer(display_grid))
         
         # Highlight hover cell
         hx, hy = self._hover_cell
@@ -746,8 +803,7 @@ class MatrixDesignCanvas(QWidget):
                     
                     # Mark dirty region
                     if filled_pixels:
-                        self._dirty_regions.append((min_x, min_y, max_x - min_x + 1, max_y - min_y + 1))
-                        self.update()
+                        self.mark_dirty(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
                         self.painting_finished.emit()
                 elif self._drawing_mode == DrawingMode.SELECTION:
                     # Check if clicking inside existing selection (Move)
@@ -796,9 +852,7 @@ class MatrixDesignCanvas(QWidget):
         
         cell = self._cell_from_point(pos)
         if cell != self._hover_cell:
-            self._hover_cell = cell
-            self.hover_changed.emit(cell[0], cell[1])
-            self.update()
+            self._set_hover_cell(cell)
         
         if self._is_dragging:
             if self._drawing_mode in (DrawingMode.PIXEL, DrawingMode.ERASER):
@@ -922,11 +976,18 @@ class MatrixDesignCanvas(QWidget):
         super().mouseReleaseEvent(event)
 
     def leaveEvent(self, event):
-        self._hover_cell = (-1, -1)
-        self.hover_changed.emit(-1, -1)
-        self.update()
+        self._set_hover_cell((-1, -1))
         super().leaveEvent(event)
 
+    def _set_hover_cell(self, cell: Tuple[int, int]) -> None:
+        """Move the hover highlight, repainting only the old and new cells."""
+        previous = self._hover_cell
+        self._hover_cell = cell
+        self.hover_changed.emit(cell[0], cell[1])
+        for hx, hy in (previous, cell):
+            if 0 <= hx < self._matrix_width and 0 <= hy < self._matrix_height:
+                self.update(self._cells_to_widget_rect(hx, hy))
+
     def wheelEvent(self, event):
         """Handle mouse wheel zoom."""
         from PySide6.QtCore import Qt
@@ -983,8 +1044,7 @@ class MatrixDesignCanvas(QWidget):
                             if 0 <= px < self._matrix_width and 0 <= py < self._matrix_height:
                                 self._grid[py][px] = self._erase_color
                                 self.pixel_updated.emit(px, py, self._erase_color)
-                    self._dirty_regions.append((x, y, w, h))
-                    self.update()
+                    self.mark_dirty(x, y, w, h)
             event.accept()
             return
 
@@ -1100,9 +1160,6 @@ class MatrixDesignCanvas(QWidget):
                          if 0 <= y < len(self._selection_buffer) and 0 <= x < len(self._selection_buffer[y]):
                             self._grid[py][px] = self._selection_buffer[y][x]
                             self.pixel_updated.emit(px, py, self._grid[py][px])
-        
-        if self._selection_buffer:
-            self._full_repaint_needed = True
 
         self._selection_rect = None
         self._selection_buffer = None
@@ -1125,8 +1182,6 @@ class MatrixDesignCanvas(QWidget):
                     self._grid[py][px] = self._erase_color
                     self.pixel_updated.emit(px, py, self._erase_color)
             self._selection_buffer.append(row)
-        if self._selection_rect:
-            self._dirty_regions.append(self._selection_rect)
         self.update()
 
     # ------------------------------------------------------------------
@@ -1209,7 +1264,6 @@ class MatrixDesignCanvas(QWidget):
                 self._grid[y][x] = grid[y][x]
                 self.pixel_updated.emit(x, y, grid[y][x])
         
-        self._full_repaint_needed = True
         self.update()
     
     def _draw_gradient_preview(self, painter: QPainter) -> None:
@@ -1268,8 +1322,7 @@ class MatrixDesignCanvas(QWidget):
                 if 0 <= px < self._matrix_width and 0 <= py < self._matrix_height:
                     self._grid[py][px] = self._erase_color
                     self.pixel_updated.emit(px, py, self._erase_color)
-        self._dirty_regions.append((x, y, w, h))
-        self.update()
+        self.mark_dirty(x, y, w, h)
 
     def _copy_to_clipboard(self):
         """Copy selection to system clipboard."""
@@ -1389,12 +1442,12 @@ class MatrixDesignCanvas(QWidget):
             else:
                 color = self._current_color
         
-        # Track dirty region for optimization
         brush_half = self._brush_size // 2
         
         # Apply brush size
         if self._brush_size > 1:
-            # Paint brush-sized area
+            # Paint brush-sized area, repainting only the tiles it touched
+            changed = False
             for dy in range(-brush_half, brush_half + 1):
                 for dx in range(-brush_half, brush_half + 1):
                     px, py = x + dx, y + dy
@@ -1402,18 +1455,16 @@ class MatrixDesignCanvas(QWidget):
                         if self._grid[py][px] != color:
                             self._grid[py][px] = color
                             self.pixel_updated.emit(px, py, color)
-                            # Add to dirty region
-                            self._dirty_regions.append((px, py, 1, 1))
+                            changed = True
+            if changed:
+                self.mark_dirty(x - brush_half, y - brush_half, 2 * brush_half + 1, 2 * brush_half + 1)
         else:
             # Single pixel
             if self._grid[y][x] == color:
                 return
             self._grid[y][x] = color
             self.pixel_updated.emit(x, y, color)
-            # Add to dirty region
-            self._dirty_regions.append((x, y, 1, 1))
-        
-        self.update()
+            self.mark_dirty(x, y)
 
     def _commit_shape(self):
         """Commit the current shape to the grid."""
@@ -1431,14 +1482,6 @@ class MatrixDesignCanvas(QWidget):
             self._draw_line(self._shape_start[0], self._shape_start[1], 
                           self._shape_end[0], self._shape_end[1], color, preview=False)
         
-        # Mark entire shape region as dirty
-        if self._shape_start and self._shape_end:
-            x_min = min(self._shape_start[0], self._shape_end[0])
-            x_max = max(self._shape_start[0], self._shape_end[0])
-            y_min = min(self._shape_start[1], self._shape_end[1])
-            y_max = max(self._shape_start[1], self._shape_end[1])
-            self._dirty_regions.append((x_min, y_min, x_max - x_min + 1, y_max - y_min + 1))
-        
         # Emit updates for all changed pixels
         for y in range(self._matrix_height):
             for x in range(self._matrix_width):
@@ -1608,16 +1651,21 @@ class MatrixDesignCanvas(QWidget):
         """Render a pixel tile respecting the selected pixel shape."""
         painter.save()
         painter.setBrush(QBrush(QColor(*color)))
-        
-        # Set border pen based on border width setting
+        painter.setPen(self._tile_pen())
+        self._draw_tile_shape(painter, rect_x, rect_y, rect_w, rect_h)
+        painter.restore()
+
+    def _tile_pen(self) -> QPen:
+        """Border pen for pixel tiles based on the border width setting."""
         if self._border_width > 0:
             border_color = self._pixel_border_color if self._pixel_border_color.isValid() else QColor(18, 18, 18)
-            painter.setPen(QPen(border_color, self._border_width))
-        elif self._pixel_border_color.isValid():
-            painter.setPen(QPen(self._pixel_border_color, 1))
-        else:
-            painter.setPen(Qt.NoPen)
+            return QPen(border_color, self._border_width)
+        if self._pixel_border_color.isValid():
+            return QPen(self._pixel_border_color, 1)
+        return QPen(Qt.NoPen)
 
+    def _draw_tile_shape(self, painter: QPainter, rect_x: int, rect_y: int, rect_w: int, rect_h: int):
+        """Draw one tile outline/fill with the painter's current pen and brush."""
         if self._pixel_shape == PixelShape.ROUND:
             painter.drawEllipse(rect_x, rect_y, rect_w, rect_h)
         elif self._pixel_shape == PixelShape.ROUNDED:
@@ -1625,7 +1673,6 @@ class MatrixDesignCanvas(QWidget):
             painter.drawRoundedRect(QRectF(rect_x, rect_y, rect_w, rect_h), radius, radius)
         else:
             painter.drawRect(rect_x, rect_y, rect_w, rect_h)
-        painter.restore()
 
     def set_pattern_metadata(self, metadata: Optional['PatternMetadata']) -> None:
         """
@@ -1641,6 +1688,9 @@ class MatrixDesignCanvas(QWidget):
         """
         from core.pattern import PatternMetadata
         self._pattern_metadata = metadata
+        # Metadata lists may have been edited in place; rebuild dependent layers
+        self._metadata_epoch += 1
+        self._background_pixmap = None
         self.update()  # Trigger repaint to show updated overlay
     
     def _draw_geometry_overlay(self, painter: QPainter):
@@ -1654,81 +1704,103 @@ class MatrixDesignCanvas(QWidget):
         - Grid-based editing remains primary
         - Overlay is interpretation layer only
         """
+        layer = self._geometry_overlay_layer()
+        if layer is None:
+            return
+        
+        clear_mask, outline = layer
         painter.save()
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        bounds = self.rect().adjusted(6, 6, -6, -6)
+        # Hide unmapped cells completely (not just dimmed)
+        painter.setCompositionMode(QPainter.CompositionMode_DestinationOut)
+        painter.drawPixmap(0, 0, clear_mask)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.drawPixmap(0, 0, outline)
+        painter.restore()
+        
+        # Wiring overlay removed - only geometry overlays (radial rings, rectangular, irregular) are shown
+    
+    def _geometry_overlay_layer(self) -> Optional[Tuple[QPixmap, QPixmap]]:
+        """
+        Cached geometry overlay as (clear mask, outline) pixmaps.
         
+        Rebuilt only when the widget size, matrix size or layout metadata
+        change, so brush strokes never re-run the mapping lookups.
+        """
         # Check if pattern has circular layout
         layout_type = None
         if self._pattern_metadata:
             layout_type = getattr(self._pattern_metadata, 'layout_type', 'rectangular')
+        if not layout_type or layout_type == "rectangular":
+            return None
         
-        # For circular layouts and irregular shapes, dim unmapped/inactive cells
-        if layout_type and layout_type != "rectangular":
-            from core.mapping.circular_mapper import CircularMapper
-            
-            # Dim unmapped cells
+        metadata = self._pattern_metadata
+        mapping_table = getattr(metadata, 'circular_mapping_table', None)
+        key = (
+            self.width(), self.height(), self.devicePixelRatioF(),
+            self._matrix_width, self._matrix_height, layout_type, self._metadata_epoch,
+            getattr(metadata, 'circular_radius', None),
+            getattr(metadata, 'circular_inner_radius', None),
+            getattr(metadata, 'circular_start_angle', 0.0),
+            getattr(metadata, 'circular_end_angle', 360.0),
+        )
+        if self._geometry_layer is not None and key == self._geometry_layer_key:
+            return self._geometry_layer
+        
+        bounds = self.rect().adjusted(6, 6, -6, -6)
+        clear_mask = self._new_layer(self.width(), self.height())
+        outline = self._new_layer(self.width(), self.height())
+        
+        # For circular layouts, hide unmapped cells (irregular shapes handle this in the cell layer)
+        if layout_type != "irregular":
             cell_width = bounds.width() / self._matrix_width if self._matrix_width > 0 else 1
             cell_height = bounds.height() / self._matrix_height if self._matrix_height > 0 else 1
+            mapped = {tuple(cell) for cell in mapping_table} if mapping_table else set()
             
-            inactive_brush = QBrush(QColor(60, 60, 60, 40))
-            painter.setBrush(inactive_brush)
-            painter.setPen(Qt.NoPen)
-            
-            # For circular layouts, dim unmapped cells (irregular shapes handle this in paintEvent)
-            if layout_type != "irregular":
-                for y in range(self._matrix_height):
-                    for x in range(self._matrix_width):
-                        # Check if this cell is mapped/active
-                        is_active = CircularMapper.is_mapped(x, y, self._pattern_metadata)
-                        
-                        if not is_active:
-                            # Hide inactive/unmapped cell completely (not just dimmed)
-                            cell_x = bounds.x() + x * cell_width
-                            cell_y = bounds.y() + y * cell_height
-                            # Use composition mode to clear the cell
-                            from PySide6.QtGui import QPainter as QP
-                            painter.setCompositionMode(QP.CompositionMode_Clear)
-                            painter.fillRect(int(cell_x), int(cell_y), int(cell_width), int(cell_height), 
-                                           QColor(0, 0, 0, 0))
-                            painter.setCompositionMode(QP.CompositionMode_SourceOver)
-            
-            # Draw circular bounds overlay
-            overlay_pen = QPen(QColor(0, 255, 120, 120), 2, Qt.SolidLine)
-            painter.setPen(overlay_pen)
-            painter.setBrush(Qt.NoBrush)
-            
-            if layout_type == "circle":
-                painter.drawEllipse(bounds)
-            elif layout_type == "ring":
-                painter.drawEllipse(bounds)
-                if self._pattern_metadata and self._pattern_metadata.circular_inner_radius:
-                    # Calculate inner radius proportion
-                    outer_radius = self._pattern_metadata.circular_radius or (min(bounds.width(), bounds.height()) / 2.0)
-                    inner_radius = self._pattern_metadata.circular_inner_radius
-                    ratio = inner_radius / outer_radius if outer_radius > 0 else 0.2
-                    inner = bounds.adjusted(
-                        int(bounds.width() * ratio / 2),
-                        int(bounds.height() * ratio / 2),
-                        -int(bounds.width() * ratio / 2),
-                        -int(bounds.height() * ratio / 2),
-                    )
-                    painter.drawEllipse(inner)
-            elif layout_type == "arc":
-                # Draw arc based on start/end angles
-                start_angle = getattr(self._pattern_metadata, 'circular_start_angle', 0.0) if self._pattern_metadata else 0.0
-                end_angle = getattr(self._pattern_metadata, 'circular_end_angle', 360.0) if self._pattern_metadata else 360.0
-                span_angle = int((end_angle - start_angle) * 16)  # Qt uses 1/16th degree units
-                start_angle_qt = int(start_angle * 16)
-                painter.drawArc(bounds, start_angle_qt, span_angle)
-            elif layout_type == "radial":
-                # Draw concentric circles (rows = circles, cols = LEDs per circle)
-                # This matches the radial preview interpretation
-                num_circles = self._pattern_metadata.height if self._pattern_metadata else 1
-                
-        painter.restore()
-        
-        # Wiring overlay removed - only geometry overlays (radial rings, rectangular, irregular) are shown
+            painter = QPainter(clear_mask)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            for y in range(self._matrix_height):
+                for x in range(self._matrix_width):
+                    if (x, y) not in mapped:
+                        cell_x = bounds.x() + x * cell_width
+                        cell_y = bounds.y() + y * cell_height
+                        painter.fillRect(int(cell_x), int(cell_y), int(cell_width), int(cell_height),
+                                         QColor(0, 0, 0))
+            painter.end()
+        
+        # Draw circular bounds overlay
+        painter = QPainter(outline)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(QPen(QColor(0, 255, 120, 120), 2, Qt.SolidLine))
+        painter.setBrush(Qt.NoBrush)
+        
+        if layout_type == "circle":
+            painter.drawEllipse(bounds)
+        elif layout_type == "ring":
+            painter.drawEllipse(bounds)
+            if metadata.circular_inner_radius:
+                # Calculate inner radius proportion
+                outer_radius = metadata.circular_radius or (min(bounds.width(), bounds.height()) / 2.0)
+                inner_radius = metadata.circular_inner_radius
+                ratio = inner_radius / outer_radius if outer_radius > 0 else 0.2
+                inner = bounds.adjusted(
+                    int(bounds.width() * ratio / 2),
+                    int(bounds.height() * ratio / 2),
+                    -int(bounds.width() * ratio / 2),
+                    -int(bounds.height() * ratio / 2),
+                )
+                painter.drawEllipse(inner)
+        elif layout_type == "arc":
+            # Draw arc based on start/end angles
+            start_angle = getattr(metadata, 'circular_start_angle', 0.0)
+            end_angle = getattr(metadata, 'circular_end_angle', 360.0)
+            span_angle = int((end_angle - start_angle) * 16)  # Qt uses 1/16th degree units
+            start_angle_qt = int(start_angle * 16)
+            painter.drawArc(bounds, start_angle_qt, span_angle)
+        painter.end()
+        
+        self._geometry_layer = (clear_mask, outline)
+        self._geometry_layer_key = key
+        return self._geometry_layer
     
     def _draw_wiring_overlay(self, painter: QPainter, bounds):
         """
@@ -1941,6 +2013,7 @@ class MatrixDesignCanvas(QWidget):
         self._onion_skin_next_frames = next_frames
         self._onion_skin_prev_opacities = prev_opacities
         self._onion_skin_next_opacities = next_opacities
+        self._onion_layer_key = None
         self.update()
 
     def _draw_onion_skins(self, painter: QPainter):
@@ -1948,15 +2021,35 @@ class MatrixDesignCanvas(QWidget):
         if not self._onion_skin_prev_frames and not self._onion_skin_next_frames:
             return
         
-        painter.save()
+        key = (
+            self._onion_skin_prev_frames, self._onion_skin_next_frames,
+            tuple(self._onion_skin_prev_opacities), tuple(self._onion_skin_next_opacities),
+            self._matrix_width, self._matrix_height, self._pixel_size, self.devicePixelRatioF(),
+            self._pixel_shape, self._border_width, self._pixel_border_color.isValid(),
+            self._pixel_border_color.rgba(),
+        )
+        if self._onion_layer is None or key != self._onion_layer_key:
+            self._onion_layer = self._render_onion_layer()
+            self._onion_layer_key = key
+        painter.drawPixmap(0, 0, self._onion_layer)
+    
+    def _render_onion_layer(self) -> QPixmap:
+        """Render onion skin frames into an offscreen layer."""
+        layer = self._new_layer(
+            self._matrix_width * self._pixel_size + 1,
+            self._matrix_height * self._pixel_size + 1,
+        )
+        painter = QPainter(layer)
         painter.setRenderHint(QPainter.Antialiasing, False)
         
-        # Draw previous frames (behind current, but we draw after so they appear ghosted)
-        for i, (prev_grid, opacity) in enumerate(zip(self._onion_skin_prev_frames, self._onion_skin_prev_opacities)):
-            if opacity <= 0.0 or not prev_grid:
+        # Previous frames first, then next frames on top
+        skins = list(zip(self._onion_skin_prev_frames, self._onion_skin_prev_opacities))
+        skins += list(zip(self._onion_skin_next_frames, self._onion_skin_next_opacities))
+        for grid, opacity in skins:
+            if opacity <= 0.0 or not grid:
                 continue
-            for y in range(min(len(prev_grid), self._matrix_height)):
-                row = prev_grid[y] if prev_grid[y] else []
+            for y in range(min(len(grid), self._matrix_height)):
+                row = grid[y] if grid[y] else []
                 for x in range(min(len(row), self._matrix_width)):
                     color = row[x]
                     if not color:
@@ -1965,39 +2058,11 @@ class MatrixDesignCanvas(QWidget):
                     rect_y = y * self._pixel_size + 1
                     rect_w = self._pixel_size - 2
                     rect_h = self._pixel_size - 2
-                    
-                    # Draw with reduced opacity
-                    r, g, b = color if isinstance(color, tuple) else (color[0], color[1], color[2])
-                    qcolor = QColor(r, g, b)
-                    qcolor.setAlphaF(opacity)
-                    painter.setBrush(QBrush(qcolor))
-                    painter.setPen(Qt.NoPen)
-                    self._draw_pixel_tile(painter, rect_x, rect_y, rect_w, rect_h, (r, g, b))
-        
-        # Draw next frames (on top, but still semi-transparent)
-        for i, (next_grid, opacity) in enumerate(zip(self._onion_skin_next_frames, self._onion_skin_next_opacities)):
-            if opacity <= 0.0 or not next_grid:
-                continue
-            for y in range(min(len(next_grid), self._matrix_height)):
-                row = next_grid[y] if next_grid[y] else []
-                for x in range(min(len(row), self._matrix_width)):
-                    color = row[x]
-                    if not color:
-                        continue
-                    rect_x = x * self._pixel_size + 1
-                    rect_y = y * self._pixel_size + 1
-                    rect_w = self._pixel_size - 2
-                    rect_h = self._pixel_size - 2
-                    
-                    # Draw with reduced opacity
-                    r, g, b = color if isinstance(color, tuple) else (color[0], color[1], color[2])
-                    qcolor = QColor(r, g, b)
-                    qcolor.setAlphaF(opacity)
-                    painter.setBrush(QBrush(qcolor))
-                    painter.setPen(Qt.NoPen)
-                    self._draw_pixel_tile(painter, rect_x, rect_y, rect_w, rect_h, (r, g, b))
+                    self._draw_pixel_tile(painter, rect_x, rect_y, rect_w, rect_h,
+                                          (color[0], color[1], color[2]))
         
-        painter.restore()
+        painter.end()
+        return layer
 
     def _next_gradient_color(self) -> RGB:
         """Return the next interpolated gradient colour."""
@@ -2097,8 +2162,6 @@ class MatrixDesignCanvas(QWidget):
                 self._grid[y][x] = color
                 self.pixel_updated.emit(x, y, color)
         
-        # Mark entire matrix as dirty
-        self._dirty_regions.append((0, 0, self._matrix_width, self._matrix_height))
         self.update()
 
     # ------------------------------------------------------------------
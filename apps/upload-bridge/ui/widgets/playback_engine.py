@@ -0,0 +1,394 @@
+"""
+Playback Engine - Frame-accurate pattern playback with predictive prefetch.
+
+Restarting a ``QTimer`` with each frame's duration accumulates timer and
+paint latency into drift, and a minimum interval clamps short frames (e.g.
+those produced by ``Pattern.apply_variable_speed``) to the wrong timing.
+The engine instead maps a monotonic clock onto the pattern's timeline:
+
+- On every tick the frame due *now* is presented; frames whose slot has
+  already passed are skipped (and counted as dropped) instead of delaying
+  everything after them.
+- The next frames in the playhead's direction are prefetched in idle
+  event-loop turns between ticks, so presenting a frame does not wait on
+  layer compositing. Rendering stays on the GUI thread because it reads
+  the layer model and its caches, which are not thread-safe.
+- Achieved FPS, presentation jitter and dropped frames are tracked in
+  ``PlaybackStats``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import statistics
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFETCH_COUNT = 8
+STATS_WINDOW = 120
+
+# Absorbs float error converting clock seconds to media milliseconds, so a
+# tick landing exactly on a frame boundary presents the new frame
+_BOUNDARY_EPSILON_MS = 1e-6
+
+
+@dataclass
+class PlaybackStats:
+    """Presentation statistics over a sliding window of frames"""
+    frames_presented: int = 0
+    dropped_frames: int = 0
+    _times: Deque[float] = field(default_factory=lambda: deque(maxlen=STATS_WINDOW), repr=False)
+    _lateness: Deque[float] = field(default_factory=lambda: deque(maxlen=STATS_WINDOW), repr=False)
+
+    def record(self, now: float, lateness_ms: float, dropped: int = 0) -> None:
+        """Record one presented frame (``now`` in seconds)"""
+        self.frames_presented += 1
+        self.dropped_frames += dropped
+        self._times.append(now)
+        self._lateness.append(lateness_ms)
+
+    def reset(self) -> None:
+        """Clear counters and samples"""
+        self.frames_presented = 0
+        self.dropped_frames = 0
+        self._times.clear()
+        self._lateness.clear()
+
+    @property
+    def achieved_fps(self) -> float:
+        """Frames presented per wall-clock second"""
+        if len(self._times) < 2 or self._times[-1] <= self._times[0]:
+            return 0.0
+        return (len(self._times) - 1) / (self._times[-1] - self._times[0])
+
+    @property
+    def jitter_ms(self) -> float:
+        """Standard deviation of presentation lateness"""
+        if len(self._lateness) < 2:
+            return 0.0
+        return statistics.pstdev(self._lateness)
+
+    @property
+    def mean_lateness_ms(self) -> float:
+        """Average delay between a frame's slot and its presentation"""
+        return statistics.fmean(self._lateness) if self._lateness else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Serializable summary"""
+        return {
+            "frames_presented": self.frames_presented,
+            "dropped_frames": self.dropped_frames,
+            "achieved_fps": round(self.achieved_fps, 2),
+            "jitter_ms": round(self.jitter_ms, 3),
+            "mean_lateness_ms": round(self.mean_lateness_ms, 3),
+        }
+
+
+class FramePrefetcher:
+    """
+    Renders upcoming frames ahead of time, one per idle event-loop turn.
+
+    ``render`` is called with a frame index on the GUI thread and its result
+    is kept until taken. Only the most recent ``prefetch`` request is worked
+    on; call ``invalidate`` whenever the frames or layers change.
+    """
+
+    def __init__(self, render: Callable[[int], object], capacity: int = DEFAULT_PREFETCH_COUNT * 2):
+        """
+        Initialize prefetcher
+
+        Args:
+            render: Produces the display-ready frame for an index
+            capacity: Maximum number of prefetched frames held
+        """
+        self.render = render
+        self.capacity = max(1, capacity)
+        self.hits = 0
+        self.misses = 0
+        self._pending: List[int] = []
+        self._ready: "OrderedDict[int, object]" = OrderedDict()
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._render_next)
+
+    def prefetch(self, indices: Iterable[int]) -> None:
+        """Replace the work queue with ``indices`` (nearest first)"""
+        self._pending = [i for i in indices if i not in self._ready]
+        if self._pending:
+            self._timer.start(0)
+
+    def take(self, index: int) -> Optional[object]:
+        """Prefetched frame for ``index``, or None if it is not ready"""
+        frame = self._ready.pop(index, None)
+        if frame is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def invalidate(self, *_args) -> None:
+        """Drop prefetched and queued frames (the pattern or its layers changed)"""
+        self._pending = []
+        self._ready.clear()
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Render every queued frame now; False if ``timeout`` ran out first"""
+        deadline = time.perf_counter() + timeout
+        while self._pending:
+            if time.perf_counter() > deadline:
+                return False
+            self._render_next()
+        return True
+
+    def stop(self) -> None:
+        """Drop queued work"""
+        self._timer.stop()
+        self._pending = []
+
+    def _render_next(self) -> None:
+        if not self._pending:
+            return
+        index = self._pending.pop(0)
+        try:
+            frame = self.render(index)
+        except Exception as e:
+            logger.debug(f"Prefetch failed for frame {index}: {e}")
+            frame = None
+        if frame is not None:
+            self._ready[index] = frame
+            while len(self._ready) > self.capacity:
+                self._ready.popitem(last=False)
+        if self._pending:
+            # Yield to the event loop so playback ticks are never delayed by more than one frame
+            self._timer.start(0)
+
+
+class PlaybackEngine(QObject):
+    """
+    Schedules frames against a monotonic clock.
+
+    Media time advances at ``speed`` times wall-clock time (negative speeds
+    play backwards). ``frame_due`` is emitted whenever the frame under the
+    playhead changes; ``finished`` when a non-looping playback reaches the
+    end of the pattern.
+    """
+
+    frame_due = Signal(int)  # frame_index
+    finished = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None, prefetch_count: int = DEFAULT_PREFETCH_COUNT,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize playback engine
+
+        Args:
+            parent: Owning QObject
+            prefetch_count: Frames to prefetch ahead of the playhead
+            clock: Monotonic clock in seconds
+        """
+        super().__init__(parent)
+        self.prefetch_count = prefetch_count
+        self.loop = False
+        self.stats = PlaybackStats()
+        self.prefetcher: Optional[FramePrefetcher] = None
+        self._clock = clock
+        self._starts: List[float] = [0.0]
+        self._durations: List[float] = []
+        self._speed = 1.0
+        self._anchor_clock = 0.0
+        self._anchor_ms = 0.0
+        self._current = 0
+        self._active = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    # Timeline
+
+    def set_durations(self, durations: Sequence[float]) -> None:
+        """
+        Set per-frame durations in milliseconds.
+
+        Durations are used as-is (no minimum interval), so variable-speed
+        patterns keep their true timing. While playing, the playhead keeps
+        its current frame.
+        """
+        self._durations = [max(0.0, float(d)) for d in durations]
+        starts = [0.0]
+        for duration in self._durations:
+            starts.append(starts[-1] + duration)
+        self._starts = starts
+        self._current = min(self._current, max(0, len(self._durations) - 1))
+        if self.prefetcher:
+            self.prefetcher.invalidate()
+        if self._active:
+            self._reanchor(self._frame_time(self._current))
+            self._schedule(self._anchor_ms)
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._durations)
+
+    @property
+    def total_ms(self) -> float:
+        """Length of one pass through the pattern"""
+        return self._starts[-1]
+
+    def frame_start_ms(self, frame_index: int) -> float:
+        """Media time at which a frame starts"""
+        return self._starts[max(0, min(frame_index, self.frame_count))]
+
+    def frame_at(self, time_ms: float) -> int:
+        """Frame under the playhead at ``time_ms`` (clamped to the pattern)"""
+        if not self._durations:
+            return 0
+        idx = bisect.bisect_right(self._starts, time_ms) - 1
+        return max(0, min(idx, self.frame_count - 1))
+
+    # Transport
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    def set_speed(self, speed: float) -> None:
+        """Set the playback rate; negative values play backwards"""
+        if speed == 0:
+            raise ValueError("Playback speed cannot be zero")
+        if self._active:
+            position = self.position_ms()
+            self._speed = float(speed)
+            self._reanchor(position)
+            self._schedule(position)
+        else:
+            self._speed = float(speed)
+
+    @property
+    def direction(self) -> int:
+        return 1 if self._speed > 0 else -1
+
+    @property
+    def current_frame(self) -> int:
+        return self._current
+
+    def is_active(self) -> bool:
+        return self._active
+
+    def start(self, frame_index: Optional[int] = None) -> None:
+        """Start playing from ``frame_index`` (default: current frame)"""
+        if not self._durations or self.total_ms <= 0:
+            return
+        if frame_index is not None:
+            self._current = max(0, min(frame_index, self.frame_count - 1))
+        self.stats.reset()
+        self._active = True
+        self._reanchor(self._frame_time(self._current))
+        self._present(self._current, self._clock(), 0.0, dropped=0)
+        self._schedule(self._anchor_ms)
+
+    def stop(self) -> None:
+        """Stop playing (the playhead stays on the current frame)"""
+        self._active = False
+        self._timer.stop()
+
+    def seek(self, frame_index: int) -> None:
+        """Move the playhead; playback continues from there if active"""
+        self._current = max(0, min(frame_index, max(0, self.frame_count - 1)))
+        if self._active:
+            self._reanchor(self._frame_time(self._current))
+            self._schedule(self._anchor_ms)
+            self._prefetch_ahead()
+
+    def position_ms(self, now: Optional[float] = None) -> float:
+        """Current media time"""
+        if not self._active:
+            return self._frame_time(self._current)
+        now = self._clock() if now is None else now
+        return self._anchor_ms + (now - self._anchor_clock) * 1000.0 * self._speed
+
+    # Scheduling
+
+    def _frame_time(self, frame_index: int) -> float:
+        """Media time at which playback enters a frame in the current direction"""
+        if self.direction > 0:
+            return self._starts[frame_index]
+        # Backwards playback enters a frame at its end
+        return math.nextafter(self._starts[frame_index + 1], -math.inf)
+
+    def _reanchor(self, position_ms: float) -> None:
+        self._anchor_clock = self._clock()
+        self._anchor_ms = position_ms
+
+    def _schedule(self, position_ms: float) -> None:
+        """Arm the timer for the next frame boundary"""
+        if not self._active:
+            return
+        if self.direction > 0:
+            boundary = self._starts[self._current + 1]
+            wait_ms = (boundary - position_ms) / self._speed
+        else:
+            boundary = self._starts[self._current]
+            wait_ms = (position_ms - boundary) / -self._speed
+        self._timer.start(max(0, math.ceil(wait_ms)))
+
+    def _tick(self) -> None:
+        if not self._active:
+            return
+        now = self._clock()
+        position = self.position_ms(now) + _BOUNDARY_EPSILON_MS * self.direction
+        total = self.total_ms
+
+        wrapped = position >= total or position < 0
+        if wrapped:
+            if not self.loop:
+                self._active = False
+                self.finished.emit()
+                return
+            position %= total
+            self._anchor_ms = position
+            self._anchor_clock = now
+
+        index = self.frame_at(position)
+        if index != self._current or wrapped:
+            lateness = abs(position - self._frame_time(index)) / abs(self._speed)
+            self._present(index, now, lateness, dropped=self._skipped_between(self._current, index))
+        self._schedule(position)
+
+    def _skipped_between(self, previous: int, index: int) -> int:
+        """Frames with a non-zero slot passed over between two presentations"""
+        count = self.frame_count
+        step = self.direction
+        skipped = 0
+        i = (previous + step) % count
+        while i != index:
+            if self._durations[i] > 0:
+                skipped += 1
+            i = (i + step) % count
+        return skipped
+
+    def _present(self, index: int, now: float, lateness_ms: float, dropped: int) -> None:
+        self._current = index
+        self.stats.record(now, lateness_ms, dropped)
+        self._prefetch_ahead()
+        self.frame_due.emit(index)
+
+    def _prefetch_ahead(self) -> None:
+        if not self.prefetcher or not self.frame_count:
+            return
+        step = self.direction
+        upcoming = []
+        for offset in range(1, min(self.prefetch_count, self.frame_count - 1) + 1):
+            index = self._current + step * offset
+            if not self.loop and not 0 <= index < self.frame_count:
+                break
+            upcoming.append(index % self.frame_count)
+        self.prefetcher.prefetch(upcoming)
@@ -0,0 +1,293 @@
+"""
+Thumbnail Service - Background rendering of timeline frame thumbnails.
+
+Compositing every layer of a frame and scaling it to a thumbnail stalls the
+UI when done synchronously for each frame of a long pattern on every
+timeline refresh. This service renders thumbnails on a worker thread:
+
+- Frame pixels are read on the GUI thread, a few frames per event-loop
+  turn, and handed to the worker as packed bytes; the worker never touches
+  the layer model, so it cannot race edits or the layer caches.
+- Frames inside the visible timeline range are rendered first, then the
+  rest outward from the playhead.
+- Thumbnails are memoized by a hash of the frame's pixel content in an LRU
+  cache bounded by a byte budget, so unchanged frames are never rendered
+  twice and editing one frame produces exactly one new thumbnail.
+- Finished thumbnails are delivered on the GUI thread through
+  ``thumbnail_ready`` as they complete.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, QSize, Qt, QTimer, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from ui.widgets.led_render_cache import NUMPY_AVAILABLE, pixels_to_array
+
+logger = logging.getLogger(__name__)
+
+RGB = Tuple[int, int, int]
+
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+# GUI time spent reading frame pixels per event-loop turn
+SNAPSHOT_SLICE_SECONDS = 0.008
+
+
+def frame_bytes(pixels: Sequence[RGB], count: int) -> bytes:
+    """
+    Pack row-major pixels into ``count * 3`` RGB bytes.
+
+    Missing or malformed pixels become black, matching the synchronous
+    thumbnail renderer.
+    """
+    if NUMPY_AVAILABLE:
+        try:
+            return pixels_to_array(pixels, count).tobytes()
+        except (TypeError, ValueError):
+            pass
+    data = bytearray(count * 3)
+    for idx, pixel in enumerate(pixels[:count]):
+        if isinstance(pixel, (list, tuple)) and len(pixel) >= 3:
+            data[idx * 3:idx * 3 + 3] = bytes(max(0, min(255, int(c))) for c in pixel[:3])
+    return bytes(data)
+
+
+def content_key(data: bytes, width: int, height: int, size: QSize) -> str:
+    """Hash of a frame's pixels plus the dimensions that shape its thumbnail."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{width}x{height}:{size.width()}x{size.height()}:".encode("ascii"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def render_thumbnail(data: bytes, width: int, height: int, size: QSize) -> QImage:
+    """Scale packed RGB bytes to a thumbnail (safe to call off the GUI thread)."""
+    image = QImage(data, width, height, width * 3, QImage.Format_RGB888)
+    # copy() detaches from ``data`` even when no scaling was needed
+    return image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation).copy()
+
+
+class ThumbnailService(QObject):
+    """
+    Worker-thread thumbnail renderer with a content-addressed LRU cache.
+
+    Call ``request`` whenever the frames may have changed; results for
+    frames whose content is unchanged are served from the cache and are not
+    re-emitted. All public methods must be called on the GUI thread.
+    """
+
+    thumbnail_ready = Signal(int, QPixmap)  # frame_index, thumbnail
+    _image_ready = Signal(int, int, str, QImage)  # generation, frame_index, key, image
+
+    def __init__(self, parent: Optional[QObject] = None, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        """
+        Initialize thumbnail service
+
+        Args:
+            parent: Owning QObject
+            budget_bytes: Byte budget of the thumbnail cache
+        """
+        super().__init__(parent)
+        self.budget_bytes = budget_bytes
+        self.renders = 0  # Counters are updated under _cond by the worker
+        self.hits = 0
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[int, bytes]] = []  # Snapshots awaiting the worker
+        self._busy = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._generation = 0
+        self._source: Optional[Callable[[int], Sequence[RGB]]] = None
+        self._to_snapshot: List[int] = []  # Frames whose pixels are still to be read
+        self._snapshot_timer = QTimer(self)
+        self._snapshot_timer.setSingleShot(True)
+        self._snapshot_timer.timeout.connect(self._snapshot_slice)
+        self._dims: Tuple[int, int] = (1, 1)
+        self._size = QSize(72, 72)
+        self._memo: "OrderedDict[str, QImage]" = OrderedDict()
+        self._memo_bytes = 0
+        self._delivered: Dict[int, Tuple[str, QPixmap]] = {}
+        self._image_ready.connect(self._on_image_ready)
+
+    # Requests
+
+    def request(self, frame_count: int, source: Callable[[int], Sequence[RGB]],
+                width: int, height: int, size: QSize,
+                visible: Optional[Iterable[int]] = None, playhead: int = 0) -> None:
+        """
+        Queue thumbnails for every frame, replacing any pending work.
+
+        Args:
+            frame_count: Number of frames
+            source: Returns the composite pixels of a frame (called on the GUI thread)
+            width: Frame width in pixels
+            height: Frame height in pixels
+            size: Thumbnail bounding size
+            visible: Frame indices currently on screen (rendered first)
+            playhead: Remaining frames are ordered by distance from this index
+        """
+        with self._cond:
+            self._generation += 1
+            self._dims = (max(1, int(width)), max(1, int(height)))
+            self._size = QSize(size)
+            self._pending = []
+        self._source = source
+        self._to_snapshot = self._priority_order(frame_count, visible, playhead)
+        for index in [i for i in self._delivered if i >= frame_count]:
+            del self._delivered[index]
+        self._ensure_worker()
+        self._snapshot_timer.start(0)
+
+    def prioritize(self, visible: Iterable[int], playhead: int = 0) -> None:
+        """Move pending frames that just became visible to the front of the queue."""
+        pending = set(self._to_snapshot)
+        front = [i for i in visible if i in pending]
+        if not front:
+            return
+        chosen = set(front)
+        rest = sorted((i for i in self._to_snapshot if i not in chosen), key=lambda i: abs(i - playhead))
+        self._to_snapshot = front + rest
+
+    @staticmethod
+    def _priority_order(frame_count: int, visible: Optional[Iterable[int]], playhead: int) -> List[int]:
+        front = [i for i in (visible or ()) if 0 <= i < frame_count]
+        chosen = set(front)
+        rest = sorted((i for i in range(frame_count) if i not in chosen), key=lambda i: (abs(i - playhead), i))
+        return front + rest
+
+    def thumbnail(self, frame_index: int) -> Optional[QPixmap]:
+        """Last thumbnail delivered for a frame (may be stale until a request completes)."""
+        entry = self._delivered.get(frame_index)
+        return entry[1] if entry else None
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """
+        Read every queued frame now and block until the worker has drained
+        its queue (results still need the event loop).
+        """
+        self._snapshot_timer.stop()
+        self._snapshot(len(self._to_snapshot))
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def clear(self) -> None:
+        """Drop cached and delivered thumbnails."""
+        with self._cond:
+            self._memo.clear()
+            self._memo_bytes = 0
+        self._delivered.clear()
+
+    def stop(self) -> None:
+        """Stop the worker thread."""
+        self._snapshot_timer.stop()
+        self._to_snapshot = []
+        self._source = None
+        with self._cond:
+            self._stopped = True
+            self._pending = []
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    @property
+    def cache_bytes(self) -> int:
+        """Bytes held by cached thumbnails"""
+        return self._memo_bytes
+
+    # GUI thread snapshots
+
+    def _snapshot_slice(self) -> None:
+        deadline = time.perf_counter() + SNAPSHOT_SLICE_SECONDS
+        while self._to_snapshot and time.perf_counter() < deadline:
+            self._snapshot(1)
+        if self._to_snapshot:
+            self._snapshot_timer.start(0)
+
+    def _snapshot(self, count: int) -> None:
+        """Read the next ``count`` queued frames and hand their bytes to the worker."""
+        width, height = self._dims
+        batch: List[Tuple[int, bytes]] = []
+        for index in self._to_snapshot[:count]:
+            try:
+                pixels = self._source(index)
+            except Exception as e:
+                # The pattern may change under us; the next request retries
+                logger.debug(f"Thumbnail source failed for frame {index}: {e}")
+                continue
+            if pixels:
+                batch.append((index, frame_bytes(pixels, width * height)))
+        del self._to_snapshot[:count]
+        if batch:
+            with self._cond:
+                self._pending.extend(batch)
+                self._cond.notify_all()
+
+    # Worker
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="ThumbnailService", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                index, data = self._pending.pop(0)
+                self._busy = True
+                generation, (width, height), size = self._generation, self._dims, QSize(self._size)
+
+            key = content_key(data, width, height, size)
+            image = self._lookup(key)
+            if image is None:
+                image = render_thumbnail(data, width, height, size)
+                self._store(key, image)
+
+            try:
+                self._image_ready.emit(generation, index, key, image)
+            except RuntimeError:
+                # Owner was deleted
+                return
+
+    def _lookup(self, key: str) -> Optional[QImage]:
+        with self._cond:
+            image = self._memo.get(key)
+            if image is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def _store(self, key: str, image: QImage) -> None:
+        with self._cond:
+            self.renders += 1
+            self._memo[key] = image
+            self._memo_bytes += image.sizeInBytes()
+            while self._memo_bytes > self.budget_bytes and len(self._memo) > 1:
+                _, evicted = self._memo.popitem(last=False)
+                self._memo_bytes -= evicted.sizeInBytes()
+
+    # GUI thread
+
+    def _on_image_ready(self, generation: int, index: int, key: str, image: QImage) -> None:
+        if generation != self._generation:
+            return
+        previous = self._delivered.get(index)
+        if previous is not None and previous[0] == key:
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._delivered[index] = (key, pixmap)
+        self.thumbnail_ready.emit(index, pixmap)
@@ -706,6 +706,35 @@ class TimelineWidget(QWidget):
         ])
     
     
+    def set_frame_thumbnail(self, frame_idx: int, thumbnail: Optional[QPixmap]) -> None:
+        """Replace the thumbnail of one frame (e.g. when a background render completes)."""
+        if not 0 <= frame_idx < len(self._frames):
+            return
+        label, _ = self._frames[frame_idx]
+        self._frames[frame_idx] = (label, thumbnail)
+        self._composite_thumbnail_cache.pop(frame_idx, None)
+        self.update()
+    
+    def visible_frame_range(self) -> range:
+        """Indices of frames inside the visible part of the widget (e.g. a scroll viewport)."""
+        count = len(self._frames)
+        visible = self.visibleRegion().boundingRect()
+        if not count or visible.isEmpty():
+            return range(0)
+        
+        if self._grid_mode and self._frame_positions:
+            first = self._grid_frame_index_at_x(visible.left())
+            last = self._grid_frame_index_at_x(visible.right())
+            first = 0 if first is None else first
+            last = count - 1 if last is None else last
+        else:
+            frame_width = self._frame_width()
+            first = int(max(0, visible.left() - self.LANE_PADDING) // frame_width)
+            last = int(max(0, visible.right() - self.LANE_PADDING) // frame_width)
+        first = min(first, count - 1)
+        last = min(max(first, last), count - 1)
+        return range(first, last + 1)
+    
     def set_composite_thumbnail(self, frame_idx: int, thumbnail: QPixmap) -> None:
         """Set composite thumbnail for a frame (called from external code)."""
         self._composite_thumbnail_cache[frame_idx] = thumbnail
@@ -13,7 +13,7 @@ from typing import Optional
 
 from .base import (
     UploaderBase, BuildResult, UploadResult, DeviceInfo,
-    UploadStatus, BuildError, UploadError
+    UploadStatus, BuildError, UploadError, project_lock
 )
 from core.subprocess_utils import get_hidden_subprocess_kwargs
 
@@ -80,25 +80,34 @@ class AvrUploader(UploaderBase):
             # Create output directory
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Step 1: Generate pattern_data.h
+            # Step 1: Generate sources into the persistent project for this chip
             self._report_progress(UploadStatus.BUILDING, 0.1, "Generating pattern data...")
-            pattern_header = self._generate_pattern_header(pattern, gpio_pin)
+            project_dir = self.get_project_dir(build_opts)
             
-            header_path = output_dir / "pattern_data.h"
-            with open(header_path, 'w', encoding='utf-8') as f:
-                f.write(pattern_header)
-            
-            self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with avr-gcc...")
-            
-            # Step 2: Check if Makefile exists
-            makefile = template_path / "Makefile"
-            
-            if makefile.exists():
-                # Use Makefile
-                result = self._build_with_makefile(template_path, output_dir, build_opts)
-            else:
-                # Direct avr-gcc compilation
-                result = self._build_direct(template_path, output_dir, build_opts)
+            with project_lock(project_dir):
+                if self._generate_project(pattern, build_opts, default_gpio_pin=gpio_pin) is not None:
+                    # Step 2: make rebuilds only what changed (usually pattern_data.o) and relinks
+                    self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with avr-gcc...")
+                    result = self._build_project(project_dir, output_dir, build_opts)
+                else:
+                    # Chips without a generator profile use the template directory
+                    pattern_header = self._generate_pattern_header(pattern, gpio_pin)
+                    
+                    header_path = output_dir / "pattern_data.h"
+                    with open(header_path, 'w', encoding='utf-8') as f:
+                        f.write(pattern_header)
+                    
+                    self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with avr-gcc...")
+                    
+                    # Step 2: Check if Makefile exists
+                    makefile = template_path / "Makefile"
+                    
+                    if makefile.exists():
+                        # Use Makefile
+                        result = self._build_with_makefile(template_path, output_dir, build_opts)
+                    else:
+                        # Direct avr-gcc compilation
+                        result = self._build_direct(template_path, output_dir, build_opts)
             
             if result.returncode == 0:
                 self._report_progress(UploadStatus.BUILDING, 0.9, "Build successful!")
@@ -262,6 +271,37 @@ class AvrUploader(UploaderBase):
         
         return None
     
+    def _build_project(self, project_dir: Path, output_dir: Path, opts: dict) -> subprocess.CompletedProcess:
+        """Build a generated project with avr-gcc and write firmware.hex"""
+        chip_spec = self.get_chip_spec()
+        mcu = self.chip_id
+        f_cpu = chip_spec.get('clock_speed', 16000000)
+        optimize = opts.get('optimize', '-Os')
+        
+        result = self._make_project(project_dir, {
+            "CC": "avr-gcc",
+            "CFLAGS": f"-mmcu={mcu} -DF_CPU={f_cpu}UL {optimize} -Wall -std=gnu99",
+            "LDFLAGS": f"-mmcu={mcu}",
+        })
+        if result.returncode != 0:
+            return result
+        
+        objcopy = subprocess.run(
+            [
+                "avr-objcopy",
+                "-O", "ihex",
+                "-R", ".eeprom",
+                str(project_dir / "professional_pattern_player"),
+                str(output_dir / "firmware.hex")
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            **get_hidden_subprocess_kwargs()
+        )
+        # Keep the compiler output for warning parsing
+        return objcopy if objcopy.returncode != 0 else result
+    
     def _build_with_makefile(self, template_path: Path, output_dir: Path, opts: dict) -> subprocess.CompletedProcess:
         """Build using Makefile"""
         cmd = [
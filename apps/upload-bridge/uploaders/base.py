@@ -3,10 +3,25 @@ Uploader Base Classes - Interface for all chip uploaders
 Complete implementation with real error handling
 """
 
+import json
+import subprocess
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, List, Callable
+from pathlib import Path
+from typing import Optional, List, Callable, Dict
 from enum import Enum
+from functools import lru_cache
+
+# Generated firmware projects persist here so rebuilds only touch pattern data
+DEFAULT_PROJECT_ROOT = Path.home() / ".upload_bridge" / "projects"
+
+# Build options forwarded to the universal pattern generator
+_GENERATOR_OPTS = ('gpio_pin', 'split_pattern_data', 'compress_frames',
+                   'palette_max_colors', 'color_correction')
+
+_project_locks: Dict[str, threading.Lock] = {}
+_project_locks_guard = threading.Lock()
 
 
 class UploadStatus(Enum):
@@ -30,6 +45,8 @@ class BuildResult:
     chip_model: str
     warnings: List[str] = None
     error_message: Optional[str] = None
+    cache_hit: bool = False  # True if served from the firmware build cache
+    build_seconds: float = 0.0  # Toolchain time (0 on cache hits)
     
     def __post_init__(self):
         if self.warnings is None:
@@ -62,6 +79,30 @@ class DeviceInfo:
     mac_address: Optional[str] = None
 
 
+@lru_cache(maxsize=None)
+def _tool_version(tool: str) -> str:
+    """First line of ``tool --version`` output, probed once per process"""
+    import shutil
+    import subprocess
+    
+    path = shutil.which(tool)
+    if not path:
+        return "missing"
+    try:
+        proc = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
+        output = (proc.stdout or proc.stderr or "").strip()
+        return output.splitlines()[0] if output else path
+    except Exception:
+        return path
+
+
+def project_lock(project_dir: Path) -> threading.Lock:
+    """Lock serializing generation and builds in one project directory"""
+    key = str(Path(project_dir).resolve())
+    with _project_locks_guard:
+        return _project_locks.setdefault(key, threading.Lock())
+
+
 class UploaderBase(ABC):
     """
     Base class for all chip uploaders
@@ -223,6 +264,114 @@ class UploaderBase(ABC):
         
         return (len(missing) == 0, missing)
     
+    def get_toolchain_version(self) -> str:
+        """
+        Get a string identifying the installed build toolchain
+        
+        Used in the firmware build cache key so a toolchain upgrade
+        invalidates cached artifacts.
+        
+        Returns:
+            "tool=version" entries for each required tool
+        
+        Note:
+            Override if a tool reports its version differently
+        """
+        return ";".join(
+            f"{tool}={_tool_version(tool)}" for tool in sorted(self.get_requirements())
+        )
+    
+    def get_project_dir(self, build_opts: dict) -> Path:
+        """
+        Get the persistent firmware project directory for this chip
+        
+        The directory outlives individual builds so the toolchain can reuse
+        the template objects from the previous build.
+        
+        Args:
+            build_opts: Build options (``project_dir`` overrides the default)
+        
+        Returns:
+            Project directory (default: ~/.upload_bridge/projects/<chip_id>)
+        """
+        return Path(build_opts.get('project_dir') or DEFAULT_PROJECT_ROOT / self.chip_id)
+    
+    def _generate_project(self, pattern, build_opts: dict, default_gpio_pin: int = 2) -> Optional[Path]:
+        """
+        Internal: Generate firmware sources with the universal pattern generator
+        
+        Files are rewritten only when their content changes, so a new pattern
+        only touches the pattern data unit and make/arduino-cli rebuild that
+        object and relink. Hold ``project_lock`` around this and the build.
+        
+        Args:
+            pattern: Pattern object to embed
+            build_opts: Build options (generator options are forwarded)
+            default_gpio_pin: Data pin when build_opts has none
+        
+        Returns:
+            Project directory, or None if the generator doesn't support this chip
+        """
+        from firmware.universal_pattern_generator import UniversalPatternGenerator
+        
+        generator = UniversalPatternGenerator()
+        if self.chip_id not in generator.chip_capabilities:
+            return None
+        
+        project_dir = self.get_project_dir(build_opts)
+        config = self.generator_config(build_opts, default_gpio_pin)
+        generator.generate_universal_firmware(pattern, self.chip_id, str(project_dir), config)
+        return project_dir
+    
+    def generator_config(self, build_opts: dict, default_gpio_pin: int = 2) -> dict:
+        """
+        Get the universal pattern generator configuration a build uses
+        
+        Budget estimates pass this to the generator so they measure the
+        same layout the build compiles.
+        
+        Args:
+            build_opts: Build options
+            default_gpio_pin: Data pin when build_opts has none
+        
+        Returns:
+            Generator config (gpio_pin, compress_frames, ...)
+        """
+        config = {name: build_opts[name] for name in _GENERATOR_OPTS if name in build_opts}
+        config.setdefault('gpio_pin', default_gpio_pin)
+        return config
+    
+    def _make_project(self, project_dir: Path, variables: Dict[str, str],
+                      timeout: int = 180) -> subprocess.CompletedProcess:
+        """
+        Internal: Run the generated Makefile with toolchain variables
+        
+        Objects are cleaned first only when the variables differ from the
+        last build in this directory.
+        
+        Args:
+            project_dir: Directory from _generate_project
+            variables: Make variable overrides (CC, CFLAGS, LDFLAGS, ...)
+            timeout: Build timeout in seconds
+        
+        Returns:
+            Completed make process
+        """
+        from core.subprocess_utils import get_hidden_subprocess_kwargs
+        
+        stamp = project_dir / ".build_flags"
+        flags = json.dumps(variables, sort_keys=True)
+        if not stamp.exists() or stamp.read_text(encoding='utf-8') != flags:
+            subprocess.run(["make", "-C", str(project_dir), "clean"], capture_output=True,
+                           text=True, timeout=60, **get_hidden_subprocess_kwargs())
+            stamp.write_text(flags, encoding='utf-8')
+        
+        cmd = ["make", "-C", str(project_dir)]
+        cmd += [f"{name}={value}" for name, value in variables.items()]
+        cmd.append("all")
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout,
+                              **get_hidden_subprocess_kwargs())
+    
     def get_chip_spec(self) -> dict:
         """
         Get chip specifications
@@ -268,8 +417,15 @@ class UploaderBase(ABC):
             Estimated time in seconds
         
         Note:
-            Override for chip-specific calculations
+            Measured throughput of earlier uploads to this chip (from the
+            metrics collector) is used when available. Override for
+            chip-specific nominal calculations.
         """
+        from core.metrics_collector import get_metrics_collector
+        measured = get_metrics_collector().estimate_upload_seconds(firmware_size_bytes, self.chip_id)
+        if measured is not None:
+            return measured
+        
         # Default: assume 115200 baud, ~11520 bytes/sec, plus 30s overhead
         transfer_time = firmware_size_bytes / 11520.0
         return transfer_time + 30.0
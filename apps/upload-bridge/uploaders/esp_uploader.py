@@ -8,7 +8,7 @@ import time
 from pathlib import Path
 from typing import Optional
 
-from .base import UploaderBase, UploadStatus, UploadResult, BuildResult, UploadError, BuildError, DeviceInfo
+from .base import UploaderBase, UploadStatus, UploadResult, BuildResult, UploadError, BuildError, DeviceInfo, project_lock
 from core.subprocess_utils import get_hidden_subprocess_kwargs
 
 # #region agent log
@@ -85,27 +85,6 @@ class EspUploader(UploaderBase):
             # Create output directory
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Step 1: Use simple firmware generator to create firmware source
-            self._report_progress(UploadStatus.BUILDING, 0.1, "Generating firmware source...")
-            
-            from firmware.simple_firmware_generator import generate_simple_firmware
-
-            # Generate firmware source using simple firmware generator (compatible with old format)
-            source_path = generate_simple_firmware(
-                pattern=pattern,
-                chip_id=self.chip_id,
-                output_dir=output_dir,
-                config={"gpio_pin": gpio_pin}
-            )
-            
-            # Step 2: The universal pattern generator already creates the file with the correct name
-            self._report_progress(UploadStatus.BUILDING, 0.2, "Preparing sketch for compilation...")
-            
-            target_ino = Path(source_path)
-            
-            # Step 3: Compile the .ino file to .bin using Arduino CLI
-            self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with Arduino CLI...")
-            
             # Determine FQBN (Fully Qualified Board Name)
             fqbn_map = {
                 "esp8266": "esp8266:esp8266:nodemcuv2",
@@ -116,37 +95,62 @@ class EspUploader(UploaderBase):
             }
             fqbn = fqbn_map.get(self.chip_id, fqbn_map["esp8266"])
             
-            # Create a separate build directory for Arduino CLI
-            build_dir = output_dir / "arduino_build"
-            build_dir.mkdir(exist_ok=True)
-            
-            # Compile using Arduino CLI
-            cmd = [
-                "arduino-cli", "compile",
-                "--fqbn", fqbn,
-                "--build-path", str(build_dir),
-                "--output-dir", str(output_dir),
-                str(target_ino)
-            ]
-            
-            self._report_progress(UploadStatus.BUILDING, 0.5, "Invoking compiler...")
+            # Step 1: Generate the sketch into the persistent project for this chip
+            self._report_progress(UploadStatus.BUILDING, 0.1, "Generating firmware source...")
+            project_dir = self.get_project_dir(build_opts)
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=180,  # 3 minute timeout
-                **get_hidden_subprocess_kwargs()
-            )
+            with project_lock(project_dir):
+                if self._generate_project(pattern, build_opts, default_gpio_pin=gpio_pin) is not None:
+                    target_ino = project_dir / f"{project_dir.name}.ino"
+                    # arduino-cli reuses the core and sketch objects in its build path,
+                    # so a new pattern only recompiles pattern_data.cpp and relinks
+                    build_dir = project_dir.parent / f"{project_dir.name}_build"
+                else:
+                    # Chips without a generator profile use the simple sketch
+                    from firmware.simple_firmware_generator import generate_simple_firmware
+                    
+                    source_path = generate_simple_firmware(
+                        pattern=pattern,
+                        chip_id=self.chip_id,
+                        output_dir=output_dir,
+                        config={"gpio_pin": gpio_pin}
+                    )
+                    target_ino = Path(source_path)
+                    build_dir = output_dir / "arduino_build"
+                build_dir.mkdir(parents=True, exist_ok=True)
+                
+                # Step 2: Compile the .ino file to .bin using Arduino CLI
+                self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with Arduino CLI...")
+                
+                cmd = [
+                    "arduino-cli", "compile",
+                    "--fqbn", fqbn,
+                    "--build-path", str(build_dir),
+                    "--output-dir", str(output_dir),
+                    str(target_ino)
+                ]
+                
+                self._report_progress(UploadStatus.BUILDING, 0.5, "Invoking compiler...")
+                
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    encoding='utf-8',
+                    errors='ignore',
+                    timeout=180,  # 3 minute timeout
+                    **get_hidden_subprocess_kwargs()
+                )
             
             if result.returncode == 0:
                 self._report_progress(UploadStatus.BUILDING, 0.9, "Compilation successful!")
                 
                 # Find the generated binary file
+                sketch_bin = output_dir / f"{target_ino.name}.bin"
                 binary_files = list(output_dir.glob("*.bin"))
-                if binary_files:
+                if sketch_bin.exists():
+                    firmware_path = sketch_bin
+                elif binary_files:
                     firmware_path = binary_files[0]
                 else:
                     # Look for .ino.bin files
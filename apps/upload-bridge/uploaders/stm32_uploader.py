@@ -12,7 +12,7 @@ from typing import Optional
 
 from .base import (
     UploaderBase, BuildResult, UploadResult, DeviceInfo,
-    UploadStatus, BuildError, UploadError
+    UploadStatus, BuildError, UploadError, project_lock
 )
 
 
@@ -84,25 +84,34 @@ class Stm32Uploader(UploaderBase):
             # Create output directory
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Step 1: Generate pattern_data.h
+            # Step 1: Generate sources into the persistent project for this chip
             self._report_progress(UploadStatus.BUILDING, 0.1, "Generating pattern data...")
-            pattern_header = self._generate_pattern_header(pattern, gpio_pin)
+            project_dir = self.get_project_dir(build_opts)
             
-            header_path = output_dir / "pattern_data.h"
-            with open(header_path, 'w', encoding='utf-8') as f:
-                f.write(pattern_header)
-            
-            self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with arm-none-eabi-gcc...")
-            
-            # Step 2: Check for Makefile
-            makefile = template_path / "Makefile"
-            
-            if makefile.exists():
-                # Use Makefile
-                result = self._build_with_makefile(template_path, output_dir, build_opts)
-            else:
-                # Look for STM32CubeIDE project
-                result = self._build_with_cube(template_path, output_dir, build_opts)
+            with project_lock(project_dir):
+                if self._generate_project(pattern, build_opts, default_gpio_pin=gpio_pin) is not None:
+                    # Step 2: make rebuilds only what changed (usually pattern_data.o) and relinks
+                    self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with arm-none-eabi-gcc...")
+                    result = self._build_project(project_dir, template_path, output_dir)
+                else:
+                    # Chips without a generator profile use the template directory
+                    pattern_header = self._generate_pattern_header(pattern, gpio_pin)
+                    
+                    header_path = output_dir / "pattern_data.h"
+                    with open(header_path, 'w', encoding='utf-8') as f:
+                        f.write(pattern_header)
+                    
+                    self._report_progress(UploadStatus.BUILDING, 0.3, "Compiling with arm-none-eabi-gcc...")
+                    
+                    # Step 2: Check for Makefile
+                    makefile = template_path / "Makefile"
+                    
+                    if makefile.exists():
+                        # Use Makefile
+                        result = self._build_with_makefile(template_path, output_dir, build_opts)
+                    else:
+                        # Look for STM32CubeIDE project
+                        result = self._build_with_cube(template_path, output_dir, build_opts)
             
             if result.returncode == 0:
                 self._report_progress(UploadStatus.BUILDING, 0.9, "Build successful!")
@@ -272,6 +281,43 @@ class Stm32Uploader(UploaderBase):
             error_msg = self._parse_upload_error(result.stderr + result.stdout)
             raise UploadError(f"st-flash failed: {error_msg}")
     
+    def _build_project(self, project_dir: Path, template_path: Path, output_dir: Path) -> subprocess.CompletedProcess:
+        """Build a generated project with arm-none-eabi-gcc and write firmware.bin"""
+        if self.chip_id.startswith("stm32f0"):
+            cpu = "cortex-m0"
+        elif self.chip_id.startswith("stm32f4"):
+            cpu = "cortex-m4"
+        else:
+            cpu = "cortex-m3"
+        
+        ldflags = f"-mcpu={cpu} -mthumb --specs=nosys.specs -Wl,--gc-sections"
+        linker_scripts = sorted(template_path.glob("*.ld")) if template_path.exists() else []
+        if linker_scripts:
+            ldflags += f" -T {linker_scripts[0]}"
+        
+        result = self._make_project(project_dir, {
+            "CC": "arm-none-eabi-gcc",
+            "CFLAGS": f"-mcpu={cpu} -mthumb -Os -Wall -std=c99 -ffunction-sections -fdata-sections",
+            "INCLUDES": f"-I. -I{template_path}",
+            "LDFLAGS": ldflags,
+        })
+        if result.returncode != 0:
+            return result
+        
+        objcopy = subprocess.run(
+            [
+                "arm-none-eabi-objcopy",
+                "-O", "binary",
+                str(project_dir / "professional_pattern_player"),
+                str(output_dir / "firmware.bin")
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        # Keep the compiler output for warning parsing
+        return objcopy if objcopy.returncode != 0 else result
+    
     def _build_with_makefile(self, template_path: Path, output_dir: Path, opts: dict) -> subprocess.CompletedProcess:
         """Build using Makefile"""
         cmd = [